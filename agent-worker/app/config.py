@@ -21,16 +21,129 @@ class Settings(BaseSettings):
     tts_cache_ttl: int = 86400  # 24 hours
     tts_cache_enabled: bool = True
 
+    # Deepgram connection pool: warm sockets kept ready for new calls
+    stt_pool_min_size: int = 2
+    stt_pool_max_size: int = 8
+    stt_pool_keepalive_s: float = 5.0  # Deepgram closes idle sockets after ~10s
+    stt_pool_max_age_s: float = 300.0
+
+    # STT send batching: frames are packed into packets of this length
+    # (40-100ms; 0 sends every frame as its own message)
+    stt_batch_ms: int = 60
+
+    # Deepgram reconnect after a dropped socket (audio replay uses
+    # stt_replay_seconds)
+    stt_reconnect_attempts: int = 5
+    stt_reconnect_base_delay_s: float = 0.25
+    stt_reconnect_max_delay_s: float = 4.0
+
+    # STT provider (Assistant.stt_provider overrides) and a warm standby
+    # that takes over mid-call, replaying recent audio ("" disables)
+    stt_provider: str = "deepgram"
+    stt_standby_provider: str = ""
+    stt_replay_seconds: float = 3.0
+    stt_keepalive_interval_s: float = 5.0
+
+    # TTS provider routing: preferred engine, comma-separated failover
+    # list, and the limits past which a provider is routed around
+    tts_provider: str = "minimax"
+    tts_fallback_providers: str = ""
+    tts_router_min_samples: int = 10
+    tts_router_max_error_rate: float = 0.2
+    tts_router_degraded_ttfb_ms: int = 1500
+
+    # TTS request hedging: fire a second request when the first byte is
+    # later than the endpoint's learned TTFB percentile (clamped)
+    tts_hedging_enabled: bool = True
+    tts_hedge_percentile: float = 95.0
+    tts_hedge_default_ms: int = 400  # until enough TTFB samples are seen
+    tts_hedge_min_ms: int = 150
+    tts_hedge_max_ms: int = 2000
+
+    # Local on-disk TTS clip store (per worker host, in front of Redis)
+    tts_disk_cache_enabled: bool = False
+    tts_disk_cache_dir: str = "/var/cache/vox/tts"
+    tts_disk_cache_max_bytes: int = 512 * 1024 * 1024  # 512MB
+
     # AI Services
     openrouter_api_key: Optional[str] = None
     openrouter_base_url: str = "https://openrouter.ai/api/v1"
     minimax_api_key: Optional[str] = None
     minimax_group_id: Optional[str] = None
     minimax_base_url: str = "https://api.minimax.chat/v1"
+    tts_model: str = "speech-02-turbo"
+    # Second region for hedged TTS requests (same endpoint if unset)
+    minimax_fallback_base_url: Optional[str] = None
     deepgram_api_key: Optional[str] = None
 
+    # LLM provider routing and racing: once the primary route has gone
+    # its learned TTFT percentile (clamped) without a token, a second
+    # request goes to llm_race_provider (or llm_race_model) and the first
+    # token wins. Route stats are shared across workers through Redis
+    llm_provider_order: str = "Groq,Together,OpenAI"
+    llm_racing_enabled: bool = False
+    llm_race_provider: str = "Together"
+    llm_race_model: Optional[str] = None
+    llm_race_percentile: int = 90
+    llm_race_default_ms: int = 600  # until enough TTFT samples are seen
+    llm_race_min_ms: int = 150
+    llm_race_max_ms: int = 3000
+    llm_race_min_samples: int = 20
+    llm_stats_window_s: float = 300.0
+
+    # Tool calls: rounds of tool use per turn, the timeout for tools
+    # without server_config.timeoutSeconds, and result size sent to the LLM
+    tool_max_rounds: int = 3
+    tool_default_timeout_s: float = 20.0
+    tool_result_max_chars: int = 4000
+
+    # Tool result cache: tools opt in with server_config.cacheable (and
+    # cacheTtlSeconds); Redis is shared, the hot tier is per process
+    tool_cache_enabled: bool = True
+    tool_cache_default_ttl: int = 300
+    tool_cache_hot_ttl_s: float = 60.0
+    tool_cache_hot_max_entries: int = 1000
+
+    # Prompt-prefix caching: cache_control on the stable system prefix for
+    # providers that need explicit breakpoints (Anthropic minimum is 1024)
+    llm_prompt_cache_enabled: bool = True
+    llm_prompt_cache_min_tokens: int = 1024
+
+    # LLM context window: prompt token budget for models without a
+    # built-in entry, and the background rolling summary of older turns
+    llm_context_token_budget: int = 3000
+    llm_summary_enabled: bool = True
+    llm_summary_trigger_ratio: float = 0.75
+    llm_summary_max_tokens: int = 200
+
+    # Turn detection: end the user's turn on local VAD silence plus a
+    # stable (and ideally punctuated) transcript, before STT finalizes
+    turn_detection_enabled: bool = True
+    turn_fast_silence_ms: int = 200  # stable text ending in . ? !
+    turn_silence_ms: int = 500  # stable text without punctuation
+    turn_fallback_silence_ms: int = 1000  # text that looks unfinished
+    turn_stability_ms: int = 250
+
+    # Filler audio: a cached phrase plays when no response audio has
+    # started this long after the caller stopped speaking ("|"-separated)
+    filler_enabled: bool = True
+    filler_threshold_ms: int = 1200
+    filler_phrases: str = "One moment please|Just a second|Let me check that for you"
+
+    # LLM response cache for short FAQ-style turns (opt-in per assistant
+    # via Assistant.response_cache_enabled); near-duplicate matching is
+    # enabled by setting an OpenAI-compatible embeddings URL
+    response_cache_ttl: int = 3600
+    response_cache_max_words: int = 12
+    response_cache_similarity: float = 0.92
+    response_cache_similarity_timeout_ms: int = 100  # budget for the embedding lookup on a miss
+    response_cache_embedding_url: Optional[str] = None
+    response_cache_embedding_api_key: Optional[str] = None
+    response_cache_embedding_model: str = "text-embedding-3-small"
+
     # Control Plane
     control_plane_url: str = "http://control-plane:8000"
+    worker_service_token: Optional[str] = None  # for the control plane's /internal routes
 
     # Pipeline Settings
     sample_rate: int = 16000
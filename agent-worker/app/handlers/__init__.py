@@ -1,4 +1,10 @@
 """Handlers package."""
 from app.handlers.barge_in import BargeInHandler, create_barge_in_handler
+from app.handlers.turn_detection import TurnDetector, TurnEnd, create_turn_detector
+from app.handlers.filler import FillerPlayer, create_filler_player
 
-__all__ = ["BargeInHandler", "create_barge_in_handler"]
+__all__ = [
+    "BargeInHandler", "create_barge_in_handler",
+    "TurnDetector", "TurnEnd", "create_turn_detector",
+    "FillerPlayer", "create_filler_player"
+]
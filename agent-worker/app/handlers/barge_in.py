@@ -25,11 +25,14 @@ class BargeInHandler:
         )
         self.is_playing = False
         self.interrupted = False
+        # Bumped per start_playback, so a player can tell it was superseded
+        self.playbacks = 0
         self._cancel_event: Optional[asyncio.Event] = None
 
     def start_playback(self):
         """Mark playback as started."""
         self.is_playing = True
+        self.playbacks += 1
         self.interrupted = False
         self.vad_state.reset()
         self._cancel_event = asyncio.Event()
@@ -0,0 +1,205 @@
+"""Filler audio to mask response latency."""
+import asyncio
+import time
+from typing import Awaitable, Callable, Optional
+import numpy as np
+import structlog
+
+from app.config import settings
+from app.handlers.barge_in import BargeInHandler
+from app.services.latency import LatencyStats
+
+logger = structlog.get_logger()
+
+
+class FillerPlayer:
+    """
+    Plays a short filler phrase when a response is slow to start.
+
+    The wait is measured from when the caller stopped speaking, so time
+    already spent deciding the turn ended counts against the threshold;
+    a turn whose response audio has not started ``threshold_ms`` after the
+    caller went quiet gets one filler ("One moment please"). Clips are
+    held in memory, loaded once through the TTS cache.
+
+    Filler audio is queued in small paced chunks, so once response audio
+    arrives (``on_response_audio``) at most one chunk is still queued; one
+    more chunk of the clip is queued faded to silence, so the phrase ends
+    softly instead of clicking off, and the response follows without
+    overlap. While a filler plays, the barge-in handler treats it as
+    playback, so the caller can talk over it.
+    """
+
+    def __init__(
+        self,
+        play: Callable[[bytes], Awaitable[None]],
+        barge_in: Optional[BargeInHandler] = None,
+        phrases: Optional[list[str]] = None,
+        threshold_ms: Optional[int] = None,
+        enabled: Optional[bool] = None,
+        chunk_ms: int = 60,
+        sample_rate: Optional[int] = None,
+        sample_width: int = 2,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize player.
+
+        Args:
+            play: Coroutine queueing one audio chunk for playback
+            barge_in: Handler told when filler playback starts and stops
+            phrases: Filler phrases (settings.filler_phrases if None)
+            threshold_ms: Dead air allowed before a filler plays
+                (settings.filler_threshold_ms if None)
+            enabled: If False, never play fillers
+            chunk_ms: Duration of each queued filler chunk
+            sample_rate: Audio sample rate (settings.sample_rate if None)
+            sample_width: Bytes per sample (mono)
+            clock: Monotonic time source in seconds
+        """
+        self._play = play
+        self.barge_in = barge_in
+        if phrases is None:
+            phrases = [p.strip() for p in settings.filler_phrases.split("|") if p.strip()]
+        self.phrases = phrases
+        self.threshold_ms = threshold_ms or settings.filler_threshold_ms
+        self.enabled = settings.filler_enabled if enabled is None else enabled
+        self.chunk_ms = chunk_ms
+        self.chunk_bytes = (sample_rate or settings.sample_rate) * sample_width * chunk_ms // 1000
+        self._clock = clock
+
+        self.clips: dict[str, bytes] = {}
+        self._next = 0
+        self._task: Optional[asyncio.Task] = None
+        self._turn_started: Optional[float] = None
+        self._responded = True
+        # Clip being played and the offset of its next chunk
+        self._clip = b""
+        self._position = 0
+        self._playing = False
+        self._playback = 0
+
+        # Metrics
+        self.turns = 0
+        self.played = 0
+        self.latency = LatencyStats()  # caller silence to response audio
+
+    async def load(self, tts):
+        """Fetch filler clips into memory (cached audio after pre-warm)."""
+        if not self.enabled:
+            return
+        for phrase in self.phrases:
+            try:
+                audio = await tts.synthesize(phrase)
+            except Exception as e:
+                logger.warning("Filler clip unavailable", phrase=phrase, error=str(e))
+                continue
+            if audio:
+                self.clips[phrase] = bytes(audio)
+        logger.debug("Filler clips loaded", count=len(self.clips))
+
+    def start_turn(self, elapsed_ms: float = 0.0):
+        """
+        Start timing a response.
+
+        Args:
+            elapsed_ms: Time since the caller stopped speaking
+                (TurnEnd.latency_ms)
+        """
+        self._cancel_task()
+        self._end_playback()
+        self.turns += 1
+        self._turn_started = self._clock() - elapsed_ms / 1000
+        self._responded = False
+        if self.enabled and self.clips:
+            self._task = asyncio.create_task(self._run(self.threshold_ms - elapsed_ms))
+
+    async def _run(self, wait_ms: float):
+        if wait_ms > 0:
+            await asyncio.sleep(wait_ms / 1000)
+        if self._responded:
+            return
+
+        phrases = [p for p in self.phrases if p in self.clips]
+        phrase = phrases[self._next % len(phrases)]
+        self._next += 1
+        self.played += 1
+        logger.info("Playing filler", phrase=phrase, waited_ms=round(self._elapsed_ms()))
+
+        self._clip = self.clips[phrase]
+        self._position = 0
+        self._playing = True
+        if self.barge_in:
+            self.barge_in.start_playback()
+            self._playback = self.barge_in.playbacks
+        while self._position < len(self._clip):
+            if self._responded or (self.barge_in and self.barge_in.interrupted):
+                break
+            chunk = self._clip[self._position:self._position + self.chunk_bytes]
+            self._position += len(chunk)
+            await self._play(chunk)
+            await asyncio.sleep(self.chunk_ms / 1000)
+        self._end_playback()
+
+    def _elapsed_ms(self) -> float:
+        return (self._clock() - self._turn_started) * 1000 if self._turn_started else 0.0
+
+    async def on_response_audio(self):
+        """
+        Note that response audio is ready; stops any filler.
+
+        Await before queueing the response: a filler cut mid-clip gets a
+        short faded tail queued first. Playback tracking passes to the
+        response, which has already started it.
+        """
+        if self._responded:
+            return
+        self._responded = True
+        self.latency.record(self._elapsed_ms())
+        self._cancel_task()
+        if self._playing:
+            self._playing = False
+            tail = self._clip[self._position:self._position + self.chunk_bytes]
+            if tail:
+                await self._play(_fade_out(tail))
+
+    def _end_playback(self):
+        if self._playing:
+            self._playing = False
+            # Leave playback alone if the response has already started it
+            if self.barge_in and self.barge_in.playbacks == self._playback:
+                self.barge_in.stop_playback()
+
+    def _cancel_task(self):
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+        self._task = None
+
+    def cancel(self):
+        """End the turn without response audio (barge-in, empty reply)."""
+        self._responded = True
+        self._cancel_task()
+        self._end_playback()
+
+    def stats(self) -> dict:
+        """Filler counters and response latency for logging."""
+        return {
+            "turns": self.turns,
+            "fillers": self.played,
+            "response_latency_ms": self.latency.snapshot(),
+        }
+
+
+def _fade_out(pcm: bytes) -> bytes:
+    """Ramp 16-bit PCM linearly down to silence."""
+    samples = np.frombuffer(pcm[:len(pcm) - len(pcm) % 2], dtype="<i2")
+    ramp = np.linspace(1.0, 0.0, len(samples), dtype=np.float32)
+    return (samples * ramp).astype("<i2").tobytes()
+
+
+def create_filler_player(
+    play: Callable[[bytes], Awaitable[None]],
+    barge_in: Optional[BargeInHandler] = None,
+    **kwargs
+) -> FillerPlayer:
+    return FillerPlayer(play, barge_in, **kwargs)
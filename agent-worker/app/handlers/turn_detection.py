@@ -0,0 +1,219 @@
+"""Turn detection: decide when the user has finished speaking."""
+import re
+import time
+from typing import Callable, Optional
+import structlog
+
+from app.config import settings
+from app.services.transcript import Transcript
+from app.services.vad import VADState, create_vad_state
+
+logger = structlog.get_logger()
+
+# Trailing words that suggest the user is mid-sentence
+CONTINUATION_WORDS = frozenset({
+    "and", "but", "or", "so", "because", "then", "um", "uh", "like",
+    "the", "a", "an", "to", "of", "with", "my", "if", "that", "which",
+})
+
+_SENTENCE_END = re.compile(r"[.?!][\"')\]]*$")
+
+
+class TurnEnd:
+    """A decision that the user's turn is over."""
+
+    __slots__ = ("text", "reason", "latency_ms")
+
+    def __init__(self, text: str, reason: str, latency_ms: float):
+        self.text = text
+        self.reason = reason
+        # Time from the last voiced frame to the decision
+        self.latency_ms = latency_ms
+
+    def __repr__(self) -> str:
+        return f"TurnEnd({self.text!r}, reason={self.reason!r})"
+
+
+class TurnDetector:
+    """
+    Fuses local VAD, interim stability and punctuation to end turns early.
+
+    Deepgram finalizes a segment only after its own endpointing pause;
+    locally we already know when the caller went quiet. A turn ends when,
+    after local silence:
+
+    - "punctuation": ``fast_silence_ms`` of silence and a stable transcript
+      ending in sentence-final punctuation
+    - "silence": ``silence_ms`` of silence and a stable transcript
+    - "final": Deepgram finalizes an unambiguous transcript
+    - "fallback": the transcript looks unfinished (trailing conjunction,
+      filler or comma), so only ``fallback_silence_ms`` of silence ends it
+
+    A transcript is stable when no interim has changed it for
+    ``stability_ms``. After an early decision, transcripts are ignored
+    until new speech starts, so Deepgram's late final for the same words
+    does not start a second turn. If that final only arrives once the
+    caller speaks again, it is recognised by its audio timing (or, without
+    timings, its text) and dropped rather than prepended to the new turn.
+    """
+
+    def __init__(
+        self,
+        enabled: Optional[bool] = None,
+        fast_silence_ms: Optional[int] = None,
+        silence_ms: Optional[int] = None,
+        fallback_silence_ms: Optional[int] = None,
+        stability_ms: Optional[int] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize detector (thresholds default to settings.turn_*).
+
+        Args:
+            enabled: If False, every non-empty final ends the turn
+            fast_silence_ms: Silence needed when punctuation ends the text
+            silence_ms: Silence needed for an unpunctuated stable text
+            fallback_silence_ms: Silence needed when the text looks unfinished
+            stability_ms: Time without interim changes to call text stable
+            clock: Monotonic time source in seconds
+        """
+        self.enabled = settings.turn_detection_enabled if enabled is None else enabled
+        self.fast_silence_ms = fast_silence_ms or settings.turn_fast_silence_ms
+        self.silence_ms = silence_ms or settings.turn_silence_ms
+        self.fallback_silence_ms = fallback_silence_ms or settings.turn_fallback_silence_ms
+        self.stability_ms = stability_ms or settings.turn_stability_ms
+        self._clock = clock
+
+        self.vad_state: VADState = create_vad_state(
+            silence_threshold_ms=self.silence_ms,
+            speech_threshold_ms=100
+        )
+        self._finals: list[str] = []
+        self._interim = ""
+        self._text_changed_at = 0.0
+        self._last_speech_at: Optional[float] = None
+        self._committed = False
+        # Stream time (s) covered by transcripts of the current turn, and
+        # where the last committed turn ended, to spot its late results
+        self._heard_until = 0.0
+        self._committed_until = 0.0
+        self._committed_text = ""
+
+    @property
+    def text(self) -> str:
+        """Transcript of the turn so far."""
+        return " ".join(part for part in (*self._finals, self._interim) if part).strip()
+
+    def process_frame(self, is_speech: bool, frame_duration_ms: int = 30) -> Optional[TurnEnd]:
+        """
+        Feed one VAD decision.
+
+        Returns:
+            TurnEnd if this frame's silence completes the turn
+        """
+        state = self.vad_state.update(is_speech, frame_duration_ms)
+        if state["speech_started"]:
+            self._committed = False
+        if is_speech:
+            self._last_speech_at = self._clock()
+            return None
+        if not self.enabled or self._committed:
+            return None
+
+        silence = self.vad_state.silence_frames * frame_duration_ms
+        return self._evaluate(silence)
+
+    def on_transcript(self, transcript: Transcript) -> Optional[TurnEnd]:
+        """
+        Feed one STT result.
+
+        Returns:
+            TurnEnd if this result completes the turn
+        """
+        if self._committed:
+            return None
+        text = transcript.text.strip()
+        if self._from_committed_turn(transcript, text):
+            return None
+        self._heard_until = max(self._heard_until, transcript.end)
+
+        if not self.enabled:
+            if transcript.is_final and text:
+                self._finals.append(text)
+                return self._end("final")
+            return None
+
+        if transcript.is_final:
+            if text:
+                self._finals.append(text)
+                self._text_changed_at = self._clock()
+            self._interim = ""
+            if self.text and not self._unfinished(self.text):
+                return self._end("final")
+        elif text != self._interim:
+            self._interim = text
+            self._text_changed_at = self._clock()
+        return None
+
+    def _evaluate(self, silence_ms: float) -> Optional[TurnEnd]:
+        text = self.text
+        if not text or silence_ms < self.fast_silence_ms:
+            return None
+
+        if self._unfinished(text):
+            if silence_ms >= self.fallback_silence_ms:
+                return self._end("fallback")
+            return None
+
+        stable = (self._clock() - self._text_changed_at) * 1000 >= self.stability_ms
+        if not stable:
+            return None
+        if _SENTENCE_END.search(text):
+            return self._end("punctuation")
+        if silence_ms >= self.silence_ms:
+            return self._end("silence")
+        return None
+
+    def _from_committed_turn(self, transcript: Transcript, text: str) -> bool:
+        """Whether a result belongs to audio of the already-ended turn."""
+        if transcript.end > 0 and self._committed_until > 0:
+            return transcript.start < self._committed_until
+        return bool(text) and text == self._committed_text
+
+    @staticmethod
+    def _unfinished(text: str) -> bool:
+        if text.endswith((",", "-", "...")):
+            return True
+        last = text.rsplit(None, 1)[-1].strip(".,?!\"'").lower()
+        return last in CONTINUATION_WORDS
+
+    def _end(self, reason: str) -> TurnEnd:
+        now = self._clock()
+        latency_ms = (now - self._last_speech_at) * 1000 if self._last_speech_at else 0.0
+        turn = TurnEnd(self.text, reason, latency_ms)
+        logger.info("Turn end", reason=reason, decision_latency_ms=round(latency_ms, 1))
+
+        self._committed_until = self._heard_until
+        self._committed_text = turn.text
+        self._finals = []
+        self._interim = ""
+        # Early decisions wait for new speech; a final has no late duplicate
+        self._committed = reason != "final"
+        if self._committed:
+            self.vad_state.reset()  # so resumed speech registers as a start
+        return turn
+
+    def reset(self):
+        """Forget the current turn."""
+        self.vad_state.reset()
+        self._finals = []
+        self._interim = ""
+        self._last_speech_at = None
+        self._committed = False
+        self._heard_until = 0.0
+        self._committed_until = 0.0
+        self._committed_text = ""
+
+
+def create_turn_detector(**kwargs) -> TurnDetector:
+    return TurnDetector(**kwargs)
@@ -7,8 +7,9 @@ from livekit.api import RoomServiceClient, CreateRoomRequest
 from app.config import settings
 from app.pipeline import run_bot
 from app.services import (
-    DeepgramSTTService, MinimaxTTSService, OpenRouterService,
-    tts_cache, prewarm_tts_cache
+    DeepgramSTTService, MinimaxTTSService, OpenRouterService, ToolExecutor,
+    tts_cache, prewarm_tts_cache, response_cache, http_embedder, llm_stats,
+    tool_cache
 )
 
 structlog.configure(
@@ -29,9 +30,26 @@ async def prewarm_connections():
     # Connect to Redis for TTS caching
     await tts_cache.connect()
 
+    # Connect response cache (with near-duplicate matching if configured)
+    embedder = None
+    if settings.response_cache_embedding_url:
+        embedder = http_embedder(
+            settings.response_cache_embedding_url,
+            settings.response_cache_embedding_api_key,
+            settings.response_cache_embedding_model
+        )
+    await response_cache.connect(embedder)
+
+    # Shared LLM route stats (drive racing thresholds across workers)
+    await llm_stats.connect()
+
+    # Connect tool result cache
+    await tool_cache.connect()
+
     # Pre-warm shared HTTP clients
     await MinimaxTTSService.get_shared_client()
     await OpenRouterService.get_shared_client()
+    await ToolExecutor.get_shared_client()
 
     # Pre-warm Deepgram WebSocket connection
     if settings.deepgram_api_key:
@@ -111,8 +129,15 @@ class AgentWorker:
 
         self.active_bots.clear()
 
+        # Close warm STT sockets and the tool client pool
+        await DeepgramSTTService.close_pooled_connection()
+        await ToolExecutor.close_shared_client()
+
         # Disconnect TTS cache
         await tts_cache.disconnect()
+        await response_cache.disconnect()
+        await llm_stats.disconnect()
+        await tool_cache.disconnect()
 
     async def _poll_rooms(self):
         """Poll for new LiveKit rooms."""
@@ -179,18 +204,65 @@ class AgentWorker:
 
                     if response.status_code == 200:
                         data = response.json()
+                        tools = await self._get_tools(client, data["id"], data.get("tool_ids") or [])
+                        # Comma-separated in the control plane; None keeps the worker default
+                        fallbacks = data.get("tts_fallback_providers")
+                        if fallbacks is not None:
+                            fallbacks = [p.strip() for p in fallbacks.split(",") if p.strip()]
                         return {
                             "assistant_id": data["id"],
                             "system_prompt": data["system_prompt"],
                             "minimax_voice_id": data["minimax_voice_id"],
+                            "tts_model": data.get("tts_model"),
+                            "tts_provider": data.get("tts_provider"),
+                            "tts_fallback_providers": fallbacks,
+                            "stt_provider": data.get("stt_provider"),
                             "llm_model": data["llm_model"],
-                            "first_message": data.get("first_message")
+                            "first_message": data.get("first_message"),
+                            "response_cache_enabled": data.get("response_cache_enabled", False),
+                            # Any edit to the assistant invalidates cached responses
+                            "config_version": data.get("updated_at") or "",
+                            "tools": tools
                         }
             except Exception as e:
                 logger.error("Failed to get assistant config", error=str(e))
 
         return None
 
+    async def _get_tool_auth(self, client, base: str, assistant_id: str) -> dict:
+        """Resolved tool credentials from the control plane's internal route."""
+        if not settings.worker_service_token:
+            return {}
+        response = await client.get(
+            f"{base}/internal/assistants/{assistant_id}/tool-auth",
+            headers={"Authorization": f"Bearer {settings.worker_service_token}"}
+        )
+        response.raise_for_status()
+        return response.json().get("tools", {})
+
+    async def _get_tools(self, client, assistant_id: str, tool_ids: list[str]) -> list[dict]:
+        """Fetch the assistant's tool definitions and credentials concurrently."""
+        if not tool_ids:
+            return []
+        base = f"{settings.control_plane_url}/api/v1"
+        auth, *responses = await asyncio.gather(
+            self._get_tool_auth(client, base, assistant_id),
+            *(client.get(f"{base}/tools/{tool_id}") for tool_id in tool_ids),
+            return_exceptions=True
+        )
+        if isinstance(auth, Exception):
+            logger.warning("Failed to resolve tool credentials", assistant_id=assistant_id, error=str(auth))
+            auth = {}
+
+        tools = []
+        for tool_id, response in zip(tool_ids, responses):
+            if isinstance(response, Exception) or response.status_code != 200:
+                logger.warning("Failed to load tool", tool_id=tool_id)
+                continue
+            tool = response.json()
+            tool["auth_headers"] = auth.get(str(tool["id"]), {})
+            tools.append(tool)
+        return tools
 
 async def main():
     """Main entry point."""
@@ -10,10 +10,16 @@ from app.config import settings
 from app.services import (
     create_llm_service, create_tts_service,
     create_stt_service, create_vad_service,
-    OpenRouterService, MinimaxTTSService,
-    DeepgramSTTService, WebRTCVADService
+    OpenRouterService, TTSProvider,
+    STTProvider, DeepgramSTTService, WebRTCVADService, AudioCoalescer,
+    ConversationContext, llm_summarizer, response_cache,
+    ToolCall, ToolExecutor, create_tool_executor
+)
+from app.handlers import (
+    BargeInHandler, create_barge_in_handler,
+    TurnDetector, TurnEnd, create_turn_detector,
+    FillerPlayer, create_filler_player
 )
-from app.handlers import BargeInHandler, create_barge_in_handler
 
 logger = structlog.get_logger()
 
@@ -38,30 +44,49 @@ class VoiceBot:
         system_prompt: str,
         voice_id: str = "mallory",
         llm_model: str = "groq/llama-3.1-8b-instant",
-        first_message: Optional[str] = None
+        first_message: Optional[str] = None,
+        tts_model: Optional[str] = None,
+        tts_provider: Optional[str] = None,
+        tts_fallback_providers: Optional[list[str]] = None,
+        stt_provider: Optional[str] = None,
+        response_cache_enabled: bool = False,
+        config_version: str = "",
+        tools: Optional[list[dict]] = None
     ):
         self.room_name = room_name
         self.assistant_id = assistant_id
         self.system_prompt = system_prompt
         self.voice_id = voice_id
+        self.tts_model = tts_model
+        self.tts_provider = tts_provider
+        self.tts_fallback_providers = tts_fallback_providers
+        self.stt_provider = stt_provider
         self.llm_model = llm_model
         self.first_message = first_message
+        self.response_cache_enabled = response_cache_enabled
+        self.config_version = config_version
+        self.tool_configs = tools
 
         # Services
         self.llm: Optional[OpenRouterService] = None
-        self.tts: Optional[MinimaxTTSService] = None
-        self.stt: Optional[DeepgramSTTService] = None
+        self.tts: Optional[TTSProvider] = None
+        self.stt: Optional[STTProvider] = None
+        self.stt_sender: Optional[AudioCoalescer] = None
         self.vad: Optional[WebRTCVADService] = None
         self.barge_in: Optional[BargeInHandler] = None
+        self.turn_detector: Optional[TurnDetector] = None
+        self.filler: Optional[FillerPlayer] = None
+        self.tools: Optional[ToolExecutor] = None
 
         # LiveKit
         self.room: Optional[Room] = None
         self.audio_source: Optional[AudioSource] = None
 
         # State
-        self.conversation_history: list[dict] = []
+        self.context: Optional[ConversationContext] = None
         self.is_running = False
         self._audio_queue: asyncio.Queue = asyncio.Queue()
+        self._turn_queue: asyncio.Queue = asyncio.Queue()
 
     async def start(self):
         """Initialize services and connect to LiveKit room."""
@@ -73,12 +98,25 @@ class VoiceBot:
 
         # Initialize services
         self.llm = create_llm_service(model=self.llm_model)
-        self.tts = create_tts_service(voice_id=self.voice_id)
-        self.stt = create_stt_service()
+        self.context = ConversationContext(
+            self.llm_model,
+            summarizer=llm_summarizer(self.llm)
+        )
+        self.tts = create_tts_service(
+            voice_id=self.voice_id,
+            model=self.tts_model,
+            provider=self.tts_provider,
+            fallback_providers=self.tts_fallback_providers
+        )
+        self.stt = create_stt_service(provider=self.stt_provider)
+        self.stt_sender = AudioCoalescer(self.stt.send_audio)
         self.vad = create_vad_service(aggressiveness=3)
         self.barge_in = create_barge_in_handler(on_interrupt=self._on_interrupt)
+        self.turn_detector = create_turn_detector()
+        self.filler = create_filler_player(play=self._audio_queue.put, barge_in=self.barge_in)
+        self.tools = create_tool_executor(self.tool_configs)
 
-        # Connect to Deepgram
+        # Connect to the STT provider
         await self.stt.connect()
 
         # Connect to LiveKit room
@@ -96,7 +134,9 @@ class VoiceBot:
         self.is_running = True
         asyncio.create_task(self._process_incoming_audio())
         asyncio.create_task(self._process_transcripts())
+        asyncio.create_task(self._process_turns())
         asyncio.create_task(self._play_audio())
+        asyncio.create_task(self.filler.load(self.tts))
 
         # Send first message if configured
         if self.first_message:
@@ -107,8 +147,19 @@ class VoiceBot:
         logger.info("Stopping voice bot")
         self.is_running = False
 
+        if self.stt_sender:
+            await self.stt_sender.close()
+            logger.info("STT batching stats", **self.stt_sender.stats())
+        if self.filler:
+            self.filler.cancel()
+            logger.info("Filler stats", **self.filler.stats())
         if self.stt:
             await self.stt.close()
+            pool_metrics = DeepgramSTTService.pool_metrics()
+            if pool_metrics:
+                logger.info("STT pool stats", **pool_metrics)
+        if self.context:
+            await self.context.close()
         if self.llm:
             await self.llm.close()
         if self.tts:
@@ -151,6 +202,7 @@ class VoiceBot:
     async def _process_incoming_audio(self):
         """Process incoming audio from the room."""
         logger.info("Starting incoming audio processing")
+        was_speech = False
 
         async for audio_stream in AudioStream.create(
             room=self.room,
@@ -162,65 +214,148 @@ class VoiceBot:
 
                 # Get frame data
                 audio_data = frame.frame.data
+                frame_ms = round(frame.frame.samples_per_channel * 1000 / frame.frame.sample_rate)
 
                 # Run VAD
                 is_speech = self.vad.is_speech(bytes(audio_data))
 
                 # Check for barge-in
-                if self.barge_in.process_frame(is_speech):
+                if self.barge_in.process_frame(is_speech, frame_ms):
                     logger.info("Barge-in detected")
                     await self.barge_in.cancel()
 
-                # Send to STT if speech detected
+                # Local silence can end the turn before STT finalizes
+                turn = self.turn_detector.process_frame(is_speech, frame_ms)
+                if turn:
+                    self._turn_queue.put_nowait(turn)
+
+                # Send to STT if speech detected, in batched packets;
+                # flush the partial packet as soon as speech ends
                 if is_speech:
-                    await self.stt.send_audio(bytes(audio_data))
+                    await self.stt_sender.add(bytes(audio_data))
+                elif was_speech:
+                    await self.stt_sender.flush()
+                was_speech = is_speech
 
     async def _process_transcripts(self):
-        """Process STT transcripts and generate responses."""
+        """Feed STT transcripts to turn detection."""
         logger.info("Starting transcript processing")
 
         async for transcript in self.stt.receive_transcripts():
             if not self.is_running:
                 break
 
-            text = transcript["text"]
-            is_final = transcript["is_final"]
+            turn = self.turn_detector.on_transcript(transcript)
+            if turn:
+                self._turn_queue.put_nowait(turn)
 
-            if is_final and text.strip():
-                logger.info("User said", text=text)
-                self.conversation_history.append({
-                    "role": "user",
-                    "content": text
-                })
+    async def _process_turns(self):
+        """Generate responses to completed user turns, one at a time."""
+        while self.is_running:
+            turn: TurnEnd = await self._turn_queue.get()
 
-                # Generate and speak response
-                await self._respond(text)
+            logger.info("User said", text=turn.text, turn_end=turn.reason)
+            history = self.context.history()
+            self.context.add("user", turn.text)
 
-    async def _respond(self, user_input: str):
-        """Generate and speak response to user input."""
-        logger.info("Generating response")
+            # Dead air is counted from when the caller went quiet
+            self.filler.start_turn(turn.latency_ms)
 
-        full_response = ""
-        async for chunk in self.llm.stream_completion(
-            messages=self.conversation_history,
-            system_prompt=self.system_prompt
-        ):
-            full_response += chunk
+            # Serve a cached reply if this assistant opted in
+            if self.response_cache_enabled:
+                cached = await response_cache.get(
+                    self.assistant_id, self.config_version, turn.text, history
+                )
+                if cached:
+                    await self._speak_cached(cached)
+                    self.filler.cancel()
+                    continue
+
+            # Generate and speak response
+            await self._respond(turn.text, history)
+            self.filler.cancel()
+
+    async def _speak_cached(self, sentences: list[str]):
+        """Speak a cached reply; per-sentence audio comes from the TTS cache."""
+        for sentence in sentences:
+            await self._speak(sentence)
+            if self.barge_in.interrupted:
+                break
+        self.context.add("assistant", " ".join(sentences))
+        self.context.schedule_summary()
 
-            # Stream to TTS in sentences
-            if chunk in ".!?":
-                await self._speak(full_response.strip())
-                full_response = ""
+    async def _respond(self, user_input: str, history: Optional[list[dict]] = None):
+        """Generate and speak response to user input, running any tool calls."""
+        logger.info("Generating response")
 
-        # Speak any remaining text
-        if full_response.strip():
-            await self._speak(full_response.strip())
+        spoken: list[str] = []
+        interrupted = False
+        used_tools = False
+
+        for round_index in range(settings.tool_max_rounds + 1):
+            full_response = ""
+            sentence = ""
+            calls: list[ToolCall] = []
+            running: list[asyncio.Task] = []
+            announced: set[str] = set()
+            # The last round gets no tools, so it has to answer in words
+            tools = self.tools.definitions() if self.tools and round_index < settings.tool_max_rounds else None
+
+            async for chunk in self.llm.stream_completion(
+                messages=self.context.window(self.system_prompt),
+                system_prompt=self.system_prompt,
+                tools=tools
+            ):
+                if isinstance(chunk, ToolCall):
+                    # Start now; later calls in the same response run alongside
+                    calls.append(chunk)
+                    running.append(self.tools.start(chunk))
+                    message = self.tools.message(chunk.name, "on_start")
+                    if message and chunk.name not in announced:
+                        announced.add(chunk.name)
+                        await self._speak(message)
+                    continue
+
+                full_response += chunk
+                sentence += chunk
+
+                # Stream to TTS in sentences
+                if chunk in ".!?":
+                    spoken.append(sentence.strip())
+                    await self._speak(spoken[-1])
+                    interrupted = interrupted or self.barge_in.interrupted
+                    sentence = ""
+
+            # Speak any remaining text
+            if sentence.strip():
+                spoken.append(sentence.strip())
+                await self._speak(spoken[-1])
+                interrupted = interrupted or self.barge_in.interrupted
+
+            if not calls:
+                # Add to history, then condense old turns off the response path
+                self.context.add("assistant", full_response)
+                break
 
-        # Add to history
-        self.conversation_history.append({
-            "role": "assistant",
-            "content": full_response
-        })
+            used_tools = True
+            self.context.add_message({
+                "role": "assistant",
+                "content": full_response or None,
+                "tool_calls": [call.to_message() for call in calls]
+            })
+            for result in await asyncio.gather(*running):
+                self.context.add_message(result.to_message())
+                message = self.tools.message(result.call.name, "on_success" if result.ok else "on_error")
+                if message:
+                    await self._speak(message)
+
+        self.context.schedule_summary()
+
+        # Only complete replies that did not depend on live tool data are reused
+        if self.response_cache_enabled and history is not None and not interrupted and not used_tools:
+            asyncio.create_task(response_cache.set(
+                self.assistant_id, self.config_version, user_input, history, spoken
+            ))
 
     async def _speak(self, text: str):
         """Synthesize and queue audio for playback."""
@@ -235,6 +370,7 @@ class VoiceBot:
             async for audio_chunk in self.tts.stream_tts(text):
                 if self.barge_in.interrupted:
                     break
+                await self.filler.on_response_audio()
                 await self._audio_queue.put(audio_chunk)
         finally:
             self.barge_in.stop_playback()
@@ -264,6 +400,7 @@ class VoiceBot:
     async def _on_interrupt(self):
         """Handle barge-in interruption."""
         logger.info("Playback interrupted by user")
+        self.filler.cancel()
         # Clear audio queue
         while not self._audio_queue.empty():
             try:
@@ -292,7 +429,14 @@ async def run_bot(
         system_prompt=assistant_config["system_prompt"],
         voice_id=assistant_config.get("minimax_voice_id", "mallory"),
         llm_model=assistant_config.get("llm_model", "groq/llama-3.1-8b-instant"),
-        first_message=assistant_config.get("first_message")
+        first_message=assistant_config.get("first_message"),
+        tts_model=assistant_config.get("tts_model"),
+        tts_provider=assistant_config.get("tts_provider"),
+        tts_fallback_providers=assistant_config.get("tts_fallback_providers"),
+        stt_provider=assistant_config.get("stt_provider"),
+        response_cache_enabled=assistant_config.get("response_cache_enabled", False),
+        config_version=assistant_config.get("config_version", ""),
+        tools=assistant_config.get("tools")
     )
 
     await bot.start()
@@ -1,5 +1,6 @@
 """Services package."""
-from app.services.llm import OpenRouterService, create_llm_service
+from app.services.llm import OpenRouterService, ToolCall, create_llm_service
+from app.services.llm_stats import LLMStatsStore, llm_stats
 from app.services.tts import MinimaxTTSService, create_tts_service
 from app.services.stt import DeepgramSTTService, create_stt_service
 from app.services.vad import (
@@ -10,11 +11,44 @@ from app.services.tts_cache import (
     TTSCacheService, tts_cache,
     prewarm_tts_cache, get_common_phrases
 )
+from app.services.tts_disk_cache import TTSDiskCache
+from app.services.audio_transcode import StreamTranscoder, transcode
+from app.services.latency import LatencyStats, LatencyTracker
+from app.services.stt_provider import (
+    STTProvider, FailoverSTTService, LocalSTTService,
+    register_stt_provider, create_stt_provider
+)
+from app.services.stt_batch import AudioCoalescer
+from app.services.transcript import Transcript, TranscriptParser
+from app.services.tool_cache import ToolResultCache, tool_cache
+from app.services.tools import (
+    ToolSpec, ToolResult, ToolExecutor, create_tool_executor
+)
+from app.services.context import ConversationContext, llm_summarizer
+from app.services.response_cache import (
+    ResponseCacheService, response_cache, http_embedder
+)
+from app.services.tts_provider import (
+    TTSProvider, TTSRouter, LocalTTSService,
+    register_tts_provider, create_tts_provider
+)
 
 __all__ = [
-    "OpenRouterService", "create_llm_service",
+    "OpenRouterService", "ToolCall", "create_llm_service",
+    "LLMStatsStore", "llm_stats",
     "MinimaxTTSService", "create_tts_service",
     "DeepgramSTTService", "create_stt_service",
     "WebRTCVADService", "VADState", "create_vad_service", "create_vad_state",
-    "TTSCacheService", "tts_cache", "prewarm_tts_cache", "get_common_phrases"
+    "TTSCacheService", "tts_cache", "prewarm_tts_cache", "get_common_phrases",
+    "TTSDiskCache", "StreamTranscoder", "transcode",
+    "LatencyStats", "LatencyTracker",
+    "TTSProvider", "TTSRouter", "LocalTTSService",
+    "register_tts_provider", "create_tts_provider",
+    "STTProvider", "FailoverSTTService", "LocalSTTService",
+    "register_stt_provider", "create_stt_provider",
+    "AudioCoalescer", "Transcript", "TranscriptParser",
+    "ToolResultCache", "tool_cache",
+    "ToolSpec", "ToolResult", "ToolExecutor", "create_tool_executor",
+    "ConversationContext", "llm_summarizer",
+    "ResponseCacheService", "response_cache", "http_embedder"
 ]
@@ -0,0 +1,46 @@
+"""Bounded buffer of recently sent audio for replay after reconnects."""
+from collections import deque
+
+
+class AudioReplayBuffer:
+    """
+    Ring buffer holding the last ``seconds`` of a PCM stream.
+
+    Also tracks where the buffered audio sits in the stream, so results
+    from a replayed connection can be mapped back to stream time.
+    """
+
+    def __init__(self, seconds: float, sample_rate: int, sample_width: int = 2):
+        """
+        Initialize buffer.
+
+        Args:
+            seconds: Audio duration to retain
+            sample_rate: Stream sample rate
+            sample_width: Bytes per sample (mono)
+        """
+        self.bytes_per_second = sample_rate * sample_width
+        self.limit = int(seconds * self.bytes_per_second)
+        self._chunks: deque[bytes] = deque()
+        self.nbytes = 0
+        self.total_bytes = 0  # everything ever appended
+
+    def append(self, chunk: bytes):
+        """Add a chunk, dropping the oldest audio beyond the limit."""
+        self._chunks.append(chunk)
+        self.nbytes += len(chunk)
+        self.total_bytes += len(chunk)
+        while self.nbytes > self.limit and self._chunks:
+            self.nbytes -= len(self._chunks.popleft())
+
+    def chunks(self) -> list[bytes]:
+        """Buffered chunks, oldest first."""
+        return list(self._chunks)
+
+    @property
+    def start_seconds(self) -> float:
+        """Stream time of the oldest buffered audio."""
+        return (self.total_bytes - self.nbytes) / self.bytes_per_second
+
+    def __len__(self) -> int:
+        return len(self._chunks)
@@ -0,0 +1,237 @@
+"""Vectorized audio resampling and G.711 µ-law transcoding."""
+from functools import lru_cache
+from typing import Optional
+import numpy as np
+
+SUPPORTED_SAMPLE_RATES = (8000, 16000, 24000, 48000)
+SUPPORTED_CODECS = ("pcm", "mulaw")
+
+# G.711 µ-law constants
+MULAW_BIAS = 0x84
+MULAW_CLIP = 32635
+
+# Low-pass FIR used before decimation: taps per side, cutoff as a fraction
+# of the output Nyquist frequency
+FILTER_HALF_TAPS = 16
+FILTER_CUTOFF = 0.9
+
+
+def _build_mulaw_tables() -> tuple[np.ndarray, np.ndarray]:
+    # Segment (exponent) for each value of (biased magnitude >> 7)
+    exponent = np.zeros(256, dtype=np.int32)
+    for i in range(1, 256):
+        exponent[i] = int(i).bit_length() - 1
+
+    codes = np.arange(256, dtype=np.int32)
+    inverted = ~codes & 0xFF
+    exp = (inverted >> 4) & 0x07
+    mantissa = inverted & 0x0F
+    magnitude = (((mantissa << 3) + MULAW_BIAS) << exp) - MULAW_BIAS
+    decoded = np.where(inverted & 0x80, -magnitude, magnitude).astype(np.int16)
+    return exponent, decoded
+
+
+_MULAW_EXPONENT, _MULAW_DECODE = _build_mulaw_tables()
+
+
+def pcm16_to_mulaw(samples: np.ndarray) -> np.ndarray:
+    """
+    Encode signed 16-bit samples as G.711 µ-law.
+
+    Args:
+        samples: int16 sample array
+
+    Returns:
+        uint8 µ-law code array
+    """
+    x = samples.astype(np.int32)
+    sign = (x < 0).astype(np.int32) << 7
+    magnitude = np.minimum(np.abs(x), MULAW_CLIP) + MULAW_BIAS
+    exponent = _MULAW_EXPONENT[magnitude >> 7]
+    mantissa = (magnitude >> (exponent + 3)) & 0x0F
+    return (~(sign | (exponent << 4) | mantissa) & 0xFF).astype(np.uint8)
+
+
+def mulaw_to_pcm16(codes: np.ndarray) -> np.ndarray:
+    """
+    Decode G.711 µ-law codes to signed 16-bit samples.
+
+    Args:
+        codes: uint8 µ-law code array
+
+    Returns:
+        int16 sample array
+    """
+    return _MULAW_DECODE[codes]
+
+
+@lru_cache(maxsize=16)
+def _lowpass_taps(src_rate: int, dst_rate: int) -> np.ndarray:
+    """Windowed-sinc low-pass at the output Nyquist, in input-sample units."""
+    cutoff = FILTER_CUTOFF * dst_rate / src_rate  # fraction of input Nyquist
+    n = np.arange(-FILTER_HALF_TAPS, FILTER_HALF_TAPS + 1)
+    taps = cutoff * np.sinc(cutoff * n) * np.blackman(len(n))
+    return taps / taps.sum()
+
+
+def _decode(data, codec: str) -> np.ndarray:
+    if codec == "mulaw":
+        return mulaw_to_pcm16(np.frombuffer(data, dtype=np.uint8))
+    return np.frombuffer(data, dtype="<i2")
+
+
+def _encode(samples: np.ndarray, codec: str) -> bytes:
+    if codec == "mulaw":
+        return pcm16_to_mulaw(samples).tobytes()
+    return samples.astype("<i2").tobytes()
+
+
+class StreamTranscoder:
+    """
+    Stateful converter between sample rates and codecs.
+
+    Works on a stream of arbitrarily sized chunks and produces the same
+    output as converting the whole clip at once: filter history and the
+    fractional output position carry across chunk boundaries.
+
+    Downsampling applies a windowed-sinc low-pass before linear
+    interpolation to avoid aliasing; upsampling interpolates directly.
+    """
+
+    def __init__(
+        self,
+        src_rate: int,
+        dst_rate: int,
+        src_codec: str = "pcm",
+        dst_codec: str = "pcm"
+    ):
+        for rate in (src_rate, dst_rate):
+            if rate not in SUPPORTED_SAMPLE_RATES:
+                raise ValueError(f"Unsupported sample rate: {rate}")
+        for codec in (src_codec, dst_codec):
+            if codec not in SUPPORTED_CODECS:
+                raise ValueError(f"Unsupported codec: {codec}")
+
+        self.src_rate = src_rate
+        self.dst_rate = dst_rate
+        self.src_codec = src_codec
+        self.dst_codec = dst_codec
+
+        if dst_rate < src_rate:
+            self._taps: Optional[np.ndarray] = _lowpass_taps(src_rate, dst_rate)
+            self._half = FILTER_HALF_TAPS
+        else:
+            self._taps = None
+            self._half = 0
+
+        # Raw input not yet consumed, starting at absolute sample _start.
+        # Zero history before the first sample keeps the filter centred.
+        self._pending = np.zeros(self._half, dtype=np.float64)
+        self._start = -self._half
+        self._received = 0
+        self._next_out = 0  # index of the next output sample
+        self._carry = b""  # odd trailing byte of a PCM16 chunk
+
+    @property
+    def passthrough(self) -> bool:
+        """True when input and output formats are identical."""
+        return self.src_rate == self.dst_rate and self.src_codec == self.dst_codec
+
+    def process(self, chunk) -> bytes:
+        """
+        Convert one chunk.
+
+        Args:
+            chunk: Input audio (bytes or any buffer)
+
+        Returns:
+            Converted audio available so far (may be empty)
+        """
+        if self.passthrough:
+            return bytes(chunk)
+
+        if self.src_codec == "pcm":
+            if self._carry:
+                chunk = self._carry + bytes(chunk)
+                self._carry = b""
+            if len(chunk) % 2:
+                self._carry = bytes(chunk[-1:])
+                chunk = chunk[:-1]
+
+        samples = _decode(chunk, self.src_codec)
+        self._received += len(samples)
+        self._pending = np.concatenate((self._pending, samples))
+        return self._emit(final=False)
+
+    def flush(self) -> bytes:
+        """Convert whatever input remains at the end of the stream."""
+        if self.passthrough:
+            return b""
+        self._pending = np.concatenate((self._pending, np.zeros(self._half)))
+        return self._emit(final=True)
+
+    def _emit(self, final: bool) -> bytes:
+        pending = self._pending
+        if self._taps is not None:
+            if len(pending) < len(self._taps):
+                return b""
+            filtered = np.convolve(pending, self._taps, mode="valid")
+        else:
+            filtered = pending
+        # filtered[i] is centred on absolute input sample _start + _half + i
+        first = self._start + self._half
+        last = first + len(filtered) - 1
+
+        ratio = self.src_rate / self.dst_rate
+        if final:
+            # Clip duration is preserved: ceil(N * dst / src) samples in total
+            total = -(-self._received * self.dst_rate // self.src_rate)
+            count = total - self._next_out
+        else:
+            # Emit outputs whose right neighbour has been filtered already
+            limit = last - 1
+            if limit < 0:
+                return b""
+            count = int(np.floor(limit / ratio)) + 1 - self._next_out
+        if count <= 0 or len(filtered) == 0:
+            return b""
+
+        positions = (self._next_out + np.arange(count)) * ratio
+        values = np.interp(positions - first, np.arange(len(filtered)), filtered)
+        self._next_out += count
+
+        # Keep only the input still needed for the next output sample
+        keep_from = int(np.floor(self._next_out * ratio)) - self._half
+        drop = keep_from - self._start
+        if drop > 0:
+            self._pending = pending[drop:]
+            self._start += drop
+
+        out = np.clip(np.rint(values), -32768, 32767).astype(np.int16)
+        return _encode(out, self.dst_codec)
+
+
+def transcode(
+    audio,
+    src_rate: int,
+    dst_rate: int,
+    src_codec: str = "pcm",
+    dst_codec: str = "pcm"
+) -> bytes:
+    """
+    Convert a complete clip between sample rates and codecs.
+
+    Args:
+        audio: Input audio (bytes or any buffer)
+        src_rate: Input sample rate
+        dst_rate: Output sample rate
+        src_codec: Input encoding ("pcm" 16-bit LE or "mulaw")
+        dst_codec: Output encoding
+
+    Returns:
+        Converted audio
+    """
+    transcoder = StreamTranscoder(src_rate, dst_rate, src_codec, dst_codec)
+    if transcoder.passthrough:
+        return bytes(audio)
+    return transcoder.process(audio) + transcoder.flush()
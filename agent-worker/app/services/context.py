@@ -0,0 +1,187 @@
+"""Conversation history window with a token budget and rolling summary."""
+import asyncio
+from typing import Awaitable, Callable, Optional
+import structlog
+
+from app.config import settings
+
+logger = structlog.get_logger()
+
+# Prompt budget (system prompt + summary + history) by model family.
+# Kept well under each context window: prompt size drives TTFT.
+MODEL_TOKEN_BUDGETS = {
+    "llama-3.1-8b": 3000,
+    "llama-3.1-70b": 4000,
+    "gpt-4o": 6000,
+    "claude": 6000,
+}
+
+# Per-message framing overhead (role markers etc.)
+MESSAGE_OVERHEAD_TOKENS = 4
+
+SUMMARY_PROMPT = (
+    "Summarize the conversation so far for the assistant's own reference. "
+    "Keep names, numbers, dates, requests and anything the assistant "
+    "promised. Reply with the summary only, in at most five sentences."
+)
+
+Summarizer = Callable[[list[dict]], Awaitable[str]]
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token for English)."""
+    return len(text) // 4 + 1
+
+
+def _message_tokens(message: dict) -> int:
+    tokens = estimate_tokens(message.get("content") or "") + MESSAGE_OVERHEAD_TOKENS
+    for call in message.get("tool_calls") or []:
+        tokens += estimate_tokens(call["function"]["name"] + call["function"]["arguments"])
+    return tokens
+
+
+def token_budget_for(model: str) -> int:
+    """Prompt token budget for ``model`` (settings default if unknown)."""
+    for family, budget in MODEL_TOKEN_BUDGETS.items():
+        if family in model:
+            return budget
+    return settings.llm_context_token_budget
+
+
+class ConversationContext:
+    """
+    Conversation history sent to the LLM, bounded by a token budget.
+
+    ``window()`` returns the newest messages that fit the budget alongside
+    the system prompt, dropping the oldest first. When a summarizer is
+    set, ``schedule_summary()`` (called between turns) folds the oldest
+    messages into a rolling summary in the background once history nears
+    the budget, so older context is condensed rather than lost and no
+    summarization happens on the response path.
+    """
+
+    def __init__(
+        self,
+        model: str,
+        budget_tokens: Optional[int] = None,
+        summarizer: Optional[Summarizer] = None
+    ):
+        """
+        Initialize context.
+
+        Args:
+            model: LLM model name (selects the default budget)
+            budget_tokens: Override the model's prompt token budget
+            summarizer: Async callable turning messages into a summary
+        """
+        self.budget_tokens = budget_tokens or token_budget_for(model)
+        self.summarizer = summarizer
+        self.messages: list[dict] = []
+        self.summary: Optional[str] = None
+        self._summary_task: Optional[asyncio.Task] = None
+
+    def add(self, role: str, content: str):
+        """Append a message to the history."""
+        self.messages.append({"role": role, "content": content})
+
+    def add_message(self, message: dict):
+        """Append a prebuilt message (e.g. tool calls or a tool result)."""
+        self.messages.append(message)
+
+    def _summary_message(self) -> Optional[dict]:
+        if not self.summary:
+            return None
+        return {"role": "system", "content": f"Earlier in this conversation: {self.summary}"}
+
+    def window(self, system_prompt: Optional[str] = None) -> list[dict]:
+        """
+        Messages to send with ``system_prompt``, newest first to fit.
+
+        The latest message is always included, even if it alone exceeds
+        the budget.
+        """
+        used = estimate_tokens(system_prompt or "")
+        summary = self._summary_message()
+        if summary:
+            used += _message_tokens(summary)
+
+        kept: list[dict] = []
+        for message in reversed(self.messages):
+            cost = _message_tokens(message)
+            if kept and used + cost > self.budget_tokens:
+                break
+            kept.append(message)
+            used += cost
+        kept.reverse()
+        # A tool result cannot lead: its assistant tool call was dropped
+        while len(kept) > 1 and kept[0]["role"] == "tool":
+            kept.pop(0)
+
+        if len(kept) < len(self.messages):
+            logger.debug("Context truncated", dropped=len(self.messages) - len(kept))
+        return ([summary] if summary else []) + kept
+
+    def history(self) -> list[dict]:
+        """Summary (if any) plus every message, untruncated."""
+        summary = self._summary_message()
+        return ([summary] if summary else []) + list(self.messages)
+
+    def history_tokens(self) -> int:
+        """Estimated tokens of summary plus full history."""
+        summary = self._summary_message()
+        return sum(_message_tokens(m) for m in self.messages) + (
+            _message_tokens(summary) if summary else 0
+        )
+
+    def schedule_summary(self):
+        """Start a background summary if history is nearing the budget."""
+        if self.summarizer is None or not settings.llm_summary_enabled:
+            return
+        if self._summary_task is not None and not self._summary_task.done():
+            return
+        if self.history_tokens() < settings.llm_summary_trigger_ratio * self.budget_tokens:
+            return
+        # Keep the most recent exchanges verbatim, fold the older half
+        count = len(self.messages) // 2
+        if count < 2:
+            return
+        self._summary_task = asyncio.create_task(self._summarize(count))
+
+    async def _summarize(self, count: int):
+        older = self.messages[:count]
+        prompt = []
+        if self.summary:
+            prompt.append({"role": "system", "content": f"Summary so far: {self.summary}"})
+        prompt.extend(older)
+        try:
+            summary = (await self.summarizer(prompt)).strip()
+        except Exception as e:
+            logger.warning("Context summary failed", error=str(e))
+            return
+        if not summary:
+            return
+        # History is append-only, so the first ``count`` messages are unchanged
+        self.summary = summary
+        del self.messages[:count]
+        logger.info("Context summarized", messages=count, tokens=estimate_tokens(summary))
+
+    async def close(self):
+        """Cancel any in-flight summary."""
+        if self._summary_task is not None and not self._summary_task.done():
+            self._summary_task.cancel()
+
+
+def llm_summarizer(llm) -> Summarizer:
+    """Summarizer that asks ``llm`` (an OpenRouterService) for a summary."""
+    async def summarize(messages: list[dict]) -> str:
+        transcript = "\n".join(f"{m['role']}: {m.get('content') or ''}" for m in messages)
+        chunks = []
+        async for chunk in llm.stream_completion(
+            messages=[{"role": "user", "content": transcript}],
+            system_prompt=SUMMARY_PROMPT,
+            temperature=0.2,
+            max_tokens=settings.llm_summary_max_tokens
+        ):
+            chunks.append(chunk)
+        return "".join(chunks)
+    return summarize
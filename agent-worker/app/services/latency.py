@@ -0,0 +1,160 @@
+"""Rolling latency statistics for upstream endpoints."""
+import bisect
+import time
+from typing import Optional
+
+
+def _bucket_bounds(low_ms: float = 5.0, high_ms: float = 30000.0, growth: float = 1.2) -> list[float]:
+    """Log-spaced bucket upper bounds, so relative error is constant."""
+    bounds = [low_ms]
+    while bounds[-1] < high_ms:
+        bounds.append(bounds[-1] * growth)
+    return bounds
+
+
+BUCKET_BOUNDS_MS = _bucket_bounds()
+
+
+def bucket_index(latency_ms: float) -> int:
+    """Histogram bucket for ``latency_ms``."""
+    return bisect.bisect_left(BUCKET_BOUNDS_MS, latency_ms)
+
+
+def percentile_from_counts(counts: list[int], p: float) -> Optional[float]:
+    """
+    Latency at percentile ``p`` (0-100) from per-bucket counts.
+
+    Returns:
+        Bucket upper bound containing the percentile, or None if empty
+    """
+    total = sum(counts)
+    if not total:
+        return None
+
+    rank = max(1, int(round(p / 100.0 * total)))
+    seen = 0
+    for bucket, count in enumerate(counts):
+        seen += count
+        if seen >= rank:
+            return BUCKET_BOUNDS_MS[min(bucket, len(BUCKET_BOUNDS_MS) - 1)]
+    return BUCKET_BOUNDS_MS[-1]
+
+
+class LatencyStats:
+    """
+    Latency histogram and error counter over a rolling time window.
+
+    The window is split into slots; each slot holds its own bucket counts
+    and the oldest slot is recycled as time moves on, so percentiles track
+    recent behaviour without storing individual samples. Percentiles are
+    resolved to a bucket upper bound (within ~20%).
+    """
+
+    def __init__(self, window_s: float = 300.0, slots: int = 10):
+        """
+        Initialize stats.
+
+        Args:
+            window_s: Length of the rolling window in seconds
+            slots: Number of sub-windows the window is divided into
+        """
+        self.slot_s = window_s / slots
+        self._counts = [[0] * (len(BUCKET_BOUNDS_MS) + 1) for _ in range(slots)]
+        self._errors = [0] * slots
+        self._slot_ids = [-1] * slots
+
+    def _slot(self) -> int:
+        """Index of the current slot, clearing it if it holds stale data."""
+        slot_id = int(time.monotonic() / self.slot_s)
+        index = slot_id % len(self._slot_ids)
+        if self._slot_ids[index] != slot_id:
+            self._slot_ids[index] = slot_id
+            self._counts[index] = [0] * (len(BUCKET_BOUNDS_MS) + 1)
+            self._errors[index] = 0
+        return index
+
+    def _live_slots(self) -> list[int]:
+        current = int(time.monotonic() / self.slot_s)
+        oldest = current - len(self._slot_ids) + 1
+        return [i for i, slot_id in enumerate(self._slot_ids) if oldest <= slot_id <= current]
+
+    def record(self, latency_ms: float):
+        """Record one successful request's latency."""
+        index = self._slot()
+        self._counts[index][bucket_index(latency_ms)] += 1
+
+    def record_censored(self, elapsed_ms: float):
+        """
+        Record a request abandoned after ``elapsed_ms`` with no response.
+
+        Its latency is only known to exceed ``elapsed_ms``, so it is
+        counted there: a lower bound, but it keeps requests cancelled for
+        being slow (e.g. the loser of a hedge) from dropping out of the
+        tail and dragging the percentiles down.
+        """
+        self.record(elapsed_ms)
+
+    def record_error(self):
+        """Record one failed request."""
+        self._errors[self._slot()] += 1
+
+    @property
+    def count(self) -> int:
+        """Successful samples in the window."""
+        return sum(sum(self._counts[i]) for i in self._live_slots())
+
+    @property
+    def errors(self) -> int:
+        """Failures in the window."""
+        return sum(self._errors[i] for i in self._live_slots())
+
+    @property
+    def error_rate(self) -> float:
+        """Fraction of requests in the window that failed."""
+        errors = self.errors
+        total = self.count + errors
+        return errors / total if total else 0.0
+
+    def bucket_counts(self) -> list[int]:
+        """Per-bucket counts merged over the window."""
+        live = self._live_slots()
+        return [sum(self._counts[i][b] for i in live) for b in range(len(BUCKET_BOUNDS_MS) + 1)]
+
+    def percentile(self, p: float) -> Optional[float]:
+        """
+        Latency at percentile ``p`` (0-100) in milliseconds.
+
+        Returns:
+            Bucket upper bound containing the percentile, or None if empty
+        """
+        return percentile_from_counts(self.bucket_counts(), p)
+
+    def snapshot(self) -> dict:
+        """Summary for logging and stats endpoints."""
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "error_rate": self.error_rate,
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "p99_ms": self.percentile(99),
+        }
+
+
+class LatencyTracker:
+    """Named collection of ``LatencyStats`` (one per endpoint or provider)."""
+
+    def __init__(self, window_s: float = 300.0):
+        self.window_s = window_s
+        self._stats: dict[str, LatencyStats] = {}
+
+    def get(self, name: str) -> LatencyStats:
+        """Stats for ``name``, created on first use."""
+        stats = self._stats.get(name)
+        if stats is None:
+            stats = self._stats[name] = LatencyStats(window_s=self.window_s)
+        return stats
+
+    def snapshot(self) -> dict:
+        """Summaries for every tracked name."""
+        return {name: stats.snapshot() for name, stats in self._stats.items()}
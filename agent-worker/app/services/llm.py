@@ -1,9 +1,61 @@
 """OpenRouter LLM service for streaming text generation."""
+import asyncio
 import os
-from typing import AsyncGenerator, Optional, ClassVar
+import time
+from typing import AsyncGenerator, Optional, ClassVar, Union
 import httpx
 import json
+import structlog
 from app.config import settings
+from app.services.context import estimate_tokens
+from app.services.llm_stats import llm_stats
+from app.services.race import RaceAttempt, stream_first
+
+logger = structlog.get_logger()
+
+# Model prefixes that need explicit cache_control breakpoints; other
+# providers (OpenAI, DeepSeek, Groq...) cache matching prefixes automatically
+CACHE_CONTROL_PREFIXES = ("anthropic/", "google/gemini")
+
+
+def route_name(model: str, provider: str) -> str:
+    """Stats key for one model served by one provider."""
+    return f"{model}@{provider}"
+
+
+class ToolCall:
+    """A function call requested by the model."""
+
+    __slots__ = ("id", "name", "arguments", "index")
+
+    def __init__(self, id: str, name: str, arguments: str = "", index: int = 0):
+        self.id = id
+        self.name = name
+        self.arguments = arguments  # JSON text, as streamed
+        self.index = index
+
+    def parsed_arguments(self) -> dict:
+        """
+        Arguments as a dict ({} if empty).
+
+        Raises:
+            ValueError: If the arguments are not a JSON object
+        """
+        value = json.loads(self.arguments or "{}")
+        if not isinstance(value, dict):
+            raise ValueError(f"expected a JSON object, got {type(value).__name__}")
+        return value
+
+    def to_message(self) -> dict:
+        """Entry for an assistant message's ``tool_calls``."""
+        return {
+            "id": self.id,
+            "type": "function",
+            "function": {"name": self.name, "arguments": self.arguments or "{}"}
+        }
+
+    def __repr__(self) -> str:
+        return f"ToolCall({self.name!r}, {self.arguments!r})"
 
 
 class OpenRouterService:
@@ -17,6 +69,14 @@ class OpenRouterService:
     - HTTP/2 connection pooling
     - Persistent client with keep-alive
     - Prioritizes fastest providers (Groq)
+    - Prompt-prefix caching: stable leading system messages (system prompt,
+      conversation summary) are marked with cache_control where the
+      provider needs it, and cache read/write tokens are recorded
+    - Streaming tool calls: each call is yielded as soon as its arguments
+      are complete
+    - Racing (opt-in): if no token arrives within the primary route's
+      learned TTFT percentile, a second request goes to another provider
+      or model; the first to stream wins and the other is cancelled
     """
 
     # Shared client pool for connection reuse
@@ -30,14 +90,29 @@ class OpenRouterService:
         "groq-llama-70b": "groq/llama-3.1-70b-versatile",
     }
 
+    # Token usage across all requests in this process
+    usage_totals: ClassVar[dict] = {
+        "requests": 0,
+        "prompt_tokens": 0,
+        "completion_tokens": 0,
+        "cache_read_tokens": 0,
+        "cache_write_tokens": 0,
+    }
+
     def __init__(
         self,
         model: str = "groq/llama-3.1-8b-instant",
-        api_key: Optional[str] = None
+        api_key: Optional[str] = None,
+        prompt_cache: Optional[bool] = None,
+        racing: Optional[bool] = None
     ):
         self.model = model
         self.api_key = api_key or settings.openrouter_api_key
         self.base_url = settings.openrouter_base_url
+        self.prompt_cache = settings.llm_prompt_cache_enabled if prompt_cache is None else prompt_cache
+        self.racing = settings.llm_racing_enabled if racing is None else racing
+        self.provider_order = [p.strip() for p in settings.llm_provider_order.split(",") if p.strip()]
+        self.last_usage: Optional[dict] = None
 
     @classmethod
     async def get_shared_client(cls) -> httpx.AsyncClient:
@@ -65,8 +140,9 @@ class OpenRouterService:
         messages: list[dict],
         system_prompt: Optional[str] = None,
         temperature: float = 0.7,
-        max_tokens: int = 256
-    ) -> AsyncGenerator[str, None]:
+        max_tokens: int = 256,
+        tools: Optional[list[dict]] = None
+    ) -> AsyncGenerator[Union[str, ToolCall], None]:
         """
         Stream text completion from the LLM.
 
@@ -75,18 +151,14 @@ class OpenRouterService:
             system_prompt: System prompt for the assistant
             temperature: Sampling temperature
             max_tokens: Maximum tokens to generate
+            tools: Function definitions the model may call
 
         Yields:
-            Text chunks as they are generated
+            Text chunks as they are generated, and each ToolCall as soon
+            as its arguments are complete (so it can start executing
+            while the model streams the rest)
         """
-        # Build message list
-        full_messages = []
-        if system_prompt:
-            full_messages.append({
-                "role": "system",
-                "content": system_prompt
-            })
-        full_messages.extend(messages)
+        full_messages = self._build_messages(messages, system_prompt)
 
         payload = {
             "model": self.model,
@@ -95,11 +167,12 @@ class OpenRouterService:
             "temperature": temperature,
             "max_tokens": max_tokens,
             "transforms": ["middle-out"],  # Optimize for streaming
-            "provider": {
-                "order": ["Groq", "Together", "OpenAI"],
-                "allow_fallbacks": True
-            }
+            # Final chunk reports token usage, including cache reads/writes
+            "usage": {"include": True}
         }
+        if tools:
+            payload["tools"] = tools
+            payload["tool_choice"] = "auto"
 
         headers = {
             "Authorization": f"Bearer {self.api_key}",
@@ -108,28 +181,255 @@ class OpenRouterService:
             "X-Title": "Vox Voice AI"
         }
 
-        client = await self.get_shared_client()
-        async with client.stream(
-            "POST",
-            f"{self.base_url}/chat/completions",
-            json=payload,
-            headers=headers
-        ) as response:
-            response.raise_for_status()
-            async for line in response.aiter_lines():
-                if line.startswith("data: "):
+        async for content in self._stream_raced(payload, headers):
+            yield content
+
+    def _race_route(self) -> Optional[tuple[str, list[str]]]:
+        """Model and provider order for the racing request, if any differs."""
+        primary = self.provider_order[0]
+        if settings.llm_race_model and settings.llm_race_model != self.model:
+            return settings.llm_race_model, self.provider_order
+        provider = settings.llm_race_provider
+        if provider == primary:
+            others = self.provider_order[1:]
+            if not others:
+                return None
+            provider = others[0]
+        return self.model, [provider] + [p for p in self.provider_order if p not in (provider, primary)]
+
+    def _race_delay(self, route: str) -> float:
+        """Seconds to wait for a first token before racing, from learned TTFT."""
+        threshold_ms = llm_stats.ttft_percentile(
+            route, settings.llm_race_percentile, settings.llm_race_min_samples
+        )
+        if threshold_ms is None:
+            threshold_ms = settings.llm_race_default_ms
+        threshold_ms = min(max(threshold_ms, settings.llm_race_min_ms), settings.llm_race_max_ms)
+        return threshold_ms / 1000
+
+    async def _run_attempt(
+        self,
+        attempt: RaceAttempt,
+        model: str,
+        order: list[str],
+        client: httpx.AsyncClient,
+        payload: dict,
+        headers: dict,
+        censor_after_s: float
+    ):
+        """
+        Stream one request into the attempt's queue, recording route stats.
+
+        An attempt cancelled before its first token (it lost the race, or
+        the caller stopped listening) is recorded as a censored TTFT if it
+        had already waited ``censor_after_s``, so the percentiles driving
+        the race delay see slow requests, not just winners.
+        """
+        payload = {
+            **payload,
+            "model": model,
+            "provider": {"order": order, "allow_fallbacks": True}
+        }
+        route = route_name(model, order[0])
+        start = time.perf_counter()
+        first_at: Optional[float] = None
+        chunks = 0
+        completion_tokens = 0
+        call: Optional[ToolCall] = None
+
+        def first_token(chunk: dict):
+            nonlocal first_at, route
+            first_at = time.perf_counter()
+            # Fallbacks may serve from another provider than asked
+            if chunk.get("provider"):
+                route = route_name(model, chunk["provider"])
+            attempt.ready.set_result(None)
+
+        try:
+            async with client.stream(
+                "POST",
+                f"{self.base_url}/chat/completions",
+                json=payload,
+                headers=headers
+            ) as response:
+                response.raise_for_status()
+                async for line in response.aiter_lines():
+                    if not line.startswith("data: "):
+                        continue
                     data = line[6:]
                     if data == "[DONE]":
                         break
                     try:
                         chunk = json.loads(data)
-                        if chunk.get("choices"):
-                            delta = chunk["choices"][0].get("delta", {})
-                            content = delta.get("content", "")
-                            if content:
-                                yield content
                     except json.JSONDecodeError:
                         continue
+                    if chunk.get("usage"):
+                        self._record_usage(chunk["usage"])
+                        completion_tokens = chunk["usage"].get("completion_tokens", 0)
+                    if not chunk.get("choices"):
+                        continue
+                    delta = chunk["choices"][0].get("delta") or {}
+
+                    for part in delta.get("tool_calls") or []:
+                        if first_at is None:
+                            first_token(chunk)
+                        index = part.get("index", 0)
+                        function = part.get("function") or {}
+                        if call is None or index != call.index:
+                            # A new index means the previous call is complete
+                            if call is not None:
+                                attempt.queue.put_nowait(call)
+                            call = ToolCall(part.get("id") or f"call_{index}", function.get("name") or "", index=index)
+                        elif function.get("name"):
+                            call.name = function["name"]
+                        call.arguments += function.get("arguments") or ""
+
+                    content = delta.get("content") or ""
+                    if not content:
+                        continue
+                    if first_at is None:
+                        first_token(chunk)
+                    chunks += 1
+                    attempt.queue.put_nowait(content)
+
+            if call is not None:
+                attempt.queue.put_nowait(call)
+
+            if first_at is not None:
+                llm_stats.record(
+                    route,
+                    (first_at - start) * 1000,
+                    tokens=max((completion_tokens or chunks) - 1, 0),
+                    stream_s=time.perf_counter() - first_at
+                )
+            attempt.finish()
+
+        except asyncio.CancelledError:
+            elapsed_s = time.perf_counter() - start
+            if first_at is None and elapsed_s >= censor_after_s:
+                llm_stats.record_censored(route, elapsed_s * 1000)
+            raise
+        except Exception as e:
+            if attempt.fail(e):
+                llm_stats.record_error(route)
+
+    async def _stream_raced(
+        self,
+        payload: dict,
+        headers: dict
+    ) -> AsyncGenerator[Union[str, ToolCall], None]:
+        """
+        Stream a completion, racing a slow or failed first token.
+
+        The primary request gets ``_race_delay`` to produce a token. After
+        that (or as soon as it fails) a second request goes to the racing
+        route. The first request to stream a token wins and the other is
+        cancelled. With racing off, this is a single plain request.
+        """
+        client = await self.get_shared_client()
+        race_route = self._race_route() if self.racing else None
+        race_delay = self._race_delay(route_name(self.model, self.provider_order[0]))
+
+        def run(model: str, order: list[str]):
+            return lambda attempt: self._run_attempt(
+                attempt, model, order, client, payload, headers, race_delay
+            )
+
+        async def race(reason: str):
+            logger.info(
+                "LLM racing request",
+                reason=reason,
+                model=race_route[0],
+                provider=race_route[1][0]
+            )
+            return run(*race_route)
+
+        async for item in stream_first(
+            run(self.model, self.provider_order),
+            race if race_route is not None else None,
+            race_delay,
+            output="token"
+        ):
+            yield item
+
+    def _build_messages(
+        self,
+        messages: list[dict],
+        system_prompt: Optional[str]
+    ) -> list[dict]:
+        """
+        Build the request messages, stable prefix first.
+
+        The system prompt and any leading system messages (e.g. the
+        conversation summary) form a prefix that is identical across
+        turns. For providers that need explicit breakpoints, the system
+        prompt and the end of that prefix are marked cacheable once they
+        are long enough to be worth caching.
+        """
+        full_messages = []
+        if system_prompt:
+            full_messages.append({
+                "role": "system",
+                "content": system_prompt
+            })
+        full_messages.extend(messages)
+
+        if not self.prompt_cache or not self.model.startswith(CACHE_CONTROL_PREFIXES):
+            return full_messages
+
+        prefix_len = 0
+        while prefix_len < len(full_messages) and full_messages[prefix_len]["role"] == "system":
+            prefix_len += 1
+        if not prefix_len:
+            return full_messages
+
+        # Breakpoints after the system prompt and after the whole prefix, so
+        # the system prompt stays cached when the summary changes
+        prefix_tokens = 0
+        cumulative = []
+        for message in full_messages[:prefix_len]:
+            prefix_tokens += estimate_tokens(message["content"])
+            cumulative.append(prefix_tokens)
+
+        for index in sorted({0, prefix_len - 1}):
+            if cumulative[index] < settings.llm_prompt_cache_min_tokens:
+                continue
+            message = full_messages[index]
+            full_messages[index] = {
+                "role": message["role"],
+                "content": [{
+                    "type": "text",
+                    "text": message["content"],
+                    "cache_control": {"type": "ephemeral"}
+                }]
+            }
+        return full_messages
+
+    def _record_usage(self, usage: dict):
+        """Record token usage, normalizing provider cache fields."""
+        details = usage.get("prompt_tokens_details") or {}
+        record = {
+            "prompt_tokens": usage.get("prompt_tokens", 0),
+            "completion_tokens": usage.get("completion_tokens", 0),
+            "cache_read_tokens": (
+                details.get("cached_tokens")
+                or usage.get("cache_read_input_tokens")
+                or 0
+            ),
+            "cache_write_tokens": (
+                details.get("cache_write_tokens")
+                or usage.get("cache_creation_input_tokens")
+                or 0
+            ),
+        }
+        self.last_usage = record
+
+        totals = OpenRouterService.usage_totals
+        totals["requests"] += 1
+        for field, value in record.items():
+            totals[field] += value
+
+        logger.info("LLM usage", model=self.model, **record)
 
     async def close(self):
         """Close the HTTP client (no-op for shared client)."""
@@ -0,0 +1,222 @@
+"""LLM route latency and throughput stats, shared across workers via Redis."""
+import asyncio
+import time
+from typing import ClassVar, Optional
+import redis.asyncio as redis
+import structlog
+
+from app.config import settings
+from app.services.latency import (
+    BUCKET_BOUNDS_MS, LatencyTracker, bucket_index, percentile_from_counts
+)
+
+logger = structlog.get_logger()
+
+
+class _SharedRoute:
+    """Merged view of one route's recent stats across all workers."""
+
+    __slots__ = ("counts", "tokens", "stream_s", "errors", "refreshed_at")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKET_BOUNDS_MS) + 1)
+        self.tokens = 0
+        self.stream_s = 0.0
+        self.errors = 0
+        self.refreshed_at = 0.0
+
+    @property
+    def count(self) -> int:
+        return sum(self.counts)
+
+
+class LLMStatsStore:
+    """
+    Time-to-first-token and token-rate stats per LLM route.
+
+    A route is one model/provider pairing (e.g.
+    ``groq/llama-3.1-8b-instant@Groq``). Every sample is recorded in a
+    local rolling ``LatencyTracker`` and, when Redis is connected,
+    published to time-sliced Redis hashes that all workers write to. Reads
+    never wait on Redis: they use the merged shared view refreshed in the
+    background every ``REFRESH_S`` seconds, falling back to local stats
+    until the shared view has enough samples.
+
+    Key layout (``{slot}`` is wall-clock time divided into window/10 slices,
+    each key expiring once it leaves the window):
+    - ``vox:llm:stats:{route}:{slot}``  hash: b{bucket} -> TTFT count,
+      tokens, stream_s, errors
+    """
+
+    _instance: ClassVar[Optional["LLMStatsStore"]] = None
+    _client: Optional[redis.Redis] = None
+    _prefix: str = "vox:llm:stats:"
+
+    SLOTS: ClassVar[int] = 10
+    REFRESH_S: ClassVar[float] = 10.0
+
+    def __new__(cls):
+        """Singleton pattern for shared stats instance."""
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance.local = LatencyTracker(window_s=settings.llm_stats_window_s)
+            cls._instance._local_tokens = {}
+            cls._instance._shared = {}
+            cls._instance._pending = set()
+        return cls._instance
+
+    async def connect(self):
+        """Initialize Redis connection."""
+        if self._client is not None:
+            return
+        try:
+            self._client = redis.from_url(settings.redis_url, decode_responses=True)
+            await self._client.ping()
+            logger.info("LLM stats connected to Redis")
+        except Exception as e:
+            logger.warning("LLM stats Redis connection failed, using local stats", error=str(e))
+            self._client = None
+
+    async def disconnect(self):
+        """Flush pending writes and close Redis connection."""
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+        if self._client:
+            await self._client.close()
+            self._client = None
+
+    def _spawn(self, coro):
+        """Run Redis I/O off the request path, keeping a reference until done."""
+        task = asyncio.create_task(coro)
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    @property
+    def _slot_s(self) -> float:
+        return settings.llm_stats_window_s / self.SLOTS
+
+    def _key(self, route: str, slot: int) -> str:
+        return f"{self._prefix}{route}:{slot}"
+
+    def record(self, route: str, ttft_ms: float, tokens: int = 0, stream_s: float = 0.0):
+        """
+        Record one completed (or first-token) stream.
+
+        Args:
+            route: Model/provider route name
+            ttft_ms: Time to first token
+            tokens: Completion tokens streamed after the first
+            stream_s: Seconds from first to last token
+        """
+        self.local.get(route).record(ttft_ms)
+        if tokens and stream_s > 0:
+            total = self._local_tokens.setdefault(route, [0, 0.0])
+            total[0] += tokens
+            total[1] += stream_s
+        if self._client:
+            self._spawn(self._publish(route, {f"b{bucket_index(ttft_ms)}": 1}, tokens, stream_s))
+
+    def record_censored(self, route: str, elapsed_ms: float):
+        """
+        Record a stream abandoned after ``elapsed_ms`` without a first token.
+
+        Counted as a TTFT of ``elapsed_ms`` (see LatencyStats.record_censored)
+        so losing race attempts keep the route's tail in the percentiles.
+        """
+        self.local.get(route).record_censored(elapsed_ms)
+        if self._client:
+            self._spawn(self._publish(route, {f"b{bucket_index(elapsed_ms)}": 1}))
+
+    def record_error(self, route: str):
+        """Record one request that failed before its first token."""
+        self.local.get(route).record_error()
+        if self._client:
+            self._spawn(self._publish(route, {"errors": 1}))
+
+    async def _publish(self, route: str, counters: dict, tokens: int = 0, stream_s: float = 0.0):
+        try:
+            key = self._key(route, int(time.time() / self._slot_s))
+            pipe = self._client.pipeline(transaction=False)
+            for field, value in counters.items():
+                pipe.hincrby(key, field, value)
+            if tokens and stream_s > 0:
+                pipe.hincrby(key, "tokens", tokens)
+                pipe.hincrbyfloat(key, "stream_s", stream_s)
+            pipe.expire(key, int(settings.llm_stats_window_s + self._slot_s))
+            await pipe.execute()
+        except Exception as e:
+            logger.debug("LLM stats publish failed", error=str(e))
+
+    async def refresh(self, route: str):
+        """Merge the route's live Redis slots into the shared view."""
+        if not self._client:
+            return
+        shared = self._shared.setdefault(route, _SharedRoute())
+        shared.refreshed_at = time.monotonic()
+        current = int(time.time() / self._slot_s)
+        try:
+            pipe = self._client.pipeline(transaction=False)
+            for slot in range(current - self.SLOTS + 1, current + 1):
+                pipe.hgetall(self._key(route, slot))
+            slots = await pipe.execute()
+        except Exception as e:
+            logger.debug("LLM stats refresh failed", error=str(e))
+            return
+
+        merged = _SharedRoute()
+        merged.refreshed_at = shared.refreshed_at
+        for fields in slots:
+            for field, value in fields.items():
+                if field.startswith("b"):
+                    merged.counts[int(field[1:])] += int(value)
+                elif field == "tokens":
+                    merged.tokens += int(value)
+                elif field == "stream_s":
+                    merged.stream_s += float(value)
+                elif field == "errors":
+                    merged.errors += int(value)
+        self._shared[route] = merged
+
+    def _shared_view(self, route: str) -> Optional[_SharedRoute]:
+        """Shared stats for ``route``, scheduling a refresh when stale."""
+        if not self._client:
+            return None
+        shared = self._shared.get(route)
+        if shared is None or time.monotonic() - shared.refreshed_at >= self.REFRESH_S:
+            self._shared.setdefault(route, _SharedRoute()).refreshed_at = time.monotonic()
+            self._spawn(self.refresh(route))
+        return shared
+
+    def ttft_percentile(self, route: str, p: float, min_samples: int = 1) -> Optional[float]:
+        """
+        TTFT at percentile ``p`` for ``route`` in milliseconds.
+
+        Returns:
+            Shared percentile if enough samples, else local, else None
+        """
+        shared = self._shared_view(route)
+        if shared is not None and shared.count >= min_samples:
+            return percentile_from_counts(shared.counts, p)
+        local = self.local.get(route)
+        if local.count >= min_samples:
+            return local.percentile(p)
+        return None
+
+    def tokens_per_second(self, route: str) -> Optional[float]:
+        """Streaming token rate for ``route`` (shared if known, else local)."""
+        shared = self._shared_view(route)
+        if shared is not None and shared.stream_s > 0:
+            return shared.tokens / shared.stream_s
+        tokens, seconds = self._local_tokens.get(route, (0, 0.0))
+        return tokens / seconds if seconds > 0 else None
+
+    def snapshot(self) -> dict:
+        """Per-route summaries for logging."""
+        return {
+            route: {**summary, "tokens_per_s": self.tokens_per_second(route)}
+            for route, summary in self.local.snapshot().items()
+        }
+
+
+# Global instance
+llm_stats = LLMStatsStore()
@@ -0,0 +1,122 @@
+"""Racing a streaming request against a delayed backup, first output wins."""
+import asyncio
+from typing import AsyncGenerator, Awaitable, Callable, Optional
+
+
+class RaceAttempt:
+    """
+    One in-flight streaming request in a race.
+
+    The attempt's runner puts output on ``queue`` and resolves ``ready``
+    on its first item; ``finish`` and ``fail`` end the stream.
+    """
+
+    def __init__(self):
+        self.queue: asyncio.Queue = asyncio.Queue()
+        # Resolves on the first output, or with the error if none arrives
+        self.ready: asyncio.Future = asyncio.get_running_loop().create_future()
+        self.task: Optional[asyncio.Task] = None
+
+    @property
+    def succeeded(self) -> bool:
+        return self.ready.done() and self.ready.exception() is None
+
+    def finish(self):
+        """End the stream (a completed stream wins even without output)."""
+        if not self.ready.done():
+            self.ready.set_result(None)
+        self.queue.put_nowait(None)
+
+    def fail(self, error: Exception) -> bool:
+        """
+        End the stream with ``error``.
+
+        Returns:
+            True if the attempt failed before producing any output
+        """
+        self.queue.put_nowait(error)
+        if self.ready.done():
+            return False
+        self.ready.set_exception(error)
+        return True
+
+
+# Streams one request into the attempt it is given
+Runner = Callable[[RaceAttempt], Awaitable[None]]
+
+
+async def stream_first(
+    primary: Runner,
+    backup: Optional[Callable[[str], Awaitable[Runner]]],
+    delay_s: float,
+    output: str = "output"
+) -> AsyncGenerator:
+    """
+    Stream from ``primary``, racing a backup if its first output is slow.
+
+    The primary gets ``delay_s`` to produce output. After that (or as soon
+    as it fails) ``backup(reason)`` supplies a second runner. The first
+    attempt to produce output wins and the other is cancelled; the
+    winner's stream is yielded through, ending in its error if it fails
+    later. With no backup this is a single plain request.
+
+    Args:
+        primary: Runner for the first request
+        backup: Returns the runner for the second request, given the
+            reason it is needed (None to never race)
+        delay_s: Head start the primary gets
+        output: What the primary is waiting for, for the race reason
+    """
+    attempts: list[RaceAttempt] = []
+
+    def launch(run: Runner):
+        attempt = RaceAttempt()
+        attempt.task = asyncio.create_task(run(attempt))
+        attempts.append(attempt)
+
+    launch(primary)
+    raced = backup is None
+
+    async def race(reason: str):
+        nonlocal raced
+        raced = True
+        launch(await backup(reason))
+
+    try:
+        winner: Optional[RaceAttempt] = None
+        while winner is None:
+            waiting = [a.ready for a in attempts if not a.ready.done()]
+            if waiting:
+                done, _ = await asyncio.wait(
+                    waiting,
+                    timeout=None if raced else delay_s,
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    await race(f"no {output} after {delay_s * 1000:.0f}ms")
+                    continue
+
+            winner = next((a for a in attempts if a.succeeded), None)
+            if winner is None and not [a for a in attempts if not a.ready.done()]:
+                if raced:
+                    raise attempts[-1].ready.exception()
+                await race("primary failed")
+
+        for attempt in attempts:
+            if attempt is not winner:
+                attempt.task.cancel()
+
+        while True:
+            item = await winner.queue.get()
+            if item is None:
+                break
+            if isinstance(item, Exception):
+                raise item
+            yield item
+
+    finally:
+        for attempt in attempts:
+            if not attempt.task.done():
+                attempt.task.cancel()
+            if attempt.ready.done() and not attempt.ready.cancelled():
+                attempt.ready.exception()  # mark retrieved
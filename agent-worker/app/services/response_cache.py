@@ -0,0 +1,258 @@
+"""Per-assistant cache of LLM responses for repeated FAQ-style turns."""
+import asyncio
+import hashlib
+import json
+import re
+from collections import OrderedDict
+from typing import Awaitable, Callable, ClassVar, Optional
+import numpy as np
+import redis.asyncio as redis
+import structlog
+
+from app.config import settings
+
+logger = structlog.get_logger()
+
+# Fillers dropped when normalizing utterances
+FILLER_WORDS = frozenset({"um", "uh", "er", "erm", "hmm", "ah", "oh", "so", "well", "like"})
+
+Embedder = Callable[[str], Awaitable[list[float]]]
+
+
+def normalize_utterance(text: str) -> str:
+    """Lowercase, strip punctuation and fillers, collapse whitespace."""
+    words = re.sub(r"[^\w\s']", " ", text.lower()).split()
+    return " ".join(w for w in words if w not in FILLER_WORDS)
+
+
+def context_hash(messages: list[dict]) -> str:
+    """
+    Hash of the conversation a response depends on.
+
+    Covers every prior message (user turns, assistant replies, tool calls
+    and results, a context summary), so a reply is only reused after an
+    identical conversation and never carries one caller's details into
+    another call. In practice that means opening turns and stateless
+    FAQ answers early in a call.
+    """
+    dialogue = [
+        [m.get("role"), normalize_utterance(m.get("content") or ""), m.get("tool_calls"), m.get("tool_call_id")]
+        for m in messages
+    ]
+    return hashlib.sha1(json.dumps(dialogue, sort_keys=True).encode()).hexdigest()[:16]
+
+
+class ResponseCacheService:
+    """
+    Redis cache of assistant responses, opt-in per assistant.
+
+    Entries are keyed on the normalized utterance, the assistant's config
+    version (any edit invalidates) and a short context hash. A response is
+    stored as the sentences it was spoken in, so replaying a hit hits the
+    TTS cache sentence by sentence and skips both LLM and synthesis.
+
+    With an embedder configured, misses fall back to a near-duplicate
+    search over the (small) set of cached utterances in the same
+    assistant/version/context bucket. That search is cut off after
+    ``response_cache_similarity_timeout_ms`` so a slow embeddings API
+    never delays a reply by more, and the utterance's embedding is kept
+    for the ``set`` that follows a miss.
+
+    Key layout (``{bucket}`` is ``{assistant_id}:{version}:{context hash}``):
+    - ``vox:resp:{bucket}:{utterance hash}``  JSON list of sentences
+    - ``vox:resp:{bucket}:vec``               hash: utterance hash -> float32 embedding
+    """
+
+    _instance: ClassVar[Optional["ResponseCacheService"]] = None
+    _client: Optional[redis.Redis] = None
+    _prefix: str = "vox:resp:"
+
+    # Bucket size cap for the near-duplicate index
+    MAX_VECTORS: ClassVar[int] = 500
+    # Recent utterance embeddings kept for reuse by ``set``
+    MAX_EMBEDDINGS: ClassVar[int] = 256
+
+    def __new__(cls):
+        """Singleton pattern for shared cache instance."""
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance.embedder = None
+            cls._instance._embeddings = OrderedDict()
+        return cls._instance
+
+    async def connect(self, embedder: Optional[Embedder] = None):
+        """Initialize the Redis connection (and optional embedder)."""
+        if embedder is not None:
+            self.embedder = embedder
+        if self._client is not None:
+            return
+        try:
+            self._client = redis.from_url(settings.redis_url, decode_responses=False)
+            await self._client.ping()
+            logger.info("Response cache connected to Redis")
+        except Exception as e:
+            logger.warning("Response cache Redis connection failed, caching disabled", error=str(e))
+            self._client = None
+
+    async def disconnect(self):
+        """Close Redis connection."""
+        if self._client:
+            await self._client.close()
+            self._client = None
+
+    @staticmethod
+    def cacheable(utterance: str) -> bool:
+        """Only short, FAQ-like utterances are worth caching."""
+        words = normalize_utterance(utterance).split()
+        return 0 < len(words) <= settings.response_cache_max_words
+
+    def _bucket(self, assistant_id: str, version: str, messages: list[dict]) -> str:
+        return f"{self._prefix}{assistant_id}:{version}:{context_hash(messages)}:"
+
+    @staticmethod
+    def _entry(utterance: str) -> str:
+        return hashlib.sha1(normalize_utterance(utterance).encode()).hexdigest()[:16]
+
+    async def get(
+        self,
+        assistant_id: str,
+        version: str,
+        utterance: str,
+        messages: list[dict]
+    ) -> Optional[list[str]]:
+        """
+        Look up a cached response.
+
+        Args:
+            assistant_id: Assistant the response belongs to
+            version: Assistant config version (e.g. updated_at)
+            utterance: What the user just said
+            messages: History before the utterance
+
+        Returns:
+            Response sentences, or None on a miss
+        """
+        if not self._client or not self.cacheable(utterance):
+            return None
+
+        bucket = self._bucket(assistant_id, version, messages)
+        try:
+            raw = await self._client.get(bucket + self._entry(utterance))
+            if raw is None and self.embedder is not None:
+                try:
+                    raw = await asyncio.wait_for(
+                        self._get_similar(bucket, utterance),
+                        settings.response_cache_similarity_timeout_ms / 1000
+                    )
+                except asyncio.TimeoutError:
+                    logger.debug("Response cache similarity lookup timed out")
+            if raw is None:
+                return None
+            logger.info("Response cache hit", assistant=assistant_id)
+            return json.loads(raw)
+        except Exception as e:
+            logger.warning("Response cache get failed", error=str(e))
+            return None
+
+    def _embed(self, utterance: str) -> asyncio.Task:
+        """Embedding of ``utterance``, started once and shared by ``get`` and ``set``."""
+        text = normalize_utterance(utterance)
+        task = self._embeddings.pop(text, None)
+        if task is None or (task.done() and (task.cancelled() or task.exception() is not None)):
+            task = asyncio.create_task(self.embedder(text))
+            # A lookup that timed out leaves nobody awaiting it
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        self._embeddings[text] = task
+        while len(self._embeddings) > self.MAX_EMBEDDINGS:
+            self._embeddings.popitem(last=False)
+        return task
+
+    async def _get_similar(self, bucket: str, utterance: str) -> Optional[bytes]:
+        # Embed alongside the index read; shielded so a timeout leaves the
+        # embedding running for the ``set`` after the LLM answers
+        embedding = self._embed(utterance)
+        vectors = await self._client.hgetall(bucket + "vec")
+        if not vectors:
+            return None
+        query = _unit(await asyncio.shield(embedding))
+
+        entries = list(vectors)
+        matrix = np.stack([np.frombuffer(vectors[e], dtype=np.float32) for e in entries])
+        scores = matrix @ query
+        best = int(np.argmax(scores))
+        if scores[best] < settings.response_cache_similarity:
+            return None
+        logger.debug("Response cache near-duplicate", score=float(scores[best]))
+        return await self._client.get(bucket + entries[best].decode())
+
+    async def set(
+        self,
+        assistant_id: str,
+        version: str,
+        utterance: str,
+        messages: list[dict],
+        sentences: list[str],
+        ttl: Optional[int] = None
+    ) -> bool:
+        """
+        Store a response.
+
+        Args:
+            assistant_id: Assistant the response belongs to
+            version: Assistant config version
+            utterance: What the user said
+            messages: History before the utterance
+            sentences: Response as spoken, sentence by sentence
+            ttl: Seconds to keep it (settings.response_cache_ttl if None)
+
+        Returns:
+            True if stored
+        """
+        if not self._client or not sentences or not self.cacheable(utterance):
+            return False
+
+        ttl = ttl or settings.response_cache_ttl
+        bucket = self._bucket(assistant_id, version, messages)
+        entry = self._entry(utterance)
+        try:
+            pipe = self._client.pipeline(transaction=False)
+            pipe.set(bucket + entry, json.dumps(sentences), ex=ttl)
+            if self.embedder is not None:
+                vector = _unit(await self._embed(utterance))
+                pipe.hlen(bucket + "vec")
+                pipe.hset(bucket + "vec", entry, vector.tobytes())
+                pipe.expire(bucket + "vec", ttl)
+            results = await pipe.execute()
+            if self.embedder is not None and results[1] >= self.MAX_VECTORS:
+                # Index outgrew FAQ size; start it over rather than scan it
+                await self._client.delete(bucket + "vec")
+            return True
+        except Exception as e:
+            logger.warning("Response cache set failed", error=str(e))
+            return False
+
+
+def _unit(vector) -> np.ndarray:
+    v = np.asarray(vector, dtype=np.float32)
+    norm = float(np.linalg.norm(v))
+    return v / norm if norm else v
+
+
+def http_embedder(url: str, api_key: Optional[str], model: str) -> Embedder:
+    """Embedder for an OpenAI-compatible ``/embeddings`` endpoint."""
+    async def embed(text: str) -> list[float]:
+        from app.services.llm import OpenRouterService
+
+        client = await OpenRouterService.get_shared_client()
+        response = await client.post(
+            url,
+            json={"model": model, "input": text},
+            headers={"Authorization": f"Bearer {api_key}"} if api_key else {}
+        )
+        response.raise_for_status()
+        return response.json()["data"][0]["embedding"]
+    return embed
+
+
+# Global instance
+response_cache = ResponseCacheService()
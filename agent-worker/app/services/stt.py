@@ -1,9 +1,34 @@
 """Deepgram STT service for streaming speech recognition."""
 import asyncio
 import json
-from typing import AsyncGenerator, Optional, Callable
+from typing import AsyncGenerator, ClassVar, Optional
+import structlog
 import websockets
 from app.config import settings
+from app.services.audio_buffer import AudioReplayBuffer
+from app.services.stt_pool import WebSocketPool
+from app.services.transcript import Transcript, TranscriptParser
+from app.services.stt_provider import (
+    STTProvider, FailoverSTTService, create_stt_provider, get_stt_provider_names,
+    register_stt_provider
+)
+
+logger = structlog.get_logger()
+
+
+def _listen_url(model: str, language: str, sample_rate: int) -> str:
+    return (
+        f"wss://api.deepgram.com/v1/listen?"
+        f"model={model}&"
+        f"language={language}&"
+        f"sample_rate={sample_rate}&"
+        f"encoding=linear16&"
+        f"channels=1&"
+        f"interim_results=true&"
+        f"punctuate=true&"
+        f"smart_format=true&"
+        f"endpointing=100"
+    )
 
 
 class DeepgramSTTService:
@@ -14,129 +39,218 @@ class DeepgramSTTService:
     with interim results for responsive conversations.
 
     Optimizations:
-    - Pre-warmed connections
-    - Connection pooling for reduced latency
-    - Automatic reconnection
+    - Pool of pre-opened connections, refilled in the background and
+      kept alive with KeepAlive messages
+    - Sockets validated before handout
+    - Automatic reconnection with backoff, replaying the last few
+      seconds of audio and de-duplicating overlapping transcripts
     """
 
-    # Connection pool for reuse
-    _pooled_connection: Optional[websockets.WebSocketClientProtocol] = None
-    _pool_lock: asyncio.Lock = None
+    # Warm connections for the default listen URL
+    _pool: ClassVar[Optional[WebSocketPool]] = None
+    _pool_url: ClassVar[Optional[str]] = None
 
     def __init__(
         self,
         api_key: Optional[str] = None,
         model: str = "nova-2",
-        language: str = "en-US"
+        language: str = "en-US",
+        include_words: bool = False
     ):
         self.api_key = api_key or settings.deepgram_api_key
         self.model = model
         self.language = language
+        # Word timings are skipped while parsing unless asked for
+        self._parser = TranscriptParser(with_words=include_words)
+        self._word_parser = TranscriptParser(with_words=True)
         self.sample_rate = settings.sample_rate
         self.websocket: Optional[websockets.WebSocketClientProtocol] = None
 
-    @classmethod
-    async def _get_pool_lock(cls) -> asyncio.Lock:
-        """Get or create the pool lock."""
-        if cls._pool_lock is None:
-            cls._pool_lock = asyncio.Lock()
-        return cls._pool_lock
+        # Reconnect state: recent audio to replay, the stream time at which
+        # the current connection's clock starts, and how far finals reach
+        self._replay = AudioReplayBuffer(settings.stt_replay_seconds, self.sample_rate)
+        self._stream_offset = 0.0
+        self._final_until = 0.0
+        self._reconnect_lock = asyncio.Lock()
+        self._closing = False
+        self.reconnects = 0
 
     @classmethod
-    async def prewarm_connection(cls, api_key: str, model: str = "nova-2", sample_rate: int = 16000):
-        """Pre-warm a WebSocket connection for faster first response."""
-        lock = await cls._get_pool_lock()
-        async with lock:
-            if cls._pooled_connection is not None:
-                try:
-                    # Close old connection if it exists
-                    await cls._pooled_connection.close()
-                except:
-                    pass
+    async def prewarm_connection(
+        cls,
+        api_key: str,
+        model: str = "nova-2",
+        sample_rate: int = 16000,
+        language: str = "en-US"
+    ):
+        """Start the connection pool for faster first response."""
+        await cls.close_pooled_connection()
 
-            url = (
-                f"wss://api.deepgram.com/v1/listen?"
-                f"model={model}&"
-                f"language=en-US&"
-                f"sample_rate={sample_rate}&"
-                f"encoding=linear16&"
-                f"channels=1&"
-                f"interim_results=true&"
-                f"endpointing=100"
-            )
-            headers = {"Authorization": f"Token {api_key}"}
-            cls._pooled_connection = await websockets.connect(url, additional_headers=headers)
+        url = _listen_url(model, language, sample_rate)
+        headers = {"Authorization": f"Token {api_key}"}
+        cls._pool = WebSocketPool(
+            lambda: websockets.connect(url, additional_headers=headers),
+            min_size=settings.stt_pool_min_size,
+            max_size=settings.stt_pool_max_size,
+            keepalive_interval=settings.stt_pool_keepalive_s,
+            max_age=settings.stt_pool_max_age_s
+        )
+        cls._pool_url = url
+        cls._pool.start()
 
     @classmethod
     async def close_pooled_connection(cls):
-        """Close the pooled connection."""
-        if cls._pooled_connection is not None:
-            try:
-                await cls._pooled_connection.close()
-            except:
-                pass
-            cls._pooled_connection = None
+        """Close the connection pool."""
+        if cls._pool is not None:
+            await cls._pool.close()
+            cls._pool = None
+            cls._pool_url = None
+
+    @classmethod
+    def pool_metrics(cls) -> Optional[dict]:
+        """Connection pool metrics, or None if no pool is running."""
+        return cls._pool.metrics() if cls._pool else None
+
+    def _url(self) -> str:
+        return _listen_url(self.model, self.language, self.sample_rate)
+
+    async def _open(self):
+        url = self._url()
+        # Pooled sockets are only usable for the same listen parameters
+        if self._pool is not None and self._pool_url == url:
+            return await self._pool.acquire()
+
+        headers = {"Authorization": f"Token {self.api_key}"}
+        return await websockets.connect(url, additional_headers=headers)
 
     async def connect(self):
         """Establish WebSocket connection to Deepgram."""
-        lock = await self._get_pool_lock()
-        async with lock:
-            # Try to use pooled connection if available
-            if self._pooled_connection is not None:
-                self.websocket = self._pooled_connection
-                self._pooled_connection = None
-                return
+        self._closing = False
+        self.websocket = await self._open()
 
-        # Create new connection if no pooled one available
-        url = (
-            f"wss://api.deepgram.com/v1/listen?"
-            f"model={self.model}&"
-            f"language={self.language}&"
-            f"sample_rate={self.sample_rate}&"
-            f"encoding=linear16&"
-            f"channels=1&"
-            f"interim_results=true&"
-            f"endpointing=100"
-        )
+    async def _reconnect(self, failed) -> bool:
+        """
+        Replace a dropped connection and replay recent audio into it.
 
-        headers = {"Authorization": f"Token {self.api_key}"}
-        self.websocket = await websockets.connect(url, additional_headers=headers)
+        Retries with exponential backoff. Returns False if ``failed`` was
+        already replaced by a concurrent reconnect or the service is closing.
+
+        Raises:
+            ConnectionError: If every attempt fails
+        """
+        async with self._reconnect_lock:
+            if self._closing or self.websocket is not failed:
+                return False
+
+            delay = settings.stt_reconnect_base_delay_s
+            last_error: Optional[Exception] = None
+            for attempt in range(settings.stt_reconnect_attempts):
+                if attempt:
+                    await asyncio.sleep(delay)
+                    delay = min(delay * 2, settings.stt_reconnect_max_delay_s)
+                try:
+                    websocket = await self._open()
+                    # New connection's time 0 is the oldest replayed sample
+                    self._stream_offset = self._replay.start_seconds
+                    for chunk in self._replay.chunks():
+                        await websocket.send(chunk)
+                except Exception as e:
+                    last_error = e
+                    logger.warning("Deepgram reconnect failed", attempt=attempt + 1, error=str(e))
+                    continue
+
+                self.websocket = websocket
+                self.reconnects += 1
+                logger.info(
+                    "Deepgram reconnected",
+                    attempt=attempt + 1,
+                    replay_bytes=self._replay.nbytes
+                )
+                try:
+                    await failed.close()
+                except Exception:
+                    pass
+                return True
+
+            raise ConnectionError(f"Deepgram reconnect failed: {last_error}")
 
     async def send_audio(self, audio_chunk: bytes):
         """
-        Send audio chunk to Deepgram.
+        Send audio chunk to Deepgram, reconnecting if the socket dropped.
 
         Args:
             audio_chunk: PCM audio data (16-bit, 16kHz, mono)
         """
+        websocket = self.websocket
+        if not websocket:
+            return
+        # Buffered first so a reconnect replays this chunk too
+        self._replay.append(audio_chunk)
+        try:
+            await websocket.send(audio_chunk)
+        except websockets.ConnectionClosed:
+            await self._reconnect(websocket)
+
+    async def keepalive(self):
+        """Send a KeepAlive so an idle connection is not closed by Deepgram."""
         if self.websocket:
-            await self.websocket.send(audio_chunk)
+            await self.websocket.send(json.dumps({"type": "KeepAlive"}))
 
-    async def receive_transcripts(self) -> AsyncGenerator[dict, None]:
+    async def receive_transcripts(self) -> AsyncGenerator[Transcript, None]:
         """
         Receive transcription results.
 
+        Survives dropped connections: the stream resumes on the reconnected
+        socket, skipping words already delivered in a final transcript.
+
         Yields:
-            Dictionary with 'text', 'is_final', and 'confidence'
+            Transcript results (interim and final)
         """
         if not self.websocket:
             raise RuntimeError("WebSocket not connected")
 
-        async for message in self.websocket:
-            data = json.loads(message)
+        while True:
+            websocket = self.websocket
+            try:
+                async for message in websocket:
+                    transcript = self._parse(message)
+                    if transcript is not None:
+                        yield transcript
+            except websockets.ConnectionClosed as e:
+                logger.warning("Deepgram connection dropped", code=e.rcvd.code if e.rcvd else None)
+
+            if self._closing:
+                return
+            if self.websocket is websocket:
+                await self._reconnect(websocket)
 
-            if data.get("type") == "Results":
-                channel = data.get("channel", {})
-                alternatives = channel.get("alternatives", [])
+    def _parse(self, message) -> Optional[Transcript]:
+        """Turn a Results message into a transcript, minus replayed words."""
+        transcript = self._parser.parse(message)
+        if transcript is None:
+            return None
 
-                if alternatives:
-                    transcript = alternatives[0]
-                    yield {
-                        "text": transcript.get("transcript", ""),
-                        "is_final": data.get("is_final", False),
-                        "confidence": transcript.get("confidence", 0.0),
-                        "words": transcript.get("words", [])
-                    }
+        start = self._stream_offset + transcript.start
+        end = self._stream_offset + transcript.end
+        if start < self._final_until:
+            # Overlaps audio already finalized before a reconnect
+            if end <= self._final_until:
+                return None
+            if not self._parser.with_words:
+                # Rare (only right after a replay): decode the word timings
+                transcript = self._word_parser.parse(message)
+            words = [
+                w for w in transcript.words
+                if self._stream_offset + w.start >= self._final_until
+            ]
+            if not words:
+                return None
+            transcript.words = words
+            transcript.text = " ".join(w.punctuated_word for w in words)
+
+        if transcript.is_final:
+            self._final_until = max(self._final_until, end)
+        return transcript
 
     async def close(self, return_to_pool: bool = False):
         """Close the WebSocket connection.
@@ -144,28 +258,57 @@ class DeepgramSTTService:
         Args:
             return_to_pool: If True, return connection to pool for reuse
         """
+        self._closing = True
         if self.websocket:
-            if return_to_pool:
-                # Return to pool instead of closing
-                lock = await self._get_pool_lock()
-                async with lock:
-                    if self._pooled_connection is None:
-                        self._pooled_connection = self.websocket
-                        self.websocket = None
-                        return
+            websocket, self.websocket = self.websocket, None
+            if return_to_pool and self._pool is not None and self._pool_url == self._url():
+                await self._pool.release(websocket)
+                return
 
             # Close the connection
             try:
-                await self.websocket.send(json.dumps({"type": "CloseStream"}))
-                await self.websocket.close()
-            except:
+                await websocket.send(json.dumps({"type": "CloseStream"}))
+                await websocket.close()
+            except Exception:
                 pass
-            self.websocket = None
+
+
+register_stt_provider("deepgram", DeepgramSTTService)
 
 
 # Factory function
 def create_stt_service(
     model: str = "nova-2",
-    language: str = "en-US"
-) -> DeepgramSTTService:
-    return DeepgramSTTService(model=model, language=language)
+    language: str = "en-US",
+    provider: Optional[str] = None,
+    standby_provider: Optional[str] = None
+) -> STTProvider:
+    """
+    Create the STT service for an assistant.
+
+    Args:
+        model: STT model
+        language: Recognition language
+        provider: Provider name, normally Assistant.stt_provider
+            (settings.stt_provider if None)
+        standby_provider: Provider to hold warm for failover
+            (settings.stt_standby_provider if None, "" to disable)
+
+    Returns:
+        The provider itself, or a FailoverSTTService with a warm standby
+    """
+    registered = get_stt_provider_names()
+    provider = provider or settings.stt_provider
+    if provider not in registered:
+        # An assistant configured for an engine this worker lacks still
+        # gets a call, just not with the engine it asked for
+        logger.warning("Unknown STT provider, using default", provider=provider, default=settings.stt_provider)
+        provider = settings.stt_provider
+    if standby_provider is None:
+        standby_provider = settings.stt_standby_provider
+    if standby_provider and standby_provider not in registered:
+        logger.warning("Unknown STT standby provider, failover disabled", provider=standby_provider)
+        standby_provider = ""
+    if standby_provider:
+        return FailoverSTTService(provider, standby_provider, model=model, language=language)
+    return create_stt_provider(provider, model=model, language=language)
@@ -0,0 +1,106 @@
+"""Coalescing of small audio frames into larger STT packets."""
+import asyncio
+import time
+from typing import Awaitable, Callable, Optional
+
+from app.config import settings
+from app.services.latency import LatencyStats
+
+# Packet sizes outside this range either save little or delay STT too much
+MIN_PACKET_MS = 40
+MAX_PACKET_MS = 100
+
+
+class AudioCoalescer:
+    """
+    Packs audio frames into ``packet_ms`` packets before sending.
+
+    Cuts WebSocket writes (one syscall and masking pass each) by 2-10x at
+    the cost of up to ``packet_ms`` extra delay for the first frame of a
+    packet. A partial packet is sent when speech ends (``flush``) or when
+    its oldest frame has waited ``packet_ms``, so audio never sits idle.
+    The added delay is recorded in ``delay``.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[bytes], Awaitable[None]],
+        packet_ms: Optional[int] = None,
+        sample_rate: Optional[int] = None,
+        sample_width: int = 2
+    ):
+        """
+        Initialize coalescer.
+
+        Args:
+            send: Coroutine that sends one packet (e.g. stt.send_audio)
+            packet_ms: Packet duration, clamped to 40-100ms
+                (settings.stt_batch_ms if None; 0 sends frames unbatched)
+            sample_rate: Audio sample rate (settings.sample_rate if None)
+            sample_width: Bytes per sample (mono)
+        """
+        self._send = send
+        packet_ms = settings.stt_batch_ms if packet_ms is None else packet_ms
+        self.packet_ms = min(max(packet_ms, MIN_PACKET_MS), MAX_PACKET_MS) if packet_ms else 0
+        rate = sample_rate or settings.sample_rate
+        self.packet_bytes = rate * sample_width * self.packet_ms // 1000
+
+        self._buffer = bytearray()
+        self._first_at = 0.0  # arrival of the oldest buffered frame
+        self._timer: Optional[asyncio.Task] = None
+        self._send_lock = asyncio.Lock()
+
+        # Metrics
+        self.frames = 0
+        self.packets = 0
+        self.delay = LatencyStats()
+
+    async def add(self, frame: bytes):
+        """Buffer one frame, sending a packet once enough audio is queued."""
+        self.frames += 1
+        if not self.packet_ms:
+            await self._write(bytes(frame), time.perf_counter())
+            return
+
+        if not self._buffer:
+            self._first_at = time.perf_counter()
+            self._timer = asyncio.create_task(self._flush_later())
+        self._buffer += frame
+        if len(self._buffer) >= self.packet_bytes:
+            await self.flush()
+
+    async def _flush_later(self):
+        await asyncio.sleep(self.packet_ms / 1000)
+        self._timer = None
+        await self.flush()
+
+    async def flush(self):
+        """Send whatever is buffered (call on speech end)."""
+        if self._timer is not None and self._timer is not asyncio.current_task():
+            self._timer.cancel()
+        self._timer = None
+        if not self._buffer:
+            return
+        packet, self._buffer = bytes(self._buffer), bytearray()
+        await self._write(packet, self._first_at)
+
+    async def _write(self, packet: bytes, first_at: float):
+        # Lock keeps packet order when a timer flush and add() overlap
+        async with self._send_lock:
+            await self._send(packet)
+        self.packets += 1
+        self.delay.record((time.perf_counter() - first_at) * 1000)
+
+    def stats(self) -> dict:
+        """Batching counters and added delay for logging."""
+        return {
+            "packet_ms": self.packet_ms,
+            "frames": self.frames,
+            "packets": self.packets,
+            "frames_per_packet": self.frames / self.packets if self.packets else 0.0,
+            "delay_ms": self.delay.snapshot(),
+        }
+
+    async def close(self):
+        """Send any remaining audio and stop the timer."""
+        await self.flush()
@@ -0,0 +1,253 @@
+"""Pool of pre-opened WebSocket connections for streaming STT."""
+import asyncio
+import json
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable
+import structlog
+from websockets.protocol import State
+
+from app.services.latency import LatencyStats
+
+logger = structlog.get_logger()
+
+
+class _PooledSocket:
+    """Idle socket with the timestamps used for validation."""
+
+    def __init__(self, websocket: Any):
+        self.websocket = websocket
+        self.opened_at = time.monotonic()
+        self.last_ok = self.opened_at  # last successful keepalive/validation
+
+
+def _is_open(websocket: Any) -> bool:
+    return getattr(websocket, "state", None) is State.OPEN
+
+
+class WebSocketPool:
+    """
+    Keeps ``min_size`` warm WebSocket connections ready for handout.
+
+    A background task refills the pool whenever it drops below
+    ``min_size`` (never holding more than ``max_size`` idle or opening
+    sockets), and idle sockets get a KeepAlive message every
+    ``keepalive_interval`` seconds so the server does not time them out.
+    Sockets are validated before handout: closed or over-age sockets are
+    discarded, and ones not confirmed alive recently are pinged.
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], Awaitable[Any]],
+        min_size: int = 2,
+        max_size: int = 8,
+        keepalive_interval: float = 5.0,
+        max_age: float = 300.0,
+        validate_timeout: float = 0.5,
+        keepalive_message: str = json.dumps({"type": "KeepAlive"})
+    ):
+        """
+        Initialize pool.
+
+        Args:
+            connect: Coroutine factory that opens one connection
+            min_size: Idle sockets to keep ready
+            max_size: Upper bound on idle plus opening sockets
+            keepalive_interval: Seconds between KeepAlive messages
+            max_age: Seconds after which an idle socket is recycled
+            validate_timeout: Ping timeout when validating a stale socket
+            keepalive_message: Text frame sent to keep idle sockets open
+        """
+        self._connect = connect
+        self.min_size = min_size
+        self.max_size = max(max_size, min_size)
+        self.keepalive_interval = keepalive_interval
+        self.max_age = max_age
+        self.validate_timeout = validate_timeout
+        self.keepalive_message = keepalive_message
+
+        self._idle: deque[_PooledSocket] = deque()
+        self._opening = 0
+        self._refill = asyncio.Event()
+        self._tasks: list[asyncio.Task] = []
+        self._closed = False
+
+        # Metrics
+        self.hits = 0
+        self.misses = 0
+        self.created = 0
+        self.discarded = 0
+        self.connect_failures = 0
+        self.connect_latency = LatencyStats()
+
+    @property
+    def idle(self) -> int:
+        """Sockets ready for handout."""
+        return len(self._idle)
+
+    def start(self):
+        """Start the refill and keepalive tasks."""
+        if self._tasks:
+            return
+        self._closed = False
+        self._tasks = [
+            asyncio.create_task(self._refill_loop()),
+            asyncio.create_task(self._keepalive_loop()),
+        ]
+        self._refill.set()
+
+    async def _open(self) -> Any:
+        """Open one connection, recording connect time."""
+        start = time.perf_counter()
+        try:
+            websocket = await self._connect()
+        except Exception:
+            self.connect_failures += 1
+            self.connect_latency.record_error()
+            raise
+        self.created += 1
+        self.connect_latency.record((time.perf_counter() - start) * 1000)
+        return websocket
+
+    async def _open_into_pool(self):
+        try:
+            websocket = await self._open()
+        finally:
+            self._opening -= 1
+        if self._closed or len(self._idle) >= self.max_size:
+            await self._discard(websocket)
+        else:
+            self._idle.append(_PooledSocket(websocket))
+
+    async def _refill_loop(self):
+        """Top the pool up to ``min_size`` whenever it is signalled."""
+        delay = 0.5
+        while not self._closed:
+            await self._refill.wait()
+            self._refill.clear()
+
+            needed = min(
+                self.min_size - len(self._idle) - self._opening,
+                self.max_size - len(self._idle) - self._opening
+            )
+            if needed <= 0:
+                continue
+
+            self._opening += needed
+            results = await asyncio.gather(
+                *(self._open_into_pool() for _ in range(needed)),
+                return_exceptions=True
+            )
+            failures = [r for r in results if isinstance(r, Exception)]
+            if failures:
+                logger.warning("STT pool refill failed", failed=len(failures), error=str(failures[0]))
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 30.0)
+                self._refill.set()
+            else:
+                delay = 0.5
+
+    async def _keepalive_loop(self):
+        """Send KeepAlive on idle sockets and drop dead or over-age ones."""
+        while not self._closed:
+            await asyncio.sleep(self.keepalive_interval)
+            now = time.monotonic()
+            for pooled in list(self._idle):
+                if now - pooled.opened_at > self.max_age or not _is_open(pooled.websocket):
+                    self._remove(pooled)
+                    await self._discard(pooled.websocket)
+                    continue
+                try:
+                    await pooled.websocket.send(self.keepalive_message)
+                    pooled.last_ok = time.monotonic()
+                except Exception:
+                    self._remove(pooled)
+                    await self._discard(pooled.websocket)
+            if len(self._idle) < self.min_size:
+                self._refill.set()
+
+    def _remove(self, pooled: _PooledSocket):
+        try:
+            self._idle.remove(pooled)
+        except ValueError:
+            pass  # handed out meanwhile
+
+    async def _discard(self, websocket: Any):
+        self.discarded += 1
+        try:
+            await websocket.close()
+        except Exception:
+            pass
+
+    async def _validate(self, pooled: _PooledSocket) -> bool:
+        now = time.monotonic()
+        if not _is_open(pooled.websocket) or now - pooled.opened_at > self.max_age:
+            return False
+        if now - pooled.last_ok <= 2 * self.keepalive_interval:
+            return True
+        # Not confirmed alive recently: spend a round trip to check
+        try:
+            pong = await pooled.websocket.ping()
+            await asyncio.wait_for(pong, self.validate_timeout)
+            return True
+        except Exception:
+            return False
+
+    async def acquire(self) -> Any:
+        """
+        Take a validated socket from the pool, or open one if none is ready.
+
+        Returns:
+            An open WebSocket connection owned by the caller
+        """
+        try:
+            while self._idle:
+                pooled = self._idle.popleft()
+                if await self._validate(pooled):
+                    self.hits += 1
+                    return pooled.websocket
+                await self._discard(pooled.websocket)
+
+            self.misses += 1
+            logger.info("STT pool empty, opening cold connection")
+            return await self._open()
+        finally:
+            self._refill.set()
+
+    async def release(self, websocket: Any) -> bool:
+        """
+        Return a socket to the pool.
+
+        Returns:
+            True if pooled, False if it was closed instead
+        """
+        if self._closed or not _is_open(websocket) or len(self._idle) >= self.max_size:
+            await self._discard(websocket)
+            return False
+        self._idle.append(_PooledSocket(websocket))
+        return True
+
+    def metrics(self) -> dict:
+        """Pool counters for logging and stats endpoints."""
+        return {
+            "idle": len(self._idle),
+            "opening": self._opening,
+            "min_size": self.min_size,
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "created": self.created,
+            "discarded": self.discarded,
+            "connect_failures": self.connect_failures,
+            "connect_ms": self.connect_latency.snapshot(),
+        }
+
+    async def close(self):
+        """Stop background tasks and close every idle socket."""
+        self._closed = True
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+        while self._idle:
+            await self._discard(self._idle.popleft().websocket)
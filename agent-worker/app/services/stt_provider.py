@@ -0,0 +1,257 @@
+"""STT provider interface, registry and warm-standby failover."""
+import asyncio
+from typing import AsyncIterator, Callable, Optional, Protocol, runtime_checkable
+import structlog
+
+from app.config import settings
+from app.services.audio_buffer import AudioReplayBuffer
+from app.services.transcript import Transcript
+
+logger = structlog.get_logger()
+
+
+@runtime_checkable
+class STTProvider(Protocol):
+    """
+    Streaming STT engine.
+
+    Transcripts are ``Transcript`` objects (text, is_final, confidence).
+    """
+
+    async def connect(self) -> None:
+        ...
+
+    async def send_audio(self, audio_chunk: bytes) -> None:
+        ...
+
+    def receive_transcripts(self) -> AsyncIterator[Transcript]:
+        ...
+
+    async def keepalive(self) -> None:
+        ...
+
+    async def close(self) -> None:
+        ...
+
+
+# name -> factory(model=..., language=...)
+_providers: dict[str, Callable[..., STTProvider]] = {}
+
+
+def register_stt_provider(name: str, factory: Callable[..., STTProvider]):
+    """Register an STT provider factory under ``name``."""
+    _providers[name] = factory
+
+
+def get_stt_provider_names() -> list[str]:
+    """Names of all registered providers."""
+    return list(_providers)
+
+
+def create_stt_provider(name: str, **kwargs) -> STTProvider:
+    """
+    Create a provider by name.
+
+    Raises:
+        ValueError: If no provider is registered under ``name``
+    """
+    factory = _providers.get(name)
+    if factory is None:
+        raise ValueError(f"Unknown STT provider: {name}")
+    return factory(**kwargs)
+
+
+class LocalSTTService:
+    """
+    Local stub provider that accepts audio and never transcribes.
+
+    Needs no network or credentials; useful for development and as a
+    standby that keeps a call alive without understanding it.
+    """
+
+    def __init__(self, model: Optional[str] = None, language: str = "en-US"):
+        self.model = model
+        self.language = language
+        self._closed = asyncio.Event()
+
+    async def connect(self):
+        self._closed.clear()
+
+    async def send_audio(self, audio_chunk: bytes):
+        pass
+
+    async def receive_transcripts(self) -> AsyncIterator[Transcript]:
+        await self._closed.wait()
+        return
+        yield
+
+    async def keepalive(self):
+        pass
+
+    async def close(self):
+        self._closed.set()
+
+
+class FailoverSTTService:
+    """
+    STT with a warm standby provider for mid-call failover.
+
+    The standby connection is opened alongside the primary and kept alive
+    but sent no audio. When the active provider fails (a send raises or
+    its transcript stream ends unexpectedly) the standby takes over, the
+    last ``replay_seconds`` of audio is replayed into it so the words in
+    flight are not lost, and a fresh standby is warmed in the background.
+    """
+
+    def __init__(
+        self,
+        primary: str,
+        standby: str,
+        replay_seconds: Optional[float] = None,
+        **provider_kwargs
+    ):
+        """
+        Initialize failover STT.
+
+        Args:
+            primary: Name of the provider to use first
+            standby: Name of the provider to hold warm
+            replay_seconds: Audio kept for replay (settings.stt_replay_seconds if None)
+            **provider_kwargs: Passed to both provider factories
+        """
+        self.names = {"active": primary, "standby": standby}
+        self.provider_kwargs = provider_kwargs
+        self.active: STTProvider = create_stt_provider(primary, **provider_kwargs)
+        self.standby: Optional[STTProvider] = None
+        self.failovers = 0
+
+        replay = settings.stt_replay_seconds if replay_seconds is None else replay_seconds
+        self._replay = AudioReplayBuffer(replay, settings.sample_rate)
+
+        self._lock = asyncio.Lock()
+        self._standby_task: Optional[asyncio.Task] = None
+        self._keepalive_task: Optional[asyncio.Task] = None
+        self._closed = False
+
+    async def connect(self):
+        """Connect the primary and start warming the standby."""
+        await self.active.connect()
+        self._standby_task = asyncio.create_task(self._warm_standby())
+        self._keepalive_task = asyncio.create_task(self._keepalive_loop())
+
+    async def _connect_standby(self) -> bool:
+        """Try once to open the standby connection."""
+        standby = create_stt_provider(self.names["standby"], **self.provider_kwargs)
+        try:
+            await standby.connect()
+        except Exception as e:
+            logger.warning("STT standby connect failed", provider=self.names["standby"], error=str(e))
+            return False
+        self.standby = standby
+        logger.info("STT standby warm", provider=self.names["standby"])
+        return True
+
+    async def _warm_standby(self):
+        """Open a standby connection, retrying with backoff."""
+        delay = 1.0
+        while not self._closed and not await self._connect_standby():
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 30.0)
+
+    async def _keepalive_loop(self):
+        """Keep the idle standby connection from timing out."""
+        while not self._closed:
+            await asyncio.sleep(settings.stt_keepalive_interval_s)
+            standby = self.standby
+            if standby is None:
+                continue
+            try:
+                await standby.keepalive()
+            except Exception as e:
+                logger.warning("STT standby keepalive failed", error=str(e))
+                self.standby = None
+                await standby.close()
+                if self._standby_task is None or self._standby_task.done():
+                    self._standby_task = asyncio.create_task(self._warm_standby())
+
+    async def send_audio(self, audio_chunk: bytes):
+        """Send audio to the active provider, failing over if it errors."""
+        self._replay.append(audio_chunk)
+        provider = self.active
+        try:
+            await provider.send_audio(audio_chunk)
+        except Exception as e:
+            logger.warning("STT send failed", provider=self.names["active"], error=str(e))
+            # The chunk is in the replay buffer, so it reaches the standby
+            await self._failover(provider)
+
+    async def _failover(self, failed: STTProvider):
+        """Promote the standby in place of ``failed`` and replay audio."""
+        async with self._lock:
+            if failed is not self.active or self._closed:
+                return  # already handled
+
+            if self.standby is None:
+                # Standby still warming: connect now rather than wait
+                if self._standby_task is not None and not self._standby_task.done():
+                    self._standby_task.cancel()
+                if not await self._connect_standby():
+                    self._standby_task = asyncio.create_task(self._warm_standby())
+                    return
+
+            self.active, self.standby = self.standby, None
+            self.names["active"], self.names["standby"] = self.names["standby"], self.names["active"]
+            self.failovers += 1
+            logger.warning(
+                "STT failed over",
+                provider=self.names["active"],
+                replay_bytes=self._replay.nbytes
+            )
+
+            for chunk in self._replay.chunks():
+                await self.active.send_audio(chunk)
+
+            asyncio.create_task(self._close_quietly(failed))
+            self._standby_task = asyncio.create_task(self._warm_standby())
+
+    @staticmethod
+    async def _close_quietly(provider: STTProvider):
+        try:
+            await provider.close()
+        except Exception:
+            pass
+
+    async def receive_transcripts(self) -> AsyncIterator[Transcript]:
+        """Yield transcripts from whichever provider is active."""
+        while not self._closed:
+            provider = self.active
+            try:
+                async for transcript in provider.receive_transcripts():
+                    yield transcript
+            except Exception as e:
+                logger.warning("STT transcript stream failed", provider=self.names["active"], error=str(e))
+
+            if self._closed:
+                return
+            # Ended without close(): the provider dropped, unless a send
+            # already failed over in which case the next loop picks it up
+            await self._failover(provider)
+            if self.active is provider:
+                await asyncio.sleep(1.0)  # no standby yet
+
+    async def keepalive(self):
+        await self.active.keepalive()
+
+    async def close(self):
+        """Close both connections and stop background tasks."""
+        self._closed = True
+        for task in (self._standby_task, self._keepalive_task):
+            if task is not None and not task.done():
+                task.cancel()
+        await self.active.close()
+        if self.standby is not None:
+            await self.standby.close()
+            self.standby = None
+
+
+register_stt_provider("local", LocalSTTService)
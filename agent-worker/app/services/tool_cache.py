@@ -0,0 +1,173 @@
+"""Cache of tool call results, shared across calls and workers."""
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, ClassVar, Optional
+import redis.asyncio as redis
+import structlog
+
+from app.config import settings
+
+logger = structlog.get_logger()
+
+# (content, ok) as produced by a tool request
+Loader = Callable[[], Awaitable[tuple[str, bool]]]
+
+
+def canonical_arguments(arguments: dict) -> str:
+    """Arguments as stable JSON: sorted keys, no whitespace, trimmed strings."""
+    def normalize(value):
+        if isinstance(value, str):
+            return value.strip()
+        if isinstance(value, dict):
+            return {k: normalize(v) for k, v in value.items()}
+        if isinstance(value, list):
+            return [normalize(v) for v in value]
+        return value
+
+    return json.dumps(normalize(arguments), sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+class ToolResultCache:
+    """
+    Two-tier cache of successful tool results.
+
+    Only tools that opt in through ``server_config.cacheable`` are cached,
+    for ``server_config.cacheTtlSeconds`` (settings.tool_cache_default_ttl
+    if unset). Entries are keyed on tool id, tool version (its updated_at,
+    so editing a tool invalidates its results) and canonicalized
+    arguments. Redis holds the shared tier; a bounded in-process LRU in
+    front of it serves repeats within ``tool_cache_hot_ttl_s`` without a
+    network round trip. Concurrent identical calls share one request.
+
+    Key layout:
+    - ``vox:tool:{tool_id}:{version}:{argument hash}``  result content
+    """
+
+    _instance: ClassVar[Optional["ToolResultCache"]] = None
+    _client: Optional[redis.Redis] = None
+    _prefix: str = "vox:tool:"
+
+    def __new__(cls):
+        """Singleton pattern for shared cache instance."""
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._hot = OrderedDict()
+            cls._instance._inflight = {}
+            cls._instance.hits = 0
+            cls._instance.misses = 0
+        return cls._instance
+
+    @property
+    def enabled(self) -> bool:
+        """Check if caching is enabled."""
+        return settings.tool_cache_enabled
+
+    async def connect(self):
+        """Initialize Redis connection."""
+        if self._client is not None:
+            return
+        try:
+            self._client = redis.from_url(settings.redis_url, decode_responses=True)
+            await self._client.ping()
+            logger.info("Tool cache connected to Redis")
+        except Exception as e:
+            logger.warning("Tool cache Redis connection failed, using in-process cache only", error=str(e))
+            self._client = None
+
+    async def disconnect(self):
+        """Close Redis connection."""
+        if self._client:
+            await self._client.close()
+            self._client = None
+
+    def make_key(self, tool_id: str, version: str, arguments: dict) -> str:
+        """Cache key for one tool invocation."""
+        digest = hashlib.sha1(canonical_arguments(arguments).encode()).hexdigest()[:20]
+        return f"{self._prefix}{tool_id}:{version}:{digest}"
+
+    def _hot_get(self, key: str) -> Optional[str]:
+        entry = self._hot.get(key)
+        if entry is None:
+            return None
+        content, expires_at = entry
+        if time.monotonic() >= expires_at:
+            del self._hot[key]
+            return None
+        self._hot.move_to_end(key)
+        return content
+
+    def _hot_set(self, key: str, content: str, ttl: float):
+        self._hot[key] = (content, time.monotonic() + min(ttl, settings.tool_cache_hot_ttl_s))
+        self._hot.move_to_end(key)
+        while len(self._hot) > settings.tool_cache_hot_max_entries:
+            self._hot.popitem(last=False)
+
+    async def get(self, key: str) -> Optional[str]:
+        """Cached content for ``key`` (hot tier, then Redis)."""
+        content = self._hot_get(key)
+        if content is not None or not self._client:
+            return content
+        try:
+            content = await self._client.get(key)
+        except Exception as e:
+            logger.warning("Tool cache get failed", error=str(e))
+            return None
+        if content is not None:
+            self._hot_set(key, content, settings.tool_cache_hot_ttl_s)
+        return content
+
+    async def set(self, key: str, content: str, ttl: int):
+        """Store content in both tiers."""
+        self._hot_set(key, content, ttl)
+        if not self._client:
+            return
+        try:
+            await self._client.set(key, content, ex=ttl)
+        except Exception as e:
+            logger.warning("Tool cache set failed", error=str(e))
+
+    async def fetch(self, key: str, ttl: int, loader: Loader) -> tuple[str, bool, bool]:
+        """
+        Cached result for ``key``, else run ``loader`` once and cache success.
+
+        Concurrent fetches of the same key wait on the first one's request.
+
+        Returns:
+            (content, ok, cached)
+        """
+        content = await self.get(key)
+        if content is not None:
+            self.hits += 1
+            return content, True, True
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            content, ok = await asyncio.shield(pending)
+            return content, ok, True
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            content, ok = await loader()
+            if ok:
+                await self.set(key, content, ttl)
+            future.set_result((content, ok))
+            return content, ok, False
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # mark retrieved when nobody is waiting
+            raise
+        finally:
+            del self._inflight[key]
+
+    def stats(self) -> dict:
+        """Hit/miss counters for logging."""
+        return {"hits": self.hits, "misses": self.misses, "hot_entries": len(self._hot)}
+
+
+# Global instance
+tool_cache = ToolResultCache()
@@ -0,0 +1,245 @@
+"""Execution of assistant tools requested by the LLM."""
+import asyncio
+import json
+import time
+from typing import Optional, ClassVar
+import httpx
+import structlog
+
+from app.config import settings
+from app.services.llm import ToolCall
+from app.services.tool_cache import tool_cache
+
+logger = structlog.get_logger()
+
+# Schema for tools that do not declare parameters
+ANY_PARAMETERS = {"type": "object", "additionalProperties": True}
+
+
+def _load_json(value, default):
+    if not value:
+        return default
+    if not isinstance(value, str):
+        return value
+    try:
+        return json.loads(value)
+    except json.JSONDecodeError:
+        return default
+
+
+class ToolSpec:
+    """One tool as configured in the control plane."""
+
+    __slots__ = (
+        "id", "name", "description", "url", "timeout_s",
+        "headers", "parameters", "messages", "server_config",
+        "version", "cacheable", "cache_ttl"
+    )
+
+    def __init__(
+        self,
+        id: str,
+        name: str,
+        url: str,
+        description: Optional[str] = None,
+        timeout_s: Optional[float] = None,
+        headers: Optional[dict] = None,
+        parameters: Optional[dict] = None,
+        messages: Optional[dict] = None,
+        server_config: Optional[dict] = None,
+        version: str = "",
+        cacheable: bool = False,
+        cache_ttl: Optional[int] = None
+    ):
+        self.id = id
+        self.name = name
+        self.url = url
+        self.description = description or ""
+        self.timeout_s = timeout_s or settings.tool_default_timeout_s
+        self.headers = headers or {}
+        self.parameters = parameters or ANY_PARAMETERS
+        # trigger ("on_start", "on_success", "on_error") -> message
+        self.messages = messages or {}
+        self.server_config = server_config or {}
+        self.version = version
+        # Only read-only lookups should opt in; results are reused verbatim
+        self.cacheable = cacheable
+        self.cache_ttl = cache_ttl or settings.tool_cache_default_ttl
+
+    @classmethod
+    def from_api(cls, data: dict) -> "ToolSpec":
+        """Build from a control plane ToolResponse (JSON string fields) plus auth_headers."""
+        server_config = _load_json(data.get("server_config"), {})
+        mcp_config = _load_json(data.get("mcp_config"), {})
+        headers = {
+            header["key"]: header["value"]
+            for header in server_config.get("headers", [])
+            if isinstance(header, dict) and "key" in header and "value" in header
+        }
+        # Resolved server_config.credentialId (control plane tool-auth)
+        headers.update(data.get("auth_headers") or {})
+        messages = {
+            message["trigger"]: message["message"]
+            for message in _load_json(data.get("messages"), [])
+            if isinstance(message, dict) and message.get("trigger") and message.get("message")
+        }
+        return cls(
+            id=str(data["id"]),
+            name=data["name"],
+            url=server_config.get("url", ""),
+            description=data.get("description"),
+            timeout_s=server_config.get("timeoutSeconds"),
+            headers=headers,
+            parameters=server_config.get("parameters") or mcp_config.get("parameters"),
+            messages=messages,
+            server_config=server_config,
+            version=str(data.get("updated_at") or ""),
+            cacheable=bool(server_config.get("cacheable", False)),
+            cache_ttl=server_config.get("cacheTtlSeconds")
+        )
+
+    def definition(self) -> dict:
+        """OpenAI-style function definition for the LLM request."""
+        return {
+            "type": "function",
+            "function": {
+                "name": self.name,
+                "description": self.description,
+                "parameters": self.parameters
+            }
+        }
+
+
+class ToolResult:
+    """Outcome of one tool call."""
+
+    __slots__ = ("call", "content", "ok", "latency_ms", "cached")
+
+    def __init__(self, call: ToolCall, content: str, ok: bool, latency_ms: float, cached: bool = False):
+        self.call = call
+        self.content = content
+        self.ok = ok
+        self.latency_ms = latency_ms
+        self.cached = cached
+
+    def to_message(self) -> dict:
+        """Tool message answering the call in the conversation."""
+        return {"role": "tool", "tool_call_id": self.call.id, "content": self.content}
+
+
+class ToolExecutor:
+    """
+    Runs an assistant's tools for the LLM.
+
+    Calls start as soon as the LLM has streamed them (``start``) and run
+    concurrently over a shared, pooled HTTP client, each bounded by its
+    tool's ``server_config.timeoutSeconds``. Failures and timeouts become
+    error results for the LLM rather than exceptions. Tools marked
+    ``cacheable`` are served from ``tool_cache`` when possible.
+    """
+
+    # Shared client pool for connection reuse across calls and bots
+    _shared_client: ClassVar[Optional[httpx.AsyncClient]] = None
+
+    def __init__(self, tools: list[ToolSpec]):
+        self.tools = {tool.name: tool for tool in tools}
+
+    @classmethod
+    async def get_shared_client(cls) -> httpx.AsyncClient:
+        """Get or create shared HTTP client with connection pooling."""
+        if cls._shared_client is None or cls._shared_client.is_closed:
+            cls._shared_client = httpx.AsyncClient(
+                timeout=settings.tool_default_timeout_s,
+                http2=True,
+                limits=httpx.Limits(
+                    max_connections=100,
+                    max_keepalive_connections=20,
+                    keepalive_expiry=30.0
+                )
+            )
+        return cls._shared_client
+
+    @classmethod
+    async def close_shared_client(cls):
+        """Close the shared HTTP client."""
+        if cls._shared_client and not cls._shared_client.is_closed:
+            await cls._shared_client.aclose()
+            cls._shared_client = None
+
+    def definitions(self) -> list[dict]:
+        """Function definitions for every tool."""
+        return [tool.definition() for tool in self.tools.values()]
+
+    def message(self, name: str, trigger: str) -> Optional[str]:
+        """Configured message for ``trigger`` on tool ``name``, if any."""
+        tool = self.tools.get(name)
+        return tool.messages.get(trigger) if tool else None
+
+    def start(self, call: ToolCall) -> asyncio.Task:
+        """Start executing ``call`` in the background."""
+        return asyncio.create_task(self.run(call))
+
+    async def execute(self, calls: list[ToolCall]) -> list[ToolResult]:
+        """Run independent calls concurrently, results in call order."""
+        return list(await asyncio.gather(*(self.run(call) for call in calls)))
+
+    async def run(self, call: ToolCall) -> ToolResult:
+        """Execute one call, from the result cache when the tool allows it."""
+        start = time.perf_counter()
+        content, ok, cached = await self._execute(call)
+
+        latency_ms = (time.perf_counter() - start) * 1000
+        logger.info("Tool call", tool=call.name, ok=ok, cached=cached, latency_ms=round(latency_ms, 1))
+        return ToolResult(call, content, ok, latency_ms, cached)
+
+    async def _execute(self, call: ToolCall) -> tuple[str, bool, bool]:
+        tool = self.tools.get(call.name)
+        if tool is None or not tool.url:
+            return json.dumps({"error": f"Unknown tool: {call.name}"}), False, False
+
+        try:
+            arguments = call.parsed_arguments()
+        except ValueError as e:
+            # Tell the LLM so it can retry, rather than calling with nothing
+            return json.dumps({"error": f"Invalid arguments: {e}"}), False, False
+
+        if tool.cacheable and tool_cache.enabled:
+            return await tool_cache.fetch(
+                tool_cache.make_key(tool.id, tool.version, arguments),
+                tool.cache_ttl,
+                lambda: self._request(tool, arguments)
+            )
+        content, ok = await self._request(tool, arguments)
+        return content, ok, False
+
+    async def _request(self, tool: ToolSpec, arguments: dict) -> tuple[str, bool]:
+        """POST the arguments to the tool's server."""
+        try:
+            client = await self.get_shared_client()
+            response = await client.post(
+                tool.url,
+                json=arguments,
+                headers=tool.headers or None,
+                timeout=tool.timeout_s
+            )
+            content = response.text[:settings.tool_result_max_chars]
+        except httpx.TimeoutException:
+            return json.dumps({"error": f"Tool timed out after {tool.timeout_s}s"}), False
+        except httpx.HTTPError as e:
+            return json.dumps({"error": f"Tool request failed: {e}"}), False
+        except Exception as e:
+            # Bad URL, unencodable arguments, undecodable body: still an
+            # answer for the LLM, never an exception into the turn
+            logger.warning("Tool request error", tool=tool.name, error=str(e))
+            return json.dumps({"error": f"Tool request failed: {e}"}), False
+
+        if response.status_code >= 400:
+            return json.dumps({"error": f"HTTP {response.status_code}", "body": content}), False
+        return content, True
+
+
+def create_tool_executor(tools: Optional[list[dict]]) -> Optional[ToolExecutor]:
+    """Executor for control plane tool records (None if there are none)."""
+    if not tools:
+        return None
+    return ToolExecutor([ToolSpec.from_api(tool) for tool in tools])
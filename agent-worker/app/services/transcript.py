@@ -0,0 +1,185 @@
+"""Deepgram result parsing into lightweight transcript objects."""
+import json
+from typing import Optional
+
+try:
+    import msgspec
+except ImportError:  # optional fast path
+    msgspec = None
+
+try:
+    import orjson
+except ImportError:  # optional fast path
+    orjson = None
+
+
+class Word:
+    """One recognized word with stream timing."""
+
+    __slots__ = ("word", "punctuated_word", "start", "end")
+
+    def __init__(self, word: str, start: float, end: float, punctuated_word: Optional[str] = None):
+        self.word = word
+        self.punctuated_word = punctuated_word or word
+        self.start = start
+        self.end = end
+
+
+class Transcript:
+    """One STT result (interim or final)."""
+
+    __slots__ = ("text", "is_final", "confidence", "start", "duration", "words")
+
+    def __init__(
+        self,
+        text: str,
+        is_final: bool = False,
+        confidence: float = 0.0,
+        start: float = 0.0,
+        duration: float = 0.0,
+        words: Optional[list[Word]] = None
+    ):
+        self.text = text
+        self.is_final = is_final
+        self.confidence = confidence
+        self.start = start
+        self.duration = duration
+        # Empty unless the parser was asked for words
+        self.words = words or []
+
+    @property
+    def end(self) -> float:
+        return self.start + self.duration
+
+    def __repr__(self) -> str:
+        return f"Transcript({self.text!r}, is_final={self.is_final})"
+
+
+if msgspec is not None:
+    # Typed schemas: msgspec skips fields not declared here (notably the
+    # per-word arrays) without building Python objects for them
+    class _MsgWord(msgspec.Struct):
+        word: str = ""
+        start: float = 0.0
+        end: float = 0.0
+        punctuated_word: Optional[str] = None
+
+    class _MsgAlternative(msgspec.Struct):
+        transcript: str = ""
+        confidence: float = 0.0
+
+    class _MsgWordsAlternative(_MsgAlternative):
+        words: list[_MsgWord] = []
+
+    class _MsgChannel(msgspec.Struct):
+        alternatives: list[_MsgAlternative] = []
+
+    class _MsgWordsChannel(msgspec.Struct):
+        alternatives: list[_MsgWordsAlternative] = []
+
+    class _MsgResults(msgspec.Struct):
+        type: str = ""
+        is_final: bool = False
+        start: float = 0.0
+        duration: float = 0.0
+        channel: Optional[_MsgChannel] = None
+
+    class _MsgWordsResults(_MsgResults):
+        channel: Optional[_MsgWordsChannel] = None
+
+    _msg_decoder = msgspec.json.Decoder(_MsgResults)
+    _msg_words_decoder = msgspec.json.Decoder(_MsgWordsResults)
+
+
+def available_backends() -> list[str]:
+    """Parser backends usable in this environment, fastest first."""
+    backends = []
+    if msgspec is not None:
+        backends.append("msgspec")
+    if orjson is not None:
+        backends.append("orjson")
+    backends.append("json")
+    return backends
+
+
+class TranscriptParser:
+    """
+    Parses Deepgram streaming messages into ``Transcript`` objects.
+
+    Uses msgspec with a typed schema when installed, else orjson, else the
+    standard library. Word timings are only decoded when ``with_words``
+    is set, since most consumers need just the text.
+    """
+
+    def __init__(self, with_words: bool = False, backend: Optional[str] = None):
+        """
+        Initialize parser.
+
+        Args:
+            with_words: Decode per-word timings
+            backend: Force "msgspec", "orjson" or "json" (fastest available if None)
+
+        Raises:
+            ValueError: If the requested backend is not installed
+        """
+        self.with_words = with_words
+        self.backend = backend or available_backends()[0]
+        if self.backend not in available_backends():
+            raise ValueError(f"Transcript parser backend not available: {self.backend}")
+
+    def parse(self, message) -> Optional[Transcript]:
+        """
+        Parse one message.
+
+        Returns:
+            Transcript for a Results message with an alternative, else None
+        """
+        if self.backend == "msgspec":
+            try:
+                return self._parse_msgspec(message)
+            except msgspec.ValidationError:
+                # Another message type whose fields clash with the schema
+                # (e.g. UtteranceEnd's "channel" list)
+                return None
+        loads = orjson.loads if self.backend == "orjson" else json.loads
+        return self._parse_dict(loads(message))
+
+    def _parse_msgspec(self, message) -> Optional[Transcript]:
+        decoder = _msg_words_decoder if self.with_words else _msg_decoder
+        data = decoder.decode(message)
+        if data.type != "Results" or data.channel is None or not data.channel.alternatives:
+            return None
+        alternative = data.channel.alternatives[0]
+        words = None
+        if self.with_words:
+            words = [Word(w.word, w.start, w.end, w.punctuated_word) for w in alternative.words]
+        return Transcript(
+            alternative.transcript,
+            data.is_final,
+            alternative.confidence,
+            data.start,
+            data.duration,
+            words
+        )
+
+    def _parse_dict(self, data: dict) -> Optional[Transcript]:
+        if data.get("type") != "Results":
+            return None
+        alternatives = data.get("channel", {}).get("alternatives", [])
+        if not alternatives:
+            return None
+        alternative = alternatives[0]
+        words = None
+        if self.with_words:
+            words = [
+                Word(w.get("word", ""), w.get("start", 0.0), w.get("end", 0.0), w.get("punctuated_word"))
+                for w in alternative.get("words", [])
+            ]
+        return Transcript(
+            alternative.get("transcript", ""),
+            data.get("is_final", False),
+            alternative.get("confidence", 0.0),
+            data.get("start", 0.0),
+            data.get("duration", 0.0),
+            words
+        )
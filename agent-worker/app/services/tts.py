@@ -1,44 +1,73 @@
 """Minimax TTS service for streaming speech synthesis."""
 import asyncio
 import struct
+import time
 from typing import AsyncGenerator, Optional, ClassVar
 import httpx
 import json
 import structlog
 from app.config import settings
 from app.services.tts_cache import tts_cache
+from app.services.audio_transcode import StreamTranscoder
+from app.services.latency import LatencyTracker
+from app.services.race import RaceAttempt, stream_first
+from app.services.tts_provider import (
+    TTSProvider, TTSRouter, create_tts_provider, get_tts_provider_names, register_tts_provider
+)
 
 logger = structlog.get_logger()
 
+# Time-to-first-byte per Minimax endpoint, drives the hedging threshold
+tts_latency = LatencyTracker()
+
 
 class MinimaxTTSService:
     """
     Minimax TTS service with streaming PCM output.
 
-    Uses Minimax Speech-01-Turbo for ultra-low latency voice synthesis
-    with superior prosody and emotional control.
+    Uses Minimax Speech-02-Turbo (configurable per assistant) for
+    ultra-low latency voice synthesis with superior prosody and
+    emotional control.
 
     Optimizations:
     - HTTP/2 connection pooling for reduced latency
     - Persistent client with keep-alive
     - Pre-warmed connections
     - Redis-based caching for common phrases
+    - Hedged requests: a second request (fallback region, or a second
+      connection) fires if the first byte is later than the endpoint's
+      learned p95 TTFB; the first to stream wins
+    - One canonical clip per phrase (synthesis format), converted on the
+      fly to the leg's output format (e.g. 8kHz µ-law for telephony)
     """
 
     # Shared client pool for connection reuse
     _shared_client: ClassVar[Optional[httpx.AsyncClient]] = None
+    # Separate pool so a same-endpoint hedge does not share the slow connection
+    _hedge_client: ClassVar[Optional[httpx.AsyncClient]] = None
+
+    # TTFB samples needed before the learned threshold replaces the default
+    HEDGE_MIN_SAMPLES: ClassVar[int] = 20
 
     def __init__(
         self,
         voice_id: str = "mallory",
         api_key: Optional[str] = None,
-        group_id: Optional[str] = None
+        group_id: Optional[str] = None,
+        model: Optional[str] = None,
+        output_sample_rate: Optional[int] = None,
+        output_codec: str = "pcm"
     ):
         self.voice_id = voice_id
+        self.model = model or settings.tts_model
         self.api_key = api_key or settings.minimax_api_key
         self.group_id = group_id or settings.minimax_group_id
         self.base_url = settings.minimax_base_url
         self.sample_rate = settings.sample_rate
+        self.audio_format = "pcm"
+        # Output format of stream_tts; synthesis and caching stay canonical
+        self.output_sample_rate = output_sample_rate or self.sample_rate
+        self.output_codec = output_codec
         self._own_client = False
 
     @classmethod
@@ -55,12 +84,37 @@ class MinimaxTTSService:
             )
         return cls._shared_client
 
+    @classmethod
+    async def get_hedge_client(cls) -> httpx.AsyncClient:
+        """Get or create the HTTP client used for same-endpoint hedges."""
+        if cls._hedge_client is None or cls._hedge_client.is_closed:
+            cls._hedge_client = httpx.AsyncClient(
+                timeout=30.0,
+                http2=True,
+                limits=httpx.Limits(
+                    max_keepalive_connections=10,
+                    keepalive_expiry=30.0
+                )
+            )
+        return cls._hedge_client
+
     @classmethod
     async def close_shared_client(cls):
-        """Close the shared HTTP client."""
+        """Close the shared HTTP clients."""
         if cls._shared_client and not cls._shared_client.is_closed:
             await cls._shared_client.aclose()
             cls._shared_client = None
+        if cls._hedge_client and not cls._hedge_client.is_closed:
+            await cls._hedge_client.aclose()
+            cls._hedge_client = None
+
+    def _cache_format(self) -> dict:
+        """Model and output format that cached audio must match."""
+        return {
+            "model": self.model,
+            "sample_rate": self.sample_rate,
+            "codec": self.audio_format
+        }
 
     async def stream_tts(
         self,
@@ -69,9 +123,11 @@ class MinimaxTTSService:
         use_cache: bool = True
     ) -> AsyncGenerator[bytes, None]:
         """
-        Stream TTS audio as PCM chunks.
+        Stream TTS audio in the service's output format.
 
-        Checks cache first for common phrases to reduce latency.
+        Checks cache first for common phrases to reduce latency. Audio is
+        synthesized and cached in the canonical format and converted on
+        the fly when the output format differs.
 
         Args:
             text: Text to synthesize
@@ -79,21 +135,50 @@ class MinimaxTTSService:
             use_cache: Whether to check/use cache (default True)
 
         Yields:
-            PCM audio chunks (16-bit, 16kHz, mono)
+            Audio chunks (16-bit PCM at settings.sample_rate unless an
+            output rate/codec was configured)
         """
+        if (self.output_sample_rate, self.output_codec) == (self.sample_rate, self.audio_format):
+            async for chunk in self._stream_canonical(text, speed, use_cache):
+                yield chunk
+            return
+
+        transcoder = StreamTranscoder(
+            self.sample_rate,
+            self.output_sample_rate,
+            src_codec=self.audio_format,
+            dst_codec=self.output_codec
+        )
+        async for chunk in self._stream_canonical(text, speed, use_cache):
+            converted = transcoder.process(chunk)
+            if converted:
+                yield converted
+        tail = transcoder.flush()
+        if tail:
+            yield tail
+
+    async def _stream_canonical(
+        self,
+        text: str,
+        speed: float,
+        use_cache: bool
+    ) -> AsyncGenerator[bytes, None]:
+        """Stream audio in the synthesis format, from cache or Minimax."""
         # Check cache first
         if use_cache:
-            cached_audio = await tts_cache.get(text, self.voice_id, speed)
+            cached_audio = await tts_cache.get(text, self.voice_id, speed, **self._cache_format())
             if cached_audio:
                 logger.info("TTS cache hit, using cached audio", text_preview=text[:30])
-                # Yield cached audio in chunks for consistent interface
+                # Yield cached audio in chunks for consistent interface;
+                # memoryview slices avoid copying clips served from disk
+                cached_view = memoryview(cached_audio)
                 chunk_size = 4096  # ~128ms of audio at 16kHz
-                for i in range(0, len(cached_audio), chunk_size):
-                    yield cached_audio[i:i + chunk_size]
+                for i in range(0, len(cached_view), chunk_size):
+                    yield cached_view[i:i + chunk_size]
                 return
 
         payload = {
-            "model": "speech-01-turbo",
+            "model": self.model,
             "text": text,
             "stream": True,
             "voice_setting": {
@@ -102,7 +187,7 @@ class MinimaxTTSService:
             },
             "audio_setting": {
                 "sample_rate": self.sample_rate,
-                "format": "pcm",
+                "format": self.audio_format,
                 "channel": 1
             }
         }
@@ -112,35 +197,120 @@ class MinimaxTTSService:
             "Content-Type": "application/json"
         }
 
-        url = f"{self.base_url}/text_to_speech"
-        if self.group_id:
-            url = f"{self.base_url}/text_to_speech?GroupId={self.group_id}"
-
-        client = await self.get_shared_client()
-
         # Collect audio for caching if enabled
         audio_collector = [] if use_cache else None
 
-        async with client.stream(
-            "POST",
-            url,
-            json=payload,
-            headers=headers
-        ) as response:
-            response.raise_for_status()
-            async for chunk in response.aiter_bytes():
-                if chunk:
-                    if audio_collector is not None:
-                        audio_collector.append(chunk)
-                    # Minimax streams raw PCM data
-                    yield chunk
+        async for chunk in self._stream_hedged(payload, headers):
+            if audio_collector is not None:
+                audio_collector.append(chunk)
+            # Minimax streams raw PCM data
+            yield chunk
 
         # Cache the audio if collected
         if audio_collector and use_cache:
             full_audio = b"".join(audio_collector)
-            await tts_cache.set(text, self.voice_id, full_audio, speed)
+            await tts_cache.set(text, self.voice_id, full_audio, speed, **self._cache_format())
             logger.debug("TTS audio cached", text_preview=text[:30], size=len(full_audio))
 
+    def _url(self, base_url: str) -> str:
+        url = f"{base_url}/text_to_speech"
+        if self.group_id:
+            url = f"{base_url}/text_to_speech?GroupId={self.group_id}"
+        return url
+
+    def _hedge_delay(self, base_url: str) -> float:
+        """Seconds to wait for a first byte before hedging, from learned TTFB."""
+        stats = tts_latency.get(base_url)
+        threshold_ms = None
+        if stats.count >= self.HEDGE_MIN_SAMPLES:
+            threshold_ms = stats.percentile(settings.tts_hedge_percentile)
+        if threshold_ms is None:
+            threshold_ms = settings.tts_hedge_default_ms
+        threshold_ms = min(max(threshold_ms, settings.tts_hedge_min_ms), settings.tts_hedge_max_ms)
+        return threshold_ms / 1000
+
+    async def _run_attempt(
+        self,
+        attempt: RaceAttempt,
+        base_url: str,
+        client: httpx.AsyncClient,
+        payload: dict,
+        headers: dict,
+        censor_after_s: float
+    ):
+        """
+        Stream one request into the attempt's queue, recording TTFB.
+
+        An attempt cancelled before its first byte (it lost the race, or
+        the caller stopped listening) is recorded as a censored sample if
+        it had already waited ``censor_after_s``, so the TTFB percentiles
+        driving the hedge delay see the slow requests, not just winners.
+        """
+        stats = tts_latency.get(base_url)
+        start = time.perf_counter()
+        try:
+            async with client.stream(
+                "POST",
+                self._url(base_url),
+                json=payload,
+                headers=headers
+            ) as response:
+                response.raise_for_status()
+                async for chunk in response.aiter_bytes():
+                    if not chunk:
+                        continue
+                    if not attempt.ready.done():
+                        stats.record((time.perf_counter() - start) * 1000)
+                        attempt.ready.set_result(None)
+                    attempt.queue.put_nowait(chunk)
+            attempt.finish()
+
+        except asyncio.CancelledError:
+            elapsed_s = time.perf_counter() - start
+            if not attempt.ready.done() and elapsed_s >= censor_after_s:
+                stats.record_censored(elapsed_s * 1000)
+            raise
+        except Exception as e:
+            if attempt.fail(e):
+                stats.record_error()
+
+    async def _stream_hedged(
+        self,
+        payload: dict,
+        headers: dict
+    ) -> AsyncGenerator[bytes, None]:
+        """
+        Stream a synthesis request, hedging slow or failed first bytes.
+
+        The primary request gets ``_hedge_delay`` to produce audio. After
+        that (or as soon as it fails) a second request goes to the fallback
+        endpoint, or to the same endpoint over a separate connection. The
+        first request to stream audio wins and the other is cancelled.
+        """
+        client = await self.get_shared_client()
+        hedge_url = settings.minimax_fallback_base_url or self.base_url
+        hedge_delay = self._hedge_delay(self.base_url)
+
+        async def hedge(reason: str):
+            logger.info("TTS hedging request", reason=reason, endpoint=hedge_url)
+            hedge_client = (
+                await self.get_hedge_client() if hedge_url == self.base_url
+                else await self.get_shared_client()
+            )
+            return lambda attempt: self._run_attempt(
+                attempt, hedge_url, hedge_client, payload, headers, hedge_delay
+            )
+
+        async for chunk in stream_first(
+            lambda attempt: self._run_attempt(
+                attempt, self.base_url, client, payload, headers, hedge_delay
+            ),
+            hedge if settings.tts_hedging_enabled else None,
+            hedge_delay,
+            output="audio"
+        ):
+            yield chunk
+
     async def synthesize(
         self,
         text: str,
@@ -167,6 +337,62 @@ class MinimaxTTSService:
         pass
 
 
+register_tts_provider("minimax", MinimaxTTSService)
+
+
 # Factory function
-def create_tts_service(voice_id: str = "mallory") -> MinimaxTTSService:
-    return MinimaxTTSService(voice_id=voice_id)
+def create_tts_service(
+    voice_id: str = "mallory",
+    model: Optional[str] = None,
+    output_sample_rate: Optional[int] = None,
+    output_codec: str = "pcm",
+    provider: Optional[str] = None,
+    fallback_providers: Optional[list[str]] = None
+) -> TTSProvider:
+    """
+    Create the TTS service for an assistant.
+
+    Args:
+        voice_id: Voice to synthesize with
+        model: TTS model (provider default if None)
+        output_sample_rate: Output sample rate (canonical if None)
+        output_codec: Output encoding ("pcm" or "mulaw")
+        provider: Preferred provider name (settings.tts_provider if None
+            or not registered)
+        fallback_providers: Providers to fail over to, in order
+            (settings.tts_fallback_providers if None); unregistered
+            names are skipped
+
+    Returns:
+        The provider itself, or a TTSRouter when fallbacks are configured
+    """
+    if fallback_providers is None:
+        fallback_providers = [
+            name.strip() for name in settings.tts_fallback_providers.split(",") if name.strip()
+        ]
+    registered = get_tts_provider_names()
+    provider = provider or settings.tts_provider
+    if provider not in registered:
+        logger.warning("Unknown TTS provider, using default", provider=provider, default=settings.tts_provider)
+        provider = settings.tts_provider
+
+    names = [provider]
+    for name in fallback_providers:
+        if name not in registered:
+            logger.warning("Unknown TTS fallback provider, skipping", provider=name)
+        elif name not in names:
+            names.append(name)
+
+    services = {
+        name: create_tts_provider(
+            name,
+            voice_id=voice_id,
+            model=model,
+            output_sample_rate=output_sample_rate,
+            output_codec=output_codec
+        )
+        for name in names
+    }
+    if len(services) == 1:
+        return services[names[0]]
+    return TTSRouter(services)
@@ -1,10 +1,13 @@
 """TTS Cache service for caching pre-generated speech audio."""
+import asyncio
 import hashlib
+import time
 import structlog
-from typing import Optional, ClassVar
+from typing import Optional, ClassVar, Union
 import redis.asyncio as redis
 
 from app.config import settings
+from app.services.tts_disk_cache import TTSDiskCache
 
 logger = structlog.get_logger()
 
@@ -59,24 +62,46 @@ class TTSCacheService:
     """
     Redis-based cache for TTS audio.
 
-    Uses text hash + voice_id as cache key to enable
-    fast lookups for previously generated audio.
+    Uses text hash + voice, model and output format as cache key to
+    enable fast lookups for previously generated audio.
 
     Features:
     - Hash-based cache keys (text + voice_id + speed)
+    - Model, sample rate and codec carried in the key
     - TTL-based eviction
     - Pre-warming of common phrases
     - Graceful degradation if Redis unavailable
+    - O(1) statistics from maintained per-namespace counters
+    - O(1) invalidation of everything, one voice, or one model via
+      namespace generations
+    - Optional local disk tier (``TTSDiskCache``) checked before Redis,
+      keyed by the same namespaced keys so invalidation applies to both
+
+    Key layout (``{ns}`` is ``g{global}:{voice_id}:v{voice gen}:{model}:m{model gen}``):
+    - ``vox:tts:{ns}:{sample_rate}:{codec}:{hash}``  cached audio
+    - ``vox:tts:{ns}:idx``                           index hash: entry -> size
+    - ``vox:tts:{ns}:stats``                         counters: entries, bytes, hits, misses, evictions
+    - ``vox:tts:g{global}:namespaces``               set of ``voice|model`` pairs with entries
+    - ``vox:tts:gens``                               generations: global, voice:{id}, model:{id}
     """
 
     _instance: ClassVar[Optional["TTSCacheService"]] = None
     _client: Optional[redis.Redis] = None
+    _local: Optional[TTSDiskCache] = None
     _prefix: str = "vox:tts:"
 
+    # Namespace generations, cached locally and re-read from Redis periodically
+    _generations_checked_at: float = 0.0
+    _generation_refresh_s: float = 5.0
+
+    STAT_FIELDS: ClassVar[tuple[str, ...]] = ("entries", "bytes", "hits", "misses", "evictions")
+
     def __new__(cls):
         """Singleton pattern for shared cache instance."""
         if cls._instance is None:
             cls._instance = super().__new__(cls)
+            cls._instance._pending = set()
+            cls._instance._generations = {}
         return cls._instance
 
     @property
@@ -85,7 +110,19 @@ class TTSCacheService:
         return settings.tts_cache_enabled
 
     async def connect(self):
-        """Initialize Redis connection."""
+        """Initialize Redis connection and the local disk tier if enabled."""
+        if settings.tts_disk_cache_enabled and self._local is None:
+            try:
+                local = TTSDiskCache(
+                    settings.tts_disk_cache_dir,
+                    settings.tts_disk_cache_max_bytes
+                )
+                # Index rebuild reads the whole segment; keep it off the loop
+                await asyncio.to_thread(local.open)
+                self._local = local
+            except Exception as e:
+                logger.warning("TTS disk cache unavailable, using Redis only", error=str(e))
+
         if self._client is not None:
             return
 
@@ -104,12 +141,45 @@ class TTSCacheService:
 
     async def disconnect(self):
         """Close Redis connection."""
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
         if self._client:
             await self._client.close()
             self._client = None
+        if self._local:
+            self._local.close()
+            self._local = None
 
-    def _make_key(self, text: str, voice_id: str, speed: float = 1.0) -> str:
-        """Generate cache key from text, voice, and speed."""
+    @property
+    def _gens_key(self) -> str:
+        return f"{self._prefix}gens"
+
+    @property
+    def generation(self) -> int:
+        """Current global namespace generation."""
+        return self._generations.get("global", 0)
+
+    def _ns(self, voice_id: str, model: str) -> str:
+        """Key prefix for a voice/model namespace at its current generations."""
+        gens = self._generations
+        return (
+            f"{self._prefix}g{self.generation}:"
+            f"{voice_id}:v{gens.get(f'voice:{voice_id}', 0)}:"
+            f"{model}:m{gens.get(f'model:{model}', 0)}:"
+        )
+
+    def _namespaces_key(self) -> str:
+        return f"{self._prefix}g{self.generation}:namespaces"
+
+    def _entry(
+        self,
+        text: str,
+        voice_id: str,
+        speed: float,
+        sample_rate: int,
+        codec: str
+    ) -> str:
+        """Entry id within a namespace: output format plus content hash."""
         # Normalize text
         normalized = text.strip().lower()
 
@@ -117,34 +187,146 @@ class TTSCacheService:
         content = f"{normalized}:{voice_id}:{speed}"
         hash_key = hashlib.sha256(content.encode()).hexdigest()[:16]
 
-        return f"{self._prefix}{voice_id}:{hash_key}"
+        return f"{sample_rate}:{codec}:{hash_key}"
+
+    @staticmethod
+    def _resolve_format(
+        model: Optional[str],
+        sample_rate: Optional[int]
+    ) -> tuple[str, int]:
+        return model or settings.tts_model, sample_rate or settings.sample_rate
+
+    def _make_key(
+        self,
+        text: str,
+        voice_id: str,
+        speed: float = 1.0,
+        model: Optional[str] = None,
+        sample_rate: Optional[int] = None,
+        codec: str = "pcm"
+    ) -> str:
+        """Generate cache key from text, voice, speed, model and output format."""
+        model, sample_rate = self._resolve_format(model, sample_rate)
+        entry = self._entry(text, voice_id, speed, sample_rate, codec)
+        return f"{self._ns(voice_id, model)}{entry}"
+
+    async def _refresh_generations(self, force: bool = False):
+        """Re-read the namespace generations if the local copy is stale."""
+        now = time.monotonic()
+        if not force and now - self._generations_checked_at < self._generation_refresh_s:
+            return
+
+        raw = await self._client.hgetall(self._gens_key)
+        self._generations = {
+            (k.decode() if isinstance(k, bytes) else k): int(v)
+            for k, v in (raw or {}).items()
+        }
+        self._generations_checked_at = now
+
+    async def _bump_generation(self, field: str) -> int:
+        """Move a namespace to its next generation."""
+        generation = int(await self._client.hincrby(self._gens_key, field, 1))
+        self._generations[field] = generation
+        return generation
+
+    def _store_local(self, key: str, audio_data, ttl: int):
+        """Write through to the disk tier, compacting in a thread when it overflows."""
+        if self._local is None:
+            return
+        self._local.put(key, audio_data, ttl)
+        if self._local.needs_compaction:
+            self._spawn(asyncio.to_thread(self._local.compact))
+
+    def _spawn(self, coro):
+        """Run bookkeeping off the request path, keeping a reference until done."""
+        task = asyncio.create_task(coro)
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def _record_lookup(self, ns: str, namespace: str, entry: str, hit: bool, indexed_size):
+        """Update hit/miss counters, reconciling entries that expired under us."""
+        try:
+            stats_key = f"{ns}stats"
+            namespaces_key = self._namespaces_key()
+            pipe = self._client.pipeline(transaction=False)
+            pipe.hincrby(stats_key, "hits" if hit else "misses", 1)
+            # Misses in a never-written namespace still show up in get_stats,
+            # and their counters expire like set()'s bookkeeping
+            pipe.sadd(namespaces_key, namespace)
+            for meta_key in (stats_key, namespaces_key):
+                pipe.expire(meta_key, settings.tts_cache_ttl)
+
+            if not hit and indexed_size is not None:
+                # Indexed but gone: Redis evicted it (TTL or maxmemory)
+                pipe.hdel(f"{ns}idx", entry)
+                pipe.hincrby(stats_key, "entries", -1)
+                pipe.hincrby(stats_key, "bytes", -int(indexed_size))
+                pipe.hincrby(stats_key, "evictions", 1)
+
+            await pipe.execute()
+        except Exception as e:
+            logger.debug("TTS cache stats update failed", error=str(e))
 
     async def get(
         self,
         text: str,
         voice_id: str,
-        speed: float = 1.0
-    ) -> Optional[bytes]:
+        speed: float = 1.0,
+        model: Optional[str] = None,
+        sample_rate: Optional[int] = None,
+        codec: str = "pcm"
+    ) -> Optional[Union[bytes, memoryview]]:
         """
         Get cached TTS audio if available.
 
+        The local disk tier is checked first and answers without touching
+        Redis; Redis hits are written through to it.
+
         Args:
             text: Text that was synthesized
             voice_id: Voice identifier
             speed: Speech speed multiplier
+            model: TTS model (default from settings)
+            sample_rate: Audio sample rate (default from settings)
+            codec: Audio encoding
 
         Returns:
-            Cached PCM audio data or None if not found
+            Cached audio data (a zero-copy memoryview when served from
+            disk) or None if not found
         """
-        if not self.enabled or not self._client:
+        if not self.enabled or not (self._client or self._local):
             return None
 
         try:
-            key = self._make_key(text, voice_id, speed)
-            data = await self._client.get(key)
+            if self._client:
+                await self._refresh_generations()
+            model, sample_rate = self._resolve_format(model, sample_rate)
+            ns = self._ns(voice_id, model)
+            entry = self._entry(text, voice_id, speed, sample_rate, codec)
+            key = f"{ns}{entry}"
+
+            if self._local is not None:
+                local_data = self._local.get(key)
+                if local_data is not None:
+                    logger.debug("TTS disk cache hit", text_preview=text[:30])
+                    return local_data
+
+            if not self._client:
+                return None
+
+            pipe = self._client.pipeline(transaction=False)
+            pipe.get(key)
+            pipe.hget(f"{ns}idx", entry)
+            if self._local is not None:
+                pipe.ttl(key)
+            data, indexed_size, *remaining_ttl = await pipe.execute()
+
+            self._spawn(self._record_lookup(ns, f"{voice_id}|{model}", entry, bool(data), indexed_size))
 
             if data:
                 logger.debug("TTS cache hit", text_preview=text[:30])
+                if remaining_ttl and remaining_ttl[0] > 0:
+                    self._store_local(key, data, remaining_ttl[0])
                 return data
 
             logger.debug("TTS cache miss", text_preview=text[:30])
@@ -160,7 +342,10 @@ class TTSCacheService:
         voice_id: str,
         audio_data: bytes,
         speed: float = 1.0,
-        ttl: Optional[int] = None
+        ttl: Optional[int] = None,
+        model: Optional[str] = None,
+        sample_rate: Optional[int] = None,
+        codec: str = "pcm"
     ):
         """
         Cache TTS audio data.
@@ -168,80 +353,181 @@ class TTSCacheService:
         Args:
             text: Text that was synthesized
             voice_id: Voice identifier
-            audio_data: PCM audio bytes
+            audio_data: Encoded audio bytes
             speed: Speech speed multiplier
             ttl: Time-to-live in seconds (default from settings)
+            model: TTS model (default from settings)
+            sample_rate: Audio sample rate (default from settings)
+            codec: Audio encoding
         """
-        if not self.enabled or not self._client:
+        if not self.enabled or not (self._client or self._local):
             return
 
         try:
-            key = self._make_key(text, voice_id, speed)
+            if self._client:
+                await self._refresh_generations()
+            model, sample_rate = self._resolve_format(model, sample_rate)
+            ns = self._ns(voice_id, model)
+            entry = self._entry(text, voice_id, speed, sample_rate, codec)
             ttl = ttl or settings.tts_cache_ttl
 
-            await self._client.setex(key, ttl, audio_data)
-            logger.debug("TTS cached", text_preview=text[:30], size_bytes=len(audio_data))
+            self._store_local(f"{ns}{entry}", audio_data, ttl)
+            if not self._client:
+                return
+
+            index_key = f"{ns}idx"
+            stats_key = f"{ns}stats"
+            namespaces_key = self._namespaces_key()
+            size = len(audio_data)
+
+            pipe = self._client.pipeline(transaction=True)
+            pipe.hget(index_key, entry)
+            pipe.setex(f"{ns}{entry}", ttl, audio_data)
+            pipe.hset(index_key, entry, size)
+            pipe.sadd(namespaces_key, f"{voice_id}|{model}")
+            # Bookkeeping keys outlive the newest entry, so an orphaned
+            # namespace is reclaimed by Redis once its audio has expired
+            for meta_key in (index_key, stats_key, namespaces_key):
+                pipe.expire(meta_key, ttl)
+            previous_size = (await pipe.execute())[0]
+
+            pipe = self._client.pipeline(transaction=False)
+            if previous_size is None:
+                pipe.hincrby(stats_key, "entries", 1)
+                pipe.hincrby(stats_key, "bytes", size)
+            else:
+                pipe.hincrby(stats_key, "bytes", size - int(previous_size))
+            await pipe.execute()
+
+            logger.debug("TTS cached", text_preview=text[:30], size_bytes=size)
 
         except Exception as e:
             logger.warning("TTS cache set failed", error=str(e))
 
-    async def invalidate(self, text: str, voice_id: str, speed: float = 1.0):
+    async def invalidate(
+        self,
+        text: str,
+        voice_id: str,
+        speed: float = 1.0,
+        model: Optional[str] = None,
+        sample_rate: Optional[int] = None,
+        codec: str = "pcm"
+    ):
         """Remove specific entry from cache."""
-        if not self._client:
+        if not (self._client or self._local):
             return
 
         try:
-            key = self._make_key(text, voice_id, speed)
-            await self._client.delete(key)
+            if self._client:
+                await self._refresh_generations()
+            model, sample_rate = self._resolve_format(model, sample_rate)
+            ns = self._ns(voice_id, model)
+            entry = self._entry(text, voice_id, speed, sample_rate, codec)
+
+            if self._local is not None:
+                self._local.delete(f"{ns}{entry}")
+            if not self._client:
+                return
+
+            pipe = self._client.pipeline(transaction=True)
+            pipe.hget(f"{ns}idx", entry)
+            pipe.delete(f"{ns}{entry}")
+            pipe.hdel(f"{ns}idx", entry)
+            previous_size = (await pipe.execute())[0]
+
+            if previous_size is not None:
+                pipe = self._client.pipeline(transaction=False)
+                pipe.hincrby(f"{ns}stats", "entries", -1)
+                pipe.hincrby(f"{ns}stats", "bytes", -int(previous_size))
+                await pipe.execute()
         except Exception as e:
             logger.warning("TTS cache invalidate failed", error=str(e))
 
-    async def clear_all(self):
-        """Clear all TTS cache entries."""
+    async def invalidate_voice(self, voice_id: str):
+        """Drop every cached clip for one voice, across all models, in O(1)."""
         if not self._client:
             return
 
         try:
-            # Find all TTS cache keys
-            pattern = f"{self._prefix}*"
-            cursor = 0
-            deleted = 0
+            generation = await self._bump_generation(f"voice:{voice_id}")
+            logger.info("TTS cache voice invalidated", voice=voice_id, generation=generation)
+        except Exception as e:
+            logger.warning("TTS cache voice invalidate failed", voice=voice_id, error=str(e))
+
+    async def invalidate_model(self, model: str):
+        """Drop every cached clip for one TTS model, across all voices, in O(1)."""
+        if not self._client:
+            return
+
+        try:
+            generation = await self._bump_generation(f"model:{model}")
+            logger.info("TTS cache model invalidated", model=model, generation=generation)
+        except Exception as e:
+            logger.warning("TTS cache model invalidate failed", model=model, error=str(e))
 
-            while True:
-                cursor, keys = await self._client.scan(cursor, match=pattern, count=100)
-                if keys:
-                    await self._client.delete(*keys)
-                    deleted += len(keys)
-                if cursor == 0:
-                    break
+    async def clear_all(self):
+        """
+        Clear all TTS cache entries.
 
-            logger.info("TTS cache cleared", entries_deleted=deleted)
+        Bumps the global namespace generation instead of deleting keys, so
+        this is O(1) regardless of cache size. Entries in the old namespace
+        are unreachable immediately and expire through their TTL. Other
+        workers pick up the new generation within ``_generation_refresh_s``.
+        """
+        if not self._client:
+            return
+
+        try:
+            generation = await self._bump_generation("global")
+            logger.info("TTS cache cleared", generation=generation)
 
         except Exception as e:
             logger.warning("TTS cache clear failed", error=str(e))
 
     async def get_stats(self) -> dict:
-        """Get cache statistics."""
+        """
+        Get cache statistics.
+
+        Reads the maintained per-namespace counters; cost scales with the
+        number of voice/model pairs, not the number of cached entries.
+        """
         if not self._client:
             return {"enabled": False, "connected": False}
 
         try:
-            # Count TTS cache keys
-            pattern = f"{self._prefix}*"
-            cursor = 0
-            count = 0
-
-            while True:
-                cursor, keys = await self._client.scan(cursor, match=pattern, count=100)
-                count += len(keys)
-                if cursor == 0:
-                    break
+            await self._refresh_generations()
+            pairs = sorted(
+                (m.decode() if isinstance(m, bytes) else m).split("|", 1)
+                for m in await self._client.smembers(self._namespaces_key())
+            )
 
+            pipe = self._client.pipeline(transaction=False)
+            for voice_id, model in pairs:
+                pipe.hmget(f"{self._ns(voice_id, model)}stats", *self.STAT_FIELDS)
+            rows = await pipe.execute() if pairs else []
+
+            totals = dict.fromkeys(self.STAT_FIELDS, 0)
+            per_voice: dict[str, dict] = {}
+            per_model: dict[str, dict] = {}
+            for (voice_id, model), row in zip(pairs, rows):
+                for field, value in zip(self.STAT_FIELDS, row):
+                    value = int(value or 0)
+                    totals[field] += value
+                    for group, name in ((per_voice, voice_id), (per_model, model)):
+                        bucket = group.setdefault(name, dict.fromkeys(self.STAT_FIELDS, 0))
+                        bucket[field] += value
+
+            lookups = totals["hits"] + totals["misses"]
             return {
                 "enabled": self.enabled,
                 "connected": True,
-                "entries": count,
-                "ttl_seconds": settings.tts_cache_ttl
+                **totals,
+                "hit_rate": totals["hits"] / lookups if lookups else 0.0,
+                "voices": per_voice,
+                "models": per_model,
+                "generation": self.generation,
+                "ttl_seconds": settings.tts_cache_ttl,
+                "local": self._local.stats() if self._local else None
             }
 
         except Exception as e:
@@ -252,7 +538,7 @@ class TTSCacheService:
 tts_cache = TTSCacheService()
 
 
-async def prewarm_tts_cache(voice_ids: list[str]):
+async def prewarm_tts_cache(voice_ids: list[str], model: Optional[str] = None):
     """
     Pre-warm TTS cache with common phrases.
 
@@ -261,25 +547,27 @@ async def prewarm_tts_cache(voice_ids: list[str]):
 
     Args:
         voice_ids: List of voice IDs to pre-warm
+        model: TTS model to pre-warm (default from settings)
     """
     from app.services.tts import MinimaxTTSService
 
     logger.info("Pre-warming TTS cache", voices=voice_ids, phrases=len(COMMON_PHRASES))
 
     for voice_id in voice_ids:
-        tts = MinimaxTTSService(voice_id=voice_id)
+        tts = MinimaxTTSService(voice_id=voice_id, model=model)
 
         for phrase in COMMON_PHRASES:
             # Check if already cached
-            cached = await tts_cache.get(phrase, voice_id)
+            cached = await tts_cache.get(
+                phrase, voice_id, model=tts.model, sample_rate=tts.sample_rate
+            )
             if cached:
                 logger.debug("Phrase already cached", phrase=phrase[:20], voice=voice_id)
                 continue
 
             try:
-                # Generate and cache
-                audio_data = await tts.synthesize(phrase)
-                await tts_cache.set(phrase, voice_id, audio_data)
+                # stream_tts stores the result under the service's model/format
+                await tts.synthesize(phrase)
                 logger.debug("Pre-warmed phrase", phrase=phrase[:20], voice=voice_id)
 
             except Exception as e:
@@ -0,0 +1,401 @@
+"""Local on-disk TTS audio store served through mmap."""
+import mmap
+import os
+import struct
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Optional
+import structlog
+
+logger = structlog.get_logger()
+
+# Record layout: header | key (utf-8) | audio
+# header = magic, crc32(expires_at + key + audio), key length, audio length, expires_at
+RECORD_HEADER = struct.Struct("<4sIHId")
+RECORD_MAGIC = b"VXA1"
+SEGMENT_NAME = "clips.seg"
+# Smallest map put() grows to; maps then double so appends rarely remap
+MIN_MAP_BYTES = 1 << 20
+
+
+class TTSDiskCache:
+    """
+    Append-only segment file of audio clips on local disk.
+
+    Sits between the process and Redis so each worker host serves its hot
+    clips (greetings, common phrases) without a network round trip, and
+    keeps them across restarts.
+
+    Features:
+    - Single append-only segment file with an in-memory offset index
+    - Reads are ``memoryview`` slices of an ``mmap`` (no copies)
+    - The file is extended ahead of the data (sparsely) and the map
+      doubled when appends outgrow it, so a put rarely remaps; replaced
+      maps are closed once no reader holds a view into them
+    - Crash-safe index rebuild: records carry a CRC and a torn or
+      corrupt tail is truncated on open
+    - Deletions are tombstone records, so they survive restarts too
+    - Size-bounded compaction that keeps the most recently used clips,
+      written to a temp file and atomically swapped in
+
+    Not coroutine-aware: ``get``/``put``/``delete`` are cheap and are called
+    from the event loop; ``compact`` does bulk I/O and should be run in a
+    thread. Writes are dropped while a compaction is in progress.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        max_bytes: int,
+        compact_ratio: float = 0.5
+    ):
+        """
+        Initialize the store (call ``open`` before use).
+
+        Args:
+            directory: Directory holding the segment file
+            max_bytes: Segment size that triggers compaction
+            compact_ratio: Fraction of ``max_bytes`` kept after compaction
+        """
+        self.path = Path(directory) / SEGMENT_NAME
+        self.max_bytes = max_bytes
+        self.compact_ratio = compact_ratio
+
+        self._lock = threading.Lock()
+        self._file = None
+        # (mmap, index) swapped as one object so readers never pair a map
+        # with an index built for a different file.
+        # index: key -> (offset, length, expires_at)
+        self._view: tuple[Optional[mmap.mmap], dict] = (None, {})
+        self._size = 0
+        # Replaced maps still exported to readers, closed once released
+        self._retired: list[mmap.mmap] = []
+        self._last_access: dict[str, float] = {}
+        self._compacting = False
+        self._deleted_while_compacting: set[str] = set()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def is_open(self) -> bool:
+        return self._file is not None
+
+    @property
+    def needs_compaction(self) -> bool:
+        """Whether the segment has outgrown ``max_bytes``."""
+        return self._size > self.max_bytes and not self._compacting
+
+    def open(self):
+        """Open the segment file and rebuild the index from it."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.touch(exist_ok=True)
+
+        self._file = open(self.path, "r+b")
+        index, valid_end = self._scan(self._file)
+
+        file_size = os.fstat(self._file.fileno()).st_size
+        if valid_end < file_size:
+            # Zeroes are space put() reserved ahead of the data (left by a
+            # crash before close() trimmed it); anything else is a torn
+            # write or corruption
+            self._file.seek(valid_end)
+            if any(self._file.read(RECORD_HEADER.size)):
+                logger.warning(
+                    "TTS disk cache truncating invalid tail",
+                    path=str(self.path),
+                    dropped_bytes=file_size - valid_end
+                )
+            self._file.truncate(valid_end)
+            os.fsync(self._file.fileno())
+
+        self._file.seek(valid_end)
+        self._size = valid_end
+        self._view = (self._map(self._file), index)
+        self._last_access = {}
+
+        logger.info(
+            "TTS disk cache opened",
+            path=str(self.path),
+            entries=len(index),
+            size_bytes=valid_end
+        )
+
+    def close(self):
+        """Close the segment file. Outstanding views stay readable."""
+        with self._lock:
+            mm, _ = self._view
+            self._view = (None, {})
+            if mm is not None:
+                self._retire(mm)
+            if self._file:
+                # Drop the space reserved past the data
+                self._file.truncate(self._size)
+                self._file.close()
+                self._file = None
+
+    def _retire(self, mm: mmap.mmap):
+        """Stop serving from ``mm`` and close it once no reader views it."""
+        self._retired.append(mm)
+        self._close_retired()
+
+    def _close_retired(self):
+        """Close replaced maps, keeping any a reader still has a view into."""
+        still_viewed = []
+        for old in self._retired:
+            try:
+                old.close()
+            except BufferError:
+                still_viewed.append(old)
+        self._retired = still_viewed
+
+    def _grow_map(self, index: dict, needed: int):
+        """
+        Publish a map covering at least ``needed`` bytes of the segment.
+
+        The file is extended to double the current map (sparse, so no disk
+        is used until written) and mapped once; appends then land inside
+        the map, which sees them through the page cache. Caller holds the
+        lock.
+        """
+        old, _ = self._view
+        capacity = max(needed, MIN_MAP_BYTES, 2 * len(old) if old is not None else 0)
+        os.ftruncate(self._file.fileno(), capacity)
+        self._view = (mmap.mmap(self._file.fileno(), capacity, access=mmap.ACCESS_READ), index)
+        if old is not None:
+            self._retire(old)
+
+    @staticmethod
+    def _map(file) -> Optional[mmap.mmap]:
+        """Map the whole file read-only (``None`` for an empty file)."""
+        if os.fstat(file.fileno()).st_size == 0:
+            return None
+        return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    @staticmethod
+    def _scan(file) -> tuple[dict, int]:
+        """
+        Replay the segment into an index.
+
+        Returns:
+            (index, offset of the end of the last valid record)
+        """
+        index: dict[str, tuple[int, int, float]] = {}
+        mm = TTSDiskCache._map(file)
+        if mm is None:
+            return index, 0
+
+        now = time.time()
+        offset = 0
+        size = len(mm)
+        try:
+            while offset + RECORD_HEADER.size <= size:
+                magic, crc, key_len, data_len, expires_at = RECORD_HEADER.unpack_from(mm, offset)
+                body_start = offset + RECORD_HEADER.size
+                end = body_start + key_len + data_len
+                if magic != RECORD_MAGIC or end > size:
+                    break
+
+                body = memoryview(mm)[body_start:end]
+                try:
+                    expected = zlib.crc32(body, zlib.crc32(struct.pack("<d", expires_at)))
+                    if crc != expected:
+                        break
+                    key = bytes(body[:key_len]).decode()
+                finally:
+                    body.release()
+
+                if data_len == 0 or expires_at <= now:
+                    # Tombstone or expired clip
+                    index.pop(key, None)
+                else:
+                    index[key] = (body_start + key_len, data_len, expires_at)
+                offset = end
+        finally:
+            mm.close()
+
+        return index, offset
+
+    @staticmethod
+    def _record(key: str, data, expires_at: float) -> list:
+        """Encode one record as buffers ready for ``writelines``."""
+        key_bytes = key.encode()
+        crc = zlib.crc32(data, zlib.crc32(key_bytes, zlib.crc32(struct.pack("<d", expires_at))))
+        header = RECORD_HEADER.pack(RECORD_MAGIC, crc, len(key_bytes), len(data), expires_at)
+        return [header, key_bytes, data]
+
+    def get(self, key: str) -> Optional[memoryview]:
+        """
+        Look up a clip.
+
+        Returns:
+            Zero-copy view of the clip, or None if absent or expired
+        """
+        # Compaction retires (and may close) the old map in its thread, so
+        # the view must be taken before the swap, not between it and close
+        with self._lock:
+            mm, index = self._view
+            location = index.get(key)
+            if location is None or mm is None:
+                self.misses += 1
+                return None
+
+            offset, length, expires_at = location
+            if expires_at <= time.time():
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self._last_access[key] = time.monotonic()
+            return memoryview(mm)[offset:offset + length]
+
+    def put(self, key: str, data, ttl: int) -> bool:
+        """
+        Append a clip.
+
+        Args:
+            key: Cache key
+            data: Audio bytes (any buffer)
+            ttl: Time-to-live in seconds
+
+        Returns:
+            True if the clip was written
+        """
+        if not self._file or not len(data):
+            return False
+
+        expires_at = time.time() + ttl
+        with self._lock:
+            if self._compacting or not self._file:
+                return False
+
+            record = self._record(key, data, expires_at)
+            offset = self._size + RECORD_HEADER.size + len(record[1])
+            end = self._size + sum(len(part) for part in record)
+
+            # Map the new bytes before the index can reference them
+            mm, index = self._view
+            if mm is None or len(mm) < end:
+                self._grow_map(index, end)
+            elif self._retired:
+                self._close_retired()
+
+            self._file.writelines(record)
+            self._file.flush()
+            self._size = end
+            index[key] = (offset, len(data), expires_at)
+            self._last_access[key] = time.monotonic()
+
+        return True
+
+    def delete(self, key: str):
+        """Remove a clip (persisted as a tombstone record)."""
+        if not self._file:
+            return
+
+        with self._lock:
+            _, index = self._view
+            index.pop(key, None)
+            self._last_access.pop(key, None)
+
+            if self._compacting:
+                self._deleted_while_compacting.add(key)
+                return
+
+            self._file.writelines(self._record(key, b"", 0.0))
+            self._file.flush()
+            self._size += RECORD_HEADER.size + len(key.encode())
+
+    def compact(self):
+        """
+        Rewrite the segment with only live, recently used clips.
+
+        Keeps clips in most-recently-used order until
+        ``max_bytes * compact_ratio`` is reached. Safe to run in a thread
+        while the event loop keeps serving reads from the old map.
+        """
+        with self._lock:
+            if self._compacting or not self._file:
+                return
+            self._compacting = True
+            mm, index = self._view
+            snapshot = dict(index)
+            last_access = dict(self._last_access)
+
+        try:
+            now = time.time()
+            budget = int(self.max_bytes * self.compact_ratio)
+            live = [
+                (key, location) for key, location in snapshot.items()
+                if location[2] > now
+            ]
+            # Most recently used first; never-read clips keep append order
+            live.sort(key=lambda item: last_access.get(item[0], 0.0), reverse=True)
+
+            tmp_path = self.path.with_suffix(".seg.tmp")
+            new_index: dict[str, tuple[int, int, float]] = {}
+            written = 0
+            with open(tmp_path, "wb") as out:
+                for key, (offset, length, expires_at) in live:
+                    record = self._record(key, mm[offset:offset + length], expires_at)
+                    record_size = sum(len(part) for part in record)
+                    if written + record_size > budget:
+                        continue
+                    out.writelines(record)
+                    new_index[key] = (written + RECORD_HEADER.size + len(record[1]), length, expires_at)
+                    written += record_size
+                out.flush()
+                os.fsync(out.fileno())
+
+            os.replace(tmp_path, self.path)
+            dir_fd = os.open(self.path.parent, os.O_RDONLY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+
+            with self._lock:
+                old_file = self._file
+                self._file = open(self.path, "r+b")
+                self._file.seek(written)
+                self._size = written
+                for key in self._deleted_while_compacting:
+                    new_index.pop(key, None)
+                self._deleted_while_compacting.clear()
+                self._last_access = {
+                    key: ts for key, ts in dict(self._last_access).items() if key in new_index
+                }
+                self._view = (self._map(self._file), new_index)
+                # Playout may still hold views into the old map
+                if mm is not None:
+                    self._retire(mm)
+                if old_file:
+                    old_file.close()
+
+            dropped = len(snapshot) - len(new_index)
+            self.evictions += dropped
+            logger.info(
+                "TTS disk cache compacted",
+                kept=len(new_index),
+                dropped=dropped,
+                size_bytes=written
+            )
+        except Exception as e:
+            logger.warning("TTS disk cache compaction failed", error=str(e))
+        finally:
+            self._compacting = False
+
+    def stats(self) -> dict:
+        """Local counters for this worker's store."""
+        _, index = self._view
+        return {
+            "entries": len(index),
+            "bytes": sum(location[1] for location in index.values()),
+            "segment_bytes": self._size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions
+        }
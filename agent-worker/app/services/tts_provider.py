@@ -0,0 +1,194 @@
+"""TTS provider interface, registry and latency-aware router."""
+import asyncio
+import time
+from typing import AsyncIterator, Callable, Optional, Protocol, runtime_checkable
+import structlog
+
+from app.config import settings
+from app.services.latency import LatencyTracker
+
+logger = structlog.get_logger()
+
+# Time-to-first-audio and errors per provider name, drives routing
+tts_provider_latency = LatencyTracker()
+
+
+@runtime_checkable
+class TTSProvider(Protocol):
+    """
+    Streaming TTS engine.
+
+    Implementations yield audio in the format they were created with
+    (``output_sample_rate`` / ``output_codec`` factory arguments).
+    """
+
+    voice_id: str
+
+    def stream_tts(
+        self,
+        text: str,
+        speed: float = 1.0,
+        use_cache: bool = True
+    ) -> AsyncIterator[bytes]:
+        ...
+
+    async def synthesize(self, text: str, speed: float = 1.0) -> bytes:
+        ...
+
+    async def close(self) -> None:
+        ...
+
+
+# name -> factory(voice_id=..., model=..., output_sample_rate=..., output_codec=...)
+_providers: dict[str, Callable[..., TTSProvider]] = {}
+
+
+def register_tts_provider(name: str, factory: Callable[..., TTSProvider]):
+    """Register a TTS provider factory under ``name``."""
+    _providers[name] = factory
+
+
+def get_tts_provider_names() -> list[str]:
+    """Names of all registered providers."""
+    return list(_providers)
+
+
+def create_tts_provider(name: str, **kwargs) -> TTSProvider:
+    """
+    Create a provider by name.
+
+    Raises:
+        ValueError: If no provider is registered under ``name``
+    """
+    factory = _providers.get(name)
+    if factory is None:
+        raise ValueError(f"Unknown TTS provider: {name}")
+    return factory(**kwargs)
+
+
+class LocalTTSService:
+    """
+    Local stub provider that streams silence.
+
+    Needs no network or credentials, so it serves as a last-resort
+    fallback and for development. Duration scales with text length.
+    """
+
+    MS_PER_CHAR = 60
+    CHUNK_BYTES = 4096
+
+    def __init__(
+        self,
+        voice_id: str = "mallory",
+        model: Optional[str] = None,
+        output_sample_rate: Optional[int] = None,
+        output_codec: str = "pcm"
+    ):
+        self.voice_id = voice_id
+        self.model = model
+        self.output_sample_rate = output_sample_rate or settings.sample_rate
+        self.output_codec = output_codec
+
+    async def stream_tts(
+        self,
+        text: str,
+        speed: float = 1.0,
+        use_cache: bool = True
+    ) -> AsyncIterator[bytes]:
+        samples = int(self.output_sample_rate * len(text) * self.MS_PER_CHAR / 1000 / speed)
+        if self.output_codec == "mulaw":
+            audio = b"\xff" * samples  # µ-law zero
+        else:
+            audio = bytes(samples * 2)
+        for i in range(0, len(audio), self.CHUNK_BYTES):
+            yield audio[i:i + self.CHUNK_BYTES]
+            await asyncio.sleep(0)
+
+    async def synthesize(self, text: str, speed: float = 1.0) -> bytes:
+        return b"".join([chunk async for chunk in self.stream_tts(text, speed)])
+
+    async def close(self):
+        pass
+
+
+class TTSRouter:
+    """
+    Routes each synthesis to one of several providers.
+
+    Providers are tried in the assistant's preference order, except that
+    degraded ones (error rate or p95 time-to-first-audio over the
+    configured limits, once enough samples exist) move to the back. If a
+    provider fails before producing audio the next one is tried; a
+    failure mid-utterance is raised, since audio cannot be spliced.
+    """
+
+    def __init__(
+        self,
+        providers: dict[str, TTSProvider],
+        latency: Optional[LatencyTracker] = None
+    ):
+        """
+        Initialize router.
+
+        Args:
+            providers: Provider name -> instance, in preference order
+            latency: Stats tracker (defaults to the process-wide one)
+        """
+        if not providers:
+            raise ValueError("TTSRouter needs at least one provider")
+        self.providers = providers
+        self.latency = latency or tts_provider_latency
+        self.voice_id = next(iter(providers.values())).voice_id
+
+    def is_degraded(self, name: str) -> bool:
+        """Whether a provider's recent stats exceed the routing limits."""
+        stats = self.latency.get(name)
+        if stats.count + stats.errors < settings.tts_router_min_samples:
+            return False
+        if stats.error_rate > settings.tts_router_max_error_rate:
+            return True
+        p95 = stats.percentile(95)
+        return p95 is not None and p95 > settings.tts_router_degraded_ttfb_ms
+
+    def ranked(self) -> list[str]:
+        """Provider names in the order they will be tried."""
+        # Stable sort keeps preference order within healthy/degraded
+        return sorted(self.providers, key=self.is_degraded)
+
+    async def stream_tts(
+        self,
+        text: str,
+        speed: float = 1.0,
+        use_cache: bool = True
+    ) -> AsyncIterator[bytes]:
+        last_error: Optional[Exception] = None
+
+        for name in self.ranked():
+            stats = self.latency.get(name)
+            start = time.perf_counter()
+            started = False
+            try:
+                async for chunk in self.providers[name].stream_tts(text, speed, use_cache):
+                    if not started:
+                        started = True
+                        stats.record((time.perf_counter() - start) * 1000)
+                    yield chunk
+                return
+            except Exception as e:
+                stats.record_error()
+                if started:
+                    raise
+                last_error = e
+                logger.warning("TTS provider failed, trying next", provider=name, error=str(e))
+
+        raise last_error
+
+    async def synthesize(self, text: str, speed: float = 1.0) -> bytes:
+        return b"".join([chunk async for chunk in self.stream_tts(text, speed)])
+
+    async def close(self):
+        for provider in self.providers.values():
+            await provider.close()
+
+
+register_tts_provider("local", LocalTTSService)
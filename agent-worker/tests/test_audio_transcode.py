@@ -0,0 +1,107 @@
+"""Tests for audio resampling and µ-law transcoding."""
+import numpy as np
+import pytest
+
+from app.services.audio_transcode import (
+    StreamTranscoder,
+    transcode,
+    pcm16_to_mulaw,
+    mulaw_to_pcm16,
+)
+
+
+def tone(freq: float, rate: int, seconds: float = 0.5, amplitude: float = 10000) -> bytes:
+    """Generate a PCM16 sine tone."""
+    t = np.arange(int(rate * seconds)) / rate
+    return (np.sin(2 * np.pi * freq * t) * amplitude).astype("<i2").tobytes()
+
+
+def rms(pcm: bytes) -> float:
+    samples = np.frombuffer(pcm, dtype="<i2").astype(np.float64)
+    return float(np.sqrt(np.mean(samples ** 2)))
+
+
+class TestMulaw:
+    """Test cases for G.711 µ-law encode/decode."""
+
+    def test_known_codes(self):
+        """Test reference code points."""
+        assert mulaw_to_pcm16(np.array([0xFF, 0x7F, 0x00, 0x80], dtype=np.uint8)).tolist() == [
+            0, 0, -32124, 32124
+        ]
+        assert pcm16_to_mulaw(np.array([0, 32767, -32768], dtype=np.int16)).tolist() == [
+            0xFF, 0x80, 0x00
+        ]
+
+    def test_roundtrip_error_is_within_quantization(self):
+        """Test that decode(encode(x)) stays within the segment step size."""
+        x = np.arange(-32768, 32768, 7, dtype=np.int16)
+        y = mulaw_to_pcm16(pcm16_to_mulaw(x)).astype(np.int32)
+        error = np.abs(y - x.astype(np.int32))
+        # Step size doubles per segment; allow half a step plus clipping headroom
+        assert np.all(error <= np.maximum(np.abs(x.astype(np.int32)) // 16, 8) + 140)
+
+    def test_pcm_to_mulaw_halves_size(self):
+        """Test that µ-law uses one byte per sample."""
+        pcm = tone(440, 8000)
+        assert len(transcode(pcm, 8000, 8000, dst_codec="mulaw")) == len(pcm) // 2
+
+
+class TestResampling:
+    """Test cases for sample-rate conversion."""
+
+    @pytest.mark.parametrize("src,dst", [
+        (16000, 8000), (16000, 48000), (24000, 16000), (48000, 8000), (8000, 16000)
+    ])
+    def test_output_length_preserves_duration(self, src, dst):
+        """Test that the converted clip has the same duration."""
+        pcm = tone(300, src)
+        out = transcode(pcm, src, dst)
+        assert len(out) // 2 == -(-(len(pcm) // 2) * dst // src)
+
+    @pytest.mark.parametrize("src,dst", [(16000, 8000), (8000, 24000), (48000, 16000)])
+    def test_in_band_tone_preserved(self, src, dst):
+        """Test that a tone below both Nyquist limits survives conversion."""
+        out = transcode(tone(440, src), src, dst)
+        expected = np.frombuffer(tone(440, dst), dtype="<i2").astype(np.float64)
+        got = np.frombuffer(out, dtype="<i2").astype(np.float64)[:len(expected)]
+        # Ignore filter edge effects
+        error = got[100:-100] - expected[100:-100]
+        assert np.sqrt(np.mean(error ** 2)) < 0.02 * 10000
+
+    def test_downsampling_suppresses_aliasing(self):
+        """Test that content above the output Nyquist is filtered out."""
+        out = transcode(tone(6000, 16000), 16000, 8000)
+        assert rms(out) < 0.05 * rms(tone(6000, 16000))
+
+    @pytest.mark.parametrize("chunk_bytes", [1, 333, 4096])
+    def test_streaming_matches_whole_clip(self, chunk_bytes):
+        """Test that chunked conversion equals converting the whole clip."""
+        pcm = tone(440, 16000, seconds=0.2)
+        whole = transcode(pcm, 16000, 8000, dst_codec="mulaw")
+
+        transcoder = StreamTranscoder(16000, 8000, dst_codec="mulaw")
+        streamed = b"".join(
+            transcoder.process(pcm[i:i + chunk_bytes])
+            for i in range(0, len(pcm), chunk_bytes)
+        ) + transcoder.flush()
+
+        assert streamed == whole
+
+    def test_mulaw_input_to_wideband_pcm(self):
+        """Test telephony µ-law in, 16kHz PCM out."""
+        mulaw = transcode(tone(440, 8000), 8000, 8000, dst_codec="mulaw")
+        out = transcode(mulaw, 8000, 16000, src_codec="mulaw")
+        assert len(out) == 4 * len(mulaw)
+
+    def test_passthrough(self):
+        """Test identical formats are returned unchanged."""
+        pcm = tone(440, 16000)
+        assert transcode(memoryview(pcm), 16000, 16000) == pcm
+
+    def test_unsupported_format_rejected(self):
+        """Test that unknown rates and codecs raise."""
+        with pytest.raises(ValueError):
+            StreamTranscoder(16000, 11025)
+        with pytest.raises(ValueError):
+            StreamTranscoder(16000, 8000, dst_codec="alaw")
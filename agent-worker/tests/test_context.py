@@ -0,0 +1,172 @@
+"""Tests for the conversation context window."""
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from app.config import settings
+from app.services.context import (
+    ConversationContext,
+    estimate_tokens,
+    llm_summarizer,
+    token_budget_for,
+)
+
+
+def fill(context, turns, words=20):
+    """Add alternating user/assistant turns of ``words`` words."""
+    for i in range(turns):
+        context.add("user" if i % 2 == 0 else "assistant", f"turn{i} " + "word " * words)
+
+
+class TestWindow:
+    """Test cases for budgeted history windows."""
+
+    def test_budget_per_model(self):
+        """Test known model families get their own budget."""
+        assert token_budget_for("groq/llama-3.1-8b-instant") == 3000
+        assert token_budget_for("openai/gpt-4o-mini") == 6000
+        assert token_budget_for("unknown/model") == settings.llm_context_token_budget
+
+    def test_short_history_sent_whole(self):
+        """Test nothing is dropped under budget."""
+        context = ConversationContext("m", budget_tokens=1000)
+        fill(context, 4)
+        assert context.window("You are helpful.") == context.messages
+
+    def test_oldest_dropped_first(self):
+        """Test truncation keeps the newest messages within budget."""
+        context = ConversationContext("m", budget_tokens=200)
+        fill(context, 20)
+        window = context.window("You are helpful.")
+
+        assert window[-1] is context.messages[-1]
+        assert window == context.messages[-len(window):]
+        assert len(window) < 20
+        used = estimate_tokens("You are helpful.") + sum(estimate_tokens(m["content"]) + 4 for m in window)
+        assert used <= 200
+
+    def test_system_prompt_counts_against_budget(self):
+        """Test a long system prompt leaves less room for history."""
+        context = ConversationContext("m", budget_tokens=300)
+        fill(context, 20)
+        assert len(context.window("x" * 800)) < len(context.window("short"))
+
+    def test_latest_message_always_kept(self):
+        """Test an oversized last message is still sent."""
+        context = ConversationContext("m", budget_tokens=10)
+        context.add("user", "word " * 100)
+        assert len(context.window()) == 1
+
+    def test_orphaned_tool_result_dropped(self):
+        """Test the window never starts with a tool result whose call was cut."""
+        context = ConversationContext("m", budget_tokens=60)
+        context.add("user", "word " * 100)
+        context.add_message({
+            "role": "assistant",
+            "content": None,
+            "tool_calls": [{"id": "c1", "type": "function",
+                            "function": {"name": "get_hours", "arguments": "{\"day\": " + "1" * 400 + "}"}}],
+        })
+        context.add_message({"role": "tool", "tool_call_id": "c1", "content": "9-5"})
+        context.add("assistant", "We open at nine.")
+
+        window = context.window()
+        assert [m["role"] for m in window] == ["assistant"]
+
+
+class TestRollingSummary:
+    """Test cases for background summarization."""
+
+    @pytest.mark.asyncio
+    async def test_summary_replaces_oldest_half(self):
+        """Test that older turns are folded into a summary message."""
+        summarizer = AsyncMock(return_value="Caller Ann wants a Tuesday slot.")
+        context = ConversationContext("m", budget_tokens=200, summarizer=summarizer)
+        fill(context, 10)
+        newest = context.messages[-1]
+
+        context.schedule_summary()
+        await context._summary_task
+
+        assert len(context.messages) == 5
+        window = context.window()
+        assert window[0]["role"] == "system"
+        assert "Tuesday" in window[0]["content"]
+        assert window[-1] is newest
+        assert len(summarizer.await_args.args[0]) == 5
+        assert context.history()[0] == window[0]
+        assert len(context.history()) == 6
+
+    @pytest.mark.asyncio
+    async def test_not_triggered_under_threshold(self):
+        """Test no summary is requested while history is small."""
+        summarizer = AsyncMock(return_value="s")
+        context = ConversationContext("m", budget_tokens=5000, summarizer=summarizer)
+        fill(context, 4)
+        context.schedule_summary()
+        assert context._summary_task is None
+
+    @pytest.mark.asyncio
+    async def test_previous_summary_is_rolled_in(self):
+        """Test the next summary sees the earlier one."""
+        summarizer = AsyncMock(side_effect=["first", "second"])
+        context = ConversationContext("m", budget_tokens=150, summarizer=summarizer)
+        fill(context, 10)
+        context.schedule_summary()
+        await context._summary_task
+        fill(context, 10)
+        context.schedule_summary()
+        await context._summary_task
+
+        assert summarizer.await_args.args[0][0]["content"] == "Summary so far: first"
+        assert context.summary == "second"
+
+    @pytest.mark.asyncio
+    async def test_turns_added_during_summary_are_kept(self):
+        """Test that history appended while summarizing is not lost."""
+        release = asyncio.Event()
+
+        async def slow_summary(messages):
+            await release.wait()
+            return "summary"
+
+        context = ConversationContext("m", budget_tokens=200, summarizer=slow_summary)
+        fill(context, 10)
+        context.schedule_summary()
+        context.add("user", "late arrival")
+        release.set()
+        await context._summary_task
+
+        assert context.messages[-1]["content"] == "late arrival"
+        assert len(context.messages) == 6
+
+    @pytest.mark.asyncio
+    async def test_summary_failure_keeps_history(self):
+        """Test a failed summary leaves history untouched."""
+        context = ConversationContext("m", budget_tokens=200, summarizer=AsyncMock(side_effect=RuntimeError))
+        fill(context, 10)
+        context.schedule_summary()
+        await context._summary_task
+        assert len(context.messages) == 10 and context.summary is None
+
+    @pytest.mark.asyncio
+    async def test_disabled_by_setting(self):
+        """Test LLM_SUMMARY_ENABLED=false skips summarization."""
+        context = ConversationContext("m", budget_tokens=200, summarizer=AsyncMock())
+        fill(context, 10)
+        with patch.object(settings, "llm_summary_enabled", False):
+            context.schedule_summary()
+        assert context._summary_task is None
+
+    @pytest.mark.asyncio
+    async def test_llm_summarizer(self):
+        """Test the LLM-backed summarizer joins the streamed reply."""
+        async def stream(**kwargs):
+            for chunk in ("Ann ", "called."):
+                yield chunk
+
+        llm = AsyncMock()
+        llm.stream_completion = lambda **kwargs: stream(**kwargs)
+        summary = await llm_summarizer(llm)([{"role": "user", "content": "hi"}])
+        assert summary == "Ann called."
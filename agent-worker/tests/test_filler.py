@@ -0,0 +1,150 @@
+"""Tests for filler audio during slow responses."""
+import asyncio
+import pytest
+from unittest.mock import AsyncMock
+
+from app.handlers.barge_in import BargeInHandler
+from app.handlers.filler import FillerPlayer
+
+CLIP = b"\x01\x00" * 1600  # 100ms at 16kHz
+
+
+@pytest.fixture
+def played():
+    return []
+
+
+@pytest.fixture
+def barge_in():
+    return BargeInHandler()
+
+
+@pytest.fixture
+def filler(played, barge_in):
+    async def play(chunk):
+        played.append(chunk)
+
+    player = FillerPlayer(
+        play, barge_in, phrases=["One moment please", "Just a second"],
+        threshold_ms=50, enabled=True, chunk_ms=20, sample_rate=16000
+    )
+    player.clips = {"One moment please": CLIP, "Just a second": CLIP}
+    return player
+
+
+@pytest.mark.asyncio
+async def test_fast_response_plays_no_filler(filler, played):
+    filler.start_turn()
+    await asyncio.sleep(0.01)
+    await filler.on_response_audio()
+    await asyncio.sleep(0.08)
+
+    assert played == []
+    assert filler.played == 0
+    assert filler.latency.count == 1
+
+
+@pytest.mark.asyncio
+async def test_slow_response_plays_filler(filler, played):
+    filler.start_turn()
+    await asyncio.sleep(0.2)
+
+    assert filler.played == 1
+    assert b"".join(played) == CLIP
+
+
+@pytest.mark.asyncio
+async def test_threshold_counts_turn_decision_latency(filler, played):
+    """Silence already spent ending the turn counts against the threshold."""
+    filler.start_turn(elapsed_ms=60)
+    await asyncio.sleep(0.005)
+
+    assert filler.played == 1
+
+
+@pytest.mark.asyncio
+async def test_response_audio_fades_filler_out(filler, played):
+    filler.start_turn()
+    await asyncio.sleep(0.08)  # filler started, clip is 100ms
+    await filler.on_response_audio()
+    await asyncio.sleep(0.1)
+
+    assert 0 < len(b"".join(played)) < len(CLIP)
+    assert filler._task is None
+    # The last chunk ramps down to silence instead of cutting off
+    tail = played[-1]
+    assert len(tail) == filler.chunk_bytes
+    assert tail[:2] == b"\x01\x00" and tail[-2:] == b"\x00\x00"
+
+
+@pytest.mark.asyncio
+async def test_filler_is_tracked_as_playback(filler, barge_in):
+    filler.start_turn()
+    await asyncio.sleep(0.07)
+    assert barge_in.is_playing
+
+    # Caller talks over the filler
+    for _ in range(5):
+        barge_in.process_frame(True, 30)
+    assert barge_in.interrupted
+    filler.cancel()
+    assert not barge_in.is_playing
+
+
+@pytest.mark.asyncio
+async def test_filler_end_leaves_response_playback(filler, barge_in):
+    filler.start_turn()
+    await asyncio.sleep(0.07)
+    barge_in.start_playback()  # response started, first audio not yet in
+    await asyncio.sleep(0.1)   # filler clip ends
+
+    assert barge_in.is_playing
+
+
+@pytest.mark.asyncio
+async def test_finished_filler_stops_playback(filler, barge_in):
+    filler.start_turn()
+    await asyncio.sleep(0.2)
+    assert filler.played == 1
+    assert not barge_in.is_playing
+
+
+@pytest.mark.asyncio
+async def test_cancel_before_threshold(filler, played):
+    filler.start_turn()
+    filler.cancel()
+    await asyncio.sleep(0.08)
+
+    assert played == []
+    assert filler.latency.count == 0
+
+
+@pytest.mark.asyncio
+async def test_phrases_rotate(filler, played):
+    filler.clips = {"One moment please": b"\x01\x00", "Just a second": b"\x02\x00"}
+    for _ in range(2):
+        filler.start_turn(elapsed_ms=50)
+        await asyncio.sleep(0.005)
+        filler.cancel()
+    assert played == [b"\x01\x00", b"\x02\x00"]
+
+
+@pytest.mark.asyncio
+async def test_no_clips_or_disabled(played):
+    async def play(chunk):
+        played.append(chunk)
+
+    player = FillerPlayer(play, threshold_ms=10, enabled=False)
+    await player.load(AsyncMock())
+    player.start_turn()
+    await asyncio.sleep(0.03)
+    assert played == [] and player.clips == {}
+
+
+@pytest.mark.asyncio
+async def test_load_skips_failed_phrases(filler):
+    tts = AsyncMock()
+    tts.synthesize = AsyncMock(side_effect=[b"audio", RuntimeError("down")])
+    filler.clips = {}
+    await filler.load(tts)
+    assert filler.clips == {"One moment please": b"audio"}
@@ -0,0 +1,78 @@
+"""Tests for rolling latency statistics."""
+from unittest.mock import patch
+
+from app.services.latency import LatencyStats, LatencyTracker, BUCKET_BOUNDS_MS
+
+
+class TestLatencyStats:
+    """Test cases for LatencyStats."""
+
+    def test_empty(self):
+        """Test that no samples means no percentile."""
+        stats = LatencyStats()
+        assert stats.percentile(95) is None
+        assert stats.error_rate == 0.0
+
+    def test_percentiles_within_bucket_error(self):
+        """Test percentiles resolve to the bucket holding the sample."""
+        stats = LatencyStats()
+        for ms in range(1, 101):
+            stats.record(ms * 10)
+        assert 500 <= stats.percentile(50) < 500 * 1.2
+        assert 950 <= stats.percentile(95) < 950 * 1.2
+        assert stats.count == 100
+
+    def test_outliers_land_in_last_bucket(self):
+        """Test that very slow samples are clamped, not dropped."""
+        stats = LatencyStats()
+        stats.record(10 ** 7)
+        assert stats.percentile(99) == BUCKET_BOUNDS_MS[-1]
+
+    def test_error_rate(self):
+        """Test errors are counted against all requests."""
+        stats = LatencyStats()
+        for _ in range(3):
+            stats.record(100)
+        stats.record_error()
+        assert stats.error_rate == 0.25
+
+    def test_censored_samples_keep_the_tail(self):
+        """Test that abandoned slow requests still raise the percentiles."""
+        stats = LatencyStats()
+        for _ in range(90):
+            stats.record(100)
+        for _ in range(10):
+            stats.record_censored(800)
+        assert stats.percentile(95) >= 800
+
+    def test_old_samples_roll_out(self):
+        """Test that samples older than the window are forgotten."""
+        stats = LatencyStats(window_s=10, slots=5)
+        with patch("app.services.latency.time.monotonic", return_value=1000.0):
+            stats.record(2000)
+            stats.record_error()
+        with patch("app.services.latency.time.monotonic", return_value=1005.0):
+            stats.record(50)
+            assert stats.count == 2
+        with patch("app.services.latency.time.monotonic", return_value=1011.0):
+            assert stats.count == 1
+            assert stats.errors == 0
+            assert stats.percentile(99) < 100
+
+
+class TestLatencyTracker:
+    """Test cases for LatencyTracker."""
+
+    def test_get_creates_once(self):
+        """Test that stats are created per name and reused."""
+        tracker = LatencyTracker()
+        assert tracker.get("a") is tracker.get("a")
+        assert tracker.get("a") is not tracker.get("b")
+
+    def test_snapshot(self):
+        """Test the per-name summary."""
+        tracker = LatencyTracker()
+        tracker.get("minimax").record(120)
+        snapshot = tracker.snapshot()
+        assert snapshot["minimax"]["count"] == 1
+        assert snapshot["minimax"]["p50_ms"] >= 120
@@ -0,0 +1,281 @@
+"""Tests for OpenRouter request building, usage accounting and racing."""
+import asyncio
+import json
+from contextlib import asynccontextmanager
+
+import httpx
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.services.llm import OpenRouterService
+from app.services.llm_stats import LLMStatsStore
+
+LONG_PROMPT = "You are a helpful receptionist. " * 200  # ~1600 tokens
+
+
+async def aiter_lines(lines):
+    for line in lines:
+        yield line
+
+
+def sse(obj):
+    return "data: " + json.dumps(obj)
+
+
+class TestPromptCache:
+    """Test cases for prompt-prefix cache hints."""
+
+    def test_marks_system_prompt_for_anthropic(self):
+        """Test cache_control is added to a long system prompt."""
+        service = OpenRouterService(model="anthropic/claude-3.5-haiku", prompt_cache=True)
+        messages = service._build_messages([{"role": "user", "content": "hi"}], LONG_PROMPT)
+
+        part = messages[0]["content"][0]
+        assert part["text"] == LONG_PROMPT
+        assert part["cache_control"] == {"type": "ephemeral"}
+        assert messages[1] == {"role": "user", "content": "hi"}
+
+    def test_marks_end_of_system_prefix(self):
+        """Test the summary message closing the prefix gets a breakpoint too."""
+        service = OpenRouterService(model="anthropic/claude-3.5-haiku", prompt_cache=True)
+        history = [
+            {"role": "system", "content": "Earlier in this conversation: ..."},
+            {"role": "user", "content": "hi"},
+        ]
+        messages = service._build_messages(history, LONG_PROMPT)
+        assert isinstance(messages[0]["content"], list)
+        assert isinstance(messages[1]["content"], list)
+        assert messages[2]["content"] == "hi"
+
+    def test_short_prompt_not_marked(self):
+        """Test prompts below the provider minimum are sent plain."""
+        service = OpenRouterService(model="anthropic/claude-3.5-haiku", prompt_cache=True)
+        messages = service._build_messages([], "Be brief.")
+        assert messages[0]["content"] == "Be brief."
+
+    def test_automatic_cache_providers_untouched(self):
+        """Test providers with implicit prefix caching get plain strings."""
+        service = OpenRouterService(model="openai/gpt-4o-mini", prompt_cache=True)
+        messages = service._build_messages([], LONG_PROMPT)
+        assert messages[0]["content"] == LONG_PROMPT
+
+    def test_disabled(self):
+        """Test prompt_cache=False sends plain messages."""
+        service = OpenRouterService(model="anthropic/claude-3.5-haiku", prompt_cache=False)
+        assert service._build_messages([], LONG_PROMPT)[0]["content"] == LONG_PROMPT
+
+
+class TestUsage:
+    """Test cases for usage accounting from the stream."""
+
+    @pytest.mark.asyncio
+    async def test_records_cache_tokens_from_final_chunk(self):
+        """Test cache reads/writes are read from the usage chunk."""
+        service = OpenRouterService(model="anthropic/claude-3.5-haiku")
+        lines = [
+            sse({"choices": [{"delta": {"content": "Hi"}}]}),
+            sse({"choices": [], "usage": {
+                "prompt_tokens": 1700,
+                "completion_tokens": 3,
+                "prompt_tokens_details": {"cached_tokens": 1600, "cache_write_tokens": 0},
+            }}),
+            "data: [DONE]",
+        ]
+        response = MagicMock()
+        response.aiter_lines = MagicMock(return_value=aiter_lines(lines))
+        client = MagicMock()
+        client.stream = MagicMock()
+        client.stream.return_value.__aenter__ = AsyncMock(return_value=response)
+        client.stream.return_value.__aexit__ = AsyncMock(return_value=None)
+
+        before = dict(OpenRouterService.usage_totals)
+        with patch.object(OpenRouterService, "get_shared_client", AsyncMock(return_value=client)):
+            text = "".join([c async for c in service.stream_completion([], LONG_PROMPT)])
+
+        assert text == "Hi"
+        assert service.last_usage["cache_read_tokens"] == 1600
+        assert OpenRouterService.usage_totals["cache_read_tokens"] - before["cache_read_tokens"] == 1600
+        payload = client.stream.call_args.kwargs["json"]
+        assert payload["usage"] == {"include": True}
+
+    def test_anthropic_style_fields(self):
+        """Test provider-native cache field names are normalized."""
+        service = OpenRouterService()
+        service._record_usage({
+            "prompt_tokens": 10,
+            "completion_tokens": 2,
+            "cache_read_input_tokens": 0,
+            "cache_creation_input_tokens": 1500,
+        })
+        assert service.last_usage["cache_write_tokens"] == 1500
+
+
+class TestToolCalls:
+    """Test cases for streamed tool calls."""
+
+    @pytest.mark.asyncio
+    async def test_tool_calls_assembled_from_deltas(self):
+        """Test that argument fragments join and each call is yielded once complete."""
+        def part(index, id=None, name=None, arguments=""):
+            function = {"arguments": arguments}
+            if name:
+                function["name"] = name
+            call = {"index": index, "function": function}
+            if id:
+                call["id"] = id
+            return sse({"choices": [{"delta": {"tool_calls": [call]}}]})
+
+        lines = [
+            sse({"choices": [{"delta": {"content": "Checking."}}]}),
+            part(0, "call_a", "get_hours", '{"day": '),
+            part(0, arguments='"monday"}'),
+            part(1, "call_b", "get_weather", "{}"),
+            "data: [DONE]",
+        ]
+        response = MagicMock()
+        response.aiter_lines = MagicMock(return_value=aiter_lines(lines))
+        client = MagicMock()
+        client.stream = MagicMock()
+        client.stream.return_value.__aenter__ = AsyncMock(return_value=response)
+        client.stream.return_value.__aexit__ = AsyncMock(return_value=None)
+
+        tools = [{"type": "function", "function": {"name": "get_hours", "parameters": {}}}]
+        with patch.object(OpenRouterService, "get_shared_client", AsyncMock(return_value=client)):
+            items = [c async for c in OpenRouterService(racing=False).stream_completion([], tools=tools)]
+
+        assert items[0] == "Checking."
+        first, second = items[1:]
+        assert (first.id, first.name, first.parsed_arguments()) == ("call_a", "get_hours", {"day": "monday"})
+        assert (second.id, second.name) == ("call_b", "get_weather")
+        payload = client.stream.call_args.kwargs["json"]
+        assert payload["tools"] == tools and payload["tool_choice"] == "auto"
+
+
+class FakeRouteClient:
+    """Client whose stream() answers per first-choice provider after a delay."""
+
+    def __init__(self, routes):
+        # provider -> (delay, lines or exception)
+        self.routes = routes
+        self.providers = []
+        self.cancelled = []
+
+    @asynccontextmanager
+    async def stream(self, method, url, json=None, **kwargs):
+        provider = json["provider"]["order"][0]
+        self.providers.append(provider)
+        delay, result = self.routes[provider]
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            self.cancelled.append(provider)
+            raise
+        if isinstance(result, Exception):
+            raise result
+        response = MagicMock()
+        response.aiter_lines = MagicMock(return_value=aiter_lines(result))
+        yield response
+
+
+def tokens(*words):
+    return [sse({"choices": [{"delta": {"content": w}}]}) for w in words] + ["data: [DONE]"]
+
+
+class TestRacing:
+    """Test cases for racing a second provider on a slow first token."""
+
+    @pytest.fixture(autouse=True)
+    def race_settings(self):
+        """Short, fixed race delay and clean local stats."""
+        from app.config import settings
+        LLMStatsStore._instance = None
+        stats = LLMStatsStore()
+        with patch.object(settings, "llm_racing_enabled", True), \
+             patch.object(settings, "llm_provider_order", "Groq,Together,OpenAI"), \
+             patch.object(settings, "llm_race_provider", "Together"), \
+             patch.object(settings, "llm_race_model", None), \
+             patch.object(settings, "llm_race_default_ms", 20), \
+             patch.object(settings, "llm_race_min_ms", 10), \
+             patch("app.services.llm.llm_stats", stats):
+            self.stats = stats
+            yield
+
+    async def _collect(self, service, client):
+        with patch.object(OpenRouterService, "get_shared_client", AsyncMock(return_value=client)):
+            return "".join([c async for c in service.stream_completion([], "Be brief.")])
+
+    @pytest.mark.asyncio
+    async def test_fast_primary_is_not_raced(self):
+        """Test that no second request fires when the first token is quick."""
+        client = FakeRouteClient({"Groq": (0, tokens("Hi", "!")), "Together": (0, tokens("Yo"))})
+
+        assert await self._collect(OpenRouterService(), client) == "Hi!"
+        assert client.providers == ["Groq"]
+        assert self.stats.local.get("groq/llama-3.1-8b-instant@Groq").count == 1
+
+    @pytest.mark.asyncio
+    async def test_slow_primary_loses_race(self):
+        """Test that the racing provider wins and the primary is cancelled."""
+        client = FakeRouteClient({"Groq": (1.0, tokens("Hi")), "Together": (0, tokens("Yo"))})
+
+        assert await self._collect(OpenRouterService(), client) == "Yo"
+        assert client.providers == ["Groq", "Together"]
+        await asyncio.sleep(0)
+        assert client.cancelled == ["Groq"]
+
+    @pytest.mark.asyncio
+    async def test_slow_losers_keep_race_threshold(self):
+        """Test that cancelled slow primaries count toward the TTFT tail."""
+        from app.config import settings
+        route = "groq/llama-3.1-8b-instant@Groq"
+        for _ in range(settings.llm_race_min_samples):
+            self.stats.record(route, 30.0)
+        service = OpenRouterService()
+        delay = service._race_delay(route)
+
+        client = FakeRouteClient({"Groq": (1.0, tokens("Hi")), "Together": (0, tokens("Yo"))})
+        for _ in range(settings.llm_race_min_samples):
+            assert await self._collect(service, client) == "Yo"
+        await asyncio.sleep(0)
+
+        # Every loser was abandoned after the delay, so the tail moved up
+        stats = self.stats.local.get(route)
+        assert stats.count == 2 * settings.llm_race_min_samples
+        assert service._race_delay(route) >= delay
+
+    @pytest.mark.asyncio
+    async def test_primary_failure_races_immediately(self):
+        """Test failover to the racing provider without waiting out the delay."""
+        client = FakeRouteClient({
+            "Groq": (0, httpx.ConnectError("refused")),
+            "Together": (0, tokens("Yo")),
+        })
+
+        assert await self._collect(OpenRouterService(), client) == "Yo"
+        assert self.stats.local.get("groq/llama-3.1-8b-instant@Groq").errors == 1
+
+    @pytest.mark.asyncio
+    async def test_disabled_raises_primary_failure(self):
+        """Test that without racing the primary's error propagates."""
+        client = FakeRouteClient({"Groq": (0, httpx.ConnectError("refused"))})
+
+        with pytest.raises(httpx.ConnectError):
+            await self._collect(OpenRouterService(racing=False), client)
+        assert client.providers == ["Groq"]
+
+    @pytest.mark.asyncio
+    async def test_race_model(self):
+        """Test racing a different model on the same provider order."""
+        from app.config import settings
+        with patch.object(settings, "llm_race_model", "openai/gpt-4o-mini"):
+            service = OpenRouterService()
+            assert service._race_route() == ("openai/gpt-4o-mini", ["Groq", "Together", "OpenAI"])
+
+    def test_race_delay_uses_learned_ttft(self):
+        """Test that the race threshold follows the route's TTFT percentile."""
+        from app.config import settings
+        route = "groq/llama-3.1-8b-instant@Groq"
+        for _ in range(settings.llm_race_min_samples):
+            self.stats.record(route, 300.0)
+        delay = OpenRouterService()._race_delay(route)
+        assert 0.3 <= delay <= 0.36
@@ -0,0 +1,113 @@
+"""Tests for shared LLM route stats."""
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from app.services.llm_stats import LLMStatsStore
+
+ROUTE = "groq/llama-3.1-8b-instant@Groq"
+
+
+class FakeRedis:
+    """In-memory hashes with just the pipeline commands the store uses."""
+
+    def __init__(self):
+        self.hashes = {}
+
+    def pipeline(self, transaction=True):
+        ops = []
+        pipe = MagicMock()
+
+        def hincrby(key, field, value):
+            def op():
+                h = self.hashes.setdefault(key, {})
+                h[field] = str(int(h.get(field, 0)) + value)
+            ops.append(op)
+
+        def hincrbyfloat(key, field, value):
+            def op():
+                h = self.hashes.setdefault(key, {})
+                h[field] = str(float(h.get(field, 0)) + value)
+            ops.append(op)
+
+        pipe.hincrby = hincrby
+        pipe.hincrbyfloat = hincrbyfloat
+        pipe.expire = lambda key, ttl: ops.append(lambda: True)
+        pipe.hgetall = lambda key: ops.append(lambda: dict(self.hashes.get(key, {})))
+
+        async def execute():
+            return [op() for op in ops]
+        pipe.execute = execute
+        return pipe
+
+
+@pytest.fixture
+def store():
+    LLMStatsStore._instance = None
+    return LLMStatsStore()
+
+
+def test_local_stats_without_redis(store):
+    for _ in range(5):
+        store.record(ROUTE, 200.0, tokens=50, stream_s=0.5)
+
+    assert store.ttft_percentile(ROUTE, 90, min_samples=5) == pytest.approx(200, rel=0.2)
+    assert store.ttft_percentile(ROUTE, 90, min_samples=10) is None
+    assert store.tokens_per_second(ROUTE) == pytest.approx(100.0)
+
+
+def test_censored_samples_raise_the_tail(store):
+    for _ in range(9):
+        store.record(ROUTE, 100.0)
+    store.record_censored(ROUTE, 900.0)
+    assert store.ttft_percentile(ROUTE, 95) >= 900
+
+
+def test_errors_counted_locally(store):
+    store.record_error(ROUTE)
+    assert store.local.get(ROUTE).errors == 1
+
+
+@pytest.mark.asyncio
+async def test_stats_shared_through_redis(store):
+    redis = FakeRedis()
+    store._client = redis
+    for _ in range(3):
+        store.record(ROUTE, 800.0, tokens=20, stream_s=0.2)
+    await asyncio.gather(*store._pending)
+
+    # A second worker with no local samples sees the first worker's stats
+    LLMStatsStore._instance = None
+    other = LLMStatsStore()
+    other._client = redis
+    await other.refresh(ROUTE)
+
+    assert other.local.get(ROUTE).count == 0
+    assert other.ttft_percentile(ROUTE, 50, min_samples=3) == pytest.approx(800, rel=0.2)
+    assert other.tokens_per_second(ROUTE) == pytest.approx(100.0)
+
+
+@pytest.mark.asyncio
+async def test_stale_view_refreshes_in_background(store):
+    store._client = FakeRedis()
+    store.refresh = AsyncMock()
+
+    assert store.ttft_percentile(ROUTE, 90) is None
+    await asyncio.gather(*store._pending)
+    store.refresh.assert_awaited_once_with(ROUTE)
+
+    # Fresh view: no second refresh
+    store.ttft_percentile(ROUTE, 90)
+    assert store.refresh.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_redis_errors_are_swallowed(store):
+    client = MagicMock()
+    client.pipeline = MagicMock(side_effect=ConnectionError("down"))
+    store._client = client
+
+    store.record(ROUTE, 100.0)
+    await asyncio.gather(*store._pending)
+    await store.refresh(ROUTE)
+    assert store.local.get(ROUTE).count == 1
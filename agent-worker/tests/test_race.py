@@ -0,0 +1,83 @@
+"""Tests for first-to-produce request racing."""
+import asyncio
+
+import pytest
+
+from app.services.race import RaceAttempt, stream_first
+
+
+def runner(items, delay=0.0, error=None, log=None):
+    """Runner that waits ``delay``, then streams ``items`` or fails."""
+    async def run(attempt: RaceAttempt):
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            if log is not None:
+                log.append("cancelled")
+            raise
+        if error is not None:
+            attempt.fail(error)
+            return
+        for item in items:
+            if not attempt.ready.done():
+                attempt.ready.set_result(None)
+            attempt.queue.put_nowait(item)
+        attempt.finish()
+    return run
+
+
+def backup_of(run, reasons):
+    async def backup(reason):
+        reasons.append(reason)
+        return run
+    return backup
+
+
+async def collect(*args, **kwargs):
+    return [item async for item in stream_first(*args, **kwargs)]
+
+
+@pytest.mark.asyncio
+async def test_fast_primary_not_raced():
+    reasons = []
+    items = await collect(runner(["a", "b"]), backup_of(runner(["x"]), reasons), 0.05)
+    assert items == ["a", "b"]
+    assert reasons == []
+
+
+@pytest.mark.asyncio
+async def test_slow_primary_loses_and_is_cancelled():
+    reasons, log = [], []
+    items = await collect(
+        runner(["a"], delay=1.0, log=log), backup_of(runner(["x"]), reasons), 0.01, output="token"
+    )
+    await asyncio.sleep(0)
+    assert items == ["x"]
+    assert reasons == ["no token after 10ms"]
+    assert log == ["cancelled"]
+
+
+@pytest.mark.asyncio
+async def test_primary_failure_races_immediately():
+    reasons = []
+    items = await collect(
+        runner([], error=ConnectionError("refused")), backup_of(runner(["x"]), reasons), 5.0
+    )
+    assert items == ["x"]
+    assert reasons == ["primary failed"]
+
+
+@pytest.mark.asyncio
+async def test_both_failing_raises_last_error():
+    with pytest.raises(TimeoutError):
+        await collect(
+            runner([], error=ConnectionError("refused")),
+            backup_of(runner([], error=TimeoutError("slow")), []),
+            5.0
+        )
+
+
+@pytest.mark.asyncio
+async def test_no_backup_is_a_plain_request():
+    with pytest.raises(ConnectionError):
+        await collect(runner([], delay=0.02, error=ConnectionError("refused")), None, 0.001)
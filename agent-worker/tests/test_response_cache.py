@@ -0,0 +1,165 @@
+"""Tests for the LLM response cache."""
+import asyncio
+import pytest
+from unittest.mock import MagicMock, AsyncMock, patch
+
+from app.config import settings
+from app.services.response_cache import (
+    ResponseCacheService,
+    normalize_utterance,
+    context_hash
+)
+
+
+class FakeRedis:
+    """Just enough of redis.asyncio for the response cache."""
+
+    def __init__(self):
+        self.data = {}
+        self.hashes = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def hgetall(self, key):
+        return {k.encode(): v for k, v in self.hashes.get(key, {}).items()}
+
+    async def delete(self, key):
+        self.hashes.pop(key, None)
+
+    def pipeline(self, transaction=True):
+        ops = []
+        pipe = MagicMock()
+        pipe.set = lambda key, value, ex=None: ops.append(lambda: self.data.__setitem__(key, value.encode()))
+        pipe.hlen = lambda key: ops.append(lambda: len(self.hashes.get(key, {})))
+        pipe.hset = lambda key, field, value: ops.append(
+            lambda: self.hashes.setdefault(key, {}).__setitem__(field, value)
+        )
+        pipe.expire = lambda key, ttl: ops.append(lambda: True)
+
+        async def execute():
+            return [op() for op in ops]
+        pipe.execute = execute
+        return pipe
+
+
+HISTORY = [
+    {"role": "user", "content": "Hi"},
+    {"role": "assistant", "content": "Hello! How can I help?"},
+]
+
+
+@pytest.fixture
+def cache():
+    ResponseCacheService._instance = None
+    service = ResponseCacheService()
+    service._client = FakeRedis()
+    return service
+
+
+def test_normalize_utterance():
+    assert normalize_utterance("Um, what are your HOURS?") == "what are your hours"
+    assert normalize_utterance("  uh what's   the price ") == "what's the price"
+
+
+def test_context_hash_covers_whole_dialogue():
+    other = HISTORY[:1] + [{"role": "assistant", "content": "Anything else?"}]
+    assert context_hash(HISTORY) != context_hash(other)
+    assert context_hash(HISTORY) != context_hash(HISTORY + [{"role": "user", "content": "x"}])
+    assert context_hash(HISTORY) == context_hash([dict(m) for m in HISTORY])
+
+
+def test_only_short_utterances_cacheable(cache):
+    assert cache.cacheable("What are your hours?")
+    assert not cache.cacheable("um")
+    assert not cache.cacheable(" ".join(["word"] * 30))
+
+
+@pytest.mark.asyncio
+async def test_round_trip(cache):
+    sentences = ["We open at nine.", "We close at five."]
+    assert await cache.set("a1", "v1", "What are your hours?", HISTORY, sentences)
+
+    assert await cache.get("a1", "v1", "what are your hours", HISTORY) == sentences
+
+
+@pytest.mark.asyncio
+async def test_key_isolation(cache):
+    await cache.set("a1", "v1", "What are your hours?", HISTORY, ["Nine to five."])
+
+    # Another assistant, an edited config or a different context all miss
+    assert await cache.get("a2", "v1", "What are your hours?", HISTORY) is None
+    assert await cache.get("a1", "v2", "What are your hours?", HISTORY) is None
+    assert await cache.get("a1", "v1", "What are your hours?", []) is None
+
+
+@pytest.mark.asyncio
+async def test_different_earlier_user_turns_miss(cache):
+    """A reply built on one caller's details is not replayed to another."""
+    mine = [
+        {"role": "user", "content": "My name is Ana, booking for Friday"},
+        {"role": "assistant", "content": "Thanks, anything else?"},
+    ]
+    theirs = [
+        {"role": "user", "content": "My name is Ben, booking for Monday"},
+        {"role": "assistant", "content": "Thanks, anything else?"},
+    ]
+    await cache.set("a1", "v1", "Can you confirm that?", mine, ["Ana, Friday at ten."])
+
+    assert await cache.get("a1", "v1", "Can you confirm that?", theirs) is None
+    assert await cache.get("a1", "v1", "Can you confirm that?", mine) == ["Ana, Friday at ten."]
+
+
+@pytest.mark.asyncio
+async def test_empty_response_not_stored(cache):
+    assert not await cache.set("a1", "v1", "Hours?", HISTORY, [])
+
+
+@pytest.mark.asyncio
+async def test_no_client_is_a_miss():
+    ResponseCacheService._instance = None
+    service = ResponseCacheService()
+    service._client = None
+    assert await service.get("a1", "v1", "Hours?", HISTORY) is None
+    assert not await service.set("a1", "v1", "Hours?", HISTORY, ["Nine."])
+
+
+@pytest.mark.asyncio
+async def test_near_duplicate_match(cache):
+    vectors = {
+        "what are your hours": [1.0, 0.0, 0.0],
+        "when are you open": [0.98, 0.2, 0.0],
+        "where are you located": [0.0, 1.0, 0.0],
+    }
+    cache.embedder = AsyncMock(side_effect=lambda text: vectors[text])
+
+    await cache.set("a1", "v1", "What are your hours?", HISTORY, ["Nine to five."])
+
+    assert await cache.get("a1", "v1", "When are you open?", HISTORY) == ["Nine to five."]
+    assert await cache.get("a1", "v1", "Where are you located?", HISTORY) is None
+
+
+@pytest.mark.asyncio
+async def test_slow_embedding_is_a_miss_and_reused_by_set(cache):
+    embedded = asyncio.Event()
+
+    async def slow_embed(text):
+        await embedded.wait()
+        return [1.0, 0.0, 0.0]
+
+    cache.embedder = AsyncMock(side_effect=slow_embed)
+    cache._client.hashes["vox:resp:a1:v1:" + context_hash(HISTORY) + ":vec"] = {"x": b"\0" * 12}
+
+    with patch.object(settings, "response_cache_similarity_timeout_ms", 10):
+        assert await cache.get("a1", "v1", "When are you open?", HISTORY) is None
+
+    # The embedding keeps going and the store after the LLM reply uses it
+    embedded.set()
+    assert await cache.set("a1", "v1", "When are you open?", HISTORY, ["Nine to five."])
+    cache.embedder.assert_awaited_once_with("when are you open")
+
+
+@pytest.mark.asyncio
+async def test_redis_error_is_a_miss(cache):
+    cache._client.get = AsyncMock(side_effect=ConnectionError("down"))
+    assert await cache.get("a1", "v1", "Hours?", HISTORY) is None
@@ -0,0 +1,81 @@
+"""Tests for STT send batching."""
+import asyncio
+
+import pytest
+
+from app.services.stt_batch import AudioCoalescer
+
+FRAME_20MS = bytes(640)  # 20ms at 16kHz PCM16
+
+
+class Recorder:
+    """Send target recording packets."""
+
+    def __init__(self):
+        self.packets = []
+
+    async def __call__(self, packet):
+        self.packets.append(packet)
+
+
+class TestAudioCoalescer:
+    """Test cases for AudioCoalescer."""
+
+    @pytest.mark.asyncio
+    async def test_packs_frames_into_packets(self):
+        """Test that 20ms frames go out as 60ms packets."""
+        sent = Recorder()
+        coalescer = AudioCoalescer(sent, packet_ms=60, sample_rate=16000)
+        for _ in range(6):
+            await coalescer.add(FRAME_20MS)
+
+        assert [len(p) for p in sent.packets] == [1920, 1920]
+        assert coalescer.stats()["frames_per_packet"] == 3
+
+    @pytest.mark.asyncio
+    async def test_flush_sends_partial_packet(self):
+        """Test that speech end does not hold audio back."""
+        sent = Recorder()
+        coalescer = AudioCoalescer(sent, packet_ms=100, sample_rate=16000)
+        await coalescer.add(FRAME_20MS)
+        await coalescer.flush()
+        assert sent.packets == [FRAME_20MS]
+
+        await coalescer.flush()  # nothing buffered
+        assert len(sent.packets) == 1
+
+    @pytest.mark.asyncio
+    async def test_timer_flushes_stalled_packet(self):
+        """Test that a partial packet is sent after packet_ms."""
+        sent = Recorder()
+        coalescer = AudioCoalescer(sent, packet_ms=40, sample_rate=16000)
+        await coalescer.add(FRAME_20MS)
+        assert sent.packets == []
+        await asyncio.sleep(0.08)
+        assert sent.packets == [FRAME_20MS]
+        assert coalescer.delay.count == 1
+        assert coalescer.delay.percentile(50) >= 40
+
+    @pytest.mark.asyncio
+    async def test_order_preserved(self):
+        """Test that packets keep frame order across flush paths."""
+        sent = Recorder()
+        coalescer = AudioCoalescer(sent, packet_ms=40, sample_rate=16000)
+        for i in range(5):
+            await coalescer.add(bytes([i]) * 640)
+        await coalescer.close()
+        assert b"".join(sent.packets) == b"".join(bytes([i]) * 640 for i in range(5))
+
+    def test_packet_size_clamped(self):
+        """Test that packet_ms stays within the 40-100ms range."""
+        assert AudioCoalescer(Recorder(), packet_ms=10).packet_ms == 40
+        assert AudioCoalescer(Recorder(), packet_ms=500).packet_ms == 100
+
+    @pytest.mark.asyncio
+    async def test_disabled_sends_every_frame(self):
+        """Test that packet_ms=0 passes frames straight through."""
+        sent = Recorder()
+        coalescer = AudioCoalescer(sent, packet_ms=0)
+        await coalescer.add(FRAME_20MS)
+        await coalescer.add(FRAME_20MS)
+        assert sent.packets == [FRAME_20MS, FRAME_20MS]
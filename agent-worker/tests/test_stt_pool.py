@@ -0,0 +1,185 @@
+"""Tests for the STT WebSocket connection pool."""
+import asyncio
+import time
+
+import pytest
+from websockets.protocol import State
+
+from app.services.stt_pool import WebSocketPool, _PooledSocket
+
+
+class FakeSocket:
+    """WebSocket stand-in tracking sends and close."""
+
+    def __init__(self):
+        self.state = State.OPEN
+        self.sent = []
+        self.pings = 0
+        self.pong_ok = True
+
+    async def send(self, message):
+        if self.state is not State.OPEN:
+            raise ConnectionError("closed")
+        self.sent.append(message)
+
+    async def ping(self):
+        self.pings += 1
+        future = asyncio.get_running_loop().create_future()
+        if self.pong_ok:
+            future.set_result(None)
+        return future
+
+    async def close(self):
+        self.state = State.CLOSED
+
+
+class Connector:
+    """Connect factory that counts opens and can be made to fail."""
+
+    def __init__(self):
+        self.sockets = []
+        self.fail = False
+
+    async def __call__(self):
+        if self.fail:
+            raise ConnectionError("refused")
+        socket = FakeSocket()
+        self.sockets.append(socket)
+        return socket
+
+
+async def until(predicate, timeout=1.0):
+    """Wait for background tasks to reach a state."""
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out"
+        await asyncio.sleep(0.005)
+
+
+@pytest.fixture
+def connector():
+    return Connector()
+
+
+class TestWebSocketPool:
+    """Test cases for WebSocketPool."""
+
+    @pytest.mark.asyncio
+    async def test_prefills_to_min_size(self, connector):
+        """Test that the pool opens min_size sockets on start."""
+        pool = WebSocketPool(connector, min_size=3, max_size=5)
+        pool.start()
+        await until(lambda: pool.idle == 3)
+        assert pool.metrics()["created"] == 3
+        await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_acquire_refills(self, connector):
+        """Test that handing out a socket triggers a refill."""
+        pool = WebSocketPool(connector, min_size=2, max_size=4)
+        pool.start()
+        await until(lambda: pool.idle == 2)
+
+        socket = await pool.acquire()
+        assert socket in connector.sockets
+        await until(lambda: pool.idle == 2)
+        assert pool.hits == 1 and pool.misses == 0
+        await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_empty_pool_opens_cold(self, connector):
+        """Test that acquire still works when nothing is warm."""
+        pool = WebSocketPool(connector, min_size=0, max_size=2)
+        socket = await pool.acquire()
+        assert socket is connector.sockets[0]
+        assert pool.misses == 1
+
+    @pytest.mark.asyncio
+    async def test_closed_socket_not_handed_out(self, connector):
+        """Test that validation discards sockets the server closed."""
+        pool = WebSocketPool(connector, min_size=0, max_size=2)
+        dead, live = FakeSocket(), FakeSocket()
+        dead.state = State.CLOSED
+        await pool.release(live)
+        pool._idle.appendleft(_PooledSocket(dead))
+
+        assert await pool.acquire() is live
+        assert pool.discarded == 1
+
+    @pytest.mark.asyncio
+    async def test_stale_socket_pinged_before_handout(self, connector):
+        """Test that sockets not confirmed alive recently are pinged."""
+        pool = WebSocketPool(connector, min_size=0, max_size=2, keepalive_interval=1.0)
+        stale, fresh = FakeSocket(), FakeSocket()
+        stale.pong_ok = False
+        await pool.release(stale)
+        await pool.release(fresh)
+        pool._idle[0].last_ok -= 10
+        pool.validate_timeout = 0.01
+
+        assert await pool.acquire() is fresh
+        assert stale.pings == 1
+        assert stale.state is State.CLOSED
+
+    @pytest.mark.asyncio
+    async def test_over_age_socket_recycled(self, connector):
+        """Test that sockets past max_age are not reused."""
+        pool = WebSocketPool(connector, min_size=0, max_size=2, max_age=10)
+        old = FakeSocket()
+        await pool.release(old)
+        pool._idle[0].opened_at -= 20
+
+        assert await pool.acquire() is not old
+        assert old.state is State.CLOSED
+
+    @pytest.mark.asyncio
+    async def test_keepalive_sent_to_idle_sockets(self, connector):
+        """Test that idle sockets get KeepAlive messages."""
+        pool = WebSocketPool(connector, min_size=1, max_size=2, keepalive_interval=0.01)
+        pool.start()
+        await until(lambda: pool.idle == 1 and connector.sockets[0].sent)
+        assert '"KeepAlive"' in connector.sockets[0].sent[0]
+        await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_release_respects_max_size(self, connector):
+        """Test that returned sockets beyond max_size are closed."""
+        pool = WebSocketPool(connector, min_size=0, max_size=1)
+        first, second = FakeSocket(), FakeSocket()
+        assert await pool.release(first)
+        assert not await pool.release(second)
+        assert second.state is State.CLOSED
+
+    @pytest.mark.asyncio
+    async def test_refill_failure_is_counted_and_retried(self, connector):
+        """Test that connect errors are recorded and the pool recovers."""
+        connector.fail = True
+        pool = WebSocketPool(connector, min_size=1, max_size=2)
+        pool.start()
+        await until(lambda: pool.connect_failures >= 1)
+        connector.fail = False
+        await until(lambda: pool.idle == 1, timeout=2.0)
+        await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_close_closes_idle(self, connector):
+        """Test that closing the pool closes every idle socket."""
+        pool = WebSocketPool(connector, min_size=2, max_size=2)
+        pool.start()
+        await until(lambda: pool.idle == 2)
+        await pool.close()
+        assert all(s.state is State.CLOSED for s in connector.sockets)
+
+    @pytest.mark.asyncio
+    async def test_service_exposes_pool_metrics(self, connector):
+        """Test that the Deepgram service reports the running pool's metrics."""
+        from app.services.stt import DeepgramSTTService
+
+        assert DeepgramSTTService.pool_metrics() is None
+        pool = WebSocketPool(connector, min_size=0, max_size=2)
+        DeepgramSTTService._pool = pool
+        try:
+            await pool.acquire()
+            assert DeepgramSTTService.pool_metrics()["misses"] == 1
+        finally:
+            DeepgramSTTService._pool = None
@@ -0,0 +1,196 @@
+"""Tests for the STT provider registry and warm-standby failover."""
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from app.config import settings
+from app.services.stt import DeepgramSTTService, create_stt_service
+from app.services.transcript import Transcript
+from app.services.stt_provider import (
+    STTProvider,
+    FailoverSTTService,
+    LocalSTTService,
+    create_stt_provider,
+    get_stt_provider_names,
+    register_stt_provider,
+)
+
+
+class FakeSTT:
+    """Provider recording sent audio; transcripts are pushed by the test."""
+
+    instances: list["FakeSTT"] = []
+
+    def __init__(self, model=None, language="en-US"):
+        self.sent: list[bytes] = []
+        self.transcripts: asyncio.Queue = asyncio.Queue()
+        self.connected = False
+        self.closed = False
+        self.fail_sends = False
+        self.keepalives = 0
+        FakeSTT.instances.append(self)
+
+    async def connect(self):
+        self.connected = True
+
+    async def send_audio(self, audio_chunk):
+        if self.fail_sends:
+            raise ConnectionError("socket closed")
+        self.sent.append(audio_chunk)
+
+    async def receive_transcripts(self):
+        while True:
+            item = await self.transcripts.get()
+            if item is None:
+                return
+            yield item
+
+    async def keepalive(self):
+        self.keepalives += 1
+
+    async def close(self):
+        self.closed = True
+        self.transcripts.put_nowait(None)
+
+
+@pytest.fixture
+def fake_stt():
+    """Register the fake provider and reset its instance list."""
+    FakeSTT.instances = []
+    register_stt_provider("fake", FakeSTT)
+    return FakeSTT
+
+
+async def warm(service: FailoverSTTService):
+    """Connect and let the standby finish warming."""
+    await service.connect()
+    await asyncio.wait_for(service._standby_task, 1.0)
+
+
+class TestRegistry:
+    """Test cases for provider registration and the factory."""
+
+    def test_builtin_providers_registered(self):
+        """Test that Deepgram and the local stub are available by name."""
+        assert {"deepgram", "local"} <= set(get_stt_provider_names())
+        assert isinstance(create_stt_provider("deepgram"), DeepgramSTTService)
+
+    def test_unknown_provider_raises(self):
+        """Test that an unknown Assistant.stt_provider fails loudly."""
+        with pytest.raises(ValueError):
+            create_stt_provider("nope")
+
+    def test_factory_falls_back_for_unknown_provider(self):
+        """Test that an engine the UI offers but the worker lacks uses the default."""
+        with patch.object(settings, "stt_provider", "local"):
+            service = create_stt_service(provider="whisper", standby_provider="assemblyai")
+        assert isinstance(service, LocalSTTService)
+
+    def test_services_satisfy_protocol(self):
+        """Test that built-in services implement STTProvider."""
+        assert isinstance(DeepgramSTTService(), STTProvider)
+        assert isinstance(LocalSTTService(), STTProvider)
+
+    def test_factory_uses_assistant_provider(self):
+        """Test that the assistant's provider is used without a standby."""
+        assert isinstance(create_stt_service(provider="local", standby_provider=""), LocalSTTService)
+
+    def test_factory_with_standby(self):
+        """Test that a standby wraps the provider in failover."""
+        service = create_stt_service(provider="deepgram", standby_provider="local")
+        assert isinstance(service, FailoverSTTService)
+        assert service.names == {"active": "deepgram", "standby": "local"}
+
+
+class TestFailoverSTTService:
+    """Test cases for warm-standby failover."""
+
+    @pytest.mark.asyncio
+    async def test_standby_warm_but_idle(self, fake_stt):
+        """Test that the standby is connected and sent no audio."""
+        service = FailoverSTTService("fake", "fake")
+        await warm(service)
+        await service.send_audio(b"a" * 320)
+
+        primary, standby = fake_stt.instances
+        assert standby.connected
+        assert primary.sent == [b"a" * 320]
+        assert standby.sent == []
+        await service.close()
+
+    @pytest.mark.asyncio
+    async def test_send_failure_replays_buffer_to_standby(self, fake_stt):
+        """Test that recent audio, including the failed chunk, is replayed."""
+        service = FailoverSTTService("fake", "fake")
+        await warm(service)
+        primary, standby = fake_stt.instances
+
+        await service.send_audio(b"1")
+        await service.send_audio(b"2")
+        primary.fail_sends = True
+        await service.send_audio(b"3")
+
+        assert service.active is standby
+        assert standby.sent == [b"1", b"2", b"3"]
+        assert service.failovers == 1
+
+        await service.send_audio(b"4")
+        assert standby.sent[-1] == b"4"
+        await service.close()
+
+    @pytest.mark.asyncio
+    async def test_replay_buffer_is_bounded(self, fake_stt):
+        """Test that only the last replay_seconds of audio are kept."""
+        service = FailoverSTTService("fake", "fake", replay_seconds=0.01)  # 320 bytes
+        for i in range(10):
+            await service.send_audio(bytes([i]) * 100)
+        assert service._replay.nbytes <= 320
+        assert service._replay.chunks()[-1] == bytes([9]) * 100
+
+    @pytest.mark.asyncio
+    async def test_transcripts_continue_after_stream_drops(self, fake_stt):
+        """Test that a dropped transcript stream fails over transparently."""
+        service = FailoverSTTService("fake", "fake")
+        await warm(service)
+        primary, standby = fake_stt.instances
+        received = []
+
+        async def consume():
+            async for transcript in service.receive_transcripts():
+                received.append(transcript.text)
+                if len(received) == 2:
+                    return
+
+        consumer = asyncio.create_task(consume())
+        primary.transcripts.put_nowait(Transcript("hello", is_final=True))
+        primary.transcripts.put_nowait(None)  # socket dropped
+        await asyncio.sleep(0.01)
+        standby.transcripts.put_nowait(Transcript("again", is_final=True))
+        await asyncio.wait_for(consumer, 1.0)
+
+        assert received == ["hello", "again"]
+        assert service.active is standby
+        assert primary.closed
+        await service.close()
+
+    @pytest.mark.asyncio
+    async def test_new_standby_warmed_after_failover(self, fake_stt):
+        """Test that a replacement standby is opened after promotion."""
+        service = FailoverSTTService("fake", "fake")
+        await warm(service)
+        fake_stt.instances[0].fail_sends = True
+        await service.send_audio(b"x")
+        await asyncio.wait_for(service._standby_task, 1.0)
+
+        assert len(fake_stt.instances) == 3
+        assert service.standby is fake_stt.instances[2]
+        await service.close()
+
+    @pytest.mark.asyncio
+    async def test_close_closes_both(self, fake_stt):
+        """Test that closing tears down active and standby."""
+        service = FailoverSTTService("fake", "fake")
+        await warm(service)
+        await service.close()
+        assert all(p.closed for p in fake_stt.instances)
@@ -0,0 +1,164 @@
+"""Tests for Deepgram STT reconnect and transcript de-duplication."""
+import asyncio
+import json
+
+import pytest
+import websockets
+from unittest.mock import AsyncMock, patch
+
+from app.config import settings
+from app.services.stt import DeepgramSTTService
+
+
+def results(text, start, duration, is_final=True, words=None):
+    """Build a Deepgram Results message."""
+    return json.dumps({
+        "type": "Results",
+        "start": start,
+        "duration": duration,
+        "is_final": is_final,
+        "channel": {"alternatives": [{
+            "transcript": text,
+            "confidence": 0.9,
+            "words": words or [],
+        }]},
+    })
+
+
+def word(text, start):
+    return {"word": text.lower(), "punctuated_word": text, "start": start, "end": start + 0.3}
+
+
+class FakeWebSocket:
+    """Socket whose incoming messages are pushed by the test."""
+
+    def __init__(self):
+        self.sent = []
+        self.incoming: asyncio.Queue = asyncio.Queue()
+        self.dropped = False
+        self.closed = False
+
+    async def send(self, message):
+        if self.dropped:
+            raise websockets.ConnectionClosed(None, None)
+        self.sent.append(message)
+
+    def drop(self):
+        self.dropped = True
+        self.incoming.put_nowait(None)
+
+    async def close(self):
+        self.closed = True
+        self.incoming.put_nowait(None)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        message = await self.incoming.get()
+        if message is None:
+            if self.dropped:
+                raise websockets.ConnectionClosed(None, None)
+            raise StopAsyncIteration
+        return message
+
+
+@pytest.fixture
+def sockets():
+    return [FakeWebSocket(), FakeWebSocket(), FakeWebSocket()]
+
+
+@pytest.fixture
+def service(sockets):
+    """Deepgram service whose connections come from ``sockets``."""
+    stt = DeepgramSTTService(api_key="test")
+    with patch.object(stt, "_open", AsyncMock(side_effect=list(sockets))), \
+         patch.object(settings, "stt_reconnect_base_delay_s", 0.001):
+        yield stt
+
+
+class TestReconnect:
+    """Test cases for transparent reconnect."""
+
+    @pytest.mark.asyncio
+    async def test_send_after_drop_reconnects_and_replays(self, service, sockets):
+        """Test that a failed send reconnects and replays buffered audio."""
+        await service.connect()
+        await service.send_audio(b"a" * 320)
+        sockets[0].dropped = True
+        await service.send_audio(b"b" * 320)
+
+        assert service.websocket is sockets[1]
+        assert sockets[1].sent == [b"a" * 320, b"b" * 320]
+        assert service.reconnects == 1
+        assert sockets[0].closed
+
+    @pytest.mark.asyncio
+    async def test_replay_limited_to_window(self, service, sockets):
+        """Test that only the last stt_replay_seconds of audio is replayed."""
+        await service.connect()
+        second = service.sample_rate * 2
+        for i in range(int(settings.stt_replay_seconds) + 2):
+            await service.send_audio(bytes([i]) * second)
+        sockets[0].dropped = True
+        await service.send_audio(b"")
+
+        replayed = b"".join(sockets[1].sent)
+        assert len(replayed) <= settings.stt_replay_seconds * second
+        assert service._stream_offset == pytest.approx(2.0)
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_attempts(self, service, sockets):
+        """Test that reconnect raises once every attempt has failed."""
+        service._open.side_effect = [sockets[0]] + [OSError("refused")] * settings.stt_reconnect_attempts
+        await service.connect()
+        sockets[0].dropped = True
+        with pytest.raises(ConnectionError):
+            await service.send_audio(b"x")
+
+    @pytest.mark.asyncio
+    async def test_transcripts_resume_without_duplicates(self, service, sockets):
+        """Test that replayed audio does not repeat finalized words."""
+        await service.connect()
+        # 2s of audio sent, replay window keeps all of it
+        await service.send_audio(bytes(service.sample_rate * 2 * 2))
+        received = []
+
+        async def consume():
+            async for transcript in service.receive_transcripts():
+                received.append(transcript)
+                if len(received) == 3:
+                    return
+
+        consumer = asyncio.create_task(consume())
+        sockets[0].incoming.put_nowait(results(
+            "Hello there", 0.0, 1.0, words=[word("Hello", 0.1), word("there", 0.5)]
+        ))
+        sockets[0].drop()
+        await asyncio.sleep(0.01)
+
+        # New connection re-transcribes from stream time 0
+        sockets[1].incoming.put_nowait(results("Hello", 0.0, 0.5, is_final=False))
+        sockets[1].incoming.put_nowait(results(
+            "Hello there how are you", 0.0, 2.0,
+            words=[word("Hello", 0.1), word("there", 0.5), word("how", 1.1), word("are", 1.4), word("you", 1.7)]
+        ))
+        sockets[1].incoming.put_nowait(results("Good", 2.0, 0.5))
+        await asyncio.wait_for(consumer, 1.0)
+
+        assert [t.text for t in received] == ["Hello there", "how are you", "Good"]
+        assert service.reconnects == 1
+
+    @pytest.mark.asyncio
+    async def test_close_ends_stream_without_reconnect(self, service, sockets):
+        """Test that an intentional close is not treated as a drop."""
+        await service.connect()
+        consumer = asyncio.create_task(asyncio.wait_for(_drain(service), 1.0))
+        await asyncio.sleep(0.01)
+        await service.close()
+        await consumer
+        assert service.reconnects == 0
+
+
+async def _drain(service):
+    return [t async for t in service.receive_transcripts()]
@@ -0,0 +1,102 @@
+"""Tests for the tool result cache."""
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from app.config import settings
+from app.services.tool_cache import ToolResultCache, canonical_arguments
+
+
+@pytest.fixture
+def cache():
+    ToolResultCache._instance = None
+    service = ToolResultCache()
+    service._client = None
+    return service
+
+
+def test_canonical_arguments_ignore_order_and_padding():
+    assert canonical_arguments({"b": 1, "a": " x "}) == canonical_arguments({"a": "x", "b": 1})
+    assert canonical_arguments({"a": [" y "]}) == '{"a":["y"]}'
+
+
+def test_key_depends_on_tool_version_and_arguments(cache):
+    key = cache.make_key("t1", "v1", {"day": "mon"})
+    assert key.startswith("vox:tool:t1:v1:")
+    assert key == cache.make_key("t1", "v1", {"day": " mon"})
+    assert key != cache.make_key("t1", "v2", {"day": "mon"})
+    assert key != cache.make_key("t2", "v1", {"day": "mon"})
+    assert key != cache.make_key("t1", "v1", {"day": "tue"})
+
+
+@pytest.mark.asyncio
+async def test_fetch_caches_success(cache):
+    loader = AsyncMock(return_value=("9-5", True))
+
+    first = await cache.fetch("k", 60, loader)
+    second = await cache.fetch("k", 60, loader)
+
+    assert first == ("9-5", True, False)
+    assert second == ("9-5", True, True)
+    loader.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_failures_not_cached(cache):
+    loader = AsyncMock(return_value=('{"error": "HTTP 503"}', False))
+
+    await cache.fetch("k", 60, loader)
+    await cache.fetch("k", 60, loader)
+
+    assert loader.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_calls_share_request(cache):
+    calls = 0
+
+    async def loader():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return "9-5", True
+
+    results = await asyncio.gather(*(cache.fetch("k", 60, loader) for _ in range(5)))
+
+    assert calls == 1
+    assert all(content == "9-5" for content, _, _ in results)
+    assert not cache._inflight
+
+
+@pytest.mark.asyncio
+async def test_hot_tier_expires_and_is_bounded(cache):
+    with patch.object(settings, "tool_cache_hot_max_entries", 2):
+        for key in ("a", "b", "c"):
+            await cache.set(key, key, 60)
+        assert await cache.get("a") is None
+        assert await cache.get("c") == "c"
+
+    with patch.object(settings, "tool_cache_hot_ttl_s", 0):
+        await cache.set("d", "d", 60)
+        assert await cache.get("d") is None
+
+
+@pytest.mark.asyncio
+async def test_redis_tier_fills_hot_tier(cache):
+    client = AsyncMock()
+    client.get = AsyncMock(return_value="from-redis")
+    cache._client = client
+
+    assert await cache.get("k") == "from-redis"
+    assert await cache.get("k") == "from-redis"
+    client.get.assert_awaited_once_with("k")
+
+
+@pytest.mark.asyncio
+async def test_redis_errors_fall_back_to_loader(cache):
+    client = AsyncMock()
+    client.get = AsyncMock(side_effect=ConnectionError("down"))
+    client.set = AsyncMock(side_effect=ConnectionError("down"))
+    cache._client = client
+
+    assert await cache.fetch("k", 60, AsyncMock(return_value=("ok", True))) == ("ok", True, False)
@@ -0,0 +1,213 @@
+"""Tests for the tool executor."""
+import asyncio
+import json
+import time
+
+import httpx
+import pytest
+from unittest.mock import patch
+
+from app.services.llm import ToolCall
+from app.services.tool_cache import ToolResultCache
+from app.services.tools import ToolExecutor, ToolSpec, create_tool_executor
+
+
+def tool_record(name="get_hours", url="https://tools.example/hours", timeout=5, cacheable=False, **extra):
+    return {
+        "id": f"id-{name}",
+        "name": name,
+        "description": "Store hours",
+        "updated_at": "2026-10-01T00:00:00",
+        "server_config": json.dumps({
+            "url": url,
+            "timeoutSeconds": timeout,
+            "credentialId": None,
+            "headers": [{"key": "X-Shop", "value": "42"}],
+            "cacheable": cacheable,
+            "cacheTtlSeconds": 120,
+        }),
+        "mcp_config": json.dumps({"protocol": "shttp"}),
+        "messages": json.dumps([
+            {"trigger": "on_start", "message": "Let me check that for you"},
+            {"trigger": "on_error", "message": "Sorry, I couldn't look that up"},
+        ]),
+        **extra,
+    }
+
+
+@pytest.fixture
+def transport():
+    """Route tool requests to ``transport.handler``."""
+    class Routes:
+        handler = None
+        requests = []
+
+    routes = Routes()
+
+    async def dispatch(request):
+        routes.requests.append(request)
+        return await routes.handler(request)
+
+    ToolExecutor._shared_client = httpx.AsyncClient(transport=httpx.MockTransport(dispatch))
+    yield routes
+    ToolExecutor._shared_client = None
+
+
+def test_spec_from_api():
+    spec = ToolSpec.from_api(tool_record())
+
+    assert spec.url == "https://tools.example/hours"
+    assert spec.timeout_s == 5
+    assert spec.headers == {"X-Shop": "42"}
+    assert spec.messages["on_start"] == "Let me check that for you"
+    assert spec.definition()["function"]["name"] == "get_hours"
+    assert spec.definition()["function"]["parameters"]["type"] == "object"
+
+
+def test_spec_includes_resolved_credentials():
+    spec = ToolSpec.from_api(tool_record(auth_headers={"Authorization": "Bearer t"}))
+
+    assert spec.headers == {"X-Shop": "42", "Authorization": "Bearer t"}
+
+
+def test_create_tool_executor_none_without_tools():
+    assert create_tool_executor(None) is None
+    assert create_tool_executor([]) is None
+    assert create_tool_executor([tool_record()]).message("get_hours", "on_error")
+
+
+@pytest.mark.asyncio
+async def test_successful_call(transport):
+    async def handler(request):
+        return httpx.Response(200, text='{"open": "9-5"}')
+    transport.handler = handler
+    executor = create_tool_executor([tool_record()])
+
+    result = await executor.run(ToolCall("c1", "get_hours", '{"day": "monday"}'))
+
+    assert result.ok
+    assert result.to_message() == {"role": "tool", "tool_call_id": "c1", "content": '{"open": "9-5"}'}
+    request = transport.requests[0]
+    assert json.loads(request.content) == {"day": "monday"}
+    assert request.headers["X-Shop"] == "42"
+
+
+@pytest.mark.asyncio
+async def test_calls_run_concurrently(transport):
+    async def handler(request):
+        await asyncio.sleep(0.1)
+        return httpx.Response(200, text=request.url.path)
+    transport.handler = handler
+    executor = create_tool_executor([
+        tool_record("a", "https://tools.example/a"),
+        tool_record("b", "https://tools.example/b"),
+        tool_record("c", "https://tools.example/c"),
+    ])
+
+    start = time.perf_counter()
+    results = await executor.execute([ToolCall(f"c{n}", n) for n in "abc"])
+
+    assert time.perf_counter() - start < 0.25
+    assert [r.content for r in results] == ["/a", "/b", "/c"]
+
+
+@pytest.mark.asyncio
+async def test_timeout_becomes_error_result(transport):
+    async def handler(request):
+        raise httpx.ReadTimeout("slow", request=request)
+    transport.handler = handler
+    executor = create_tool_executor([tool_record(timeout=1)])
+
+    result = await executor.run(ToolCall("c1", "get_hours"))
+
+    assert not result.ok
+    assert "timed out after 1s" in result.content
+
+
+@pytest.mark.asyncio
+async def test_http_error_status(transport):
+    async def handler(request):
+        return httpx.Response(503, text="down")
+    transport.handler = handler
+    executor = create_tool_executor([tool_record()])
+
+    result = await executor.run(ToolCall("c1", "get_hours"))
+
+    assert not result.ok
+    assert json.loads(result.content) == {"error": "HTTP 503", "body": "down"}
+
+
+@pytest.mark.asyncio
+async def test_unknown_tool():
+    executor = create_tool_executor([tool_record()])
+    result = await executor.run(ToolCall("c1", "delete_everything"))
+    assert not result.ok and "Unknown tool" in result.content
+
+
+def test_argument_parsing():
+    assert ToolCall("c1", "x", "").parsed_arguments() == {}
+    with pytest.raises(ValueError):
+        ToolCall("c1", "x", '{"a": ').parsed_arguments()
+    with pytest.raises(ValueError):
+        ToolCall("c1", "x", "[1, 2]").parsed_arguments()
+
+
+@pytest.mark.asyncio
+async def test_malformed_arguments_not_sent_or_cached(transport):
+    async def handler(request):
+        return httpx.Response(200, text="9-5")
+    transport.handler = handler
+    ToolResultCache._instance = None
+    cache = ToolResultCache()
+    with patch("app.services.tools.tool_cache", cache):
+        executor = create_tool_executor([tool_record(cacheable=True)])
+        result = await executor.run(ToolCall("c1", "get_hours", '{"day": '))
+
+    assert not result.ok and not result.cached
+    assert "Invalid arguments: Expecting value" in json.loads(result.content)["error"]
+    assert transport.requests == []
+    assert cache.misses == 0
+
+
+@pytest.mark.asyncio
+async def test_unexpected_request_error_becomes_result(transport):
+    """Errors outside httpx.HTTPError must not escape into the turn."""
+    async def handler(request):
+        raise httpx.InvalidURL("bad host")
+    transport.handler = handler
+    executor = create_tool_executor([tool_record()])
+
+    result = await executor.run(ToolCall("c1", "get_hours"))
+
+    assert not result.ok
+    assert "bad host" in json.loads(result.content)["error"]
+
+
+@pytest.mark.asyncio
+async def test_cacheable_tool_served_from_cache(transport):
+    async def handler(request):
+        return httpx.Response(200, text="9-5")
+    transport.handler = handler
+    ToolResultCache._instance = None
+    with patch("app.services.tools.tool_cache", ToolResultCache()):
+        executor = create_tool_executor([tool_record(cacheable=True)])
+        first = await executor.run(ToolCall("c1", "get_hours", '{"day": "mon"}'))
+        second = await executor.run(ToolCall("c2", "get_hours", '{ "day": "mon" }'))
+
+    assert (first.cached, second.cached) == (False, True)
+    assert second.to_message()["tool_call_id"] == "c2"
+    assert len(transport.requests) == 1
+    assert executor.tools["get_hours"].cache_ttl == 120
+
+
+@pytest.mark.asyncio
+async def test_non_cacheable_tool_always_called(transport):
+    async def handler(request):
+        return httpx.Response(200, text="ok")
+    transport.handler = handler
+    executor = create_tool_executor([tool_record()])
+
+    for _ in range(2):
+        await executor.run(ToolCall("c1", "get_hours"))
+
+    assert len(transport.requests) == 2
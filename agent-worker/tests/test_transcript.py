@@ -0,0 +1,75 @@
+"""Tests for Deepgram transcript parsing."""
+import json
+
+import pytest
+
+from app.services.transcript import Transcript, TranscriptParser, available_backends
+
+RESULTS = json.dumps({
+    "type": "Results",
+    "channel_index": [0, 1],
+    "duration": 1.2,
+    "start": 3.5,
+    "is_final": True,
+    "speech_final": True,
+    "channel": {"alternatives": [{
+        "transcript": "hello there",
+        "confidence": 0.98,
+        "words": [
+            {"word": "hello", "start": 3.6, "end": 3.9, "confidence": 0.99, "punctuated_word": "Hello"},
+            {"word": "there", "start": 4.0, "end": 4.4, "confidence": 0.97, "punctuated_word": "there."},
+        ],
+    }]},
+    "metadata": {"request_id": "abc", "model_info": {"name": "2-general-nova"}},
+})
+
+
+@pytest.fixture(params=available_backends())
+def backend(request):
+    return request.param
+
+
+class TestTranscriptParser:
+    """Test cases for TranscriptParser across installed backends."""
+
+    def test_parses_results(self, backend):
+        """Test the fields the pipeline reads."""
+        transcript = TranscriptParser(backend=backend).parse(RESULTS)
+        assert isinstance(transcript, Transcript)
+        assert transcript.text == "hello there"
+        assert transcript.is_final is True
+        assert transcript.confidence == pytest.approx(0.98)
+        assert transcript.end == pytest.approx(4.7)
+
+    def test_words_skipped_by_default(self, backend):
+        """Test that word arrays are not decoded unless requested."""
+        assert TranscriptParser(backend=backend).parse(RESULTS).words == []
+
+    def test_words_when_requested(self, backend):
+        """Test word timings when with_words is set."""
+        words = TranscriptParser(with_words=True, backend=backend).parse(RESULTS).words
+        assert [w.punctuated_word for w in words] == ["Hello", "there."]
+        assert words[1].start == pytest.approx(4.0)
+
+    @pytest.mark.parametrize("message", [
+        {"type": "Metadata", "request_id": "abc", "channels": 1},
+        {"type": "SpeechStarted", "channel": [0], "timestamp": 1.0},
+        {"type": "UtteranceEnd", "channel": [0, 1], "last_word_end": 2.1},
+        {"type": "Results", "channel": {"alternatives": []}},
+    ])
+    def test_other_messages_ignored(self, backend, message):
+        """Test that non-transcript messages yield None."""
+        assert TranscriptParser(backend=backend).parse(json.dumps(message)) is None
+
+    def test_accepts_bytes(self, backend):
+        """Test binary frames parse the same as text."""
+        assert TranscriptParser(backend=backend).parse(RESULTS.encode()).text == "hello there"
+
+    def test_unavailable_backend_rejected(self):
+        """Test that forcing a missing backend fails loudly."""
+        with pytest.raises(ValueError):
+            TranscriptParser(backend="simdjson")
+
+    def test_transcript_is_slotted(self):
+        """Test that transcripts carry no per-instance dict."""
+        assert not hasattr(Transcript("hi"), "__dict__")
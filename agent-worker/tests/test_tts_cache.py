@@ -13,6 +13,9 @@ from app.services.tts_cache import (
 )
 
 
+STATS = "vox:tts:g0:mallory:v0:speech-02-turbo:m0:stats"
+
+
 class TestTTSCacheService:
     """Test cases for TTSCacheService."""
 
@@ -59,6 +62,16 @@ class TestTTSCacheService:
         key3 = cache_service._make_key("HELLO WORLD", "mallory", 1.0)
         assert key1 == key2 == key3
 
+    def test_make_key_carries_model_and_format(self, cache_service):
+        """Test that model, sample rate and codec are part of the key."""
+        base = cache_service._make_key("Hello", "mallory", 1.0, model="speech-02-turbo", sample_rate=16000)
+        assert base != cache_service._make_key("Hello", "mallory", 1.0, model="speech-02-hd", sample_rate=16000)
+        assert base != cache_service._make_key("Hello", "mallory", 1.0, model="speech-02-turbo", sample_rate=8000)
+        assert base != cache_service._make_key(
+            "Hello", "mallory", 1.0, model="speech-02-turbo", sample_rate=16000, codec="mulaw"
+        )
+        assert ":speech-02-turbo:" in base and ":16000:pcm:" in base
+
     def test_key_prefix(self, cache_service):
         """Test that cache keys have correct prefix."""
         key = cache_service._make_key("test", "mallory")
@@ -78,80 +91,243 @@ class TestTTSCacheService:
         # Should not raise
         await cache_service.set("Hello", "mallory", b"audio_data")
 
+    @pytest.fixture
+    def mock_client(self, cache_service):
+        """Attach a mocked Redis client whose pipelines record queued commands."""
+        client = AsyncMock()
+        client.hgetall = AsyncMock(return_value={})  # no generations bumped yet
+        client.pipelines = []
+
+        def make_pipeline(transaction=True):
+            pipe = MagicMock()
+            pipe.execute = AsyncMock(return_value=[])
+            client.pipelines.append(pipe)
+            return pipe
+
+        client.pipeline = MagicMock(side_effect=make_pipeline)
+        cache_service._client = client
+        cache_service._generations = {}
+        cache_service._generations_checked_at = 0.0
+        return client
+
+    @staticmethod
+    def _queue_results(client, *results):
+        """Make successive pipelines return the given execute() results."""
+        queued = list(results)
+
+        def make_pipeline(transaction=True):
+            pipe = MagicMock()
+            pipe.execute = AsyncMock(return_value=queued.pop(0) if queued else [])
+            client.pipelines.append(pipe)
+            return pipe
+
+        client.pipeline = MagicMock(side_effect=make_pipeline)
+
     @pytest.mark.asyncio
-    async def test_get_with_mock_client(self, cache_service):
+    async def test_get_with_mock_client(self, cache_service, mock_client):
         """Test get with mocked Redis client."""
-        mock_client = AsyncMock()
-        mock_client.get = AsyncMock(return_value=b"cached_audio_data")
-        cache_service._client = mock_client
+        self._queue_results(mock_client, [b"cached_audio_data", b"17"])
 
         result = await cache_service.get("Hello", "mallory")
+        await asyncio.gather(*cache_service._pending)
+
         assert result == b"cached_audio_data"
-        mock_client.get.assert_called_once()
+        lookup, stats = mock_client.pipelines
+        lookup.get.assert_called_once()
+        stats.hincrby.assert_called_once_with(STATS, "hits", 1)
 
     @pytest.mark.asyncio
-    async def test_get_cache_miss(self, cache_service):
+    async def test_get_cache_miss(self, cache_service, mock_client):
         """Test get when cache entry doesn't exist."""
-        mock_client = AsyncMock()
-        mock_client.get = AsyncMock(return_value=None)
-        cache_service._client = mock_client
+        self._queue_results(mock_client, [None, None])
 
         result = await cache_service.get("New phrase", "mallory")
+        await asyncio.gather(*cache_service._pending)
+
         assert result is None
+        stats = mock_client.pipelines[1]
+        stats.hincrby.assert_called_once_with(STATS, "misses", 1)
+        # Counted under a namespace get_stats can see, with a TTL
+        stats.sadd.assert_called_once_with("vox:tts:g0:namespaces", "mallory|speech-02-turbo")
+        expired = {c.args[0] for c in stats.expire.call_args_list}
+        assert expired == {STATS, "vox:tts:g0:namespaces"}
 
     @pytest.mark.asyncio
-    async def test_set_stores_with_ttl(self, cache_service):
+    async def test_get_counts_eviction_of_indexed_entry(self, cache_service, mock_client):
+        """Test a miss on an indexed entry is reconciled as an eviction."""
+        self._queue_results(mock_client, [None, b"4096"])
+
+        await cache_service.get("Hello", "mallory")
+        await asyncio.gather(*cache_service._pending)
+
+        stats = mock_client.pipelines[1]
+        stats.hdel.assert_called_once()
+        calls = [c.args for c in stats.hincrby.call_args_list]
+        assert (STATS, "entries", -1) in calls
+        assert (STATS, "bytes", -4096) in calls
+        assert (STATS, "evictions", 1) in calls
+
+    @pytest.mark.asyncio
+    async def test_set_stores_with_ttl(self, cache_service, mock_client):
         """Test that set stores data with TTL."""
-        mock_client = AsyncMock()
-        mock_client.setex = AsyncMock()
-        cache_service._client = mock_client
+        self._queue_results(mock_client, [None, True, 1, 1, True, True, True])
 
         await cache_service.set("Hello", "mallory", b"audio_data", ttl=3600)
 
+        write = mock_client.pipelines[0]
         # Verify setex was called with (key, ttl, value)
-        mock_client.setex.assert_called_once()
-        call_args = mock_client.setex.call_args
+        write.setex.assert_called_once()
+        call_args = write.setex.call_args
         # args[0] = key, args[1] = ttl, args[2] = value
         assert call_args[0][1] == 3600  # TTL
         assert call_args[0][2] == b"audio_data"  # value
 
     @pytest.mark.asyncio
-    async def test_invalidate_deletes_key(self, cache_service):
+    async def test_set_maintains_counters(self, cache_service, mock_client):
+        """Test that new entries bump entries/bytes and overwrites only adjust bytes."""
+        self._queue_results(mock_client, [None], [], [b"4"], [])
+
+        await cache_service.set("Hello", "mallory", b"audio_data")
+        await cache_service.set("Hello", "mallory", b"audio")
+
+        first = [c.args for c in mock_client.pipelines[1].hincrby.call_args_list]
+        assert first == [
+            (STATS, "entries", 1),
+            (STATS, "bytes", 10),
+        ]
+        second = [c.args for c in mock_client.pipelines[3].hincrby.call_args_list]
+        assert second == [(STATS, "bytes", 1)]
+
+    @pytest.mark.asyncio
+    async def test_invalidate_deletes_key(self, cache_service, mock_client):
         """Test that invalidate removes cache entry."""
-        mock_client = AsyncMock(spec=redis.Redis)
-        cache_service._client = mock_client
+        self._queue_results(mock_client, [b"10", 1, 1], [])
 
         await cache_service.invalidate("Hello", "mallory")
 
-        mock_client.delete.assert_called_once()
+        mock_client.pipelines[0].delete.assert_called_once()
+        calls = [c.args for c in mock_client.pipelines[1].hincrby.call_args_list]
+        assert (STATS, "entries", -1) in calls
 
     @pytest.mark.asyncio
-    async def test_get_stats(self, cache_service):
-        """Test get_stats returns correct information."""
-        mock_client = AsyncMock()
-        mock_client.scan = AsyncMock(return_value=(0, [b"key1", b"key2", b"key3"]))
-        cache_service._client = mock_client
+    async def test_get_stats(self, cache_service, mock_client):
+        """Test get_stats aggregates maintained counters without scanning."""
+        mock_client.smembers = AsyncMock(return_value={b"mallory|speech-02-turbo", b"wise_male|speech-02-turbo"})
+        self._queue_results(mock_client, [
+            [b"2", b"300", b"8", b"2", None],
+            [b"1", b"100", b"0", b"2", b"1"],
+        ])
 
         stats = await cache_service.get_stats()
 
         assert stats["enabled"] is True
         assert stats["connected"] is True
         assert stats["entries"] == 3
+        assert stats["bytes"] == 400
+        assert stats["hits"] == 8
+        assert stats["misses"] == 4
+        assert stats["evictions"] == 1
+        assert stats["voices"]["mallory"]["entries"] == 2
+        assert stats["models"]["speech-02-turbo"]["entries"] == 3
+        mock_client.scan.assert_not_called()
 
     @pytest.mark.asyncio
-    async def test_clear_all_deletes_entries(self, cache_service):
-        """Test clear_all removes all cache entries."""
-        mock_client = AsyncMock()
-        mock_client.scan = AsyncMock(side_effect=[
-            (3, [b"key1", b"key2"]),
-            (0, [b"key3"])
-        ])
-        mock_client.delete = AsyncMock()
-        cache_service._client = mock_client
+    async def test_clear_all_bumps_generation(self, cache_service, mock_client):
+        """Test clear_all switches namespace instead of deleting entries."""
+        mock_client.hincrby = AsyncMock(return_value=1)
 
         await cache_service.clear_all()
 
-        assert mock_client.delete.call_count == 2
+        mock_client.scan.assert_not_called()
+        mock_client.delete.assert_not_called()
+        mock_client.hincrby.assert_called_once_with("vox:tts:gens", "global", 1)
+        assert cache_service._make_key("Hello", "mallory").startswith("vox:tts:g1:")
+
+    @pytest.mark.asyncio
+    async def test_invalidate_voice_only_moves_that_voice(self, cache_service, mock_client):
+        """Test per-voice invalidation leaves other voices' keys untouched."""
+        mock_client.hincrby = AsyncMock(return_value=3)
+        other_before = cache_service._make_key("Hello", "wise_male")
+
+        await cache_service.invalidate_voice("mallory")
+
+        mock_client.hincrby.assert_called_once_with("vox:tts:gens", "voice:mallory", 1)
+        assert ":mallory:v3:" in cache_service._make_key("Hello", "mallory")
+        assert cache_service._make_key("Hello", "wise_male") == other_before
+
+    @pytest.mark.asyncio
+    async def test_invalidate_model_only_moves_that_model(self, cache_service, mock_client):
+        """Test per-model invalidation leaves other models' keys untouched."""
+        mock_client.hincrby = AsyncMock(return_value=2)
+        other_before = cache_service._make_key("Hello", "mallory", model="speech-02-hd")
+
+        await cache_service.invalidate_model("speech-02-turbo")
+
+        assert ":speech-02-turbo:m2:" in cache_service._make_key("Hello", "mallory", model="speech-02-turbo")
+        assert cache_service._make_key("Hello", "mallory", model="speech-02-hd") == other_before
+
+    @pytest.mark.asyncio
+    async def test_generation_picked_up_from_redis(self, cache_service, mock_client):
+        """Test that another worker's clear is seen on the next refresh."""
+        mock_client.hgetall = AsyncMock(return_value={b"global": b"7", b"voice:mallory": b"2"})
+        self._queue_results(mock_client, [None, None])
+
+        await cache_service.get("Hello", "mallory")
+
+        assert cache_service.generation == 7
+        assert cache_service._make_key("Hello", "mallory").startswith("vox:tts:g7:mallory:v2:")
+
+
+class TestDiskTier:
+    """Test cases for the local disk tier in front of Redis."""
+
+    @pytest.fixture
+    def cache_service(self, tmp_path):
+        """Cache service with a disk tier and a mocked Redis client."""
+        from app.services.tts_disk_cache import TTSDiskCache
+
+        TTSCacheService._instance = None
+        service = TTSCacheService()
+        service._local = TTSDiskCache(str(tmp_path), max_bytes=1024 * 1024)
+        service._local.open()
+        service._client = AsyncMock()
+        service._client.hgetall = AsyncMock(return_value={})
+        service._client.pipeline = MagicMock()
+        yield service
+        service._local.close()
+        service._local = None
+
+    @pytest.mark.asyncio
+    async def test_disk_hit_skips_redis(self, cache_service):
+        """Test that a clip on local disk is served without a Redis lookup."""
+        key = cache_service._make_key("Hello", "mallory")
+        cache_service._local.put(key, b"local_pcm", ttl=60)
+
+        result = await cache_service.get("Hello", "mallory")
+
+        assert bytes(result) == b"local_pcm"
+        cache_service._client.pipeline.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_redis_hit_written_through_to_disk(self, cache_service):
+        """Test that Redis hits populate the disk tier with the remaining TTL."""
+        pipe = MagicMock()
+        pipe.execute = AsyncMock(return_value=[b"redis_pcm", b"9", 120])
+        cache_service._client.pipeline = MagicMock(return_value=pipe)
+
+        await cache_service.get("Hello", "mallory")
+
+        key = cache_service._make_key("Hello", "mallory")
+        assert bytes(cache_service._local.get(key)) == b"redis_pcm"
+
+    @pytest.mark.asyncio
+    async def test_works_without_redis(self, cache_service):
+        """Test that the disk tier keeps serving when Redis is down."""
+        cache_service._client = None
+
+        await cache_service.set("Hello", "mallory", b"pcm")
+
+        assert bytes(await cache_service.get("Hello", "mallory")) == b"pcm"
 
 
 class TestCommonPhrases:
@@ -0,0 +1,248 @@
+"""Tests for the local on-disk TTS clip store."""
+import os
+import threading
+
+import pytest
+
+from app.services.tts_disk_cache import TTSDiskCache, RECORD_HEADER, SEGMENT_NAME
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Open a store in a temp directory."""
+    disk = TTSDiskCache(str(tmp_path), max_bytes=1024 * 1024)
+    disk.open()
+    yield disk
+    disk.close()
+
+
+class TestTTSDiskCache:
+    """Test cases for TTSDiskCache."""
+
+    def test_put_and_get_roundtrip(self, store):
+        """Test that stored clips come back unchanged."""
+        assert store.put("vox:tts:a", b"\x01\x02" * 100, ttl=60)
+        assert bytes(store.get("vox:tts:a")) == b"\x01\x02" * 100
+
+    def test_get_returns_memoryview(self, store):
+        """Test that reads are zero-copy views of the mapped segment."""
+        store.put("vox:tts:a", b"pcm", ttl=60)
+        view = store.get("vox:tts:a")
+        assert isinstance(view, memoryview)
+        assert view.readonly
+
+    def test_get_missing_key(self, store):
+        """Test that unknown keys miss."""
+        assert store.get("vox:tts:nope") is None
+        assert store.misses == 1
+
+    def test_latest_write_wins(self, store):
+        """Test that re-putting a key replaces the clip."""
+        store.put("vox:tts:a", b"old", ttl=60)
+        store.put("vox:tts:a", b"newer", ttl=60)
+        assert bytes(store.get("vox:tts:a")) == b"newer"
+
+    def test_expired_entries_miss(self, store):
+        """Test that clips past their TTL are not served."""
+        store.put("vox:tts:a", b"pcm", ttl=0)
+        assert store.get("vox:tts:a") is None
+
+    def test_views_survive_later_writes(self, store):
+        """Test that a view handed to playout stays valid after remapping."""
+        store.put("vox:tts:a", b"first", ttl=60)
+        view = store.get("vox:tts:a")
+        store.put("vox:tts:b", b"x" * 10000, ttl=60)
+        assert bytes(view) == b"first"
+
+    def test_appends_reuse_one_map(self, store):
+        """Test that puts only remap when the segment outgrows the map."""
+        store.put("vox:tts:a", b"first", ttl=60)
+        mm, _ = store._view
+        capacity = len(mm)
+        for i in range(100):
+            store.put(f"vox:tts:{i}", b"x" * 1000, ttl=60)
+        assert store._view[0] is mm
+
+        store.put("vox:tts:big", b"y" * capacity, ttl=60)
+        assert len(store._view[0]) >= 2 * capacity
+        assert mm.closed
+        assert bytes(store.get("vox:tts:99")) == b"x" * 1000
+
+    def test_replaced_map_closed_once_views_released(self, store):
+        """Test that an outgrown map is closed as soon as no view holds it."""
+        store.put("vox:tts:a", b"first", ttl=60)
+        old, _ = store._view
+        view = store.get("vox:tts:a")
+        store.put("vox:tts:big", b"y" * len(old), ttl=60)
+        assert not old.closed
+        assert bytes(view) == b"first"
+
+        view.release()
+        store.put("vox:tts:b", b"more", ttl=60)
+        assert old.closed
+
+    def test_reserved_space_trimmed_on_close(self, tmp_path):
+        """Test that a cleanly closed segment holds only records."""
+        disk = TTSDiskCache(str(tmp_path), max_bytes=1024 * 1024)
+        disk.open()
+        disk.put("vox:tts:a", b"hello", ttl=60)
+        assert os.path.getsize(tmp_path / SEGMENT_NAME) > disk._size
+        disk.close()
+        assert os.path.getsize(tmp_path / SEGMENT_NAME) == disk._size
+
+    def test_reserved_space_after_crash_is_not_corruption(self, tmp_path):
+        """Test that zeroes left past the data by a crash are dropped quietly."""
+        disk = TTSDiskCache(str(tmp_path), max_bytes=1024 * 1024)
+        disk.open()
+        disk.put("vox:tts:a", b"hello", ttl=60)
+        size = disk._size
+        disk._file.close()  # crash: no close(), reserved space left behind
+
+        reopened = TTSDiskCache(str(tmp_path), max_bytes=1024 * 1024)
+        reopened.open()
+        assert bytes(reopened.get("vox:tts:a")) == b"hello"
+        assert reopened._size == size
+        reopened.put("vox:tts:b", b"after", ttl=60)
+        assert bytes(reopened.get("vox:tts:b")) == b"after"
+        reopened.close()
+
+    def test_index_rebuilt_on_reopen(self, tmp_path):
+        """Test that a restarted worker starts warm."""
+        disk = TTSDiskCache(str(tmp_path), max_bytes=1024 * 1024)
+        disk.open()
+        disk.put("vox:tts:a", b"hello", ttl=60)
+        disk.put("vox:tts:b", b"world", ttl=60)
+        disk.delete("vox:tts:b")
+        disk.close()
+
+        reopened = TTSDiskCache(str(tmp_path), max_bytes=1024 * 1024)
+        reopened.open()
+        assert bytes(reopened.get("vox:tts:a")) == b"hello"
+        assert reopened.get("vox:tts:b") is None
+        reopened.close()
+
+    def test_torn_tail_is_truncated(self, tmp_path):
+        """Test that a partially written record from a crash is dropped."""
+        disk = TTSDiskCache(str(tmp_path), max_bytes=1024 * 1024)
+        disk.open()
+        disk.put("vox:tts:a", b"complete", ttl=60)
+        disk.put("vox:tts:b", b"torn" * 50, ttl=60)
+        disk.close()
+
+        path = tmp_path / SEGMENT_NAME
+        with open(path, "r+b") as f:
+            f.truncate(os.path.getsize(path) - 10)
+
+        reopened = TTSDiskCache(str(tmp_path), max_bytes=1024 * 1024)
+        reopened.open()
+        assert bytes(reopened.get("vox:tts:a")) == b"complete"
+        assert reopened.get("vox:tts:b") is None
+
+        # Appends continue from the last valid record
+        reopened.put("vox:tts:c", b"after", ttl=60)
+        reopened.close()
+        again = TTSDiskCache(str(tmp_path), max_bytes=1024 * 1024)
+        again.open()
+        assert bytes(again.get("vox:tts:c")) == b"after"
+        again.close()
+
+    def test_corrupt_record_stops_rebuild(self, tmp_path):
+        """Test that a CRC mismatch is treated as the end of valid data."""
+        disk = TTSDiskCache(str(tmp_path), max_bytes=1024 * 1024)
+        disk.open()
+        disk.put("vox:tts:a", b"good", ttl=60)
+        first_end = disk._size
+        disk.put("vox:tts:b", b"flipped", ttl=60)
+        disk.close()
+
+        path = tmp_path / SEGMENT_NAME
+        with open(path, "r+b") as f:
+            f.seek(first_end + RECORD_HEADER.size + len("vox:tts:b"))
+            f.write(b"X")
+
+        reopened = TTSDiskCache(str(tmp_path), max_bytes=1024 * 1024)
+        reopened.open()
+        assert bytes(reopened.get("vox:tts:a")) == b"good"
+        assert reopened.get("vox:tts:b") is None
+        assert os.path.getsize(path) == first_end
+        reopened.close()
+
+    def test_compaction_bounds_size_and_keeps_hot_clips(self, tmp_path):
+        """Test that compaction drops cold clips and shrinks the segment."""
+        disk = TTSDiskCache(str(tmp_path), max_bytes=4000, compact_ratio=0.5)
+        disk.open()
+        for i in range(8):
+            disk.put(f"vox:tts:{i}", bytes([i]) * 500, ttl=60)
+        disk.get("vox:tts:0")  # recently used
+        assert disk.needs_compaction
+
+        disk.compact()
+
+        assert disk._size <= 2000
+        assert os.path.getsize(tmp_path / SEGMENT_NAME) == disk._size
+        assert bytes(disk.get("vox:tts:0")) == bytes([0]) * 500
+        assert disk.stats()["entries"] < 8
+        assert disk.evictions > 0
+        assert not disk.needs_compaction
+
+        # Compacted segment is a valid segment
+        disk.close()
+        reopened = TTSDiskCache(str(tmp_path), max_bytes=4000)
+        reopened.open()
+        assert bytes(reopened.get("vox:tts:0")) == bytes([0]) * 500
+        reopened.close()
+
+    def test_compaction_drops_expired(self, store):
+        """Test that expired clips are not carried into the new segment."""
+        store.put("vox:tts:old", b"x" * 100, ttl=0)
+        store.put("vox:tts:live", b"y" * 100, ttl=60)
+        store.compact()
+        assert store.stats()["entries"] == 1
+
+    def test_reads_during_compaction_never_see_closed_map(self, tmp_path):
+        """Test that gets racing a threaded compaction hit, not fail."""
+        disk = TTSDiskCache(str(tmp_path), max_bytes=1024 * 1024, compact_ratio=1.0)
+        disk.open()
+        for i in range(50):
+            disk.put(f"vox:tts:{i}", bytes([i]) * 1000, ttl=60)
+
+        errors = []
+
+        def compact_repeatedly():
+            for _ in range(20):
+                disk.compact()
+
+        compactor = threading.Thread(target=compact_repeatedly)
+        compactor.start()
+        while compactor.is_alive():
+            for i in range(50):
+                try:
+                    view = disk.get(f"vox:tts:{i}")
+                    if view is None:
+                        errors.append(f"miss {i}")
+                    else:
+                        assert bytes(view[:1]) == bytes([i])
+                        view.release()
+                except ValueError as e:
+                    errors.append(str(e))
+        compactor.join()
+
+        assert errors == []
+        disk.close()
+
+    def test_writes_dropped_while_compacting(self, store):
+        """Test that puts during a compaction are skipped, not blocked."""
+        store._compacting = True
+        assert store.put("vox:tts:a", b"pcm", ttl=60) is False
+        store._compacting = False
+
+    def test_stats(self, store):
+        """Test local counters."""
+        store.put("vox:tts:a", b"1234", ttl=60)
+        store.get("vox:tts:a")
+        store.get("vox:tts:b")
+        stats = store.stats()
+        assert stats["entries"] == 1
+        assert stats["bytes"] == 4
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
@@ -0,0 +1,179 @@
+"""Tests for the TTS provider registry and router."""
+from unittest.mock import patch
+
+import pytest
+
+from app.config import settings
+from app.services.latency import LatencyTracker
+from app.services.tts import MinimaxTTSService, create_tts_service
+from app.services.tts_provider import (
+    TTSProvider,
+    TTSRouter,
+    LocalTTSService,
+    create_tts_provider,
+    get_tts_provider_names,
+    register_tts_provider,
+)
+
+
+class FakeProvider:
+    """Provider that yields fixed chunks or fails after ``fail_after`` chunks."""
+
+    def __init__(self, chunks, fail_after=None, voice_id="mallory"):
+        self.voice_id = voice_id
+        self.chunks = chunks
+        self.fail_after = fail_after
+        self.calls = 0
+        self.closed = False
+
+    async def stream_tts(self, text, speed=1.0, use_cache=True):
+        self.calls += 1
+        for i, chunk in enumerate(self.chunks):
+            if i == self.fail_after:
+                raise RuntimeError("provider down")
+            yield chunk
+        if self.fail_after is not None and self.fail_after >= len(self.chunks):
+            raise RuntimeError("provider down")
+
+    async def synthesize(self, text, speed=1.0):
+        return b"".join(self.chunks)
+
+    async def close(self):
+        self.closed = True
+
+
+async def collect(provider, text="Hello"):
+    return b"".join([chunk async for chunk in provider.stream_tts(text)])
+
+
+class TestRegistry:
+    """Test cases for provider registration and the factory."""
+
+    def test_builtin_providers_registered(self):
+        """Test that Minimax and the local stub are available by name."""
+        assert {"minimax", "local"} <= set(get_tts_provider_names())
+        assert isinstance(create_tts_provider("minimax", voice_id="mallory"), MinimaxTTSService)
+
+    def test_unknown_provider_raises(self):
+        """Test that a typo in config fails loudly."""
+        with pytest.raises(ValueError):
+            create_tts_provider("nope", voice_id="mallory")
+
+    def test_custom_provider(self):
+        """Test registering a new engine."""
+        register_tts_provider("fake", lambda **kwargs: FakeProvider([b"x"], voice_id=kwargs["voice_id"]))
+        assert create_tts_provider("fake", voice_id="v").voice_id == "v"
+
+    def test_services_satisfy_protocol(self):
+        """Test that built-in services implement TTSProvider."""
+        assert isinstance(MinimaxTTSService(), TTSProvider)
+        assert isinstance(LocalTTSService(), TTSProvider)
+
+    def test_factory_single_provider_is_unwrapped(self):
+        """Test that no router is added without fallbacks."""
+        service = create_tts_service("mallory", fallback_providers=[])
+        assert isinstance(service, MinimaxTTSService)
+
+    def test_factory_builds_router_in_preference_order(self):
+        """Test the assistant's provider comes first, then fallbacks."""
+        service = create_tts_service("mallory", provider="local", fallback_providers=["minimax", "local"])
+        assert isinstance(service, TTSRouter)
+        assert list(service.providers) == ["local", "minimax"]
+
+    def test_factory_unknown_provider_uses_default(self):
+        """Test that a bad assistant config falls back instead of failing the call."""
+        with patch.object(settings, "tts_provider", "local"):
+            service = create_tts_service("mallory", provider="nope", fallback_providers=["nope2"])
+        assert isinstance(service, LocalTTSService)
+
+
+class TestLocalTTSService:
+    """Test cases for the local stub provider."""
+
+    @pytest.mark.asyncio
+    async def test_streams_silence_scaled_to_text(self):
+        """Test duration tracks text length in the requested format."""
+        pcm = await collect(LocalTTSService(output_sample_rate=16000), "x" * 10)
+        assert len(pcm) == 16000 * 0.6 * 2
+        assert set(pcm) == {0}
+
+        mulaw = await collect(LocalTTSService(output_sample_rate=8000, output_codec="mulaw"), "x" * 10)
+        assert len(mulaw) == 8000 * 0.6
+        assert set(mulaw) == {0xFF}
+
+
+class TestTTSRouter:
+    """Test cases for latency/error based routing."""
+
+    @pytest.fixture
+    def tracker(self):
+        return LatencyTracker()
+
+    @pytest.mark.asyncio
+    async def test_uses_preferred_provider(self, tracker):
+        """Test that a healthy preferred provider is used."""
+        primary, backup = FakeProvider([b"a", b"b"]), FakeProvider([b"z"])
+        router = TTSRouter({"primary": primary, "backup": backup}, latency=tracker)
+
+        assert await collect(router) == b"ab"
+        assert backup.calls == 0
+        assert tracker.get("primary").count == 1
+
+    @pytest.mark.asyncio
+    async def test_fails_over_before_first_chunk(self, tracker):
+        """Test that an up-front failure moves to the next provider."""
+        primary, backup = FakeProvider([b"a"], fail_after=0), FakeProvider([b"z"])
+        router = TTSRouter({"primary": primary, "backup": backup}, latency=tracker)
+
+        assert await collect(router) == b"z"
+        assert tracker.get("primary").errors == 1
+
+    @pytest.mark.asyncio
+    async def test_mid_stream_failure_raises(self, tracker):
+        """Test that audio is never spliced across providers."""
+        primary, backup = FakeProvider([b"a", b"b"], fail_after=1), FakeProvider([b"z"])
+        router = TTSRouter({"primary": primary, "backup": backup}, latency=tracker)
+
+        with pytest.raises(RuntimeError):
+            await collect(router)
+        assert backup.calls == 0
+
+    @pytest.mark.asyncio
+    async def test_all_failing_raises_last_error(self, tracker):
+        """Test that the error surfaces when no provider works."""
+        router = TTSRouter({
+            "primary": FakeProvider([b"a"], fail_after=0),
+            "backup": FakeProvider([b"z"], fail_after=0),
+        }, latency=tracker)
+
+        with pytest.raises(RuntimeError):
+            await collect(router)
+
+    def test_error_prone_provider_routed_around(self, tracker):
+        """Test that a high error rate demotes a provider."""
+        router = TTSRouter({"primary": FakeProvider([]), "backup": FakeProvider([])}, latency=tracker)
+        for _ in range(10):
+            tracker.get("primary").record_error()
+        assert router.ranked() == ["backup", "primary"]
+
+    def test_slow_provider_routed_around(self, tracker):
+        """Test that a high p95 time-to-first-audio demotes a provider."""
+        from app.config import settings
+        router = TTSRouter({"primary": FakeProvider([]), "backup": FakeProvider([])}, latency=tracker)
+        for _ in range(settings.tts_router_min_samples):
+            tracker.get("primary").record(settings.tts_router_degraded_ttfb_ms * 2)
+            tracker.get("backup").record(100)
+        assert router.ranked() == ["backup", "primary"]
+
+    def test_too_few_samples_keeps_preference(self, tracker):
+        """Test that one bad request does not cause a failover."""
+        router = TTSRouter({"primary": FakeProvider([]), "backup": FakeProvider([])}, latency=tracker)
+        tracker.get("primary").record_error()
+        assert router.ranked() == ["primary", "backup"]
+
+    @pytest.mark.asyncio
+    async def test_close_closes_all(self, tracker):
+        """Test that closing the router closes every provider."""
+        providers = {"primary": FakeProvider([]), "backup": FakeProvider([])}
+        await TTSRouter(providers, latency=tracker).close()
+        assert all(p.closed for p in providers.values())
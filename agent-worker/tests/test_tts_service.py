@@ -1,9 +1,13 @@
 """Tests for TTS service with caching integration."""
+import asyncio
+from contextlib import asynccontextmanager
+
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 import httpx
 
 from app.services.tts import MinimaxTTSService, create_tts_service
+from app.services.latency import LatencyTracker
 
 
 async def mock_aiter_bytes(chunks):
@@ -25,6 +29,16 @@ class TestMinimaxTTSServiceWithCache:
         service = create_tts_service("wise_male")
         assert service.voice_id == "wise_male"
 
+    def test_create_tts_service_with_model(self):
+        """Test factory passes the assistant's TTS model through."""
+        service = create_tts_service("wise_male", model="speech-02-hd")
+        assert service.model == "speech-02-hd"
+
+    def test_default_model_from_settings(self, tts_service):
+        """Test the default model is configurable rather than hardcoded."""
+        from app.config import settings
+        assert tts_service.model == settings.tts_model
+
     @pytest.mark.asyncio
     async def test_stream_tts_checks_cache_first(self, tts_service):
         """Test that stream_tts checks cache before API call."""
@@ -38,7 +52,12 @@ class TestMinimaxTTSServiceWithCache:
 
             # Should get cached data
             assert b"".join(chunks) == b"cached_pcm_audio"
-            mock_cache.get.assert_called_once_with("Hello", "mallory", 1.0)
+            mock_cache.get.assert_called_once_with(
+                "Hello", "mallory", 1.0,
+                model=tts_service.model,
+                sample_rate=tts_service.sample_rate,
+                codec="pcm"
+            )
 
     @pytest.mark.asyncio
     async def test_stream_tts_caches_result(self, tts_service):
@@ -73,6 +92,11 @@ class TestMinimaxTTSServiceWithCache:
             assert call_args[0][0] == "Hello"
             assert call_args[0][1] == "mallory"
             assert call_args[0][2] == b"chunk1chunk2"
+            assert call_args[1]["model"] == tts_service.model
+
+            # The request uses the same model the audio is cached under
+            payload = mock_client.stream.call_args[1]["json"]
+            assert payload["model"] == tts_service.model
 
     @pytest.mark.asyncio
     async def test_stream_tts_skips_cache_when_disabled(self, tts_service):
@@ -102,6 +126,24 @@ class TestMinimaxTTSServiceWithCache:
             # Cache should not be checked
             mock_cache.get.assert_not_called()
 
+    @pytest.mark.asyncio
+    async def test_stream_tts_converts_canonical_clip(self):
+        """Test that a telephony leg gets 8kHz µ-law from the canonical cached clip."""
+        service = MinimaxTTSService(voice_id="mallory", output_sample_rate=8000, output_codec="mulaw")
+        canonical = b"\x10\x00" * service.sample_rate  # one second of PCM16
+
+        with patch('app.services.tts.tts_cache') as mock_cache:
+            mock_cache.get = AsyncMock(return_value=canonical)
+
+            chunks = []
+            async for chunk in service.stream_tts("Hello"):
+                chunks.append(chunk)
+
+            # Looked up under the canonical format, one byte per 8kHz sample out
+            assert mock_cache.get.call_args[1]["sample_rate"] == service.sample_rate
+            assert mock_cache.get.call_args[1]["codec"] == "pcm"
+            assert len(b"".join(chunks)) == 8000
+
     @pytest.mark.asyncio
     async def test_synthesize_uses_stream_tts(self, tts_service):
         """Test that synthesize uses stream_tts internally."""
@@ -142,3 +184,129 @@ class TestSharedClient:
 
         await MinimaxTTSService.close_shared_client()
         assert MinimaxTTSService._shared_client is None
+
+
+class FakeStreamClient:
+    """Client whose stream() waits ``delay`` seconds, then yields or fails."""
+
+    def __init__(self, chunks=None, delay=0.0, error=None):
+        self.chunks = chunks or []
+        self.delay = delay
+        self.error = error
+        self.urls = []
+        self.cancelled = False
+
+    @asynccontextmanager
+    async def stream(self, method, url, **kwargs):
+        self.urls.append(url)
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if self.error:
+            raise self.error
+        response = MagicMock()
+        response.aiter_bytes = MagicMock(return_value=mock_aiter_bytes(self.chunks))
+        yield response
+
+
+class TestHedging:
+    """Test cases for hedged Minimax requests."""
+
+    @pytest.fixture(autouse=True)
+    def hedge_settings(self):
+        """Short, fixed hedge delay and a clean latency tracker."""
+        from app.config import settings
+        with patch.object(settings, "tts_hedging_enabled", True), \
+             patch.object(settings, "tts_hedge_default_ms", 20), \
+             patch.object(settings, "tts_hedge_min_ms", 10), \
+             patch.object(settings, "minimax_fallback_base_url", "https://fallback.example"), \
+             patch("app.services.tts.tts_latency", LatencyTracker()), \
+             patch("app.services.tts.tts_cache") as mock_cache:
+            mock_cache.get = AsyncMock(return_value=None)
+            mock_cache.set = AsyncMock(return_value=True)
+            yield
+
+    async def _collect(self, service, primary, hedge):
+        with patch.object(MinimaxTTSService, "get_shared_client",
+                          AsyncMock(side_effect=[primary, hedge])):
+            return b"".join([chunk async for chunk in service.stream_tts("Hello")])
+
+    @pytest.mark.asyncio
+    async def test_fast_primary_is_not_hedged(self):
+        """Test that no second request fires when the first byte is quick."""
+        primary = FakeStreamClient([b"primary"])
+        hedge = FakeStreamClient([b"hedge"])
+
+        audio = await self._collect(MinimaxTTSService(voice_id="mallory"), primary, hedge)
+
+        assert audio == b"primary"
+        assert hedge.urls == []
+
+    @pytest.mark.asyncio
+    async def test_slow_primary_loses_to_hedge(self):
+        """Test that the hedge wins a slow first byte and the primary is cancelled."""
+        primary = FakeStreamClient([b"primary"], delay=1.0)
+        hedge = FakeStreamClient([b"hedge"])
+
+        audio = await self._collect(MinimaxTTSService(voice_id="mallory"), primary, hedge)
+
+        assert audio == b"hedge"
+        assert hedge.urls[0].startswith("https://fallback.example/")
+        await asyncio.sleep(0)
+        assert primary.cancelled
+
+    @pytest.mark.asyncio
+    async def test_cancelled_primary_recorded_as_censored_ttfb(self):
+        """Test that the slow loser's wait still counts toward the TTFB tail."""
+        from app.services import tts
+        primary = FakeStreamClient([b"primary"], delay=1.0)
+        hedge = FakeStreamClient([b"hedge"])
+        service = MinimaxTTSService(voice_id="mallory")
+
+        await self._collect(service, primary, hedge)
+        await asyncio.sleep(0)
+
+        primary_stats = tts.tts_latency.get(service.base_url)
+        assert primary_stats.count == 1
+        assert primary_stats.percentile(50) >= 20  # at least the hedge delay
+        assert tts.tts_latency.get("https://fallback.example").count == 1
+
+    @pytest.mark.asyncio
+    async def test_primary_failure_hedges_immediately(self):
+        """Test failover without waiting out the hedge delay."""
+        primary = FakeStreamClient(error=httpx.ConnectError("refused"))
+        hedge = FakeStreamClient([b"hedge"])
+
+        service = MinimaxTTSService(voice_id="mallory")
+        audio = await self._collect(service, primary, hedge)
+
+        assert audio == b"hedge"
+        from app.services import tts
+        assert tts.tts_latency.get(service.base_url).errors == 1
+
+    @pytest.mark.asyncio
+    async def test_both_failing_raises(self):
+        """Test that the error surfaces when every attempt fails."""
+        primary = FakeStreamClient(error=httpx.ConnectError("refused"))
+        hedge = FakeStreamClient(error=httpx.ConnectError("also refused"))
+
+        with pytest.raises(httpx.ConnectError):
+            await self._collect(MinimaxTTSService(voice_id="mallory"), primary, hedge)
+
+    def test_hedge_delay_learned_from_ttfb(self):
+        """Test that the threshold follows the endpoint's p95 TTFB, clamped."""
+        from app.services import tts
+        service = MinimaxTTSService(voice_id="mallory")
+        assert service._hedge_delay(service.base_url) == pytest.approx(0.020)
+
+        stats = tts.tts_latency.get(service.base_url)
+        for _ in range(MinimaxTTSService.HEDGE_MIN_SAMPLES):
+            stats.record(300)
+        assert 0.300 <= service._hedge_delay(service.base_url) < 0.360
+
+        for _ in range(100):
+            stats.record(60000)
+        from app.config import settings
+        assert service._hedge_delay(service.base_url) == settings.tts_hedge_max_ms / 1000
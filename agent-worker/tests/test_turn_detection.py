@@ -0,0 +1,165 @@
+"""Tests for turn detection."""
+import pytest
+
+from app.handlers.turn_detection import TurnDetector
+from app.services.transcript import Transcript
+
+
+class Clock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def detector(clock):
+    return TurnDetector(
+        enabled=True,
+        fast_silence_ms=200,
+        silence_ms=500,
+        fallback_silence_ms=1000,
+        stability_ms=250,
+        clock=clock
+    )
+
+
+def speak(detector, clock, ms=300, frame_ms=30):
+    """Feed voiced frames."""
+    for _ in range(ms // frame_ms):
+        clock.now += frame_ms / 1000
+        assert detector.process_frame(True, frame_ms) is None
+
+
+def silence(detector, clock, ms, frame_ms=30):
+    """Feed silent frames until a turn ends or ``ms`` elapses."""
+    for _ in range(ms // frame_ms):
+        clock.now += frame_ms / 1000
+        turn = detector.process_frame(False, frame_ms)
+        if turn:
+            return turn
+    return None
+
+
+def interim(text):
+    return Transcript(text, is_final=False)
+
+
+class TestTurnDetector:
+    """Test cases for TurnDetector."""
+
+    def test_punctuated_stable_text_ends_early(self, detector, clock):
+        """Test the fast path: punctuation plus short silence."""
+        speak(detector, clock)
+        detector.on_transcript(interim("What are your hours?"))
+        turn = silence(detector, clock, 600)
+
+        assert turn.reason == "punctuation"
+        assert turn.text == "What are your hours?"
+        assert 240 <= turn.latency_ms < 300  # stability, not the 500ms silence
+
+    def test_unpunctuated_text_waits_for_silence(self, detector, clock):
+        """Test that plain text needs the longer silence."""
+        speak(detector, clock)
+        detector.on_transcript(interim("I need to reschedule"))
+        turn = silence(detector, clock, 700)
+
+        assert turn.reason == "silence"
+        assert turn.latency_ms >= 500
+
+    def test_silence_measured_in_real_frame_duration(self, detector, clock):
+        """Test that 10ms frames are not counted as 30ms of silence each."""
+        speak(detector, clock, frame_ms=10)
+        detector.on_transcript(interim("I need to reschedule"))
+        assert silence(detector, clock, 450, frame_ms=10) is None
+        turn = silence(detector, clock, 200, frame_ms=10)
+
+        assert turn.reason == "silence"
+        assert 500 <= turn.latency_ms < 600
+
+    def test_changing_interims_block_early_end(self, detector, clock):
+        """Test that text still changing is not considered stable."""
+        speak(detector, clock)
+        detector.on_transcript(interim("Hello."))
+        assert silence(detector, clock, 120) is None
+        detector.on_transcript(interim("Hello. I wanted help."))
+        # Punctuated again, but changed just now
+        assert silence(detector, clock, 60) is None
+
+    def test_unfinished_text_uses_fallback(self, detector, clock):
+        """Test that a trailing conjunction waits for the conservative timeout."""
+        speak(detector, clock)
+        detector.on_transcript(interim("I want to book and"))
+        assert silence(detector, clock, 900) is None
+        turn = silence(detector, clock, 300)
+        assert turn.reason == "fallback"
+
+    def test_final_ends_turn(self, detector, clock):
+        """Test that an unambiguous STT final still ends the turn."""
+        speak(detector, clock)
+        turn = detector.on_transcript(Transcript("Yes please", is_final=True))
+        assert turn.reason == "final"
+        assert turn.text == "Yes please"
+
+    def test_unfinished_final_waits(self, detector, clock):
+        """Test that a final ending mid-sentence does not end the turn."""
+        speak(detector, clock)
+        assert detector.on_transcript(Transcript("I was wondering if", is_final=True)) is None
+        detector.on_transcript(interim("you are open"))
+        turn = silence(detector, clock, 600)
+        assert turn.text == "I was wondering if you are open"
+
+    def test_late_final_after_early_end_ignored(self, detector, clock):
+        """Test that STT's final for already-handled words is swallowed."""
+        speak(detector, clock)
+        detector.on_transcript(interim("Thanks."))
+        assert silence(detector, clock, 600) is not None
+        assert detector.on_transcript(Transcript("Thanks.", is_final=True)) is None
+
+        # New speech starts the next turn
+        speak(detector, clock)
+        turn = detector.on_transcript(Transcript("Bye now", is_final=True))
+        assert turn.text == "Bye now"
+
+    def test_late_final_after_new_speech_not_duplicated(self, detector, clock):
+        """Test that a final for the ended turn arriving after speech resumes is dropped."""
+        speak(detector, clock)
+        detector.on_transcript(Transcript("Thanks.", start=0.0, duration=1.2))
+        assert silence(detector, clock, 600) is not None
+
+        speak(detector, clock)
+        assert detector.on_transcript(Transcript("Thanks.", is_final=True, start=0.0, duration=1.5)) is None
+        turn = detector.on_transcript(Transcript("Bye now", is_final=True, start=2.0, duration=0.8))
+        assert turn.text == "Bye now"
+
+    def test_late_final_without_timings_matched_by_text(self, detector, clock):
+        """Test the text fallback when the STT reports no timings."""
+        speak(detector, clock)
+        detector.on_transcript(interim("Thanks."))
+        assert silence(detector, clock, 600) is not None
+
+        speak(detector, clock)
+        assert detector.on_transcript(Transcript("Thanks.", is_final=True)) is None
+        turn = detector.on_transcript(Transcript("Bye now", is_final=True))
+        assert turn.text == "Bye now"
+
+    def test_silence_without_text_never_ends(self, detector, clock):
+        """Test that background noise alone does not create a turn."""
+        speak(detector, clock)
+        assert silence(detector, clock, 2000) is None
+
+    def test_disabled_ends_on_every_final(self, clock):
+        """Test the legacy behaviour when turn detection is off."""
+        detector = TurnDetector(enabled=False, clock=clock)
+        speak(detector, clock)
+        detector.on_transcript(interim("Hello."))
+        assert silence(detector, clock, 2000) is None
+        assert detector.on_transcript(Transcript("Hello and", is_final=True)).reason == "final"
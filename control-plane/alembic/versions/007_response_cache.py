@@ -0,0 +1,29 @@
+"""Add response_cache_enabled to assistants.
+
+Revision ID: 007_response_cache
+Revises: 006_assistant_tools
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '007_response_cache'
+down_revision: Union[str, None] = '006_assistant_tools'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Opt-in reuse of LLM responses for repeated FAQ-style questions
+    op.add_column(
+        'assistants',
+        sa.Column('response_cache_enabled', sa.Boolean(), nullable=False, server_default=sa.false())
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('assistants', 'response_cache_enabled')
@@ -0,0 +1,34 @@
+"""Add tts_provider and tts_fallback_providers to assistants.
+
+Revision ID: 008_tts_providers
+Revises: 007_response_cache
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '008_tts_providers'
+down_revision: Union[str, None] = '007_response_cache'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # NULL means the worker's configured default provider and fallbacks
+    op.add_column(
+        'assistants',
+        sa.Column('tts_provider', sa.String(50), nullable=True)
+    )
+    op.add_column(
+        'assistants',
+        sa.Column('tts_fallback_providers', sa.String(255), nullable=True)
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('assistants', 'tts_fallback_providers')
+    op.drop_column('assistants', 'tts_provider')
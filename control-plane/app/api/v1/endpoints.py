@@ -1,18 +1,20 @@
 """REST API endpoints for the Vox Control Plane."""
+import hmac
 import uuid
-import time
 import json
 from typing import List, Optional
 import httpx
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
 from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from app.config import settings
 from app.database import get_db
 from app.models import Client, Assistant, PhoneNumber, CallLog, Tool, Credential
 from app.services.redis_service import redis_service
-from app.services.encryption import decrypt_value
+from app.services.credentials import credential_cache, auth_headers
+from app.services.http_client import http_client_pool, RequestTimer
 from app.api.v1.schemas import (
     ClientCreate, ClientUpdate, ClientResponse,
     AssistantCreate, AssistantUpdate, AssistantResponse,
@@ -21,7 +23,7 @@ from app.api.v1.schemas import (
     HealthResponse,
     ToolCreate, ToolUpdate, ToolResponse, ToolListResponse,
     CredentialCreate, CredentialUpdate, CredentialResponse, CredentialListResponse,
-    ToolTestRequest, ToolTestResponse
+    ToolTestRequest, ToolTestResponse, ToolTestTiming, ToolAuthResponse
 )
 
 router = APIRouter()
@@ -337,6 +339,8 @@ async def assign_phone_number(
     db.add(phone)
     await db.commit()
     await db.refresh(phone)
+    # Drop any cached "no assistant" entry for the number
+    await redis_service.invalidate_phone(phone.e164_number)
     return phone
 
 
@@ -583,14 +587,10 @@ async def test_tool(
         credential = cred_result.scalar_one_or_none()
         if credential and credential.value_encrypted:
             try:
-                decrypted_value = decrypt_value(credential.value_encrypted)
                 # Inject auth header based on credential type
-                if credential.type == "bearer":
-                    request_headers["Authorization"] = f"Bearer {decrypted_value}"
-                elif credential.type == "api_key":
-                    request_headers["X-API-Key"] = decrypted_value
-                elif credential.type == "basic":
-                    request_headers["Authorization"] = f"Basic {decrypted_value}"
+                request_headers.update(
+                    auth_headers(credential.type, credential_cache.decrypt(credential))
+                )
             except Exception:
                 return ToolTestResponse(
                     success=False,
@@ -601,17 +601,20 @@ async def test_tool(
     # Prepare request body
     request_body = data.parameters if data else None
 
-    # Make the test request
-    start_time = time.time()
+    # Make the test request over the shared pool, timing each phase
+    timer = RequestTimer()
     try:
-        async with httpx.AsyncClient(timeout=timeout_seconds) as client:
+        client = await http_client_pool.get_client()
+        # Waiting for a free slot counts toward the tool's timeout
+        async with http_client_pool.host_slot(url, timeout_seconds) as remaining:
             response = await client.post(
                 url,
                 headers=request_headers if request_headers else None,
-                json=request_body
+                json=request_body,
+                timeout=remaining,
+                extensions={"trace": timer}
             )
-
-        response_time_ms = int((time.time() - start_time) * 1000)
+        timer.finish()
 
         # Truncate response body to 10KB
         response_text = response.text
@@ -621,15 +624,17 @@ async def test_tool(
         return ToolTestResponse(
             success=response.is_success,
             status_code=response.status_code,
-            response_time_ms=response_time_ms,
+            response_time_ms=int(timer.total_ms),
+            timing=ToolTestTiming(**timer.breakdown()),
             response_body=response_text
         )
 
     except httpx.TimeoutException:
-        response_time_ms = int((time.time() - start_time) * 1000)
+        timer.finish()
         return ToolTestResponse(
             success=False,
-            response_time_ms=response_time_ms,
+            response_time_ms=int(timer.total_ms),
+            timing=ToolTestTiming(**timer.breakdown()),
             error=f"Request timed out after {timeout_seconds} seconds",
             error_type="timeout"
         )
@@ -653,6 +658,36 @@ async def test_tool(
         )
 
 
+async def require_worker_token(authorization: Optional[str] = Header(None)):
+    """Only admit agent workers presenting ``Authorization: Bearer <WORKER_SERVICE_TOKEN>``."""
+    expected = settings.worker_service_token
+    if not expected:
+        # Internal routes are disabled until a token is configured
+        raise HTTPException(status_code=404, detail="Not Found")
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not hmac.compare_digest(token.encode(), expected.encode()):
+        raise HTTPException(status_code=401, detail="Invalid service token")
+
+
+@router.get(
+    "/internal/assistants/{assistant_id}/tool-auth",
+    response_model=ToolAuthResponse,
+    include_in_schema=False,
+    dependencies=[Depends(require_worker_token)]
+)
+async def get_assistant_tool_auth(
+    assistant_id: uuid.UUID,
+    db: AsyncSession = Depends(get_db)
+):
+    """Resolve credentials for an assistant's tools (workers only, never the public API)."""
+    result = await db.execute(select(Assistant.id).where(Assistant.id == assistant_id))
+    if not result.scalar_one_or_none():
+        raise HTTPException(status_code=404, detail="Assistant not found")
+
+    tools = await credential_cache.resolve_for_assistant(db, assistant_id)
+    return ToolAuthResponse(tools=tools)
+
+
 # Credential endpoints
 @router.post("/credentials", response_model=CredentialResponse, status_code=status.HTTP_201_CREATED)
 async def create_credential(
@@ -740,6 +775,7 @@ async def update_credential(
 
     await db.commit()
     await db.refresh(credential)
+    credential_cache.invalidate(credential_id)
     return credential
 
 
@@ -756,3 +792,4 @@ async def delete_credential(
 
     await db.delete(credential)
     await db.commit()
+    credential_cache.invalidate(credential_id)
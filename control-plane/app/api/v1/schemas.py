@@ -40,6 +40,8 @@ class AssistantBase(BaseModel):
     tts_is_manual_id: bool = Field(default=False)
     llm_model: str = Field(default="groq/llama-3.1-8b-instant", max_length=100)
     stt_provider: str = Field(default="deepgram", max_length=50)
+    tts_provider: Optional[str] = Field(None, max_length=50, description="TTS provider: minimax, local (worker default if unset)")
+    tts_fallback_providers: Optional[str] = Field(None, max_length=255, description="Comma-separated TTS providers to fail over to")
     structured_output_schema: Optional[str] = Field(None, description="JSON schema for structured output")
     webhook_url: Optional[str] = Field(None, max_length=500, description="Webhook URL for call completion notifications")
     first_message: Optional[str] = None
@@ -49,6 +51,7 @@ class AssistantBase(BaseModel):
     temperature: float = Field(default=0.7, ge=0.0, le=2.0, description="LLM temperature (0.0-2.0)")
     max_tokens: int = Field(default=256, ge=1, le=32000, description="Maximum tokens in response")
     rag_file_ids: Optional[str] = Field(None, description="Comma-separated file IDs for RAG")
+    response_cache_enabled: bool = Field(default=False, description="Reuse responses to repeated short questions")
 
 
 class AssistantCreate(AssistantBase):
@@ -64,6 +67,8 @@ class AssistantUpdate(BaseModel):
     tts_is_manual_id: Optional[bool] = None
     llm_model: Optional[str] = Field(None, max_length=100)
     stt_provider: Optional[str] = Field(None, max_length=50)
+    tts_provider: Optional[str] = Field(None, max_length=50)
+    tts_fallback_providers: Optional[str] = Field(None, max_length=255)
     structured_output_schema: Optional[str] = Field(None, description="JSON schema for structured output")
     webhook_url: Optional[str] = Field(None, max_length=500, description="Webhook URL for call completion notifications")
     first_message: Optional[str] = None
@@ -73,6 +78,7 @@ class AssistantUpdate(BaseModel):
     temperature: Optional[float] = Field(None, ge=0.0, le=2.0)
     max_tokens: Optional[int] = Field(None, ge=1, le=32000)
     rag_file_ids: Optional[str] = None
+    response_cache_enabled: Optional[bool] = None
     # Tool association
     tool_ids: Optional[List[uuid.UUID]] = Field(None, description="List of tool IDs to associate with the assistant")
 
@@ -153,7 +159,7 @@ class ToolBase(BaseModel):
                       description="Tool function name (alphanumeric, underscore, hyphen only)")
     description: Optional[str] = Field(None, max_length=1000)
     type: str = Field(default="mcp", max_length=20, description="Tool type (mcp or future types)")
-    server_config: str = Field(..., description="JSON: {url, timeoutSeconds, credentialId, headers, encryption}")
+    server_config: str = Field(..., description="JSON: {url, timeoutSeconds, credentialId, headers, encryption, cacheable, cacheTtlSeconds}")
     mcp_config: str = Field(..., description="JSON: {protocol}")
     messages: Optional[str] = Field(None, description="JSON array: [{trigger, message}]")
 
@@ -233,17 +239,36 @@ class ToolBrief(BaseModel):
         from_attributes = True
 
 
+# Tool auth schema for workers executing an assistant's tools
+class ToolAuthResponse(BaseModel):
+    """Resolved credentials for an assistant's tools."""
+    tools: dict[str, dict[str, str]] = Field(
+        default_factory=dict,
+        description="Tool ID -> auth headers to add to its requests"
+    )
+
+
 # Tool Test schemas
 class ToolTestRequest(BaseModel):
     """Request body for testing a tool."""
     parameters: Optional[dict] = Field(default=None, description="Test parameters to send to the tool")
 
 
+class ToolTestTiming(BaseModel):
+    """Latency breakdown of a tool test request."""
+    connect_ms: float = Field(0.0, description="DNS resolution and TCP connect (0 on a reused connection)")
+    tls_ms: float = Field(0.0, description="TLS handshake (0 on a reused connection)")
+    ttfb_ms: Optional[float] = Field(None, description="Request sent to response headers received")
+    total_ms: Optional[float] = Field(None, description="End to end, including the body")
+    connection_reused: bool = Field(True, description="Whether a pooled connection was used")
+
+
 class ToolTestResponse(BaseModel):
     """Response from tool test execution."""
     success: bool = Field(..., description="Whether the test request succeeded")
     status_code: Optional[int] = Field(None, description="HTTP status code from the tool server")
     response_time_ms: Optional[int] = Field(None, description="Response time in milliseconds")
+    timing: Optional[ToolTestTiming] = Field(None, description="Latency breakdown of the request")
     response_body: Optional[str] = Field(None, description="Response body (truncated to 10KB)")
     error: Optional[str] = Field(None, description="Error message if test failed")
     error_type: Optional[str] = Field(None, description="Error type: timeout, connection, auth, other")
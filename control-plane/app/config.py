@@ -33,7 +33,28 @@ class Settings(BaseSettings):
     sip_trunk_secret: Optional[str] = None
     sip_external_host: Optional[str] = None
 
+    # Call routing (in-process cache in front of Redis)
+    routing_local_ttl_s: float = 60.0
+    routing_local_max_entries: int = 10000
+    routing_cache_ttl: int = 3600  # Redis
+    routing_negative_ttl_s: int = 30  # numbers with no assistant
+    routing_early_refresh_beta: float = 1.0  # >1 refreshes earlier, 0 disables
+
+    # Outbound HTTP (tool tests and execution)
+    http_client_timeout: float = 20.0
+    http_client_max_connections: int = 100
+    http_client_max_keepalive: int = 20
+    http_client_keepalive_expiry: float = 30.0
+    http_client_max_per_host: int = 10
+
     # Security
+    worker_service_token: Optional[str] = None  # required by /internal routes (agent workers)
+    credential_cache_ttl: int = 300  # seconds decrypted values stay in memory (0 disables)
+    credential_cache_max_entries: int = 1000
+    # Re-encrypt credentials onto the primary key of CREDENTIAL_ENCRYPTION_KEYS
+    credential_rotation_enabled: bool = False
+    credential_rotation_batch_size: int = 100
+    credential_rotation_pause_s: float = 0.5
     jwt_secret: str = "dev_jwt_secret_change_in_prod"
 
     # Application
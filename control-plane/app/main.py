@@ -9,6 +9,9 @@ from app.config import settings
 from app.database import init_db
 from app.api import v1_router
 from app.api.agi import agi_server
+from app.services.http_client import http_client_pool
+from app.services.encryption import warm_up as warm_up_encryption
+from app.services.key_rotation import rotate_credentials
 
 # Configure logging
 logging.basicConfig(
@@ -27,6 +30,16 @@ async def lifespan(app: FastAPI):
     await init_db()
     logger.info("Database initialized")
 
+    # Pooled client for outbound tool requests
+    await http_client_pool.start()
+
+    # Load encryption keys now rather than on the first credential request
+    await asyncio.to_thread(warm_up_encryption)
+    rotation_task = None
+    if settings.credential_rotation_enabled:
+        rotation_task = asyncio.create_task(rotate_credentials())
+        logger.info("Credential key rotation started")
+
     # Start AGI server in background
     agi_task = asyncio.create_task(agi_server.start())
     logger.info("FastAGI server started on port 4573")
@@ -41,6 +54,13 @@ async def lifespan(app: FastAPI):
     except asyncio.CancelledError:
         pass
     await agi_server.stop()
+    if rotation_task is not None and not rotation_task.done():
+        rotation_task.cancel()
+        try:
+            await rotation_task
+        except asyncio.CancelledError:
+            pass
+    await http_client_pool.close()
     logger.info("Shutdown complete")
 
 
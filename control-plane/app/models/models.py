@@ -80,6 +80,8 @@ class Assistant(Base):
         default="meta-llama/llama-3.1-70b-instruct"
     )
     stt_provider: Mapped[str] = mapped_column(String(50), default="deepgram")
+    tts_provider: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
+    tts_fallback_providers: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
     structured_output_schema: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     webhook_url: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
     first_message: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
@@ -89,6 +91,7 @@ class Assistant(Base):
     temperature: Mapped[float] = mapped_column(Float, nullable=False, default=0.7)
     max_tokens: Mapped[int] = mapped_column(Integer, nullable=False, default=256)
     rag_file_ids: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    response_cache_enabled: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     updated_at: Mapped[datetime] = mapped_column(
         DateTime,
@@ -1,6 +1,15 @@
 """Services package."""
 from app.services.redis_service import redis_service, RedisService
 from app.services.routing import RoutingService
-from app.services.encryption import encrypt_value, decrypt_value
+from app.services.route_cache import route_cache, RouteCache
+from app.services.encryption import encrypt_value, decrypt_value, Keyring, get_keyring
+from app.services.http_client import http_client_pool, HTTPClientPool, RequestTimer
+from app.services.credentials import credential_cache, CredentialCache, auth_headers
 
-__all__ = ["redis_service", "RedisService", "RoutingService", "encrypt_value", "decrypt_value"]
+__all__ = [
+    "redis_service", "RedisService", "RoutingService", "encrypt_value", "decrypt_value",
+    "route_cache", "RouteCache",
+    "Keyring", "get_keyring",
+    "http_client_pool", "HTTPClientPool", "RequestTimer",
+    "credential_cache", "CredentialCache", "auth_headers"
+]
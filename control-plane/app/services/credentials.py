@@ -0,0 +1,143 @@
+"""Decrypted credential cache and tool auth resolution."""
+import json
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Callable, Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models import Credential, Tool
+from app.models.models import assistant_tools
+from app.services.encryption import decrypt_value
+
+logger = logging.getLogger(__name__)
+
+
+def auth_headers(credential_type: str, value: str) -> dict:
+    """Request headers that authenticate with a credential of ``credential_type``."""
+    if credential_type == "bearer":
+        return {"Authorization": f"Bearer {value}"}
+    if credential_type == "api_key":
+        return {"X-API-Key": value}
+    if credential_type == "basic":
+        return {"Authorization": f"Basic {value}"}
+    return {}
+
+
+def _credential_reference(server_config: Optional[str]) -> Optional[uuid.UUID]:
+    """``credentialId`` from a tool's server_config JSON, if valid."""
+    try:
+        config = json.loads(server_config or "")
+        return uuid.UUID(str(config["credentialId"]))
+    except (ValueError, TypeError, KeyError):
+        return None
+
+
+class CredentialCache:
+    """
+    In-memory cache of decrypted credential values.
+
+    Entries are keyed by credential id and only served while the row's
+    ``updated_at`` matches, so a changed value is never returned stale
+    even by another process. Plaintext is held for at most
+    ``credential_cache_ttl`` seconds and the cache is bounded (LRU).
+    The credential endpoints invalidate on update and delete.
+    """
+
+    def __init__(
+        self,
+        ttl_s: Optional[float] = None,
+        max_entries: Optional[int] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.ttl_s = ttl_s if ttl_s is not None else settings.credential_cache_ttl
+        self.max_entries = max_entries or settings.credential_cache_max_entries
+        self._clock = clock
+        # credential id -> (updated_at, plaintext, expires_at)
+        self._entries: OrderedDict[str, tuple[Optional[datetime], str, float]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def decrypt(self, credential: Credential) -> str:
+        """
+        Plaintext value of ``credential``, decrypting only on a miss.
+
+        Raises:
+            cryptography.fernet.InvalidToken: If the value cannot be decrypted
+        """
+        key = str(credential.id)
+        entry = self._entries.get(key)
+        if entry is not None:
+            updated_at, value, expires_at = entry
+            if updated_at == credential.updated_at and self._clock() < expires_at:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            del self._entries[key]
+
+        self.misses += 1
+        value = decrypt_value(credential.value_encrypted)
+        if self.ttl_s > 0:
+            self._entries[key] = (credential.updated_at, value, self._clock() + self.ttl_s)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def invalidate(self, credential_id):
+        """Drop the cached value for one credential."""
+        self._entries.pop(str(credential_id), None)
+
+    def clear(self):
+        """Drop every cached value."""
+        self._entries.clear()
+
+    async def resolve_for_assistant(self, db: AsyncSession, assistant_id: uuid.UUID) -> dict[str, dict]:
+        """
+        Auth headers for each of an assistant's credentialed tools.
+
+        Tools reference credentials through ``server_config.credentialId``,
+        read per tool so one malformed config only affects its own tool.
+        The referenced credentials are then loaded in a single query,
+        restricted to credentials of each tool's own client.
+
+        Returns:
+            Tool id -> headers to add to its requests
+        """
+        result = await db.execute(
+            select(Tool.id, Tool.client_id, Tool.server_config)
+            .join(assistant_tools, assistant_tools.c.tool_id == Tool.id)
+            .where(assistant_tools.c.assistant_id == assistant_id)
+        )
+        references = {}
+        for tool_id, client_id, server_config in result.all():
+            credential_id = _credential_reference(server_config)
+            if credential_id is None:
+                continue
+            references[tool_id] = (credential_id, client_id)
+        if not references:
+            return {}
+
+        result = await db.execute(
+            select(Credential).where(Credential.id.in_({ref for ref, _ in references.values()}))
+        )
+        credentials = {credential.id: credential for credential in result.scalars().all()}
+
+        resolved = {}
+        for tool_id, (credential_id, client_id) in references.items():
+            credential = credentials.get(credential_id)
+            if credential is None or credential.client_id != client_id or not credential.value_encrypted:
+                continue
+            try:
+                value = self.decrypt(credential)
+            except Exception:
+                logger.warning(f"Failed to decrypt credential {credential.id} for tool {tool_id}")
+                continue
+            resolved[str(tool_id)] = auth_headers(credential.type, value)
+        return resolved
+
+# Global instance
+credential_cache = CredentialCache()
@@ -1,42 +1,110 @@
 """Encryption service for secure credential storage."""
 import os
 import base64
-from cryptography.fernet import Fernet
+from functools import lru_cache
+from cryptography.fernet import Fernet, MultiFernet
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 
+# Separates the key version from the Fernet token ("v2:gAAAA...").
+# Fernet tokens are url-safe base64, so they never contain it.
+VERSION_SEPARATOR = ":"
 
-def _get_encryption_key() -> bytes:
-    """Get or derive the encryption key from environment."""
-    # Try to get a pre-generated Fernet key first
-    fernet_key = os.getenv("CREDENTIAL_ENCRYPTION_KEY")
-    if fernet_key:
-        return fernet_key.encode() if isinstance(fernet_key, str) else fernet_key
-
-    # Derive key from secret + salt (for development)
-    secret = os.getenv("SECRET_KEY", "dev-secret-key-change-in-production")
-    salt = os.getenv("ENCRYPTION_SALT", "vox-encryption-salt")
 
+@lru_cache(maxsize=4)
+def _derive_key(secret: str, salt: str) -> bytes:
+    """Derive a Fernet key from a secret (PBKDF2, computed once per process)."""
     kdf = PBKDF2HMAC(
         algorithm=hashes.SHA256(),
         length=32,
         salt=salt.encode(),
         iterations=100000,
     )
-    key = base64.urlsafe_b64encode(kdf.derive(secret.encode()))
-    return key
+    return base64.urlsafe_b64encode(kdf.derive(secret.encode()))
+
+
+def _load_keys() -> list[tuple[str, bytes]]:
+    """
+    Versioned keys from the environment, newest (primary) first.
+
+    - ``CREDENTIAL_ENCRYPTION_KEYS``: ``"v2:<fernet key>,v1:<fernet key>"``
+    - ``CREDENTIAL_ENCRYPTION_KEY``: single key, version ``v1``
+    - otherwise a key derived from ``SECRET_KEY`` (for development)
+    """
+    keyring = os.getenv("CREDENTIAL_ENCRYPTION_KEYS")
+    if keyring:
+        keys = []
+        for entry in keyring.split(","):
+            version, _, key = entry.strip().partition(VERSION_SEPARATOR)
+            if not version or not key:
+                raise ValueError("CREDENTIAL_ENCRYPTION_KEYS entries must be 'version:key'")
+            keys.append((version, key.encode()))
+        return keys
+
+    fernet_key = os.getenv("CREDENTIAL_ENCRYPTION_KEY")
+    if fernet_key:
+        return [("v1", fernet_key.encode())]
+
+    secret = os.getenv("SECRET_KEY", "dev-secret-key-change-in-production")
+    salt = os.getenv("ENCRYPTION_SALT", "vox-encryption-salt")
+    return [("dev", _derive_key(secret, salt))]
+
+
+class Keyring:
+    """
+    Versioned Fernet keys.
+
+    Values are encrypted with the primary (first) key and stored as
+    ``{version}:{token}``, so decryption goes straight to the right key
+    and rows still on an old key are found by prefix. Unversioned values
+    from before the keyring are tried against every key (MultiFernet).
+    """
+
+    def __init__(self, keys: list[tuple[str, bytes]]):
+        if not keys:
+            raise ValueError("Keyring needs at least one key")
+        self.primary_version = keys[0][0]
+        self._fernets = {version: Fernet(key) for version, key in keys}
+        self._multi = MultiFernet([Fernet(key) for _, key in keys])
+
+    @property
+    def versions(self) -> list[str]:
+        return list(self._fernets)
+
+    def encrypt(self, plaintext: str) -> str:
+        token = self._fernets[self.primary_version].encrypt(plaintext.encode())
+        return f"{self.primary_version}{VERSION_SEPARATOR}{token.decode()}"
+
+    def decrypt(self, value: str) -> str:
+        version, separator, token = value.partition(VERSION_SEPARATOR)
+        fernet = self._fernets.get(version) if separator else None
+        if fernet is None:
+            return self._multi.decrypt(value.encode()).decode()
+        return fernet.decrypt(token.encode()).decode()
+
+    def needs_rotation(self, value: str) -> bool:
+        """Whether ``value`` is not encrypted with the primary key."""
+        return not value.startswith(f"{self.primary_version}{VERSION_SEPARATOR}")
+
+    def rotate(self, value: str) -> str:
+        """Re-encrypt ``value`` with the primary key."""
+        return self.encrypt(self.decrypt(value))
+
+
+_keyring: Keyring | None = None
 
 
-_fernet: Fernet | None = None
+def get_keyring() -> Keyring:
+    """Get or create the keyring (call ``warm_up`` at startup to pay key setup early)."""
+    global _keyring
+    if _keyring is None:
+        _keyring = Keyring(_load_keys())
+    return _keyring
 
 
-def _get_fernet() -> Fernet:
-    """Get or create Fernet instance."""
-    global _fernet
-    if _fernet is None:
-        key = _get_encryption_key()
-        _fernet = Fernet(key)
-    return _fernet
+def warm_up():
+    """Load keys (and run any key derivation) before the first request needs them."""
+    get_keyring()
 
 
 def encrypt_value(plaintext: str) -> str:
@@ -46,22 +114,18 @@ def encrypt_value(plaintext: str) -> str:
         plaintext: The value to encrypt
 
     Returns:
-        Encrypted value as a string
+        Encrypted value as a string, tagged with the key version
     """
-    fernet = _get_fernet()
-    encrypted = fernet.encrypt(plaintext.encode())
-    return encrypted.decode()
+    return get_keyring().encrypt(plaintext)
 
 
 def decrypt_value(encrypted: str) -> str:
     """Decrypt a credential value.
 
     Args:
-        encrypted: The encrypted value
+        encrypted: The encrypted value (versioned or legacy)
 
     Returns:
         Decrypted plaintext value
     """
-    fernet = _get_fernet()
-    decrypted = fernet.decrypt(encrypted.encode())
-    return decrypted.decode()
+    return get_keyring().decrypt(encrypted)
@@ -0,0 +1,135 @@
+"""Shared outbound HTTP client for tool requests."""
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from app.config import settings
+
+
+class RequestTimer:
+    """
+    Per-request latency breakdown from httpcore trace events.
+
+    Pass as ``extensions={"trace": timer}``. Connect covers host name
+    resolution as well as TCP setup, both done by httpcore's connect_tcp.
+    Phases a reused connection skips (connect, TLS) are reported as 0.
+    """
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.connect_ms = 0.0
+        self.tls_ms = 0.0
+        self.ttfb_ms: Optional[float] = None
+        self.total_ms: Optional[float] = None
+        self.connection_reused = True
+        self._started: dict[str, float] = {}
+
+    async def __call__(self, event: str, info: dict):
+        now = time.perf_counter()
+        name, _, phase = event.rpartition(".")
+        if phase == "started":
+            self._started[name] = now
+            return
+        began = self._started.get(name, now)
+        if name == "connection.connect_tcp":
+            self.connection_reused = False
+            self.connect_ms = (now - began) * 1000
+        elif name == "connection.start_tls":
+            self.tls_ms = (now - began) * 1000
+        elif name.endswith("receive_response_headers") and phase == "complete":
+            sent = min(
+                (t for n, t in self._started.items() if n.endswith("send_request_headers")),
+                default=began
+            )
+            self.ttfb_ms = (now - sent) * 1000
+
+    def finish(self):
+        """Stop the total clock."""
+        self.total_ms = (time.perf_counter() - self.start) * 1000
+
+    def breakdown(self) -> dict:
+        """Phase timings in milliseconds."""
+        def ms(value):
+            return round(value, 2) if value is not None else None
+
+        return {
+            "connect_ms": ms(self.connect_ms),
+            "tls_ms": ms(self.tls_ms),
+            "ttfb_ms": ms(self.ttfb_ms),
+            "total_ms": ms(self.total_ms),
+            "connection_reused": self.connection_reused,
+        }
+
+
+class HTTPClientPool:
+    """
+    Application-scoped HTTP client with keep-alive connection pooling.
+
+    Started and closed by the FastAPI lifespan; created lazily if used
+    outside it. HTTP/2 multiplexes concurrent requests to one host over a
+    single connection, and ``host_slot`` caps in-flight requests per host
+    so one slow tool server cannot take the whole pool.
+    """
+
+    def __init__(self):
+        self._client: Optional[httpx.AsyncClient] = None
+        self._host_slots: dict[str, asyncio.Semaphore] = {}
+
+    async def start(self):
+        """Create the shared client."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                http2=True,
+                timeout=settings.http_client_timeout,
+                limits=httpx.Limits(
+                    max_connections=settings.http_client_max_connections,
+                    max_keepalive_connections=settings.http_client_max_keepalive,
+                    keepalive_expiry=settings.http_client_keepalive_expiry
+                )
+            )
+
+    async def close(self):
+        """Close the shared client and its connections."""
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
+
+    async def get_client(self) -> httpx.AsyncClient:
+        """The shared client (started on first use)."""
+        await self.start()
+        return self._client
+
+    @asynccontextmanager
+    async def host_slot(self, url: str, timeout: Optional[float] = None):
+        """
+        Hold one of the host's ``http_client_max_per_host`` request slots.
+
+        The wait for a slot counts toward ``timeout`` (http_client_timeout
+        if None); the context yields the seconds left for the request.
+
+        Raises:
+            httpx.PoolTimeout: If no slot frees up in time
+        """
+        timeout = timeout or settings.http_client_timeout
+        host = urlsplit(url).netloc
+        slot = self._host_slots.get(host)
+        if slot is None:
+            slot = self._host_slots[host] = asyncio.Semaphore(settings.http_client_max_per_host)
+
+        began = time.perf_counter()
+        try:
+            async with asyncio.timeout(timeout):
+                await slot.acquire()
+        except TimeoutError:
+            raise httpx.PoolTimeout(f"No request slot for {host} within {timeout}s") from None
+        try:
+            yield max(timeout - (time.perf_counter() - began), 0.0)
+        finally:
+            slot.release()
+
+
+http_client_pool = HTTPClientPool()
@@ -0,0 +1,82 @@
+"""Background re-encryption of credentials onto the primary key."""
+import asyncio
+import logging
+from typing import Optional
+from cryptography.fernet import InvalidToken
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.config import settings
+from app.database import async_session_maker
+from app.models import Credential
+from app.services.encryption import VERSION_SEPARATOR, get_keyring
+
+logger = logging.getLogger(__name__)
+
+
+async def rotate_credentials(
+    session_maker: Optional[async_sessionmaker] = None,
+    batch_size: Optional[int] = None,
+    pause_s: Optional[float] = None
+) -> int:
+    """
+    Re-encrypt every credential not yet on the primary key.
+
+    Works through the table in id order, ``batch_size`` rows per short
+    transaction with ``pause_s`` between batches, so API requests are
+    never blocked behind it. Each row is only rewritten if its value is
+    unchanged since it was read, so a concurrent update wins. Plaintext
+    and ``updated_at`` are unchanged, which keeps cached decryptions valid.
+
+    Returns:
+        Number of credentials rotated
+    """
+    session_maker = session_maker or async_session_maker
+    batch_size = batch_size or settings.credential_rotation_batch_size
+    pause_s = settings.credential_rotation_pause_s if pause_s is None else pause_s
+
+    keyring = get_keyring()
+    current = f"{keyring.primary_version}{VERSION_SEPARATOR}"
+    rotated = 0
+    failed = 0
+    last_id = None
+
+    while True:
+        async with session_maker() as db:
+            stmt = (
+                select(Credential.id, Credential.value_encrypted)
+                .where(~Credential.value_encrypted.startswith(current, autoescape=True))
+                .order_by(Credential.id)
+                .limit(batch_size)
+            )
+            if last_id is not None:
+                stmt = stmt.where(Credential.id > last_id)
+            rows = (await db.execute(stmt)).all()
+            if not rows:
+                break
+
+            for credential_id, value in rows:
+                try:
+                    new_value = keyring.rotate(value)
+                except InvalidToken:
+                    failed += 1
+                    logger.error(f"Credential {credential_id} cannot be decrypted with any configured key")
+                    continue
+                result = await db.execute(
+                    update(Credential)
+                    .where(Credential.id == credential_id, Credential.value_encrypted == value)
+                    .values(value_encrypted=new_value, updated_at=Credential.updated_at)
+                )
+                rotated += result.rowcount
+            await db.commit()
+
+        last_id = rows[-1][0]
+        if len(rows) < batch_size:
+            break
+        await asyncio.sleep(pause_s)
+
+    logger.info(
+        f"Credential rotation to key {keyring.primary_version} complete: "
+        f"{rotated} rotated, {failed} failed"
+    )
+    return rotated
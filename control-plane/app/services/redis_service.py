@@ -1,30 +1,107 @@
 """Redis service for caching phone-to-assistant lookups."""
+import asyncio
 import json
+import logging
 import redis.asyncio as redis
 from typing import Optional
 from app.config import settings
+from app.services.route_cache import route_cache
+
+logger = logging.getLogger(__name__)
+
+# Resolve phone -> assistant config server-side in one round trip.
+# KEYS[1]: phone key; ARGV[1]: assistant key prefix. Returns nil on a miss,
+# else {config JSON ('{}' for a number known to have no assistant),
+# remaining TTL in ms}. The config key is derived from the phone entry,
+# so this needs a non-clustered Redis (or both keys in one hash slot).
+ROUTE_LOOKUP_SCRIPT = """
+local phone = redis.call('GET', KEYS[1])
+if not phone then return nil end
+local ok, entry = pcall(cjson.decode, phone)
+if not ok or type(entry) ~= 'table' then return nil end
+local assistant_id = entry['assistant_id']
+if assistant_id == nil or assistant_id == cjson.null then
+    return {'{}', redis.call('PTTL', KEYS[1])}
+end
+local key = ARGV[1] .. assistant_id
+local config = redis.call('GET', key)
+if not config then return nil end
+return {config, math.min(redis.call('PTTL', KEYS[1]), redis.call('PTTL', key))}
+"""
 
 
 class RedisService:
-    """Redis caching service."""
+    """
+    Redis caching service.
+
+    Invalidations also clear the in-process ``route_cache`` and are
+    published on ``vox:routing:invalidate`` ("assistant:{id}" or
+    "phone:{number}") so every replica's local cache follows.
+    """
 
     def __init__(self):
         self.client: Optional[redis.Redis] = None
         self._prefix = "vox:"
+        self._channel = f"{self._prefix}routing:invalidate"
+        self._listener: Optional[asyncio.Task] = None
+        self._route_lookup = None
 
     async def connect(self):
-        """Initialize Redis connection."""
+        """Initialize Redis connection and subscribe to invalidations."""
         self.client = redis.from_url(
             settings.redis_url,
             encoding="utf-8",
             decode_responses=True
         )
+        self._route_lookup = self.client.register_script(ROUTE_LOOKUP_SCRIPT)
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen())
 
     async def disconnect(self):
         """Close Redis connection."""
+        if self._listener:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
         if self.client:
             await self.client.close()
 
+    async def _listen(self):
+        """Apply invalidations published by any replica, resubscribing on errors."""
+        while True:
+            pubsub = self.client.pubsub()
+            try:
+                await pubsub.subscribe(self._channel)
+                # Messages may have been missed while unsubscribed
+                route_cache.clear()
+                async for message in pubsub.listen():
+                    if message["type"] == "message":
+                        self._apply_invalidation(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Routing invalidation subscription lost: {e}")
+                route_cache.clear()
+                await asyncio.sleep(1)
+            finally:
+                await pubsub.reset()
+
+    def _apply_invalidation(self, message: str):
+        kind, _, value = message.partition(":")
+        if kind == "assistant":
+            route_cache.invalidate_assistant(value)
+        elif kind == "phone":
+            route_cache.invalidate_phone(value)
+
+    async def _publish_invalidation(self, message: str):
+        try:
+            await self.client.publish(self._channel, message)
+        except Exception as e:
+            logger.warning(f"Failed to publish routing invalidation: {e}")
+
     async def get_assistant_id(self, phone_number: str) -> Optional[str]:
         """Get cached assistant ID for a phone number."""
         if not self.client:
@@ -36,6 +113,63 @@ class RedisService:
             return json.loads(data).get("assistant_id")
         return None
 
+    async def get_route(self, phone_number: str) -> tuple[Optional[dict], Optional[int]]:
+        """
+        Get cached assistant configuration for a phone number in one round trip.
+
+        Falls back to two GETs if the script cannot run (e.g. scripting
+        disabled).
+
+        Returns:
+            (config, remaining TTL in ms): config is None on a miss and
+            ``{}`` for a number cached as having no assistant; the TTL is
+            None when unknown
+        """
+        if not self.client:
+            return None, None
+
+        phone_key = f"{self._prefix}phone:{phone_number}"
+        try:
+            result = await self._route_lookup(keys=[phone_key], args=[f"{self._prefix}assistant:"])
+        except redis.ResponseError as e:
+            logger.warning(f"Route lookup script failed, using two-step lookup: {e}")
+            data = await self.client.get(phone_key)
+            if not data:
+                return None, None
+            assistant_id = json.loads(data).get("assistant_id")
+            if not assistant_id:
+                return {}, None
+            return await self.get_assistant_config(assistant_id), None
+
+        if not result:
+            return None, None
+        data, ttl_ms = result
+        return json.loads(data), (ttl_ms if ttl_ms >= 0 else None)
+
+    async def set_route(
+        self,
+        phone_number: str,
+        assistant_id: str,
+        config: dict,
+        ttl: int = 3600
+    ):
+        """Cache a phone mapping and its assistant configuration together."""
+        if not self.client:
+            return
+
+        pipe = self.client.pipeline(transaction=False)
+        pipe.setex(f"{self._prefix}phone:{phone_number}", ttl, json.dumps({"assistant_id": assistant_id}))
+        pipe.setex(f"{self._prefix}assistant:{assistant_id}", ttl, json.dumps(config))
+        await pipe.execute()
+
+    async def set_no_route(self, phone_number: str, ttl: int):
+        """Cache that a phone number has no assistant."""
+        if not self.client:
+            return
+
+        key = f"{self._prefix}phone:{phone_number}"
+        await self.client.setex(key, ttl, json.dumps({"assistant_id": None}))
+
     async def set_assistant_id(
         self,
         phone_number: str,
@@ -76,19 +210,23 @@ class RedisService:
 
     async def invalidate_assistant(self, assistant_id: str):
         """Invalidate cached assistant data."""
+        route_cache.invalidate_assistant(assistant_id)
         if not self.client:
             return
 
         key = f"{self._prefix}assistant:{assistant_id}"
         await self.client.delete(key)
+        await self._publish_invalidation(f"assistant:{assistant_id}")
 
     async def invalidate_phone(self, phone_number: str):
         """Invalidate cached phone mapping."""
+        route_cache.invalidate_phone(phone_number)
         if not self.client:
             return
 
         key = f"{self._prefix}phone:{phone_number}"
         await self.client.delete(key)
+        await self._publish_invalidation(f"phone:{phone_number}")
 
 
 # Global instance
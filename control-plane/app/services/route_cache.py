@@ -0,0 +1,98 @@
+"""In-process cache of phone number routing."""
+import time
+from collections import OrderedDict
+from typing import Callable, Optional
+
+from app.config import settings
+
+
+class RouteCache:
+    """
+    LRU of normalized phone number -> assistant config.
+
+    Sits in front of Redis so call routing is a dict lookup. Entries are
+    dropped by ``invalidate_phone``/``invalidate_assistant``, which
+    RedisService applies locally and broadcasts to the other replicas
+    over pub/sub; ``routing_local_ttl_s`` bounds staleness if a broadcast
+    is ever missed. A number with no assistant is cached as ``{}`` (see
+    ``set_no_route``) so repeated calls to it stay off Postgres.
+    """
+
+    def __init__(
+        self,
+        ttl_s: Optional[float] = None,
+        max_entries: Optional[int] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.ttl_s = ttl_s if ttl_s is not None else settings.routing_local_ttl_s
+        self.max_entries = max_entries or settings.routing_local_max_entries
+        self._clock = clock
+        # phone -> (config, expires_at)
+        self._entries: OrderedDict[str, tuple[dict, float]] = OrderedDict()
+        # assistant id -> phones routed to it
+        self._phones: dict[str, set[str]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, phone: str) -> Optional[dict]:
+        """Config for ``phone`` (a copy, ``{}`` if it has no assistant), or None if absent or expired."""
+        entry = self._entries.get(phone)
+        if entry is None:
+            self.misses += 1
+            return None
+        config, expires_at = entry
+        if self._clock() >= expires_at:
+            self._remove(phone)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(phone)
+        self.hits += 1
+        return dict(config)
+
+    def set(self, phone: str, config: dict, ttl_s: Optional[float] = None):
+        """Cache the config ``phone`` routes to."""
+        ttl_s = self.ttl_s if ttl_s is None else min(ttl_s, self.ttl_s)
+        if ttl_s <= 0:
+            return
+        self._remove(phone)
+        self._entries[phone] = (dict(config), self._clock() + ttl_s)
+        if config:
+            self._phones.setdefault(config["assistant_id"], set()).add(phone)
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+
+    def set_no_route(self, phone: str):
+        """Cache that ``phone`` has no assistant (for routing_negative_ttl_s)."""
+        self.set(phone, {}, settings.routing_negative_ttl_s)
+
+    def _remove(self, phone: str):
+        entry = self._entries.pop(phone, None)
+        if entry is None or not entry[0]:
+            return
+        assistant_id = entry[0]["assistant_id"]
+        phones = self._phones.get(assistant_id)
+        if phones is not None:
+            phones.discard(phone)
+            if not phones:
+                del self._phones[assistant_id]
+
+    def invalidate_phone(self, phone: str):
+        """Drop the route for one phone number."""
+        self._remove(phone)
+
+    def invalidate_assistant(self, assistant_id: str):
+        """Drop every route to an assistant."""
+        for phone in list(self._phones.get(assistant_id, ())):
+            self._remove(phone)
+
+    def clear(self):
+        """Drop every route."""
+        self._entries.clear()
+        self._phones.clear()
+
+
+# Global instance
+route_cache = RouteCache()
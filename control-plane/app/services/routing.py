@@ -1,14 +1,34 @@
 """Routing service for phone number to assistant lookup."""
+import asyncio
+import math
+import random
+import time
 import uuid
-from typing import Optional
+from typing import ClassVar, Optional
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
 from app.models import PhoneNumber, Assistant, Client
 from app.services.redis_service import redis_service
+from app.services.route_cache import route_cache
 
 
 class RoutingService:
-    """Service for routing calls to the correct assistant."""
+    """
+    Service for routing calls to the correct assistant.
+
+    Lookups go in-process cache -> Redis -> Postgres. Numbers with no
+    assistant are cached briefly too, concurrent misses for one number
+    share a single database query, and a Redis entry close to expiry is
+    refreshed early by one caller, chosen at random weighted by how near
+    expiry it is (probabilistic early expiration), so a popular number's
+    entry never expires under load.
+    """
+
+    # Normalized phone -> database lookup in progress (shared by all instances)
+    _inflight: ClassVar[dict[str, asyncio.Future]] = {}
+    # Smoothed database lookup time in seconds, the early refresh window scale
+    _lookup_s: ClassVar[float] = 0.05
 
     def __init__(self, db: AsyncSession):
         self.db = db
@@ -26,14 +46,56 @@ class RoutingService:
         # Normalize phone number
         normalized = self._normalize_phone(phone_number)
 
-        # Try cache first
-        cached = await redis_service.get_assistant_id(normalized)
-        if cached:
-            config = await redis_service.get_assistant_config(cached)
+        # In-process cache (kept coherent by RedisService invalidations)
+        config = route_cache.get(normalized)
+        if config is not None:
+            return config or None
+
+        # Then Redis (phone -> config in one round trip)
+        config, ttl_ms = await redis_service.get_route(normalized)
+        if config is not None and not self._refresh_early(ttl_ms):
             if config:
-                return config
+                route_cache.set(normalized, config)
+            else:
+                route_cache.set_no_route(normalized)
+            return config or None
+
+        return await self._load(normalized)
+
+    def _refresh_early(self, ttl_ms: Optional[int]) -> bool:
+        """
+        Whether this caller should refresh a cache hit ahead of expiry.
+
+        XFetch: refresh when ``lookup_time * beta * -ln(rand)`` exceeds the
+        remaining TTL, which only becomes likely within a few lookup times
+        of expiry.
+        """
+        beta = settings.routing_early_refresh_beta
+        if ttl_ms is None or beta <= 0:
+            return False
+        return self._lookup_s * beta * -math.log(1.0 - random.random()) * 1000 >= ttl_ms
+
+    async def _load(self, normalized: str) -> Optional[dict]:
+        """Database lookup, shared by concurrent callers for the same number."""
+        pending = self._inflight.get(normalized)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[normalized] = future
+        try:
+            config = await self._load_from_db(normalized)
+            future.set_result(config)
+            return config
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # mark retrieved when nobody is waiting
+            raise
+        finally:
+            del self._inflight[normalized]
 
-        # Database lookup
+    async def _load_from_db(self, normalized: str) -> Optional[dict]:
+        started = time.perf_counter()
         stmt = (
             select(PhoneNumber, Assistant, Client)
             .join(Assistant, PhoneNumber.assistant_id == Assistant.id)
@@ -42,8 +104,12 @@ class RoutingService:
         )
         result = await self.db.execute(stmt)
         row = result.first()
+        RoutingService._lookup_s = 0.8 * self._lookup_s + 0.2 * (time.perf_counter() - started)
 
         if not row:
+            # Short-lived, so a newly assigned number starts routing quickly
+            await redis_service.set_no_route(normalized, settings.routing_negative_ttl_s)
+            route_cache.set_no_route(normalized)
             return None
 
         phone, assistant, client = row
@@ -60,8 +126,8 @@ class RoutingService:
         }
 
         # Cache for future lookups
-        await redis_service.set_assistant_id(normalized, str(assistant.id))
-        await redis_service.set_assistant_config(str(assistant.id), config)
+        await redis_service.set_route(normalized, str(assistant.id), config, settings.routing_cache_ttl)
+        route_cache.set(normalized, config)
 
         return config
 
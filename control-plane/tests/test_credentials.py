@@ -0,0 +1,266 @@
+"""Tests for the decrypted credential cache."""
+import json
+import uuid
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.v1.endpoints import delete_credential, update_credential
+from app.api.v1.schemas import CredentialUpdate
+from app.config import settings
+from app.services.credentials import CredentialCache, auth_headers, credential_cache
+
+
+def make_credential(updated_at=None, type="bearer", client_id=None):
+    credential = MagicMock()
+    credential.id = uuid.uuid4()
+    credential.client_id = client_id or uuid.uuid4()
+    credential.type = type
+    credential.value_encrypted = "encrypted"
+    credential.updated_at = updated_at or datetime(2026, 1, 1)
+    return credential
+
+
+def server_config(credential_id):
+    return json.dumps({"url": "https://tools.example", "credentialId": str(credential_id)})
+
+
+def tools_result(rows):
+    result = MagicMock()
+    result.all.return_value = rows
+    return result
+
+
+def credentials_result(credentials):
+    result = MagicMock()
+    result.scalars.return_value.all.return_value = credentials
+    return result
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestCredentialCache:
+    """Tests for CredentialCache."""
+
+    def test_decrypts_once(self):
+        """Repeat lookups of an unchanged credential skip decryption."""
+        cache = CredentialCache(ttl_s=60, max_entries=10)
+        credential = make_credential()
+        with patch("app.services.credentials.decrypt_value", return_value="secret") as mock_decrypt:
+            assert cache.decrypt(credential) == "secret"
+            assert cache.decrypt(credential) == "secret"
+        mock_decrypt.assert_called_once_with("encrypted")
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_updated_row_is_decrypted_again(self):
+        """A newer updated_at misses the cache."""
+        cache = CredentialCache(ttl_s=60, max_entries=10)
+        credential = make_credential()
+        with patch("app.services.credentials.decrypt_value", side_effect=["old", "new"]):
+            assert cache.decrypt(credential) == "old"
+            credential.updated_at += timedelta(seconds=1)
+            assert cache.decrypt(credential) == "new"
+
+    def test_entries_expire(self):
+        """Plaintext is not held past the TTL."""
+        clock = Clock()
+        cache = CredentialCache(ttl_s=60, max_entries=10, clock=clock)
+        credential = make_credential()
+        with patch("app.services.credentials.decrypt_value", return_value="secret") as mock_decrypt:
+            cache.decrypt(credential)
+            clock.now = 61
+            cache.decrypt(credential)
+        assert mock_decrypt.call_count == 2
+
+    def test_invalidate(self):
+        """Invalidation drops the cached value."""
+        cache = CredentialCache(ttl_s=60, max_entries=10)
+        credential = make_credential()
+        with patch("app.services.credentials.decrypt_value", return_value="secret") as mock_decrypt:
+            cache.decrypt(credential)
+            cache.invalidate(credential.id)
+            cache.decrypt(credential)
+        assert mock_decrypt.call_count == 2
+
+    def test_bounded(self):
+        """The least recently used entry is evicted past max_entries."""
+        cache = CredentialCache(ttl_s=60, max_entries=2)
+        credentials = [make_credential() for _ in range(3)]
+        with patch("app.services.credentials.decrypt_value", return_value="secret"):
+            for credential in credentials:
+                cache.decrypt(credential)
+        assert list(cache._entries) == [str(c.id) for c in credentials[1:]]
+
+    def test_auth_headers(self):
+        """Each credential type maps to its header."""
+        assert auth_headers("bearer", "t") == {"Authorization": "Bearer t"}
+        assert auth_headers("api_key", "k") == {"X-API-Key": "k"}
+        assert auth_headers("basic", "b") == {"Authorization": "Basic b"}
+        assert auth_headers("oauth", "x") == {}
+
+    @pytest.mark.asyncio
+    async def test_resolve_for_assistant(self, mock_db):
+        """Referenced credentials are loaded in one query after the tools."""
+        cache = CredentialCache(ttl_s=60, max_entries=10)
+        client_id = uuid.uuid4()
+        bearer = make_credential(type="bearer", client_id=client_id)
+        api_key = make_credential(type="api_key", client_id=client_id)
+        tool_a, tool_b, tool_c = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+        mock_db.execute.side_effect = [
+            tools_result([
+                (tool_a, client_id, server_config(bearer.id)),
+                (tool_b, client_id, server_config(api_key.id)),
+                (tool_c, client_id, json.dumps({"url": "https://tools.example"})),
+            ]),
+            credentials_result([bearer, api_key]),
+        ]
+
+        with patch("app.services.credentials.decrypt_value", side_effect=["t", "k"]):
+            resolved = await cache.resolve_for_assistant(mock_db, uuid.uuid4())
+
+        assert mock_db.execute.await_count == 2
+        assert resolved == {
+            str(tool_a): {"Authorization": "Bearer t"},
+            str(tool_b): {"X-API-Key": "k"},
+        }
+
+    @pytest.mark.asyncio
+    async def test_malformed_server_config_only_skips_its_tool(self, mock_db):
+        """One bad server_config does not break the assistant's other tools."""
+        cache = CredentialCache(ttl_s=60, max_entries=10)
+        client_id = uuid.uuid4()
+        credential = make_credential(client_id=client_id)
+        good = uuid.uuid4()
+        mock_db.execute.side_effect = [
+            tools_result([
+                (uuid.uuid4(), client_id, "not valid json"),
+                (uuid.uuid4(), client_id, json.dumps(["not", "an", "object"])),
+                (uuid.uuid4(), client_id, json.dumps({"credentialId": "not-a-uuid"})),
+                (good, client_id, server_config(credential.id)),
+            ]),
+            credentials_result([credential]),
+        ]
+
+        with patch("app.services.credentials.decrypt_value", return_value="t"):
+            resolved = await cache.resolve_for_assistant(mock_db, uuid.uuid4())
+
+        assert resolved == {str(good): {"Authorization": "Bearer t"}}
+
+    @pytest.mark.asyncio
+    async def test_other_clients_credentials_ignored(self, mock_db):
+        """A tool cannot reference another client's credential."""
+        cache = CredentialCache(ttl_s=60, max_entries=10)
+        credential = make_credential(client_id=uuid.uuid4())
+        mock_db.execute.side_effect = [
+            tools_result([(uuid.uuid4(), uuid.uuid4(), server_config(credential.id))]),
+            credentials_result([credential]),
+        ]
+
+        assert await cache.resolve_for_assistant(mock_db, uuid.uuid4()) == {}
+
+    @pytest.mark.asyncio
+    async def test_no_credentialed_tools_single_query(self, mock_db):
+        cache = CredentialCache(ttl_s=60, max_entries=10)
+        mock_db.execute.side_effect = [tools_result([(uuid.uuid4(), uuid.uuid4(), "{}")])]
+
+        assert await cache.resolve_for_assistant(mock_db, uuid.uuid4()) == {}
+        mock_db.execute.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_resolve_skips_undecryptable(self, mock_db):
+        """A bad credential leaves its tool unauthenticated instead of failing."""
+        cache = CredentialCache(ttl_s=60, max_entries=10)
+        client_id = uuid.uuid4()
+        credential = make_credential(client_id=client_id)
+        mock_db.execute.side_effect = [
+            tools_result([(uuid.uuid4(), client_id, server_config(credential.id))]),
+            credentials_result([credential]),
+        ]
+
+        with patch("app.services.credentials.decrypt_value", side_effect=ValueError("bad token")):
+            assert await cache.resolve_for_assistant(mock_db, uuid.uuid4()) == {}
+
+
+class TestToolAuthEndpoint:
+    """The bulk resolve route is only open to workers holding the service token."""
+
+    @pytest.fixture
+    def client(self, mock_db):
+        from app.database import get_db
+        from app.main import app
+
+        async def override_db():
+            yield mock_db
+
+        app.dependency_overrides[get_db] = override_db
+        yield TestClient(app)
+        app.dependency_overrides.clear()
+
+    def url(self):
+        return f"/api/v1/internal/assistants/{uuid.uuid4()}/tool-auth"
+
+    def test_rejects_missing_token(self, client):
+        with patch.object(settings, "worker_service_token", "s3cret"):
+            response = client.get(self.url())
+        assert response.status_code == 401
+
+    def test_rejects_wrong_token(self, client):
+        with patch.object(settings, "worker_service_token", "s3cret"):
+            response = client.get(self.url(), headers={"Authorization": "Bearer guess"})
+        assert response.status_code == 401
+
+    def test_disabled_without_configured_token(self, client):
+        with patch.object(settings, "worker_service_token", None):
+            response = client.get(self.url(), headers={"Authorization": "Bearer "})
+        assert response.status_code == 404
+
+    def test_not_on_public_path(self, client):
+        response = client.get(f"/api/v1/assistants/{uuid.uuid4()}/tool-auth")
+        assert response.status_code in (404, 405)
+
+    def test_accepts_service_token(self, client, mock_db):
+        found = MagicMock()
+        found.scalar_one_or_none.return_value = uuid.uuid4()
+        mock_db.execute.return_value = found
+
+        with patch.object(settings, "worker_service_token", "s3cret"), \
+                patch.object(credential_cache, "resolve_for_assistant", AsyncMock(return_value={"t1": {"X-API-Key": "k"}})):
+            response = client.get(self.url(), headers={"Authorization": "Bearer s3cret"})
+
+        assert response.status_code == 200
+        assert response.json() == {"tools": {"t1": {"X-API-Key": "k"}}}
+
+
+class TestCredentialInvalidation:
+    """Credential endpoints drop cached plaintext."""
+
+    @pytest.mark.asyncio
+    async def test_update_invalidates(self, mock_db, mock_credential):
+        credential_id = uuid.UUID(mock_credential.id)
+        result = MagicMock()
+        result.scalar_one_or_none.return_value = mock_credential
+        mock_db.execute.return_value = result
+
+        with patch.object(credential_cache, "invalidate") as mock_invalidate, \
+                patch("app.services.encryption.encrypt_value", return_value="encrypted"):
+            await update_credential(credential_id, CredentialUpdate(value="rotated"), mock_db)
+        mock_invalidate.assert_called_once_with(credential_id)
+
+    @pytest.mark.asyncio
+    async def test_delete_invalidates(self, mock_db, mock_credential):
+        credential_id = uuid.UUID(mock_credential.id)
+        result = MagicMock()
+        result.scalar_one_or_none.return_value = mock_credential
+        mock_db.execute.return_value = result
+
+        with patch.object(credential_cache, "invalidate") as mock_invalidate:
+            await delete_credential(credential_id, mock_db)
+        mock_invalidate.assert_called_once_with(credential_id)
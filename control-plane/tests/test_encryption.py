@@ -0,0 +1,133 @@
+"""Tests for credential encryption and key rotation."""
+import uuid
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from cryptography.fernet import Fernet, InvalidToken
+
+from app.services import encryption
+from app.services.encryption import Keyring, _load_keys
+from app.services.key_rotation import rotate_credentials
+
+OLD_KEY = Fernet.generate_key()
+NEW_KEY = Fernet.generate_key()
+
+
+class TestKeyring:
+    """Tests for the versioned keyring."""
+
+    def test_encrypts_with_primary_version(self):
+        keyring = Keyring([("v2", NEW_KEY), ("v1", OLD_KEY)])
+        value = keyring.encrypt("secret")
+
+        assert value.startswith("v2:")
+        assert keyring.decrypt(value) == "secret"
+        assert not keyring.needs_rotation(value)
+
+    def test_decrypts_old_versions(self):
+        old = Keyring([("v1", OLD_KEY)]).encrypt("secret")
+        keyring = Keyring([("v2", NEW_KEY), ("v1", OLD_KEY)])
+
+        assert keyring.decrypt(old) == "secret"
+        assert keyring.needs_rotation(old)
+        rotated = keyring.rotate(old)
+        assert rotated.startswith("v2:")
+        assert keyring.decrypt(rotated) == "secret"
+
+    def test_decrypts_unversioned_values(self):
+        """Values stored before the keyring have no version prefix."""
+        legacy = Fernet(OLD_KEY).encrypt(b"secret").decode()
+        keyring = Keyring([("v2", NEW_KEY), ("v1", OLD_KEY)])
+
+        assert keyring.decrypt(legacy) == "secret"
+        assert keyring.needs_rotation(legacy)
+
+    def test_unknown_key_fails(self):
+        value = Keyring([("v1", OLD_KEY)]).encrypt("secret")
+        with pytest.raises(InvalidToken):
+            Keyring([("v2", NEW_KEY)]).decrypt(value)
+
+
+class TestLoadKeys:
+    """Tests for reading keys from the environment."""
+
+    def test_keyring_env(self, monkeypatch):
+        monkeypatch.setenv("CREDENTIAL_ENCRYPTION_KEYS", f"v2:{NEW_KEY.decode()}, v1:{OLD_KEY.decode()}")
+        assert _load_keys() == [("v2", NEW_KEY), ("v1", OLD_KEY)]
+
+    def test_single_key_env(self, monkeypatch):
+        monkeypatch.delenv("CREDENTIAL_ENCRYPTION_KEYS", raising=False)
+        monkeypatch.setenv("CREDENTIAL_ENCRYPTION_KEY", OLD_KEY.decode())
+        assert _load_keys() == [("v1", OLD_KEY)]
+
+    def test_malformed_keyring_env(self, monkeypatch):
+        monkeypatch.setenv("CREDENTIAL_ENCRYPTION_KEYS", NEW_KEY.decode())
+        with pytest.raises(ValueError):
+            _load_keys()
+
+    def test_derived_key_computed_once(self, monkeypatch):
+        """PBKDF2 runs once per secret, not per keyring."""
+        monkeypatch.delenv("CREDENTIAL_ENCRYPTION_KEYS", raising=False)
+        monkeypatch.delenv("CREDENTIAL_ENCRYPTION_KEY", raising=False)
+        encryption._derive_key.cache_clear()
+
+        first = _load_keys()
+        second = _load_keys()
+        assert first == second
+        assert first[0][0] == "dev"
+        assert encryption._derive_key.cache_info().misses == 1
+
+
+def session_maker_for(batches):
+    """Session maker whose selects return ``batches`` in turn; updates hit one row."""
+    db = AsyncMock()
+    selects = iter(batches)
+
+    async def execute(stmt):
+        result = MagicMock()
+        if stmt.is_select:
+            result.all.return_value = next(selects, [])
+        else:
+            result.rowcount = 1
+        return result
+
+    db.execute.side_effect = execute
+    session = MagicMock()
+    session.__aenter__ = AsyncMock(return_value=db)
+    session.__aexit__ = AsyncMock(return_value=None)
+    return MagicMock(return_value=session), db
+
+
+class TestRotateCredentials:
+    """Tests for the background re-encryption job."""
+
+    @pytest.mark.asyncio
+    async def test_rotates_in_batches(self):
+        keyring = Keyring([("v2", NEW_KEY), ("v1", OLD_KEY)])
+        old = Keyring([("v1", OLD_KEY)])
+        rows = [(uuid.UUID(int=i), old.encrypt(f"secret-{i}")) for i in range(3)]
+        session_maker, db = session_maker_for([rows[:2], rows[2:]])
+
+        with patch("app.services.key_rotation.get_keyring", return_value=keyring):
+            rotated = await rotate_credentials(session_maker, batch_size=2, pause_s=0)
+
+        assert rotated == 3
+        assert session_maker.call_count == 2
+        assert db.commit.await_count == 2
+        updates = [c.args[0] for c in db.execute.call_args_list if not c.args[0].is_select]
+        assert len(updates) == 3
+        new_value = updates[0].compile().params["value_encrypted"]
+        assert new_value.startswith("v2:")
+        assert keyring.decrypt(new_value) == "secret-0"
+
+    @pytest.mark.asyncio
+    async def test_undecryptable_rows_are_skipped(self):
+        keyring = Keyring([("v2", NEW_KEY)])
+        foreign = Keyring([("v1", OLD_KEY)]).encrypt("secret")
+        session_maker, db = session_maker_for([[(uuid.uuid4(), foreign)]])
+
+        with patch("app.services.key_rotation.get_keyring", return_value=keyring):
+            rotated = await rotate_credentials(session_maker, batch_size=10, pause_s=0)
+
+        assert rotated == 0
+        assert db.execute.await_count == 1
@@ -0,0 +1,108 @@
+"""Tests for the shared outbound HTTP client."""
+import asyncio
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from app.config import settings
+from app.services.http_client import HTTPClientPool, RequestTimer
+
+
+class TestRequestTimer:
+    """Tests for the per-request latency breakdown."""
+
+    @pytest.mark.asyncio
+    async def test_new_connection_phases(self):
+        """Connect, TLS and TTFB come from the trace events."""
+        clock = iter([0.0, 0.0, 0.010, 0.010, 0.030, 0.030, 0.031, 0.031, 0.081, 0.100])
+        with patch("app.services.http_client.time.perf_counter", lambda: next(clock)):
+            timer = RequestTimer()
+            await timer("connection.connect_tcp.started", {})
+            await timer("connection.connect_tcp.complete", {})
+            await timer("connection.start_tls.started", {})
+            await timer("connection.start_tls.complete", {})
+            await timer("http2.send_request_headers.started", {})
+            await timer("http2.send_request_headers.complete", {})
+            await timer("http2.receive_response_headers.started", {})
+            await timer("http2.receive_response_headers.complete", {})
+            timer.finish()
+
+        timing = timer.breakdown()
+        assert timing["connection_reused"] is False
+        assert timing["connect_ms"] == pytest.approx(10.0)
+        assert timing["tls_ms"] == pytest.approx(20.0)
+        assert timing["ttfb_ms"] == pytest.approx(51.0)
+        assert timing["total_ms"] == pytest.approx(100.0)
+
+    @pytest.mark.asyncio
+    async def test_reused_connection(self):
+        """A pooled connection reports no connect or TLS time."""
+        timer = RequestTimer()
+        await timer("http11.send_request_headers.started", {})
+        await timer("http11.receive_response_headers.complete", {})
+        timer.finish()
+
+        timing = timer.breakdown()
+        assert timing["connection_reused"] is True
+        assert timing["connect_ms"] == 0.0
+        assert timing["tls_ms"] == 0.0
+        assert timing["ttfb_ms"] is not None
+
+class TestHTTPClientPool:
+    """Tests for the application-scoped client."""
+
+    @pytest.mark.asyncio
+    async def test_client_is_shared(self):
+        """Requests reuse one client until the pool is closed."""
+        pool = HTTPClientPool()
+        first = await pool.get_client()
+        assert await pool.get_client() is first
+
+        await pool.close()
+        assert first.is_closed
+        second = await pool.get_client()
+        assert second is not first
+        await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_host_slot_limits_concurrency(self):
+        """In-flight requests per host are capped."""
+        pool = HTTPClientPool()
+        active = 0
+        peak = 0
+
+        async def request(url):
+            nonlocal active, peak
+            async with pool.host_slot(url):
+                active += 1
+                peak = max(peak, active)
+                await asyncio.sleep(0.01)
+                active -= 1
+
+        with patch.object(settings, "http_client_max_per_host", 2):
+            await asyncio.gather(*(request("https://a.example.com/x") for _ in range(5)))
+        assert peak == 2
+
+    @pytest.mark.asyncio
+    async def test_host_slot_wait_counts_toward_timeout(self):
+        """A request queued behind a busy host times out instead of waiting forever."""
+        pool = HTTPClientPool()
+        url = "https://a.example.com/x"
+        release = asyncio.Event()
+
+        async def hold():
+            async with pool.host_slot(url, 1.0):
+                await release.wait()
+
+        with patch.object(settings, "http_client_max_per_host", 1):
+            holder = asyncio.create_task(hold())
+            await asyncio.sleep(0)
+            with pytest.raises(httpx.PoolTimeout):
+                async with pool.host_slot(url, 0.02):
+                    pass
+            release.set()
+            await holder
+
+            async with pool.host_slot(url, 1.0) as remaining:
+                assert 0.9 < remaining <= 1.0
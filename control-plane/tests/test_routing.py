@@ -0,0 +1,327 @@
+"""Tests for call routing and its caches."""
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+import redis.asyncio as redis
+
+from app.config import settings
+from app.services.redis_service import RedisService
+from app.services.route_cache import RouteCache, route_cache
+from app.services.routing import RoutingService
+
+
+def config(assistant_id="a1"):
+    return {"assistant_id": assistant_id, "name": "Front desk"}
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture(autouse=True)
+def clear_route_cache():
+    route_cache.clear()
+    yield
+    route_cache.clear()
+
+
+class TestRouteCache:
+    """Tests for the in-process routing LRU."""
+
+    def test_hit_returns_copy(self):
+        cache = RouteCache(ttl_s=60, max_entries=10)
+        cache.set("+18681234567", config())
+
+        first = cache.get("+18681234567")
+        first["name"] = "changed"
+        assert cache.get("+18681234567") == config()
+        assert (cache.hits, cache.misses) == (2, 0)
+
+    def test_expiry(self):
+        clock = Clock()
+        cache = RouteCache(ttl_s=60, max_entries=10, clock=clock)
+        cache.set("+1", config())
+        clock.now = 60
+        assert cache.get("+1") is None
+        assert len(cache) == 0
+
+    def test_invalidate_assistant_drops_all_its_phones(self):
+        cache = RouteCache(ttl_s=60, max_entries=10)
+        cache.set("+1", config("a1"))
+        cache.set("+2", config("a1"))
+        cache.set("+3", config("a2"))
+
+        cache.invalidate_assistant("a1")
+        assert cache.get("+1") is None
+        assert cache.get("+2") is None
+        assert cache.get("+3") == config("a2")
+
+    def test_reassigned_phone_leaves_old_assistant_index(self):
+        cache = RouteCache(ttl_s=60, max_entries=10)
+        cache.set("+1", config("a1"))
+        cache.set("+1", config("a2"))
+
+        cache.invalidate_assistant("a1")
+        assert cache.get("+1") == config("a2")
+
+    def test_negative_entries_use_short_ttl(self):
+        clock = Clock()
+        cache = RouteCache(ttl_s=60, max_entries=10, clock=clock)
+        with patch.object(settings, "routing_negative_ttl_s", 5):
+            cache.set_no_route("+1")
+        assert cache.get("+1") == {}
+        clock.now = 5
+        assert cache.get("+1") is None
+
+    def test_bounded(self):
+        cache = RouteCache(ttl_s=60, max_entries=2)
+        cache.set("+1", config())
+        cache.set("+2", config())
+        cache.get("+1")
+        cache.set("+3", config())
+        assert cache.get("+2") is None
+        assert cache.get("+1") is not None
+
+
+class TestRoutingService:
+    """Tests for RoutingService cache tiers."""
+
+    @pytest.mark.asyncio
+    async def test_local_hit_skips_redis_and_db(self, mock_db):
+        route_cache.set("+18681234567", config())
+        with patch("app.services.routing.redis_service") as mock_redis:
+            result = await RoutingService(mock_db).get_assistant_for_phone("+1 (868) 123-4567")
+
+        assert result == config()
+        mock_redis.get_route.assert_not_called()
+        mock_db.execute.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_redis_hit_fills_local_cache(self, mock_db):
+        with patch("app.services.routing.redis_service") as mock_redis:
+            mock_redis.get_route = AsyncMock(return_value=(config(), 3_600_000))
+            await RoutingService(mock_db).get_assistant_for_phone("+18681234567")
+            await RoutingService(mock_db).get_assistant_for_phone("+18681234567")
+
+        mock_redis.get_route.assert_awaited_once_with("+18681234567")
+        assert route_cache.get("+18681234567") == config()
+
+
+def db_row(assistant_id="a1"):
+    """A (phone, assistant, client) row as the routing query returns it."""
+    assistant = MagicMock()
+    assistant.id = assistant_id
+    assistant.name = "Front desk"
+    client = MagicMock()
+    client.id = "c1"
+    client.webhook_url = None
+    return (MagicMock(), assistant, client)
+
+
+@pytest.fixture
+def redis_miss():
+    with patch("app.services.routing.redis_service") as mock_redis:
+        mock_redis.get_route = AsyncMock(return_value=(None, None))
+        mock_redis.set_route = AsyncMock()
+        mock_redis.set_no_route = AsyncMock()
+        yield mock_redis
+
+
+class TestRoutingMisses:
+    """Tests for negative caching, single-flight and early refresh."""
+
+    @pytest.mark.asyncio
+    async def test_unknown_number_cached_negatively(self, mock_db, redis_miss):
+        result = MagicMock()
+        result.first.return_value = None
+        mock_db.execute.return_value = result
+
+        assert await RoutingService(mock_db).get_assistant_for_phone("+15550000") is None
+        assert await RoutingService(mock_db).get_assistant_for_phone("+15550000") is None
+
+        mock_db.execute.assert_awaited_once()
+        redis_miss.set_no_route.assert_awaited_once_with("+15550000", 30)
+        assert route_cache.get("+15550000") == {}
+
+    @pytest.mark.asyncio
+    async def test_negative_redis_entry_skips_db(self, mock_db, redis_miss):
+        redis_miss.get_route.return_value = ({}, 20000)
+
+        assert await RoutingService(mock_db).get_assistant_for_phone("+15550000") is None
+        mock_db.execute.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_query(self, mock_db, redis_miss):
+        async def slow_query(stmt):
+            await asyncio.sleep(0.01)
+            result = MagicMock()
+            result.first.return_value = db_row()
+            return result
+
+        mock_db.execute.side_effect = slow_query
+
+        results = await asyncio.gather(*(
+            RoutingService(mock_db).get_assistant_for_phone("+18681234567") for _ in range(10)
+        ))
+
+        assert all(r["assistant_id"] == "a1" for r in results)
+        mock_db.execute.assert_awaited_once()
+        assert RoutingService._inflight == {}
+
+    @pytest.mark.asyncio
+    async def test_failed_lookup_propagates_to_waiters(self, mock_db, redis_miss):
+        async def failing_query(stmt):
+            await asyncio.sleep(0.01)
+            raise RuntimeError("db down")
+
+        mock_db.execute.side_effect = failing_query
+
+        results = await asyncio.gather(
+            *(RoutingService(mock_db).get_assistant_for_phone("+18681234567") for _ in range(3)),
+            return_exceptions=True
+        )
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert RoutingService._inflight == {}
+
+    @pytest.mark.asyncio
+    async def test_entry_near_expiry_refreshed_early(self, mock_db, redis_miss):
+        redis_miss.get_route.return_value = (config(), 1)
+        result = MagicMock()
+        result.first.return_value = db_row("a2")
+        mock_db.execute.return_value = result
+
+        with patch("app.services.routing.random.random", return_value=0.99):
+            config_ = await RoutingService(mock_db).get_assistant_for_phone("+18681234567")
+
+        assert config_["assistant_id"] == "a2"
+        redis_miss.set_route.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_fresh_entry_not_refreshed(self, mock_db, redis_miss):
+        redis_miss.get_route.return_value = (config(), 3_600_000)
+
+        with patch("app.services.routing.random.random", return_value=0.99):
+            assert await RoutingService(mock_db).get_assistant_for_phone("+18681234567") == config()
+        mock_db.execute.assert_not_called()
+
+
+class TestRouteLookup:
+    """Tests for the single-round-trip Redis lookup."""
+
+    @pytest.mark.asyncio
+    async def test_one_script_call(self):
+        service = RedisService()
+        service.client = AsyncMock()
+        service._route_lookup = AsyncMock(return_value=[json.dumps(config()), 5000])
+
+        assert await service.get_route("+1") == (config(), 5000)
+        service._route_lookup.assert_awaited_once_with(
+            keys=["vox:phone:+1"], args=["vox:assistant:"]
+        )
+        service.client.get.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_miss(self):
+        service = RedisService()
+        service.client = AsyncMock()
+        service._route_lookup = AsyncMock(return_value=None)
+
+        assert await service.get_route("+1") == (None, None)
+
+    @pytest.mark.asyncio
+    async def test_negative_entry(self):
+        service = RedisService()
+        service.client = AsyncMock()
+        service._route_lookup = AsyncMock(return_value=["{}", 20000])
+
+        assert await service.get_route("+1") == ({}, 20000)
+
+    @pytest.mark.asyncio
+    async def test_no_expiry(self):
+        service = RedisService()
+        service.client = AsyncMock()
+        service._route_lookup = AsyncMock(return_value=[json.dumps(config()), -1])
+
+        assert await service.get_route("+1") == (config(), None)
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_two_step_lookup(self):
+        service = RedisService()
+        service.client = AsyncMock()
+        service.client.get.side_effect = [json.dumps({"assistant_id": "a1"}), json.dumps(config())]
+        service._route_lookup = AsyncMock(side_effect=redis.ResponseError("NOSCRIPT disabled"))
+
+        assert await service.get_route("+1") == (config(), None)
+        assert service.client.get.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_fallback_negative_entry(self):
+        service = RedisService()
+        service.client = AsyncMock()
+        service.client.get.return_value = json.dumps({"assistant_id": None})
+        service._route_lookup = AsyncMock(side_effect=redis.ResponseError("NOSCRIPT disabled"))
+
+        assert await service.get_route("+1") == ({}, None)
+
+    @pytest.mark.asyncio
+    async def test_set_route_pipelines_both_keys(self):
+        service = RedisService()
+        service.client = MagicMock()
+        pipe = service.client.pipeline.return_value
+        pipe.execute = AsyncMock()
+
+        await service.set_route("+1", "a1", config(), ttl=60)
+
+        assert pipe.setex.call_count == 2
+        pipe.execute.assert_awaited_once()
+
+
+class TestInvalidation:
+    """Tests for cross-replica invalidation."""
+
+    @pytest.mark.asyncio
+    async def test_invalidate_publishes(self):
+        service = RedisService()
+        service.client = AsyncMock()
+        route_cache.set("+1", config("a1"))
+
+        await service.invalidate_assistant("a1")
+        await service.invalidate_phone("+2")
+
+        assert route_cache.get("+1") is None
+        service.client.publish.assert_any_await("vox:routing:invalidate", "assistant:a1")
+        service.client.publish.assert_any_await("vox:routing:invalidate", "phone:+2")
+
+    @pytest.mark.asyncio
+    async def test_invalidate_without_redis_still_clears_local(self):
+        service = RedisService()
+        route_cache.set("+1", config("a1"))
+
+        await service.invalidate_phone("+1")
+        assert route_cache.get("+1") is None
+
+    def test_applies_messages_from_other_replicas(self):
+        service = RedisService()
+        route_cache.set("+1", config("a1"))
+        route_cache.set("+2", config("a2"))
+
+        service._apply_invalidation("assistant:a1")
+        service._apply_invalidation("phone:+2")
+        service._apply_invalidation("unknown:x")
+
+        assert len(route_cache) == 0
+
+    @pytest.mark.asyncio
+    async def test_publish_failure_is_not_raised(self):
+        service = RedisService()
+        service.client = AsyncMock()
+        service.client.publish.side_effect = ConnectionError("down")
+
+        await service.invalidate_phone("+1")
+        service.client.delete.assert_awaited_once()
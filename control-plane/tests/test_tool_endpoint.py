@@ -1,6 +1,7 @@
 """Tests for the tool test endpoint."""
 import json
 import uuid
+from contextlib import nullcontext
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import httpx
@@ -32,12 +33,11 @@ class TestToolTestEndpoint:
             is_success=True
         )
 
-        with patch("app.api.v1.endpoints.httpx.AsyncClient") as mock_client_class:
+        with patch("app.api.v1.endpoints.http_client_pool") as mock_pool:
             mock_client = AsyncMock()
-            mock_client.__aenter__.return_value = mock_client
-            mock_client.__aexit__.return_value = None
+            mock_pool.get_client = AsyncMock(return_value=mock_client)
+            mock_pool.host_slot.return_value = nullcontext(25.0)
             mock_client.post.return_value = mock_response
-            mock_client_class.return_value = mock_client
 
             # Execute
             result = await test_tool(tool_id, ToolTestRequest(), mock_db)
@@ -46,8 +46,13 @@ class TestToolTestEndpoint:
             assert result.success is True
             assert result.status_code == 200
             assert result.response_time_ms is not None
+            assert result.timing is not None
+            assert result.timing.total_ms is not None
             assert result.response_body == '{"result": "success"}'
             assert result.error is None
+            # The request gets what is left after waiting for a host slot
+            mock_pool.host_slot.assert_called_once_with("https://api.example.com/test", 20)
+            assert mock_client.post.call_args.kwargs["timeout"] == 25.0
 
     @pytest.mark.asyncio
     async def test_test_tool_not_found(self, mock_db):
@@ -117,12 +122,11 @@ class TestToolTestEndpoint:
         mock_db.execute.return_value = mock_result
 
         # Mock httpx timeout
-        with patch("app.api.v1.endpoints.httpx.AsyncClient") as mock_client_class:
+        with patch("app.api.v1.endpoints.http_client_pool") as mock_pool:
             mock_client = AsyncMock()
-            mock_client.__aenter__.return_value = mock_client
-            mock_client.__aexit__.return_value = None
+            mock_pool.get_client = AsyncMock(return_value=mock_client)
+            mock_pool.host_slot.return_value = nullcontext(25.0)
             mock_client.post.side_effect = httpx.TimeoutException("Request timed out")
-            mock_client_class.return_value = mock_client
 
             # Execute
             result = await test_tool(tool_id, ToolTestRequest(), mock_db)
@@ -143,12 +147,11 @@ class TestToolTestEndpoint:
         mock_db.execute.return_value = mock_result
 
         # Mock httpx connection error
-        with patch("app.api.v1.endpoints.httpx.AsyncClient") as mock_client_class:
+        with patch("app.api.v1.endpoints.http_client_pool") as mock_pool:
             mock_client = AsyncMock()
-            mock_client.__aenter__.return_value = mock_client
-            mock_client.__aexit__.return_value = None
+            mock_pool.get_client = AsyncMock(return_value=mock_client)
+            mock_pool.host_slot.return_value = nullcontext(25.0)
             mock_client.post.side_effect = httpx.ConnectError("Connection refused")
-            mock_client_class.return_value = mock_client
 
             # Execute
             result = await test_tool(tool_id, ToolTestRequest(), mock_db)
@@ -186,14 +189,13 @@ class TestToolTestEndpoint:
         # Mock httpx client
         mock_response = mock_httpx_response(status_code=200, text='{"status": "ok"}')
 
-        with patch("app.api.v1.endpoints.httpx.AsyncClient") as mock_client_class:
+        with patch("app.api.v1.endpoints.http_client_pool") as mock_pool:
             mock_client = AsyncMock()
-            mock_client.__aenter__.return_value = mock_client
-            mock_client.__aexit__.return_value = None
+            mock_pool.get_client = AsyncMock(return_value=mock_client)
+            mock_pool.host_slot.return_value = nullcontext(25.0)
             mock_client.post.return_value = mock_response
-            mock_client_class.return_value = mock_client
 
-            with patch("app.api.v1.endpoints.decrypt_value") as mock_decrypt:
+            with patch("app.services.credentials.decrypt_value") as mock_decrypt:
                 mock_decrypt.return_value = "test-api-key"
 
                 # Execute
@@ -226,12 +228,11 @@ class TestToolTestEndpoint:
             is_success=True
         )
 
-        with patch("app.api.v1.endpoints.httpx.AsyncClient") as mock_client_class:
+        with patch("app.api.v1.endpoints.http_client_pool") as mock_pool:
             mock_client = AsyncMock()
-            mock_client.__aenter__.return_value = mock_client
-            mock_client.__aexit__.return_value = None
+            mock_pool.get_client = AsyncMock(return_value=mock_client)
+            mock_pool.host_slot.return_value = nullcontext(25.0)
             mock_client.post.return_value = mock_response
-            mock_client_class.return_value = mock_client
 
             # Execute
             result = await test_tool(tool_id, ToolTestRequest(), mock_db)
@@ -254,12 +255,11 @@ class TestToolTestEndpoint:
         # Mock httpx client
         mock_response = mock_httpx_response(status_code=200, text='{"echo": "test"}')
 
-        with patch("app.api.v1.endpoints.httpx.AsyncClient") as mock_client_class:
+        with patch("app.api.v1.endpoints.http_client_pool") as mock_pool:
             mock_client = AsyncMock()
-            mock_client.__aenter__.return_value = mock_client
-            mock_client.__aexit__.return_value = None
+            mock_pool.get_client = AsyncMock(return_value=mock_client)
+            mock_pool.host_slot.return_value = nullcontext(25.0)
             mock_client.post.return_value = mock_response
-            mock_client_class.return_value = mock_client
 
             # Execute with parameters
             test_params = {"query": "test value", "count": 5}
@@ -295,12 +295,11 @@ class TestToolTestEndpoint:
         # Mock httpx client
         mock_response = mock_httpx_response(status_code=200, text='{"status": "ok"}')
 
-        with patch("app.api.v1.endpoints.httpx.AsyncClient") as mock_client_class:
+        with patch("app.api.v1.endpoints.http_client_pool") as mock_pool:
             mock_client = AsyncMock()
-            mock_client.__aenter__.return_value = mock_client
-            mock_client.__aexit__.return_value = None
+            mock_pool.get_client = AsyncMock(return_value=mock_client)
+            mock_pool.host_slot.return_value = nullcontext(25.0)
             mock_client.post.return_value = mock_response
-            mock_client_class.return_value = mock_client
 
             # Execute
             result = await test_tool(tool_id, ToolTestRequest(), mock_db)
@@ -22,6 +22,8 @@ export interface Assistant {
   tts_is_manual_id: boolean
   llm_model: string
   stt_provider: string
+  tts_provider: string | null
+  tts_fallback_providers: string | null
   structured_output_schema: string | null
   webhook_url: string | null
   first_message: string | null
@@ -46,6 +48,8 @@ export interface AssistantCreate {
   tts_is_manual_id?: boolean
   llm_model?: string
   stt_provider?: string
+  tts_provider?: string | null
+  tts_fallback_providers?: string | null
   structured_output_schema?: string | null
   webhook_url?: string | null
   first_message?: string | null
@@ -67,6 +71,8 @@ export interface AssistantUpdate {
   tts_is_manual_id?: boolean
   llm_model?: string
   stt_provider?: string
+  tts_provider?: string | null
+  tts_fallback_providers?: string | null
   structured_output_schema?: string | null
   webhook_url?: string | null
   first_message?: string | null
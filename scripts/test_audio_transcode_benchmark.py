@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Audio Transcode Microbenchmark
+
+Measures the cost of serving a non-canonical output format from one
+canonical cached clip (16kHz PCM16) instead of caching a copy per format.
+- Target: ~1ms or less per second of audio (>500x realtime) for every leg format
+
+Usage:
+    python scripts/test_audio_transcode_benchmark.py
+"""
+
+import os
+import sys
+import time
+from unittest.mock import MagicMock
+
+import numpy as np
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_dir = os.path.dirname(script_dir)
+
+# Mock webrtcvad before importing (Windows doesn't have C++ build tools)
+sys.modules['webrtcvad'] = MagicMock()
+
+# Add agent-worker directory to path for imports
+agent_worker_dir = os.path.join(project_dir, "agent-worker")
+sys.path.insert(0, agent_worker_dir)
+
+from app.services.audio_transcode import StreamTranscoder, transcode
+
+
+CANONICAL_RATE = 16000
+
+# (label, sample rate, codec) for each leg type
+OUTPUT_FORMATS = [
+    ("telephony 8kHz mu-law", 8000, "mulaw"),
+    ("telephony 8kHz PCM", 8000, "pcm"),
+    ("WebRTC 24kHz PCM", 24000, "pcm"),
+    ("WebRTC 48kHz PCM", 48000, "pcm"),
+]
+
+
+def make_clip(seconds: float) -> bytes:
+    """Speech-like test clip: a few harmonics plus noise."""
+    rng = np.random.default_rng(0)
+    t = np.arange(int(CANONICAL_RATE * seconds)) / CANONICAL_RATE
+    signal = sum(np.sin(2 * np.pi * f * t) / (i + 1) for i, f in enumerate((180, 360, 720, 2400)))
+    signal = signal * 6000 + rng.normal(0, 300, len(t))
+    return np.clip(signal, -32768, 32767).astype("<i2").tobytes()
+
+
+def bench(fn, runs: int) -> list[float]:
+    """Time fn() over several runs, in milliseconds."""
+    fn()  # warm up (filter design, allocations)
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def run_benchmark():
+    """Run the transcode microbenchmark."""
+    print("\n" + "#" * 60)
+    print("# AUDIO TRANSCODE MICROBENCHMARK")
+    print("#" * 60)
+
+    for seconds in (1.0, 5.0):
+        clip = make_clip(seconds)
+
+        print("\n" + "=" * 60)
+        print(f"{seconds:.0f}s CANONICAL CLIP ({len(clip)} bytes, {CANONICAL_RATE}Hz PCM16)")
+        print("=" * 60)
+
+        for label, rate, codec in OUTPUT_FORMATS:
+            whole = bench(lambda: transcode(clip, CANONICAL_RATE, rate, dst_codec=codec), runs=50)
+
+            def streamed():
+                # Same 4096-byte chunks stream_tts yields for cached clips
+                transcoder = StreamTranscoder(CANONICAL_RATE, rate, dst_codec=codec)
+                for i in range(0, len(clip), 4096):
+                    transcoder.process(clip[i:i + 4096])
+                transcoder.flush()
+
+            chunked = bench(streamed, runs=50)
+
+            per_second = min(whole) / seconds
+            print(f"\n[{label}]")
+            print(f"   Whole clip: avg {np.mean(whole):.3f}ms, min {min(whole):.3f}ms")
+            print(f"   4KB chunks: avg {np.mean(chunked):.3f}ms, min {min(chunked):.3f}ms")
+            print(f"   Cost per second of audio: {per_second:.3f}ms ({1000 / per_second:.0f}x realtime)")
+
+    print("\n" + "=" * 60)
+
+
+if __name__ == "__main__":
+    run_benchmark()
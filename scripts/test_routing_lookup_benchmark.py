@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Routing Lookup Benchmark
+
+Compares the phone -> assistant config lookup an inbound call waits on
+before Asterisk can dial the LiveKit bridge:
+- Two-step: GET phone mapping, then GET assistant config (two round trips)
+- Script: both resolved server-side by ROUTE_LOOKUP_SCRIPT (one round trip)
+- Local: in-process RouteCache hit (no round trip)
+- Target: script path about half the two-step latency over a network hop
+
+Seeds a set of routes under a throwaway prefix and removes them afterwards.
+Set REDIS_URL to benchmark against a remote Redis; the gap widens with
+round-trip time.
+
+Usage:
+    python scripts/test_routing_lookup_benchmark.py [--routes 100] [--lookups 2000]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+
+from dotenv import load_dotenv
+
+# Load .env from project root
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_dir = os.path.dirname(script_dir)
+load_dotenv(os.path.join(project_dir, ".env"))
+
+# Add control-plane directory to path for imports
+control_plane_dir = os.path.join(project_dir, "control-plane")
+sys.path.insert(0, control_plane_dir)
+
+import redis.asyncio as redis
+
+from app.services.redis_service import ROUTE_LOOKUP_SCRIPT
+from app.services.route_cache import RouteCache
+
+PREFIX = "vox:bench:"
+
+
+def assistant_config(i: int) -> dict:
+    """A config shaped like RoutingService's."""
+    return {
+        "assistant_id": f"assistant-{i}",
+        "client_id": f"client-{i % 10}",
+        "name": f"Assistant {i}",
+        "system_prompt": "You are a helpful receptionist. " * 20,
+        "minimax_voice_id": "mallory",
+        "llm_model": "groq/llama-3.1-8b-instant",
+        "first_message": "Hello, how can I help you today?",
+        "webhook_url": None,
+    }
+
+
+async def seed(client: redis.Redis, routes: int) -> list[str]:
+    pipe = client.pipeline(transaction=False)
+    phones = []
+    for i in range(routes):
+        phone = f"+1868555{i:04d}"
+        config = assistant_config(i)
+        pipe.setex(f"{PREFIX}phone:{phone}", 600, json.dumps({"assistant_id": config["assistant_id"]}))
+        pipe.setex(f"{PREFIX}assistant:{config['assistant_id']}", 600, json.dumps(config))
+        phones.append(phone)
+    await pipe.execute()
+    return phones
+
+
+async def cleanup(client: redis.Redis):
+    keys = [key async for key in client.scan_iter(f"{PREFIX}*")]
+    if keys:
+        await client.delete(*keys)
+
+
+async def two_step(client: redis.Redis, phone: str) -> dict:
+    data = await client.get(f"{PREFIX}phone:{phone}")
+    assistant_id = json.loads(data)["assistant_id"]
+    return json.loads(await client.get(f"{PREFIX}assistant:{assistant_id}"))
+
+
+def script_lookup(client: redis.Redis):
+    script = client.register_script(ROUTE_LOOKUP_SCRIPT)
+
+    async def lookup(phone: str) -> dict:
+        data, _ttl_ms = await script(keys=[f"{PREFIX}phone:{phone}"], args=[f"{PREFIX}assistant:"])
+        return json.loads(data)
+
+    return lookup
+
+
+async def measure(name: str, lookup, phones: list[str], lookups: int) -> list[float]:
+    # Warm up (connection, EVALSHA script load)
+    for phone in phones[:10]:
+        await lookup(phone)
+
+    latencies = []
+    for i in range(lookups):
+        phone = phones[i % len(phones)]
+        start = time.perf_counter()
+        config = await lookup(phone)
+        latencies.append((time.perf_counter() - start) * 1000)
+        assert config["assistant_id"].startswith("assistant-")
+
+    print(f"\n{name}")
+    print(f"   Mean: {statistics.mean(latencies) * 1000:.1f}us")
+    print(f"   p50:  {statistics.median(latencies) * 1000:.1f}us")
+    print(f"   p99:  {statistics.quantiles(latencies, n=100)[98] * 1000:.1f}us")
+    return latencies
+
+
+async def run_benchmark(routes: int, lookups: int):
+    redis_url = os.getenv("REDIS_URL", "redis://localhost:6379")
+    print(f"Connecting to Redis at {redis_url}...")
+    client = redis.from_url(redis_url, encoding="utf-8", decode_responses=True)
+    try:
+        await client.ping()
+    except Exception as e:
+        print(f"ERROR: Redis unavailable ({e})")
+        return
+
+    print("\n" + "#" * 60)
+    print("# ROUTING LOOKUP BENCHMARK")
+    print("#" * 60)
+    print(f"\nRoutes: {routes}, lookups per path: {lookups}")
+
+    try:
+        phones = await seed(client, routes)
+
+        baseline = await measure("[TWO-STEP] Two GETs", lambda p: two_step(client, p), phones, lookups)
+        script = await measure("[SCRIPT] One EVALSHA", script_lookup(client), phones, lookups)
+
+        cache = RouteCache(ttl_s=600, max_entries=routes)
+        for phone in phones:
+            cache.set(phone, await two_step(client, phone))
+
+        async def local(phone: str) -> dict:
+            return cache.get(phone)
+
+        local_latencies = await measure("[LOCAL] RouteCache hit", local, phones, lookups)
+
+        print("\n" + "=" * 60)
+        print("SUMMARY")
+        print("=" * 60)
+        base_p50 = statistics.median(baseline)
+        print(f"\n   Script speedup (p50): {base_p50 / statistics.median(script):.2f}x")
+        print(f"   Local speedup (p50):  {base_p50 / statistics.median(local_latencies):.0f}x")
+    finally:
+        await cleanup(client)
+        await client.close()
+
+    print("\n" + "=" * 60)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--routes", type=int, default=100)
+    parser.add_argument("--lookups", type=int, default=2000)
+    args = parser.parse_args()
+    asyncio.run(run_benchmark(args.routes, args.lookups))
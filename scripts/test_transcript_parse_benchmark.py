@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Transcript Parsing Microbenchmark
+
+Compares the original receive_transcripts parsing (json.loads of the full
+message plus a dict per result, words included) with TranscriptParser on
+each installed backend, with and without word timings.
+- Target: fast path at least 3x faster than the original per message
+
+Messages are raw Deepgram live-streaming (nova-2) messages, one per line.
+The default, fixtures/deepgram_stream.jsonl, is a short five-utterance
+call: interim and final Results with SpeechStarted, UtteranceEnd and
+Metadata mixed in. Record your own session from a 16kHz mono PCM16 WAV
+with --capture (needs DEEPGRAM_API_KEY) and pass its path.
+
+Usage:
+    python scripts/test_transcript_parse_benchmark.py [payloads.jsonl]
+    python scripts/test_transcript_parse_benchmark.py --capture call.wav [payloads.jsonl]
+"""
+
+import asyncio
+import json
+import os
+import sys
+import time
+import wave
+from unittest.mock import MagicMock
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_dir = os.path.dirname(script_dir)
+
+# Mock webrtcvad before importing (Windows doesn't have C++ build tools)
+sys.modules['webrtcvad'] = MagicMock()
+
+# Add agent-worker directory to path for imports
+agent_worker_dir = os.path.join(project_dir, "agent-worker")
+sys.path.insert(0, agent_worker_dir)
+
+from app.services.transcript import TranscriptParser, available_backends
+
+DEFAULT_PAYLOADS = os.path.join(script_dir, "fixtures", "deepgram_stream.jsonl")
+
+
+def load_messages(path: str) -> list[str]:
+    """Raw Deepgram messages, one per line."""
+    with open(path) as f:
+        return [line.rstrip("\n") for line in f if line.strip()]
+
+
+async def capture(wav_path: str, out_path: str):
+    """Stream a WAV file to Deepgram in real time and save every raw message."""
+    from app.services.stt import DeepgramSTTService
+
+    stt = DeepgramSTTService(api_key=os.environ["DEEPGRAM_API_KEY"])
+    await stt.connect()
+    messages = []
+
+    async def receive():
+        async for message in stt.websocket:
+            messages.append(message if isinstance(message, str) else message.decode())
+
+    receiver = asyncio.create_task(receive())
+    with wave.open(wav_path, "rb") as wav:
+        frames_per_chunk = wav.getframerate() // 10  # 100ms
+        while chunk := wav.readframes(frames_per_chunk):
+            await stt.send_audio(chunk)
+            await asyncio.sleep(0.1)
+    await asyncio.sleep(2.0)  # trailing finals and UtteranceEnd
+    await stt.close()
+    receiver.cancel()
+
+    with open(out_path, "w") as f:
+        f.writelines(m + "\n" for m in messages)
+    print(f"Captured {len(messages)} messages to {out_path}")
+
+
+def original_parse(message):
+    """Parsing as receive_transcripts did before TranscriptParser."""
+    data = json.loads(message)
+    if data.get("type") == "Results":
+        alternatives = data.get("channel", {}).get("alternatives", [])
+        if alternatives:
+            transcript = alternatives[0]
+            return {
+                "text": transcript.get("transcript", ""),
+                "is_final": data.get("is_final", False),
+                "confidence": transcript.get("confidence", 0.0),
+                "words": transcript.get("words", [])
+            }
+    return None
+
+
+def bench(parse, messages, runs: int = 200) -> float:
+    """Mean microseconds per message."""
+    for m in messages:
+        parse(m)  # warm up
+    start = time.perf_counter()
+    for _ in range(runs):
+        for m in messages:
+            parse(m)
+    return (time.perf_counter() - start) / (runs * len(messages)) * 1e6
+
+
+def run_benchmark(path: str = DEFAULT_PAYLOADS):
+    """Run the transcript parsing microbenchmark."""
+    print("\n" + "#" * 60)
+    print("# TRANSCRIPT PARSING MICROBENCHMARK")
+    print("#" * 60)
+
+    messages = load_messages(path)
+    results = sum('"Results"' in m for m in messages)
+    size = sum(len(m) for m in messages) / len(messages)
+    print(f"\n{os.path.relpath(path)}: {len(messages)} messages "
+          f"({results} Results), avg {size:.0f} bytes")
+    print(f"Backends available: {', '.join(available_backends())}")
+
+    print("\n" + "=" * 60)
+    baseline = bench(original_parse, messages)
+    print(f"[original json + dict]       {baseline:7.2f} us/msg")
+
+    for backend in available_backends():
+        for with_words in (False, True):
+            parser = TranscriptParser(with_words=with_words, backend=backend)
+            us = bench(parser.parse, messages)
+            label = f"{backend}{' + words' if with_words else ''}"
+            print(f"[{label:<27}] {us:7.2f} us/msg  ({baseline / us:.1f}x)")
+
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    if args[:1] == ["--capture"]:
+        asyncio.run(capture(args[1], args[2] if len(args) > 2 else DEFAULT_PAYLOADS))
+    else:
+        run_benchmark(*args[:1])